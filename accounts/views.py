@@ -6,7 +6,8 @@ from django.views.decorators.csrf import csrf_protect, ensure_csrf_cookie
 from django.contrib.auth.views import LoginView, PasswordResetView
 from django.urls import reverse_lazy
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Q, Count
+from agro.facets import facet_totals
 from .models import User
 from .forms import (
     CustomUserCreationForm, CustomAuthenticationForm,
@@ -159,10 +160,13 @@ def user_list_view(request):
     context = {
         'users': users,
         'title': 'User Management',
-        'total_users': users.count(),
-        'admins': users.filter(role='admin').count(),
-        'managers': users.filter(role='manager').count(),
-        'staff': users.filter(role='staff').count(),
+        **facet_totals(
+            users,
+            total_users=Count('id'),
+            admins=Count('id', filter=Q(role='admin')),
+            managers=Count('id', filter=Q(role='manager')),
+            staff=Count('id', filter=Q(role='staff')),
+        ),
     }
     return render(request, 'accounts/user_list.html', context)
 
@@ -0,0 +1,212 @@
+import threading
+
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache, DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+
+
+# ==================== TWO-TIER CACHE ====================
+#
+# The default cache is a small per-process LocMemCache in front of a shared
+# cache (Redis, file or database, see CACHES in settings) that every worker
+# process reads and writes. Reads try the local tier first and fill it from
+# the shared tier, so hot keys cost no round trip; every write, delete and
+# incr goes to the shared tier. Another worker's changes become visible here
+# within LOCAL_TIMEOUT seconds, and keys matching LOCAL_EXCLUDE (such as
+# invalidation counters) always skip the local tier.
+
+_MISSING = object()
+
+STATS_KEY = 'agro:cache-stats:{}'
+STAT_NAMES = ('local_hits', 'shared_hits', 'misses')
+
+
+class CacheStats:
+    """
+    Hit/miss counters for one process. They are added to totals kept in the
+    shared cache every flush_every lookups, so totals() covers all workers.
+    """
+
+    def __init__(self, backend, flush_every=100):
+        self.backend = backend
+        self.flush_every = flush_every
+        self.lock = threading.Lock()
+        self.pending = dict.fromkeys(STAT_NAMES, 0)
+
+    def record(self, name, count=1):
+        with self.lock:
+            self.pending[name] += count
+            if sum(self.pending.values()) < self.flush_every:
+                return
+            pending, self.pending = self.pending, dict.fromkeys(STAT_NAMES, 0)
+        self._flush(pending)
+
+    def _flush(self, pending):
+        for name, count in pending.items():
+            if not count:
+                continue
+            key = STATS_KEY.format(name)
+            self.backend.shared.add(key, 0, None)
+            try:
+                self.backend.shared.incr(key, count)
+            except ValueError:
+                # Evicted between add() and incr()
+                self.backend.shared.set(key, count, None)
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, dict.fromkeys(STAT_NAMES, 0)
+        self._flush(pending)
+
+    def totals(self):
+        """Counters across all processes, this one's unflushed counts included"""
+        stored = self.backend.shared.get_many([STATS_KEY.format(name) for name in STAT_NAMES])
+        with self.lock:
+            totals = {
+                name: stored.get(STATS_KEY.format(name), 0) + self.pending[name]
+                for name in STAT_NAMES
+            }
+        lookups = sum(totals.values())
+        totals['lookups'] = lookups
+        totals['hit_rate'] = round((totals['local_hits'] + totals['shared_hits']) / lookups, 4) if lookups else 0
+        return totals
+
+    def reset(self):
+        with self.lock:
+            self.pending = dict.fromkeys(STAT_NAMES, 0)
+        self.backend.shared.delete_many([STATS_KEY.format(name) for name in STAT_NAMES])
+
+
+class TwoTierCache(BaseCache):
+    """
+    Cache backend reading through a per-process local tier to a shared cache.
+
+    OPTIONS:
+        SHARED             alias of the shared cache in CACHES (default 'shared')
+        LOCAL_TIMEOUT      seconds a value stays in the local tier (default 5)
+        LOCAL_MAX_ENTRIES  size of the local tier (default 1000)
+        LOCAL_EXCLUDE      key prefixes that are never held locally
+        STATS_FLUSH_EVERY  lookups between hit/miss counter flushes (default 100)
+    """
+
+    def __init__(self, location, params):
+        options = dict(params.get('OPTIONS') or {})
+        self.shared_alias = options.pop('SHARED', 'shared')
+        self.local_timeout = options.pop('LOCAL_TIMEOUT', 5)
+        self.local_exclude = tuple(options.pop('LOCAL_EXCLUDE', ()))
+        local_max_entries = options.pop('LOCAL_MAX_ENTRIES', 1000)
+        stats_flush_every = options.pop('STATS_FLUSH_EVERY', 100)
+        super().__init__({**params, 'OPTIONS': options})
+
+        self.local = LocMemCache(f'two-tier-{location or id(self)}', {
+            'TIMEOUT': self.local_timeout,
+            'OPTIONS': {'MAX_ENTRIES': local_max_entries},
+        })
+        self.stats = CacheStats(self, flush_every=stats_flush_every)
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _local_ok(self, key):
+        return self.local_timeout and not key.startswith(self.local_exclude)
+
+    def _local_timeout(self, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            return self.local_timeout
+        return min(timeout, self.local_timeout)
+
+    def _remember(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        if self._local_ok(key):
+            self.local.set(key, value, self._local_timeout(timeout), version=version)
+
+    # Reads
+
+    def get(self, key, default=None, version=None):
+        if self._local_ok(key):
+            value = self.local.get(key, _MISSING, version=version)
+            if value is not _MISSING:
+                self.stats.record('local_hits')
+                return value
+        value = self.shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self.stats.record('misses')
+            return default
+        self.stats.record('shared_hits')
+        self._remember(key, value, version=version)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = {}
+        local_keys = [key for key in keys if self._local_ok(key)]
+        if local_keys:
+            found.update(self.local.get_many(local_keys, version=version))
+        if found:
+            self.stats.record('local_hits', len(found))
+
+        remaining = [key for key in keys if key not in found]
+        if remaining:
+            shared = self.shared.get_many(remaining, version=version)
+            if shared:
+                self.stats.record('shared_hits', len(shared))
+            if len(shared) < len(remaining):
+                self.stats.record('misses', len(remaining) - len(shared))
+            for key, value in shared.items():
+                self._remember(key, value, version=version)
+            found.update(shared)
+        return found
+
+    def has_key(self, key, version=None):
+        return self.shared.has_key(key, version=version)
+
+    # Writes
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self._remember(key, value, timeout, version)
+        else:
+            self.local.delete(key, version=version)
+        return added
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version=version)
+        self._remember(key, value, timeout, version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version=version)
+        for key, value in data.items():
+            if key not in failed:
+                self._remember(key, value, timeout, version)
+        return failed
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        self.local.delete(key, version=version)
+        return self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        self.local.delete_many(keys, version=version)
+        self.shared.delete_many(keys, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self.local.delete(key, version=version)
+        return self.shared.incr(key, delta, version=version)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+
+def cache_stats(alias='default'):
+    """Hit/miss totals of a TwoTierCache, or None for any other backend"""
+    backend = caches[alias]
+    if not isinstance(backend, TwoTierCache):
+        return None
+    return backend.stats.totals()
@@ -0,0 +1,109 @@
+import hashlib
+import time
+from datetime import datetime
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+# ==================== CHANGE VERSIONS ====================
+#
+# Every tracked model has a version in the cache: the time, in nanoseconds,
+# of the last committed save or delete of one of its rows. Read APIs list
+# the models their payload is built from, and ConditionalGetMixin turns
+# those versions into an ETag and a Last-Modified date. A dashboard polling
+# an endpoint whose data has not changed gets a 304 Not Modified for the
+# price of one cache read, before the view runs a single query.
+#
+# Writes that skip model signals (queryset.update(), bulk_create(),
+# bulk_update()) must call changed() for the models they touch.
+
+VERSION_PREFIX = 'agro:version:'
+
+
+def _version_key(model):
+    return f'{VERSION_PREFIX}{model._meta.label_lower}'
+
+
+def model_versions(models):
+    """Current version of each model, in one cache round trip when possible"""
+    keys = {model: _version_key(model) for model in models}
+    found = cache.get_many(keys.values())
+    versions = {}
+    for model, key in keys.items():
+        if key not in found:
+            # Never bumped, or evicted: count it as changed now
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key) or time.time_ns()
+        versions[model] = found[key]
+    return versions
+
+
+def changed(*models):
+    """Bump the versions of models once the current transaction commits"""
+    keys = [_version_key(model) for model in models]
+    transaction.on_commit(lambda: cache.set_many(dict.fromkeys(keys, time.time_ns()), None))
+
+
+def _bump_sender(sender, **kwargs):
+    changed(sender)
+
+
+def track(*models):
+    """
+    Bump each model's version whenever one of its rows is saved or deleted.
+    Call it after connecting the receivers that refresh data derived from
+    these models (rollups, ledgers): on-commit callbacks run in the order
+    they were registered, so the version only moves once the derived rows
+    are up to date.
+    """
+    for model in models:
+        label = model._meta.label_lower
+        post_save.connect(_bump_sender, sender=model, dispatch_uid=f'agro_version_save_{label}')
+        post_delete.connect(_bump_sender, sender=model, dispatch_uid=f'agro_version_delete_{label}')
+
+
+# ==================== CONDITIONAL GET ====================
+
+class ConditionalGetMixin:
+    """
+    Answer GET and HEAD with an ETag and Last-Modified derived from the
+    versions of conditional_models, and with 304 Not Modified when the
+    client already holds them. The ETag also covers the query string, the
+    user and today's date, since payloads depend on those too.
+    """
+    conditional_models = ()
+
+    def get_validators(self, request):
+        """(etag, last_modified) of the response to this request"""
+        versions = model_versions(self.conditional_models)
+        today = timezone.localdate()
+        state = [
+            request.get_full_path(), request.user.pk, today.isoformat(),
+            *(f'{model._meta.label_lower}.{version}' for model, version in versions.items()),
+        ]
+        etag = quote_etag(hashlib.md5('|'.join(map(str, state)).encode()).hexdigest())
+        midnight = timezone.make_aware(datetime.combine(today, datetime.min.time()))
+        last_modified = max(int(midnight.timestamp()), *(version // 10 ** 9 for version in versions.values()))
+        return etag, last_modified
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or not self.conditional_models:
+            return super().dispatch(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators(request)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        response.headers.setdefault('ETag', etag)
+        response.headers.setdefault('Last-Modified', http_date(last_modified))
+        # Let browsers keep the payload but check back on every poll
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
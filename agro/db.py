@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+# ==================== SQLITE CONNECTION SETUP ====================
+#
+# SQLite keeps most tuning per connection, so the pragmas in
+# settings.SQLITE_PRAGMAS are run on every new connection. journal_mode=WAL
+# is stored in the database file itself: once set, readers no longer block
+# the writer and the writer no longer blocks readers.
+#
+# The production profile is defined once here and used both by
+# agro/settings.py and by `manage.py benchmark_sqlite`, so the benchmark
+# always measures what is deployed.
+
+# Connection settings merged into DATABASES['default']
+PRODUCTION_DATABASE_OPTIONS = {
+    'CONN_MAX_AGE': 600,
+    'CONN_HEALTH_CHECKS': True,
+    # Take the write lock when a transaction starts, instead of failing
+    # with "database is locked" when a read transaction tries to upgrade
+    'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+}
+
+# Run on every new SQLite connection, in this order
+PRODUCTION_SQLITE_PRAGMAS = {
+    'busy_timeout': 20000,         # ms to wait for a lock before "database is locked"
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',       # durable at checkpoints, safe against corruption in WAL mode
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64000,          # negative means KiB, so 64 MB of page cache
+    'temp_store': 'MEMORY',
+}
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Run SQLITE_PRAGMAS on each new SQLite connection"""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', None)
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def sqlite_pragma_values(connection, names):
+    """Current value of each named pragma on a SQLite connection"""
+    values = {}
+    with connection.cursor() as cursor:
+        for name in names:
+            cursor.execute(f'PRAGMA {name}')
+            row = cursor.fetchone()
+            values[name] = row[0] if row else None
+    return values
@@ -0,0 +1,69 @@
+import hashlib
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.exceptions import EmptyResultSet
+
+
+# ==================== FACET COUNTS ====================
+#
+# Filter badges and summary cards on list pages ("42 active, 7 dry, ...")
+# are conditional aggregates over the page's filtered queryset, e.g.
+#
+#     facet_totals(queryset, active=Count('id', filter=Q(status='ACTIVE')))
+#
+# All facets are read in one query instead of one count() per badge. With
+# group_by, the same facets are also broken down per value of a field in a
+# single GROUP BY query and the totals are added up from the groups, so only
+# additive aggregates (Count, Sum) belong in a grouped call.
+
+def _signature(queryset, group_by, facets):
+    """Stable digest of the filtered query and the facet definitions"""
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        # e.g. pk__in=[]: the query matches nothing whatever the other filters are
+        sql, params = 'EMPTY', ()
+    definition = repr((sql, params, group_by, sorted((name, repr(expr)) for name, expr in facets.items())))
+    return hashlib.md5(definition.encode()).hexdigest()
+
+
+def _cached(cache_key, timeout, queryset, group_by, facets, compute):
+    if cache_key is None:
+        return compute()
+    key = f'{cache_key}:{_signature(queryset, group_by, facets)}'
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        cache.set(key, result, timeout)
+    return result
+
+
+def facet_totals(queryset, cache_key=None, timeout=DEFAULT_TIMEOUT, **facets):
+    """
+    Evaluate every facet over queryset in one aggregate query.
+    Returns {name: value}, with empty sums reported as 0. Pass cache_key
+    (a prefix, e.g. a versioned key) to cache the result per filter
+    signature for timeout seconds (default: the cache's own timeout).
+    """
+    def compute():
+        totals = queryset.order_by().aggregate(**facets)
+        return {name: value or 0 for name, value in totals.items()}
+
+    return _cached(cache_key, timeout, queryset, None, facets, compute)
+
+
+def grouped_facets(queryset, group_by, cache_key=None, timeout=DEFAULT_TIMEOUT, **facets):
+    """
+    Evaluate every facet per value of group_by in one GROUP BY query.
+    Returns (totals, groups): totals sums each facet over all groups and
+    groups is a list of dicts holding group_by and each facet, in group
+    order. Caching works as in facet_totals.
+    """
+    def compute():
+        rows = queryset.order_by().values(group_by).annotate(**facets).order_by(group_by)
+        groups = [{key: (value or 0) if key in facets else value for key, value in row.items()} for row in rows]
+        totals = {name: sum(group[name] for group in groups) for name in facets}
+        return totals, groups
+
+    return _cached(cache_key, timeout, queryset, group_by, facets, compute)
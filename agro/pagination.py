@@ -0,0 +1,172 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Q
+from django.http import JsonResponse
+
+from .facets import facet_totals
+
+
+# ==================== CURSOR PAGINATION ====================
+#
+# Keyset pagination for long, append-mostly tables (milk, feed, weights,
+# water readings, expenses, sales). A page is "the next per_page rows after
+# this (date, id)" instead of "rows 5000-5050", so the database seeks
+# straight to the cursor through the date index and never counts or skips
+# the rows before it: the thousandth page costs the same as the first.
+#
+# The ordering must be unique, so it always ends with the primary key, and
+# its fields must not be NULL (and must be selected, for values() querysets).
+# Cursors are opaque to clients: base64 of the key values of the row they
+# continue from.
+
+APPROXIMATE_COUNT_TTL = 60
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _field(model, name):
+    return model._meta.pk if name in ('pk', 'id') else model._meta.get_field(name)
+
+
+class CursorPaginator:
+    """Pages of a queryset ordered by a unique key such as ('-date', '-id')"""
+
+    def __init__(self, queryset, ordering=('-date', '-id'), per_page=50):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = per_page
+        self.fields = [name.lstrip('-') for name in self.ordering]
+        self.descending = [name.startswith('-') for name in self.ordering]
+
+    # Cursors
+
+    def encode_cursor(self, row, direction):
+        """Cursor continuing from row, a model instance or a values() dict"""
+        values = []
+        for name in self.fields:
+            value = row[name] if isinstance(row, dict) else getattr(row, _field(self.queryset.model, name).attname)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        payload = json.dumps({'k': values, 'd': direction}, separators=(',', ':'), default=str)
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            values, direction = payload['k'], payload['d']
+            if direction not in ('next', 'prev') or len(values) != len(self.fields):
+                raise ValueError
+            model = self.queryset.model
+            return [_field(model, name).to_python(value) for name, value in zip(self.fields, values)], direction
+        except (ValueError, TypeError, KeyError, AttributeError, ValidationError) as exc:
+            raise InvalidCursor('Invalid cursor') from exc
+
+    # Queries
+
+    def _after(self, values, backwards):
+        """Rows strictly after values in the ordering (before them when backwards)"""
+        condition = Q()
+        equal = {}
+        for name, value, descending in zip(self.fields, values, self.descending):
+            lookup = 'lt' if descending != backwards else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        # A plain range on the leading field lets the database seek with its index
+        first, descending = self.fields[0], self.descending[0]
+        bound = 'lte' if descending != backwards else 'gte'
+        return Q(**{f'{first}__{bound}': values[0]}) & condition
+
+    def page(self, cursor=None):
+        values, direction = self.decode_cursor(cursor) if cursor else (None, 'next')
+        backwards = direction == 'prev'
+
+        ordering = self.ordering
+        if backwards:
+            ordering = tuple(name[1:] if name.startswith('-') else f'-{name}' for name in ordering)
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._after(values, backwards))
+
+        rows = list(queryset[:self.per_page + 1])
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+        return CursorPage(self, rows, cursor is not None, more, backwards)
+
+
+class CursorPage:
+    """One page of rows, with cursors for the pages either side"""
+
+    def __init__(self, paginator, rows, from_cursor, more, backwards):
+        self.paginator = paginator
+        self.rows = rows
+        if backwards:
+            self.has_next, self.has_previous = from_cursor, more
+        else:
+            self.has_next, self.has_previous = more, from_cursor
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def next_cursor(self):
+        if self.has_next and self.rows:
+            return self.paginator.encode_cursor(self.rows[-1], 'next')
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous and self.rows:
+            return self.paginator.encode_cursor(self.rows[0], 'prev')
+        return None
+
+
+def approximate_count(queryset, timeout=APPROXIMATE_COUNT_TTL):
+    """Row count of queryset, cached per filter signature for timeout seconds"""
+    key = f'approximate_count:{queryset.model._meta.label_lower}'
+    return facet_totals(queryset, cache_key=key, timeout=timeout, count=Count('pk'))['count']
+
+
+class CursorPaginatedAPIMixin:
+    """
+    List API views answer ?cursor=&per_page=&count=1 with a page of rows:
+
+        {'success': True, 'data': [...], 'pagination': {'next': ..., 'previous': ...,
+         'per_page': 50, 'count': 1234}}
+
+    'count' is only computed when asked for, and may be up to
+    APPROXIMATE_COUNT_TTL seconds old.
+    """
+    cursor_ordering = ('-date', '-id')
+    per_page = 50
+    max_per_page = 200
+
+    def get_per_page(self):
+        try:
+            return min(max(int(self.request.GET.get('per_page', self.per_page)), 1), self.max_per_page)
+        except ValueError:
+            return self.per_page
+
+    def cursor_response(self, queryset, serialize):
+        """JsonResponse for the requested page, with serialize(row) for each row"""
+        paginator = CursorPaginator(queryset, self.cursor_ordering, self.get_per_page())
+        try:
+            page = paginator.page(self.request.GET.get('cursor') or None)
+        except InvalidCursor:
+            return JsonResponse({'success': False, 'error': 'Invalid cursor'}, status=400)
+
+        pagination = {
+            'next': page.next_cursor,
+            'previous': page.previous_cursor,
+            'per_page': paginator.per_page,
+        }
+        if self.request.GET.get('count'):
+            pagination['count'] = approximate_count(queryset)
+        return JsonResponse({'success': True, 'data': [serialize(row) for row in page], 'pagination': pagination})
@@ -1,6 +1,8 @@
 from pathlib import Path
 import os
 
+from agro.db import PRODUCTION_DATABASE_OPTIONS, PRODUCTION_SQLITE_PRAGMAS
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -69,6 +71,15 @@ WSGI_APPLICATION = 'agro.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# AGRO_DB_PROFILE=basic (default) leaves SQLite at its own defaults and
+# reconnects on every request; AGRO_DB_PROFILE=production runs SQLite in WAL
+# mode with the pragmas and connection options of agro/db.py and keeps
+# connections open between requests.
+# WAL is written into the database file, so enable it only where the app is
+# deployed (set the variable in the server's environment), not for every
+# manage.py run. See agro/db.py and `manage.py benchmark_sqlite` to compare.
+AGRO_DB_PROFILE = os.environ.get('AGRO_DB_PROFILE', 'basic')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -76,6 +87,37 @@ DATABASES = {
     }
 }
 
+if AGRO_DB_PROFILE == 'production':
+    DATABASES['default'].update(
+        PRODUCTION_DATABASE_OPTIONS,
+        CONN_MAX_AGE=int(os.environ.get('AGRO_DB_CONN_MAX_AGE', PRODUCTION_DATABASE_OPTIONS['CONN_MAX_AGE'])),
+        OPTIONS=dict(PRODUCTION_DATABASE_OPTIONS['OPTIONS']),
+    )
+
+# Run on every new SQLite connection, in this order
+SQLITE_PRAGMAS = dict(PRODUCTION_SQLITE_PRAGMAS) if AGRO_DB_PROFILE == 'production' else {}
+
+# AGRO_DB_ENGINE=postgresql moves the data to a PostgreSQL server (needs the
+# psycopg package). Queries are backend neutral except for a few guarded
+# paths: the SQLite pragmas and `manage.py benchmark_sqlite` are SQLite only,
+# and home.search and its migration have an FTS5 (SQLite) and a tsvector
+# (PostgreSQL) variant. Run the test suite against both engines before
+# releasing: `python manage.py test` and
+# `AGRO_DB_ENGINE=postgresql python manage.py test`.
+if os.environ.get('AGRO_DB_ENGINE') == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('AGRO_DB_NAME', 'agro'),
+            'USER': os.environ.get('AGRO_DB_USER', 'agro'),
+            'PASSWORD': os.environ.get('AGRO_DB_PASSWORD', ''),
+            'HOST': os.environ.get('AGRO_DB_HOST', 'localhost'),
+            'PORT': os.environ.get('AGRO_DB_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.environ.get('AGRO_DB_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -178,11 +220,46 @@ if not DEBUG:
 
 
 # Cache Settings (optional - for better performance)
-CACHES = {
-    'default': {
+# AGRO_CACHE picks the cache shared by all worker processes:
+#   locmem - per process, fine for runserver and a single worker (default)
+#   redis  - Redis server at AGRO_REDIS_URL (needs the redis package)
+#   file   - files under AGRO_CACHE_DIR, for single-box installs
+#   db     - the default database (run `manage.py createcachetable` first)
+# The default cache reads through a short-lived per-process tier in front of
+# it, see agro/cache.py.
+AGRO_CACHE = os.environ.get('AGRO_CACHE', 'locmem')
+
+SHARED_CACHES = {
+    'locmem': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'LOCATION': 'unique-snowflake',
-    }
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('AGRO_REDIS_URL', 'redis://127.0.0.1:6379/1'),
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('AGRO_CACHE_DIR', str(BASE_DIR / '.cache')),
+    },
+    'db': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'agro_cache',
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'agro.cache.TwoTierCache',
+        'OPTIONS': {
+            'SHARED': 'shared',
+            'LOCAL_TIMEOUT': int(os.environ.get('AGRO_CACHE_LOCAL_TIMEOUT', 5)),
+            # Invalidation counters and change versions must be read from the
+            # shared tier every time
+            'LOCAL_EXCLUDE': ['fishery:version:', 'agro:version:'],
+        },
+    },
+    'shared': SHARED_CACHES[AGRO_CACHE],
 }
 
 
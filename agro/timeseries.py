@@ -0,0 +1,101 @@
+from datetime import date, datetime, timedelta
+
+from django.db.models.functions import TruncDay, TruncWeek, TruncMonth, TruncQuarter, TruncYear
+
+
+# ==================== TIME SERIES ====================
+#
+# Calendar-bucketed aggregates for the dairy and fishery charts. Ranges are
+# half-open (field >= start AND field < end) so the date indexes apply, each
+# series is one GROUP BY over a Trunc* of the date column, and buckets with
+# no rows are filled with zeros in Python.
+
+GRANULARITIES = {
+    'day': TruncDay,
+    'week': TruncWeek,  # ISO weeks, starting Monday
+    'month': TruncMonth,
+    'quarter': TruncQuarter,
+    'year': TruncYear,
+}
+
+
+def _as_date(value):
+    return value.date() if isinstance(value, datetime) else value
+
+
+def bucket_start(day, granularity):
+    """First day of the calendar bucket containing day"""
+    if granularity == 'day':
+        return day
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    if granularity == 'quarter':
+        return date(day.year, 3 * ((day.month - 1) // 3) + 1, 1)
+    if granularity == 'year':
+        return date(day.year, 1, 1)
+    raise ValueError(f'Unknown granularity: {granularity}')
+
+
+def next_bucket(start, granularity):
+    """First day of the bucket after the one starting at start"""
+    if granularity == 'day':
+        return start + timedelta(days=1)
+    if granularity == 'week':
+        return start + timedelta(days=7)
+    if granularity == 'year':
+        return date(start.year + 1, 1, 1)
+    months = 3 if granularity == 'quarter' else 1
+    month = start.month - 1 + months
+    return date(start.year + month // 12, month % 12 + 1, 1)
+
+
+def bucket_starts(start, end, granularity):
+    """Start dates of every bucket overlapping [start, end)"""
+    starts = []
+    current = bucket_start(start, granularity)
+    while current < end:
+        starts.append(current)
+        current = next_bucket(current, granularity)
+    return starts
+
+
+def last_buckets(count, granularity, today=None):
+    """Half-open range covering the last count buckets, ending with the current one"""
+    current = bucket_start(today or date.today(), granularity)
+    start = current
+    for _ in range(count - 1):
+        start = bucket_start(start - timedelta(days=1), granularity)
+    return start, next_bucket(current, granularity)
+
+
+def bucket_totals(queryset, date_field, start, end, granularity, **aggregates):
+    """
+    Aggregate a queryset per calendar bucket within [start, end) in one query.
+    Returns {bucket start: {name: value}} for buckets that have rows.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f'Unknown granularity: {granularity}')
+    rows = queryset.filter(**{f'{date_field}__gte': start, f'{date_field}__lt': end}).annotate(
+        period=GRANULARITIES[granularity](date_field)
+    ).values('period').annotate(**aggregates).order_by('period')
+    return {_as_date(row.pop('period')): row for row in rows}
+
+
+def time_series(queryset, date_field, start, end, granularity='month', **aggregates):
+    """
+    Zero-filled series of calendar buckets over [start, end).
+    Returns one dict per bucket, oldest first, holding 'period' (the bucket
+    start date) and a value for each named aggregate.
+    """
+    totals = bucket_totals(queryset, date_field, start, end, granularity, **aggregates)
+    return [
+        {'period': period, **{name: totals.get(period, {}).get(name) or 0 for name in aggregates}}
+        for period in bucket_starts(start, end, granularity)
+    ]
+
+
+def series_values(series, name='total'):
+    """One aggregate of a time_series() as a list of floats, for chart payloads"""
+    return [float(bucket[name]) for bucket in series]
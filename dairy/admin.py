@@ -6,6 +6,8 @@ from django.utils import timezone
 from datetime import datetime, timedelta
 
 from .models import *
+from .pdf_exports import queue_pdf_export
+from agro import conditional
 
 # ==================== CATTLE ADMIN ====================
 
@@ -51,6 +53,9 @@ class CattleAdmin(admin.ModelAdmin):
     
     autocomplete_fields = ['sire', 'dam', 'created_by']
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_financials()
+    
     def age_display(self, obj):
         if obj.birth_date:
             months = obj.age_in_months()
@@ -126,16 +131,19 @@ class CattleAdmin(admin.ModelAdmin):
     
     def mark_vaccinated(self, request, queryset):
         updated = queryset.update(is_vaccinated=True, last_vaccination_date=timezone.now())
+        conditional.changed(Cattle)
         self.message_user(request, f'{updated} cattle marked as vaccinated.')
     mark_vaccinated.short_description = "Mark selected as vaccinated"
     
     def mark_active(self, request, queryset):
         updated = queryset.update(status='ACTIVE')
+        conditional.changed(Cattle)
         self.message_user(request, f'{updated} cattle marked as active.')
     mark_active.short_description = "Mark selected as active"
     
     def mark_sold(self, request, queryset):
         updated = queryset.update(status='SOLD')
+        conditional.changed(Cattle)
         self.message_user(request, f'{updated} cattle marked as sold.')
     mark_sold.short_description = "Mark selected as sold"
     
@@ -777,6 +785,9 @@ class MilkProductionReportAdmin(admin.ModelAdmin):
     actions = ['generate_pdf_reports']
     
     def generate_pdf_reports(self, request, queryset):
+        for report in queryset:
+            export = PDFExport.objects.create(export_type='MILK', milk_report=report, requested_by=request.user)
+            queue_pdf_export(export)
         self.message_user(request, f"PDF generation started for {queryset.count()} reports")
     generate_pdf_reports.short_description = "Generate PDF reports"
 
@@ -1086,6 +1097,17 @@ class MonthlyBreedingActivityInline(admin.TabularInline):
 BreedingPerformanceReportAdmin.inlines = [SirePerformanceInline, MonthlyBreedingActivityInline]
 
 
+# ==================== PDF EXPORTS ====================
+
+@admin.register(PDFExport)
+class PDFExportAdmin(admin.ModelAdmin):
+    list_display = ['export_type', 'status', 'row_count', 'requested_by', 'created_at', 'completed_at']
+    list_filter = ['export_type', 'status']
+    date_hierarchy = 'created_at'
+    readonly_fields = ['row_count', 'error', 'created_at', 'completed_at']
+    list_select_related = ['requested_by']
+
+
 # ==================== CUSTOM ADMIN SITE CONFIGURATION ====================
 
 # Customize Admin Site
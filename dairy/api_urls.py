@@ -26,6 +26,7 @@ urlpatterns = [
     path('milk/<int:record_id>/', views.MilkRecordDetailAPIView.as_view(), name='api_milk_detail'),
     path('milk/stats/', views.MilkStatsAPIView.as_view(), name='api_milk_stats'),
     path('milk/today/', views.MilkTodayAPIView.as_view(), name='api_milk_today'),
+    path('milk/session/', views.MilkSessionBulkAPIView.as_view(), name='api_milk_session'),
     path('milk/by-cattle/<int:cattle_id>/', views.MilkByCattleAPIView.as_view(), name='api_milk_by_cattle'),
     
     # ==================== MILK SALE APIS ====================
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class DairyConfig(AppConfig):
     name = 'dairy'
+
+    def ready(self):
+        from . import signals  # noqa: F401
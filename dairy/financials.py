@@ -0,0 +1,92 @@
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import Cattle, CattleFinancials, FeedingRecord, HealthRecord, Expense, CattleSale
+
+
+# ==================== CATTLE FINANCIAL LEDGER ====================
+
+# Which CattleFinancials columns each source table feeds
+FEED = 'feed'
+HEALTH = 'health'
+EXPENSE = 'expense'
+SALE = 'sale'
+ALL_COMPONENTS = (FEED, HEALTH, EXPENSE, SALE)
+
+
+def _feed_fields(cattle_ids):
+    rows = FeedingRecord.objects.filter(cattle_id__in=cattle_ids).values('cattle_id').annotate(
+        feed_cost=Sum('total_cost'),
+    ).order_by()
+    return {r['cattle_id']: {'feed_cost': r['feed_cost'] or 0} for r in rows}
+
+
+def _health_fields(cattle_ids):
+    rows = HealthRecord.objects.filter(cattle_id__in=cattle_ids).values('cattle_id').annotate(
+        health_cost=Sum('treatment_cost'),
+    ).order_by()
+    return {r['cattle_id']: {'health_cost': r['health_cost'] or 0} for r in rows}
+
+
+def _expense_fields(cattle_ids):
+    rows = Expense.objects.filter(cattle_id__in=cattle_ids).values('cattle_id').annotate(
+        other_expenses=Sum('amount'),
+    ).order_by()
+    return {r['cattle_id']: {'other_expenses': r['other_expenses'] or 0} for r in rows}
+
+
+def _sale_fields(cattle_ids):
+    rows = CattleSale.objects.filter(cattle_id__in=cattle_ids).values_list('cattle_id', 'sale_price')
+    return {cattle_id: {'sale_revenue': price} for cattle_id, price in rows}
+
+
+COMPONENTS = {
+    FEED: (_feed_fields, {'feed_cost': 0}),
+    HEALTH: (_health_fields, {'health_cost': 0}),
+    EXPENSE: (_expense_fields, {'other_expenses': 0}),
+    SALE: (_sale_fields, {'sale_revenue': 0}),
+}
+
+
+def _compute(cattle_ids, components):
+    values = {cattle_id: {} for cattle_id in cattle_ids}
+    for component in components:
+        compute, empty = COMPONENTS[component]
+        found = compute(cattle_ids)
+        for cattle_id in cattle_ids:
+            values[cattle_id].update(found.get(cattle_id, empty))
+    return values
+
+
+def refresh_cattle_financials(cattle_ids, components=ALL_COMPONENTS):
+    """
+    Recompute the given ledger components for a set of cattle.
+    Only the tables behind the listed components are read, one grouped
+    query each. Cattle without a ledger row yet get every component built.
+    """
+    cattle_ids = set(Cattle.objects.filter(pk__in={c for c in cattle_ids if c}).values_list('pk', flat=True))
+    if not cattle_ids:
+        return 0
+
+    existing = set(
+        CattleFinancials.objects.filter(cattle_id__in=cattle_ids).values_list('cattle_id', flat=True)
+    )
+    missing = cattle_ids - existing
+
+    if existing:
+        for cattle_id, fields in _compute(existing, components).items():
+            CattleFinancials.objects.filter(cattle_id=cattle_id).update(updated_at=timezone.now(), **fields)
+    if missing:
+        CattleFinancials.objects.bulk_create(
+            [CattleFinancials(cattle_id=cattle_id, **fields) for cattle_id, fields in _compute(missing, ALL_COMPONENTS).items()],
+            ignore_conflicts=True,
+        )
+    return len(cattle_ids)
+
+
+def rebuild_cattle_financials(batch_size=500):
+    """Rebuild every CattleFinancials row from the source tables"""
+    cattle_ids = list(Cattle.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(cattle_ids), batch_size):
+        refresh_cattle_financials(cattle_ids[start:start + batch_size])
+    return len(cattle_ids)
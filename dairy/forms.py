@@ -158,7 +158,7 @@ class CattleSaleForm(BootstrapFormMixin, forms.ModelForm):
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['cattle'].queryset = Cattle.objects.filter(status='ACTIVE')
+        self.fields['cattle'].queryset = Cattle.objects.filter(status='ACTIVE').with_financials()
         
         if not self.instance.pk:
             self.initial['sale_date'] = timezone.now().date()
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dairy.rollups import rebuild_daily_summaries
+
+
+class Command(BaseCommand):
+    help = 'Rebuild DailyProductionSummary rows from milk records and milk sales'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First date to rebuild (YYYY-MM-DD). Defaults to the earliest record.')
+        parser.add_argument('--end', help='Last date to rebuild (YYYY-MM-DD). Defaults to the latest record.')
+
+    def handle(self, *args, **options):
+        start_date = self._parse_date(options['start'])
+        end_date = self._parse_date(options['end'])
+
+        if start_date and end_date and start_date > end_date:
+            raise CommandError('--start must not be after --end')
+
+        written = rebuild_daily_summaries(start_date, end_date)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} daily production summaries'))
+
+    def _parse_date(self, value):
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError(f'Invalid date: {value}. Use YYYY-MM-DD.')
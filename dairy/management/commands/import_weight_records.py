@@ -0,0 +1,42 @@
+import csv
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from dairy.weights import import_weight_records
+
+
+class Command(BaseCommand):
+    help = 'Import a weigh-day CSV with tag_number and weight columns (optionally date and notes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help='Path to the CSV file')
+        parser.add_argument('--date', help='Weigh date for rows without a date column (YYYY-MM-DD)')
+        parser.add_argument('--user', help='Username to record as the weigher')
+
+    def handle(self, *args, **options):
+        default_date = None
+        if options['date']:
+            try:
+                default_date = datetime.strptime(options['date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError(f"Invalid date: {options['date']}. Use YYYY-MM-DD.")
+
+        recorded_by = None
+        if options['user']:
+            recorded_by = get_user_model().objects.filter(username=options['user']).first()
+            if recorded_by is None:
+                raise CommandError(f"Unknown user: {options['user']}")
+
+        try:
+            with open(options['csv_file'], newline='', encoding='utf-8-sig') as handle:
+                rows = list(csv.DictReader(handle))
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        try:
+            created, updated = import_weight_records(rows, recorded_by=recorded_by, default_date=default_date)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(f'Imported {created} new and {updated} updated weight records'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from dairy.models import Cattle
+from dairy.weights import recompute_daily_gains
+
+
+class Command(BaseCommand):
+    help = 'Recompute WeightRecord daily gains and ages across whole weight series'
+
+    def add_arguments(self, parser):
+        parser.add_argument('tags', nargs='*', help='Tag numbers to recompute. Defaults to the whole herd.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows fetched and written per batch')
+
+    def handle(self, *args, **options):
+        cattle_ids = None
+        if options['tags']:
+            found = dict(Cattle.objects.filter(tag_number__in=options['tags']).values_list('tag_number', 'pk'))
+            missing = sorted(set(options['tags']) - set(found))
+            if missing:
+                raise CommandError(f"Unknown tag numbers: {', '.join(missing)}")
+            cattle_ids = found.values()
+
+        updated = recompute_daily_gains(cattle_ids, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Updated {updated} weight records'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from dairy.financials import rebuild_cattle_financials
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-animal CattleFinancials ledger from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Cattle aggregated per query batch')
+
+    def handle(self, *args, **options):
+        count = rebuild_cattle_financials(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Reconciled financials for {count} cattle'))
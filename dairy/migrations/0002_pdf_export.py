@@ -0,0 +1,36 @@
+# Generated by Django 6.0.2 on 2026-10-18 06:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dairy', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PDFExport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('export_type', models.CharField(choices=[('CATTLE', 'Cattle'), ('MILK', 'Milk Records'), ('HEALTH', 'Health Records'), ('FEEDING', 'Feeding Records'), ('WEIGHT', 'Weight Records'), ('BREEDING', 'Breeding Records'), ('VACCINATION', 'Vaccination Records'), ('SALES', 'Sales'), ('FINANCIAL', 'Financial')], max_length=20)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Rendering'), ('READY', 'Ready'), ('FAILED', 'Failed')], default='PENDING', max_length=10)),
+                ('file', models.FileField(blank=True, null=True, upload_to='exports/pdf/')),
+                ('row_count', models.IntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('milk_report', models.ForeignKey(blank=True, help_text="Limits a milk export to this report's period", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pdf_exports', to='dairy.milkproductionreport')),
+                ('requested_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'PDF Export',
+                'verbose_name_plural': 'PDF Exports',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 06:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dairy', '0002_pdf_export'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='milkproductionreport',
+            name='period',
+            field=models.CharField(choices=[('DAILY', 'Daily'), ('WEEKLY', 'Weekly'), ('MONTHLY', 'Monthly'), ('QUARTERLY', 'Quarterly'), ('YEARLY', 'Yearly'), ('CUSTOM', 'Custom Range')], max_length=20),
+        ),
+    ]
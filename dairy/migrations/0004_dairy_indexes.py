@@ -0,0 +1,69 @@
+# Generated by Django 6.0.2 on 2026-10-18 06:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dairy', '0003_milk_report_custom_period'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='breedingrecord',
+            index=models.Index(fields=['breeding_date'], name='dairy_breed_breedin_2fcbf3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breedingrecord',
+            index=models.Index(fields=['status'], name='dairy_breed_status_769d39_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='breedingrecord',
+            index=models.Index(condition=models.Q(('is_pregnant', True)), fields=['expected_calving_date'], name='dairy_breeding_calving_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cattle',
+            index=models.Index(fields=['status', 'cattle_type'], name='dairy_cattl_status_0a8301_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cattlesale',
+            index=models.Index(fields=['sale_date'], name='dairy_cattl_sale_da_601190_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['date'], name='dairy_expen_date_4bac37_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedingrecord',
+            index=models.Index(fields=['date'], name='dairy_feedi_date_1e6f4f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='healthrecord',
+            index=models.Index(fields=['date'], name='dairy_healt_date_4d69d8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='healthrecord',
+            index=models.Index(fields=['next_checkup_date'], name='dairy_healt_next_ch_30fe80_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='healthrecord',
+            index=models.Index(condition=models.Q(('is_emergency', True)), fields=['date'], name='dairy_health_emergency_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='milkrecord',
+            index=models.Index(fields=['date', 'session'], name='dairy_milkr_date_c54700_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='milksale',
+            index=models.Index(fields=['date'], name='dairy_milks_date_901dde_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vaccinationschedule',
+            index=models.Index(fields=['administered_date'], name='dairy_vacci_adminis_d43080_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vaccinationschedule',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['scheduled_date'], name='dairy_vaccine_pending_idx'),
+        ),
+    ]
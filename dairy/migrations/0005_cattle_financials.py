@@ -0,0 +1,30 @@
+# Generated by Django 6.0.2 on 2026-10-18 06:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dairy', '0004_dairy_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CattleFinancials',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feed_cost', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('health_cost', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('other_expenses', models.DecimalField(decimal_places=2, default=0, help_text='Expenses linked to this cattle', max_digits=12)),
+                ('sale_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('cattle', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='financials', to='dairy.cattle')),
+            ],
+            options={
+                'verbose_name': 'Cattle Financials',
+                'verbose_name_plural': 'Cattle Financials',
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-18 06:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dairy', '0005_cattle_financials'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='milkrecord',
+            index=models.Index(fields=['date', 'id'], name='dairy_milkr_date_7f370e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='weightrecord',
+            index=models.Index(fields=['date', 'id'], name='dairy_weigh_date_acdb74_idx'),
+        ),
+    ]
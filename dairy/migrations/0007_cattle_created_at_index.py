@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-18 07:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dairy', '0006_cursor_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cattle',
+            index=models.Index(fields=['created_at', 'id'], name='dairy_cattl_created_eb332c_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-18 07:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dairy', '0007_cattle_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='milkproductionreport',
+            name='cattle',
+            field=models.ForeignKey(blank=True, help_text='Animal the report covers; empty for the whole herd', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='milk_reports', to='dairy.cattle'),
+        ),
+        migrations.AddField(
+            model_name='milkproductionreport',
+            name='details',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
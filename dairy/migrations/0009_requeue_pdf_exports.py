@@ -0,0 +1,26 @@
+# Generated by Django 6.0.2 on 2026-10-18 07:37
+
+from django.db import migrations
+
+
+def requeue_unfinished_exports(apps, schema_editor):
+    """Exports left to the old in-process thread pool go to the report worker instead"""
+    PDFExport = apps.get_model('dairy', 'PDFExport')
+    ReportJob = apps.get_model('home', 'ReportJob')
+    exports = PDFExport.objects.filter(status__in=['PENDING', 'RUNNING'])
+    ReportJob.objects.bulk_create([
+        ReportJob(job_type='PDF_EXPORT', params={'export_id': export.pk}, requested_by_id=export.requested_by_id)
+        for export in exports.only('pk', 'requested_by_id')
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dairy', '0008_milk_report_details'),
+        ('home', '0004_report_job_pdf_export'),
+    ]
+
+    operations = [
+        migrations.RunPython(requeue_unfinished_exports, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,102 @@
+from decimal import Decimal, InvalidOperation
+
+from django.db import IntegrityError, transaction
+
+from agro import conditional
+
+from .models import Cattle, MilkRecord
+from .rollups import refresh_daily_summaries
+
+
+# ==================== MILKING SESSIONS ====================
+
+def _decimal(value, places=2):
+    """Parse a form/JSON number to a Decimal with the model's precision, or None when blank"""
+    if value is None or str(value).strip() == '':
+        return None
+    number = Decimal(str(value).strip())
+    if not number.is_finite():
+        raise InvalidOperation(f'{value} is not a finite number')
+    return number.quantize(Decimal(1).scaleb(-places))
+
+
+def record_milking_session(day, session, rows, recorded_by=None):
+    """
+    Record a whole-herd milking session in a fixed number of queries.
+    Each row is a dict with tag_number, quantity and optionally
+    fat_percentage. Valid rows are inserted together with bulk_create;
+    rows that fail validation, name an unknown or non-dairy animal, repeat
+    a tag, or clash with an existing record for the same cattle, date and
+    session are skipped and reported.
+    Returns (created, errors) where errors is a list of
+    {'row', 'tag_number', 'error'} dicts. Raises ValueError for an unknown
+    session, or if another request records the same cows concurrently.
+    """
+    if session not in dict(MilkRecord.SESSION_CHOICES):
+        raise ValueError(f'Unknown session: {session}')
+
+    rows = list(rows)
+    tags = {str(row.get('tag_number') or '').strip() for row in rows} - {''}
+    cattle = dict(
+        Cattle.objects.filter(
+            tag_number__in=tags, cattle_type__in=['DAIRY', 'DUAL'], status='ACTIVE'
+        ).values_list('tag_number', 'pk')
+    )
+    already_recorded = set(
+        MilkRecord.objects.filter(
+            date=day, session=session, cattle_id__in=cattle.values()
+        ).values_list('cattle_id', flat=True)
+    )
+
+    records, errors, seen = [], [], set()
+    for line, row in enumerate(rows, start=1):
+        tag = str(row.get('tag_number') or '').strip()
+
+        def reject(message):
+            errors.append({'row': line, 'tag_number': tag, 'error': message})
+
+        if not tag:
+            reject('Tag number is required')
+            continue
+        if tag not in cattle:
+            reject('No active dairy cattle with this tag')
+            continue
+        if tag in seen:
+            reject('Tag listed more than once')
+            continue
+        seen.add(tag)
+        if cattle[tag] in already_recorded:
+            reject('Already recorded for this session')
+            continue
+        try:
+            quantity = _decimal(row.get('quantity'))
+            fat = _decimal(row.get('fat_percentage'))
+        except InvalidOperation:
+            reject('Quantity and fat % must be numbers')
+            continue
+        if quantity is None or quantity <= 0:
+            reject('Quantity must be greater than zero')
+            continue
+        if fat is not None and not 0 <= fat <= 100:
+            reject('Fat % must be between 0 and 100')
+            continue
+
+        records.append(MilkRecord(
+            cattle_id=cattle[tag],
+            date=day,
+            session=session,
+            quantity=quantity,
+            fat_percentage=fat,
+            recorded_by=recorded_by,
+        ))
+
+    if records:
+        try:
+            with transaction.atomic():
+                MilkRecord.objects.bulk_create(records)
+                # bulk_create skips the per-record signals, so refresh the rollup once
+                transaction.on_commit(lambda: refresh_daily_summaries([day]))
+                conditional.changed(MilkRecord)
+        except IntegrityError:
+            raise ValueError('Some of these cows were recorded for this session meanwhile. Please submit again.')
+    return len(records), errors
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Q, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model 
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
@@ -8,6 +10,33 @@ User = get_user_model()
 
 # ==================== CORE CATTLE MODEL ====================
 
+class CattleQuerySet(models.QuerySet):
+    """Bulk financial annotations for cattle lists"""
+
+    def with_financials(self):
+        """
+        Annotate each animal with its CattleFinancials ledger figures, named
+        financial_<ledger field>, so a list of N cattle costs one query.
+        Animals without a ledger row yet fall back to a correlated subquery.
+        """
+        money = models.DecimalField(max_digits=12, decimal_places=2)
+
+        def ledger(field, queryset, expression):
+            live = queryset.filter(cattle=OuterRef('pk')).order_by().values('cattle').annotate(
+                total=Sum(expression)
+            ).values('total')
+            return Coalesce(
+                F(f'financials__{field}'), Subquery(live, output_field=money), Value(0), output_field=money
+            )
+
+        return self.annotate(
+            financial_feed_cost=ledger('feed_cost', FeedingRecord.objects, 'total_cost'),
+            financial_health_cost=ledger('health_cost', HealthRecord.objects, 'treatment_cost'),
+            financial_other_expenses=ledger('other_expenses', Expense.objects, 'amount'),
+            financial_sale_revenue=ledger('sale_revenue', CattleSale.objects, 'sale_price'),
+        )
+
+
 class Cattle(models.Model):
     """Main Cattle Model for both Dairy and Beef"""
     
@@ -83,9 +112,16 @@ class Cattle(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CattleQuerySet.as_manager()
+    
     class Meta:
         verbose_name_plural = "Cattle"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'cattle_type']),
+            # Keyset pages of the cattle list API
+            models.Index(fields=['created_at', 'id']),
+        ]
     
     def __str__(self):
         return f"{self.tag_number} - {self.get_breed_display()} ({self.get_gender_display()})"
@@ -116,20 +152,77 @@ class Cattle(models.Model):
         # Milk sales are global, not attributed to individual cattle
         return 0
     
+    def _stored_financials(self):
+        """CattleFinancials ledger row, or None if it has not been built yet"""
+        if self.pk is None:
+            return None
+        try:
+            return self.financials
+        except CattleFinancials.DoesNotExist:
+            return None
+    
+    def _financial(self, name, compute):
+        """
+        Resolve a figure from a with_financials() annotation, then the
+        CattleFinancials ledger, and only then from a live aggregate.
+        """
+        annotated = f'financial_{name}'
+        if annotated in self.__dict__:
+            return self.__dict__[annotated]
+        ledger = self._stored_financials()
+        if ledger is not None:
+            return getattr(ledger, name)
+        return compute()
+    
+    def total_feed_cost(self):
+        """Total feeding cost for this cattle"""
+        return self._financial('feed_cost', lambda: self.feeding_records.aggregate(total=Sum('total_cost'))['total'] or 0)
+    
+    def total_health_cost(self):
+        """Total treatment cost for this cattle"""
+        return self._financial('health_cost', lambda: self.health_records.aggregate(total=Sum('treatment_cost'))['total'] or 0)
+    
+    def total_other_expenses(self):
+        """Farm expenses booked against this cattle"""
+        return self._financial('other_expenses', lambda: self.expenses.aggregate(total=Sum('amount'))['total'] or 0)
+    
+    def sale_revenue(self):
+        """Sale price if this cattle has been sold"""
+        return self._financial('sale_revenue', lambda: CattleSale.objects.filter(
+            cattle=self
+        ).values_list('sale_price', flat=True).first() or 0)
+    
     def total_expenses(self):
         """Total expenses for this cattle"""
-        # FIXED: Changed 'cost' to 'total_cost' for feeding records
-        feed_cost = self.feeding_records.aggregate(total=models.Sum('total_cost'))['total'] or 0
-        health_cost = self.health_records.aggregate(total=models.Sum('treatment_cost'))['total'] or 0
-        return feed_cost + health_cost
+        return self.total_feed_cost() + self.total_health_cost() + self.total_other_expenses()
     
     def net_profit(self):
         """Net profit from this cattle"""
         # Only include revenue from cattle sale, not milk sales
-        revenue = 0
-        if hasattr(self, 'sale_record'):
-            revenue += self.sale_record.sale_price
-        return revenue - self.total_expenses() - (self.purchase_price or 0)
+        return self.sale_revenue() - self.total_expenses() - (self.purchase_price or 0)
+
+
+class CattleFinancials(models.Model):
+    """Per-animal cost and revenue ledger, kept in sync by dairy.financials"""
+    
+    cattle = models.OneToOneField(Cattle, on_delete=models.CASCADE, related_name='financials')
+    
+    # Costs
+    feed_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    health_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    other_expenses = models.DecimalField(max_digits=12, decimal_places=2, default=0, help_text="Expenses linked to this cattle")
+    
+    # Revenue
+    sale_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Cattle Financials"
+        verbose_name_plural = "Cattle Financials"
+    
+    def __str__(self):
+        return f"Financials - {self.cattle_id}"
 
 # ==================== MILK PRODUCTION ====================
 
@@ -158,6 +251,11 @@ class MilkRecord(models.Model):
     class Meta:
         ordering = ['-date', '-session']
         unique_together = ['cattle', 'date', 'session']
+        indexes = [
+            models.Index(fields=['date', 'session']),
+            # Cursor pagination key, see agro.pagination
+            models.Index(fields=['date', 'id']),
+        ]
     
     def __str__(self):
         return f"{self.cattle.tag_number} - {self.date} {self.session}: {self.quantity}L"
@@ -188,6 +286,9 @@ class MilkSale(models.Model):
     
     class Meta:
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date']),
+        ]
     
     def save(self, *args, **kwargs):
         self.total_amount = self.quantity * self.price_per_liter
@@ -215,6 +316,9 @@ class CattleSale(models.Model):
     
     class Meta:
         ordering = ['-sale_date']
+        indexes = [
+            models.Index(fields=['sale_date']),
+        ]
     
     def profit_loss(self):
         """Calculate profit or loss on sale"""
@@ -261,6 +365,12 @@ class HealthRecord(models.Model):
     
     class Meta:
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date']),
+            models.Index(fields=['next_checkup_date']),
+            # Dashboard and alerts only ever look at emergencies by date
+            models.Index(fields=['date'], condition=Q(is_emergency=True), name='dairy_health_emergency_idx'),
+        ]
     
     def __str__(self):
         return f"{self.cattle.tag_number} - {self.get_health_type_display()} on {self.date}"
@@ -298,6 +408,9 @@ class FeedingRecord(models.Model):
     
     class Meta:
         ordering = ['-date', '-feed_time']
+        indexes = [
+            models.Index(fields=['date']),
+        ]
     
     def save(self, *args, **kwargs):
         self.total_cost = self.quantity * self.cost_per_kg
@@ -341,6 +454,12 @@ class BreedingRecord(models.Model):
     
     class Meta:
         ordering = ['-breeding_date']
+        indexes = [
+            models.Index(fields=['breeding_date']),
+            models.Index(fields=['status']),
+            # Upcoming calvings: pregnant animals by expected date
+            models.Index(fields=['expected_calving_date'], condition=Q(is_pregnant=True), name='dairy_breeding_calving_idx'),
+        ]
     
     def gestation_period(self):
         """Calculate gestation period in days"""
@@ -371,18 +490,31 @@ class WeightRecord(models.Model):
     class Meta:
         ordering = ['-date']
         unique_together = ['cattle', 'date']
+        indexes = [
+            # Cursor pagination key, see agro.pagination
+            models.Index(fields=['date', 'id']),
+        ]
+    
+    @staticmethod
+    def gain_between(previous_date, previous_weight, date, weight):
+        """Average daily gain between two weighings, or None without a usable previous one"""
+        if previous_date is None or previous_weight is None:
+            return None
+        days_diff = (date - previous_date).days
+        if days_diff <= 0:
+            return None
+        return ((Decimal(weight) - Decimal(previous_weight)) / days_diff).quantize(Decimal('0.01'))
     
     def save(self, *args, **kwargs):
         # Calculate age in days
         self.age_in_days = (self.date - self.cattle.birth_date).days
         
-        # Calculate daily gain if there's a previous record
-        previous = WeightRecord.objects.filter(cattle=self.cattle, date__lt=self.date).order_by('-date').first()
-        if previous:
-            days_diff = (self.date - previous.date).days
-            weight_diff = self.weight - previous.weight
-            if days_diff > 0:
-                self.daily_gain = weight_diff / days_diff
+        # Calculate daily gain from the previous record; the record after this
+        # one is brought up to date by dairy.signals once the write commits
+        previous = WeightRecord.objects.filter(
+            cattle_id=self.cattle_id, date__lt=self.date
+        ).order_by('-date').values_list('date', 'weight').first() or (None, None)
+        self.daily_gain = self.gain_between(*previous, self.date, self.weight)
         
         super().save(*args, **kwargs)
     
@@ -418,6 +550,11 @@ class VaccinationSchedule(models.Model):
     
     class Meta:
         ordering = ['scheduled_date']
+        indexes = [
+            models.Index(fields=['administered_date']),
+            # Upcoming and overdue vaccinations: pending rows by scheduled date
+            models.Index(fields=['scheduled_date'], condition=Q(is_completed=False), name='dairy_vaccine_pending_idx'),
+        ]
     
     def __str__(self):
         return f"{self.cattle.tag_number} - {self.get_vaccine_type_display()} on {self.scheduled_date}"
@@ -460,6 +597,9 @@ class Expense(models.Model):
     
     class Meta:
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date']),
+        ]
     
     def __str__(self):
         return f"{self.date} - {self.description}: ৳{self.amount}"
@@ -588,6 +728,7 @@ class MilkProductionReport(models.Model):
         ('MONTHLY', 'Monthly'),
         ('QUARTERLY', 'Quarterly'),
         ('YEARLY', 'Yearly'),
+        ('CUSTOM', 'Custom Range'),
     ]
     
     title = models.CharField(max_length=200)
@@ -597,6 +738,8 @@ class MilkProductionReport(models.Model):
     week = models.IntegerField(null=True, blank=True, validators=[MinValueValidator(1), MaxValueValidator(52)])
     start_date = models.DateField()
     end_date = models.DateField()
+    cattle = models.ForeignKey(Cattle, on_delete=models.CASCADE, null=True, blank=True, related_name='milk_reports',
+                               help_text="Animal the report covers; empty for the whole herd")
     
     # Summary statistics
     total_milk = models.DecimalField(max_digits=12, decimal_places=2, default=0)
@@ -615,6 +758,9 @@ class MilkProductionReport(models.Model):
     previous_period_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     growth_percentage = models.DecimalField(max_digits=6, decimal_places=2, default=0)
     
+    # Top producers and daily breakdown as shown on the report page
+    details = models.JSONField(default=dict, blank=True)
+    
     # Report metadata
     generated_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     generated_at = models.DateTimeField(auto_now_add=True)
@@ -859,3 +1005,52 @@ class MonthlyBreedingActivity(models.Model):
     
     def __str__(self):
         return f"Month {self.month}: {self.bred} bred, {self.pregnant} pregnant"
+
+
+# ==================== PDF EXPORTS ====================
+
+class PDFExport(models.Model):
+    """A PDF export rendered in the background and kept as a file"""
+
+    EXPORT_TYPES = [
+        ('CATTLE', 'Cattle'),
+        ('MILK', 'Milk Records'),
+        ('HEALTH', 'Health Records'),
+        ('FEEDING', 'Feeding Records'),
+        ('WEIGHT', 'Weight Records'),
+        ('BREEDING', 'Breeding Records'),
+        ('VACCINATION', 'Vaccination Records'),
+        ('SALES', 'Sales'),
+        ('FINANCIAL', 'Financial'),
+    ]
+
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Rendering'),
+        ('READY', 'Ready'),
+        ('FAILED', 'Failed'),
+    ]
+
+    export_type = models.CharField(max_length=20, choices=EXPORT_TYPES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    milk_report = models.ForeignKey(MilkProductionReport, on_delete=models.SET_NULL, null=True, blank=True,
+                                    related_name='pdf_exports', help_text="Limits a milk export to this report's period")
+    file = models.FileField(upload_to='exports/pdf/', null=True, blank=True)
+    row_count = models.IntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "PDF Export"
+        verbose_name_plural = "PDF Exports"
+
+    def __str__(self):
+        return f"{self.get_export_type_display()} PDF ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in ('READY', 'FAILED')
@@ -0,0 +1,336 @@
+from collections import namedtuple
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db.models import Sum
+from django.urls import reverse
+from django.utils import timezone
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter, landscape
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, LongTable, TableStyle, Paragraph
+
+from agro.exports import choice_labels, iter_values
+from home.jobs import queue_report_job
+from .models import (
+    Cattle, MilkRecord, MilkSale, CattleSale, HealthRecord, FeedingRecord,
+    WeightRecord, BreedingRecord, VaccinationSchedule, Expense, PDFExport,
+)
+
+
+# ==================== PDF RENDERING ====================
+
+# Rows per table flowable. Each table repeats its header on every page it
+# spans; keeping tables bounded keeps reportlab's page splitting cheap.
+ROWS_PER_TABLE = 500
+
+BASE_TABLE_STYLE = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+]
+
+
+def render_pdf(output, title, header, rows, extra_style=()):
+    """
+    Write a titled, multi-page table PDF to output.
+    Returns the number of data rows written.
+    """
+    style = TableStyle(BASE_TABLE_STYLE + list(extra_style))
+    elements = [Paragraph(title, getSampleStyleSheet()['Title'])]
+
+    count = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == ROWS_PER_TABLE:
+            elements.append(_table(header, chunk, style))
+            count += len(chunk)
+            chunk = []
+    if chunk or not count:
+        elements.append(_table(header, chunk, style))
+        count += len(chunk)
+
+    SimpleDocTemplate(output, pagesize=landscape(letter)).build(elements)
+    return count
+
+
+def _table(header, rows, style):
+    table = LongTable([header] + rows, repeatRows=1)
+    table.setStyle(style)
+    return table
+
+
+def _date(value):
+    return value.strftime('%Y-%m-%d') if value else '-'
+
+
+# ==================== EXPORT DEFINITIONS ====================
+
+ExportSpec = namedtuple('ExportSpec', 'title filename header rows extra_style')
+
+
+def _cattle_rows(export):
+    today = timezone.now().date()
+    cattle_types = choice_labels(Cattle, 'cattle_type')
+    breeds = choice_labels(Cattle, 'breed')
+    genders = choice_labels(Cattle, 'gender')
+    rows = iter_values(
+        Cattle.objects.all(),
+        'tag_number', 'name', 'cattle_type', 'breed', 'gender', 'birth_date', 'weight', 'status',
+    )
+    for tag, name, cattle_type, breed, gender, birth_date, weight, status in rows:
+        months = (today.year - birth_date.year) * 12 + (today.month - birth_date.month)
+        yield [
+            tag,
+            name or '-',
+            cattle_types.get(cattle_type, cattle_type),
+            breeds.get(breed, breed),
+            genders.get(gender, gender),
+            f'{months}mo',
+            f'{weight}kg' if weight else '-',
+            status,
+        ]
+
+
+def _milk_rows(export):
+    queryset = MilkRecord.objects.all()
+    if export.milk_report_id:
+        report = export.milk_report
+        queryset = queryset.filter(date__range=[report.start_date, report.end_date])
+    sessions = choice_labels(MilkRecord, 'session')
+    rows = iter_values(
+        queryset,
+        'date', 'cattle__tag_number', 'session', 'quantity', 'fat_percentage', 'temperature',
+    )
+    for date, tag, session, quantity, fat, temperature in rows:
+        yield [
+            _date(date),
+            tag,
+            sessions.get(session, session),
+            str(quantity),
+            str(fat) if fat else '-',
+            str(temperature) if temperature else '-',
+        ]
+
+
+def _health_rows(export):
+    health_types = choice_labels(HealthRecord, 'health_type')
+    rows = iter_values(
+        HealthRecord.objects.all(),
+        'date', 'cattle__tag_number', 'health_type', 'diagnosis', 'veterinarian', 'treatment_cost',
+    )
+    for date, tag, health_type, diagnosis, vet, cost in rows:
+        yield [
+            _date(date),
+            tag,
+            health_types.get(health_type, health_type),
+            diagnosis[:30] + '...' if len(diagnosis) > 30 else diagnosis,
+            vet,
+            str(cost) if cost else '-',
+        ]
+
+
+def _feeding_rows(export):
+    feed_types = choice_labels(FeedingRecord, 'feed_type')
+    rows = iter_values(
+        FeedingRecord.objects.all(),
+        'date', 'feed_time', 'cattle__tag_number', 'feed_type', 'quantity', 'total_cost',
+    )
+    for date, feed_time, tag, feed_type, quantity, total_cost in rows:
+        yield [
+            _date(date),
+            feed_time.strftime('%H:%M'),
+            tag,
+            feed_types.get(feed_type, feed_type),
+            str(quantity),
+            str(total_cost),
+        ]
+
+
+def _weight_rows(export):
+    rows = iter_values(
+        WeightRecord.objects.all(),
+        'date', 'cattle__tag_number', 'weight', 'daily_gain', 'age_in_days',
+    )
+    for date, tag, weight, daily_gain, age_in_days in rows:
+        yield [
+            _date(date),
+            tag,
+            str(weight),
+            str(daily_gain) if daily_gain else '-',
+            str(age_in_days) if age_in_days else '-',
+        ]
+
+
+def _breeding_rows(export):
+    statuses = choice_labels(BreedingRecord, 'status')
+    rows = iter_values(
+        BreedingRecord.objects.all(),
+        'breeding_date', 'cattle__tag_number', 'sire__tag_number', 'breeding_method', 'status',
+        'expected_calving_date',
+    )
+    for breeding_date, dam, sire, method, status, expected in rows:
+        yield [_date(breeding_date), dam, sire or '-', method, statuses.get(status, status), _date(expected)]
+
+
+def _vaccination_rows(export):
+    vaccine_types = choice_labels(VaccinationSchedule, 'vaccine_type')
+    rows = iter_values(
+        VaccinationSchedule.objects.all(),
+        'scheduled_date', 'cattle__tag_number', 'vaccine_type', 'is_completed', 'administered_date',
+        'batch_number',
+    )
+    for scheduled, tag, vaccine_type, completed, administered, batch in rows:
+        yield [
+            _date(scheduled),
+            tag,
+            vaccine_types.get(vaccine_type, vaccine_type),
+            'Completed' if completed else 'Pending',
+            _date(administered),
+            batch or '-',
+        ]
+
+
+def _sales_rows(export):
+    rows = iter_values(
+        MilkSale.objects.all(),
+        'date', 'customer_name', 'quantity', 'total_amount', 'payment_received',
+    )
+    for date, customer, quantity, total, paid in rows:
+        yield [_date(date), 'Milk Sale', customer or 'Retail', f'{quantity} L', f'৳{total}',
+               'Paid' if paid else 'Pending']
+
+    rows = iter_values(
+        CattleSale.objects.all(),
+        'sale_date', 'cattle__tag_number', 'sale_price', 'payment_received',
+    )
+    for sale_date, tag, price, paid in rows:
+        yield [_date(sale_date), 'Cattle Sale', tag, '1 head', f'৳{price}', 'Paid' if paid else 'Pending']
+
+
+def _financial_rows(export):
+    total_income = MilkSale.objects.aggregate(total=Sum('total_amount'))['total'] or 0
+    total_expenses = Expense.objects.aggregate(total=Sum('amount'))['total'] or 0
+
+    yield ['Total Income', f'৳{total_income}', '']
+    yield ['Total Expenses', f'৳{total_expenses}', '']
+    yield ['Net Profit', f'৳{total_income - total_expenses}', '']
+    yield ['', '', '']
+    yield ['Expenses by Category', '', '']
+
+    by_category = Expense.objects.filter(category__isnull=False).values('category__name').annotate(
+        total=Sum('amount')
+    ).order_by('category__name')
+    for row in by_category:
+        if row['total'] > 0:
+            yield [row['category__name'], f"৳{row['total']}", '']
+
+
+
+PDF_EXPORTS = {
+    'CATTLE': ExportSpec(
+        'Cattle Export Report', 'cattle_export.pdf',
+        ['Tag Number', 'Name', 'Type', 'Breed', 'Gender', 'Age', 'Weight', 'Status'],
+        _cattle_rows,
+        [('FONTSIZE', (0, 0), (-1, 0), 10),
+         ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+         ('BACKGROUND', (0, 1), (-1, -1), colors.beige)],
+    ),
+    'MILK': ExportSpec(
+        'Milk Records Export', 'milk_records_export.pdf',
+        ['Date', 'Cattle', 'Session', 'Quantity (L)', 'Fat %', 'Temperature'],
+        _milk_rows, (),
+    ),
+    'HEALTH': ExportSpec(
+        'Health Records Export', 'health_records_export.pdf',
+        ['Date', 'Cattle', 'Health Type', 'Diagnosis', 'Veterinarian', 'Cost'],
+        _health_rows, (),
+    ),
+    'FEEDING': ExportSpec(
+        'Feeding Records Export', 'feeding_records_export.pdf',
+        ['Date', 'Time', 'Cattle', 'Feed Type', 'Quantity (kg)', 'Cost'],
+        _feeding_rows, (),
+    ),
+    'WEIGHT': ExportSpec(
+        'Weight Records Export', 'weight_records_export.pdf',
+        ['Date', 'Cattle', 'Weight (kg)', 'Daily Gain', 'Age (days)'],
+        _weight_rows, (),
+    ),
+    'BREEDING': ExportSpec(
+        'Breeding Records Export', 'breeding_records_export.pdf',
+        ['Breeding Date', 'Dam', 'Sire', 'Method', 'Status', 'Expected Calving'],
+        _breeding_rows, (),
+    ),
+    'VACCINATION': ExportSpec(
+        'Vaccination Records Export', 'vaccination_records_export.pdf',
+        ['Scheduled Date', 'Cattle', 'Vaccine', 'Status', 'Administered', 'Batch'],
+        _vaccination_rows, (),
+    ),
+    'SALES': ExportSpec(
+        'Sales Export', 'sales_export.pdf',
+        ['Date', 'Type', 'Details', 'Quantity', 'Amount', 'Status'],
+        _sales_rows, (),
+    ),
+    'FINANCIAL': ExportSpec(
+        'Financial Export', 'financial_export.pdf',
+        ['Financial Summary', '', ''],
+        _financial_rows, (),
+    ),
+}
+
+
+# ==================== BACKGROUND RENDERING ====================
+
+def queue_pdf_export(export):
+    """
+    Queue a pending export as a PDF_EXPORT job for the report worker
+    (see home.jobs). The job is saved with the export, so the worker only
+    sees it once the request commits.
+    """
+    return queue_report_job(
+        'PDF_EXPORT',
+        {'export_id': export.pk},
+        user=export.requested_by,
+        result_url=reverse('dairy:pdf_export_status', args=[export.pk]),
+    )
+
+
+def build_pdf_export(job):
+    """
+    Report worker builder for PDF_EXPORT jobs: render the export and store
+    the file on it. A job requeued after its worker died finds its export
+    still RUNNING and renders it again.
+    """
+    export_id = job.params['export_id']
+    claimed = PDFExport.objects.filter(pk=export_id, status__in=['PENDING', 'RUNNING']).update(status='RUNNING')
+    export = PDFExport.objects.select_related('milk_report').get(pk=export_id)
+    if not claimed:
+        return export
+
+    spec = PDF_EXPORTS[export.export_type]
+    job.set_progress(10, f'Rendering {spec.title}')
+    buffer = BytesIO()
+    try:
+        export.row_count = render_pdf(buffer, spec.title, spec.header, spec.rows(export), spec.extra_style)
+        stamp = timezone.now().strftime('%Y%m%d%H%M%S')
+        export.file.save(f'{stamp}_{spec.filename}', ContentFile(buffer.getvalue()), save=False)
+    except Exception as exc:
+        export.status = 'FAILED'
+        export.error = str(exc)
+        export.completed_at = timezone.now()
+        export.save(update_fields=['status', 'error', 'completed_at'])
+        raise
+
+    export.status = 'READY'
+    export.completed_at = timezone.now()
+    export.save(update_fields=['file', 'row_count', 'status', 'completed_at'])
+
+    # A milk export scoped to a report becomes that report's file
+    if export.milk_report_id:
+        export.milk_report.report_file.name = export.file.name
+        export.milk_report.save(update_fields=['report_file'])
+    return export
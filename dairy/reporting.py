@@ -0,0 +1,483 @@
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Sum, Avg, Count, Q, Max
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import (
+    Cattle, MilkRecord, DailyProductionSummary, HealthRecord, VaccinationSchedule,
+    BreedingRecord, MilkProductionReport, HealthSummaryReport, HealthCaseSummary,
+    BreedingPerformanceReport, SirePerformance, MonthlyBreedingActivity,
+)
+
+
+# ==================== REPORT PERIODS ====================
+
+def _parse_date(value):
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _month_end(year, month):
+    return date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+
+
+def report_date_range(period, year, month=None, quarter=None, start_date=None, end_date=None):
+    """
+    Inclusive (start, end) dates for a report period as chosen in the
+    report filters: daily, weekly, monthly, quarterly, yearly or custom.
+    """
+    today = timezone.now().date()
+    start_date = _parse_date(start_date)
+    end_date = _parse_date(end_date)
+
+    if period == 'daily':
+        start_date = start_date or today
+        return start_date, start_date
+    if period == 'weekly':
+        if start_date:
+            return start_date, start_date + timedelta(days=6)
+        return today - timedelta(days=6), today
+    if period == 'monthly':
+        if month:
+            return date(year, month, 1), _month_end(year, month)
+        return date(today.year, today.month, 1), _month_end(today.year, today.month)
+    if period == 'quarterly':
+        quarter = quarter or (today.month - 1) // 3 + 1
+        return date(year, quarter * 3 - 2, 1), _month_end(year, quarter * 3)
+    if period == 'yearly':
+        return date(year, 1, 1), date(year, 12, 31)
+
+    # Custom range
+    return start_date or today - timedelta(days=30), end_date or today
+
+
+def _int(value):
+    return int(value) if value not in (None, '') else None
+
+
+def params_date_range(params, default_period):
+    """report_date_range() for report filter values (GET params or a job's params)"""
+    period = params.get('period') or default_period
+    year = _int(params.get('year')) or timezone.now().year
+    start, end = report_date_range(
+        period, year,
+        month=_int(params.get('month')),
+        quarter=_int(params.get('quarter')),
+        start_date=params.get('start_date'),
+        end_date=params.get('end_date'),
+    )
+    return period, start, end
+
+
+def _stored_period(period, choices):
+    """The report model's period value, with anything it can't name stored as CUSTOM"""
+    value = period.upper()
+    return value if value in dict(choices) else 'CUSTOM'
+
+
+def _save_report(model, lookup, fields, job):
+    """
+    update_or_create() for report rows. The lookup runs outside any
+    transaction so SQLite never has to upgrade a read lock to a write lock
+    while another worker process is writing. generated_at is when the
+    worker claimed the job, before it read anything, so a change committed
+    during the build still makes the saved report stale.
+    """
+    report = model.objects.filter(**lookup).first() or model(**lookup)
+    for name, value in fields.items():
+        setattr(report, name, value)
+    report.generated_by = job.requested_by
+    built_at = job.started_at or timezone.now()
+    report.generated_at = built_at
+    report.save()
+    if report.generated_at != built_at:
+        # auto_now_add stamps new rows with the save time
+        model.objects.filter(pk=report.pk).update(generated_at=built_at)
+        report.generated_at = built_at
+    return report
+
+
+def saved_report(model, lookup):
+    """The newest saved report matching lookup, or None"""
+    return model.objects.filter(**lookup).order_by('-generated_at').first()
+
+
+def milk_report_lookup(params):
+    """(period, start, end, MilkProductionReport lookup) for the milk report filters"""
+    period, start, end = params_date_range(params, 'monthly')
+    return period, start, end, {
+        'period': _stored_period(period, MilkProductionReport.REPORT_PERIODS),
+        'start_date': start,
+        'end_date': end,
+        'cattle_id': _int(params.get('cattle')),
+    }
+
+
+def health_report_lookup(params):
+    """(period, start, end, HealthSummaryReport lookup) for the health report filters"""
+    params = dict(params, period=params.get('report_type') or 'quarterly')
+    period, start, end = params_date_range(params, 'quarterly')
+    return period, start, end, {
+        'report_type': _stored_period(period, HealthSummaryReport.REPORT_TYPES),
+        'start_date': start,
+        'end_date': end,
+    }
+
+
+def breeding_report_lookup(params):
+    """(period, start, end, BreedingPerformanceReport lookup) for the breeding report filters"""
+    period, start, end = params_date_range(params, 'yearly')
+    return period, start, end, {
+        'period': _stored_period(period, BreedingPerformanceReport.REPORT_PERIODS),
+        'start_date': start,
+        'end_date': end,
+    }
+
+
+def _money(value):
+    return Decimal(str(value or 0)).quantize(Decimal('0.01'))
+
+
+# ==================== MILK PRODUCTION FIGURES ====================
+
+def milk_production_figures(start, end, cattle_id=None, top=10):
+    """
+    Everything the milk production report shows for an inclusive date range,
+    optionally for a single animal, in at most five queries: range totals,
+    the previous period's total, top producers, the daily rollup rows and
+    (for a single animal) that animal's daily breakdown. Daily milk sales come from
+    the rollup and are joined to the breakdown by date; sales are herd-wide,
+    so they are the same whichever animal is selected.
+    """
+    days = (end - start).days + 1
+    records = MilkRecord.objects.filter(date__range=[start, end])
+    previous = MilkRecord.objects.filter(date__range=[start - timedelta(days=days), start - timedelta(days=1)])
+    if cattle_id:
+        records = records.filter(cattle_id=cattle_id)
+        previous = previous.filter(cattle_id=cattle_id)
+
+    totals = records.aggregate(
+        total=Sum('quantity'),
+        avg_fat=Avg('fat_percentage'),
+        cows=Count('cattle', distinct=True),
+    )
+    total_milk = totals['total'] or 0
+    cows = totals['cows'] or 0
+
+    if cattle_id:
+        previous_total = previous.aggregate(total=Sum('quantity'))['total'] or 0
+    else:
+        previous_total = DailyProductionSummary.objects.filter(
+            date__range=[start - timedelta(days=days), start - timedelta(days=1)]
+        ).aggregate(total=Sum('total_milk'))['total'] or 0
+
+    breeds = dict(Cattle.BREED_TYPES)
+    top_producers = [{
+        'cattle': {
+            'id': row['cattle'],
+            'tag_number': row['cattle__tag_number'],
+            'name': row['cattle__name'] or '',
+            'breed': row['cattle__breed'],
+            'get_breed_display': breeds.get(row['cattle__breed'], row['cattle__breed']),
+        },
+        'total': row['total'],
+        'avg': row['avg'],
+        'max': row['max'],
+        'percentage': (row['total'] / total_milk * 100) if total_milk > 0 else 0,
+    } for row in records.values(
+        'cattle', 'cattle__tag_number', 'cattle__name', 'cattle__breed'
+    ).annotate(
+        total=Sum('quantity'), avg=Avg('quantity'), max=Max('quantity')
+    ).order_by('-total')[:top]]
+
+    summaries = DailyProductionSummary.objects.filter(date__range=[start, end]).order_by('date')
+    if cattle_id:
+        revenue = dict(summaries.values_list('date', 'revenue'))
+        daily = [{
+            'date': row['date'],
+            'morning': row['morning'],
+            'afternoon': row['afternoon'],
+            'evening': row['evening'],
+            'total': row['total'],
+            'avg_fat': row['avg_fat'],
+            'cow_count': row['cows'],
+            'revenue': revenue.get(row['date']),
+        } for row in records.values('date').annotate(
+            total=Sum('quantity'),
+            morning=Sum('quantity', filter=Q(session='MORNING')),
+            afternoon=Sum('quantity', filter=Q(session='AFTERNOON')),
+            evening=Sum('quantity', filter=Q(session='EVENING')),
+            avg_fat=Avg('fat_percentage'),
+            cows=Count('cattle', distinct=True),
+        ).order_by('date')]
+        total_revenue = sum(revenue.values())
+    else:
+        summaries = list(summaries)
+        daily = [{
+            'date': summary.date,
+            'morning': summary.morning_total,
+            'afternoon': summary.afternoon_total,
+            'evening': summary.evening_total,
+            'total': summary.total_milk,
+            'avg_fat': summary.avg_fat,
+            'cow_count': summary.lactating_cows,
+            'revenue': summary.revenue,
+        } for summary in summaries if summary.lactating_cows]
+        total_revenue = sum(summary.revenue for summary in summaries)
+
+    daily_breakdown = [{
+        'date': day['date'],
+        'morning': float(day['morning'] or 0),
+        'afternoon': float(day['afternoon'] or 0),
+        'evening': float(day['evening'] or 0),
+        'total': float(day['total'] or 0),
+        'avg_fat': float(day['avg_fat'] or 0),
+        'cow_count': day['cow_count'] or 0,
+        'revenue': float(day['revenue'] or 0),
+    } for day in daily]
+    peak = max(daily, key=lambda day: day['total'] or 0, default=None)
+
+    return {
+        'total_milk': total_milk,
+        'avg_daily': total_milk / days,
+        'avg_fat': totals['avg_fat'] or 0,
+        'total_revenue': total_revenue,
+        'avg_price': total_revenue / total_milk if total_milk > 0 else 0,
+        'total_lactating': cows,
+        'avg_per_cow': total_milk / cows if cows > 0 else 0,
+        'peak_day': peak['date'] if peak else None,
+        'peak_amount': peak['total'] if peak else 0,
+        'previous_total': previous_total,
+        'milk_growth': ((total_milk - previous_total) / previous_total * 100) if previous_total > 0 else 0,
+        'top_producers': top_producers,
+        'daily_breakdown': daily_breakdown,
+        'chart_labels': [day['date'].strftime('%Y-%m-%d') for day in daily_breakdown],
+        'morning_data': [day['morning'] for day in daily_breakdown],
+        'afternoon_data': [day['afternoon'] for day in daily_breakdown],
+        'evening_data': [day['evening'] for day in daily_breakdown],
+        'total_data': [day['total'] for day in daily_breakdown],
+    }
+
+
+# ==================== REPORT BUILDERS ====================
+#
+# Each builder runs in the report worker (see home.jobs): it reads the
+# report filters from job.params, reports progress as it goes and saves
+# the figures into the stored report model, replacing an earlier report
+# for the same period.
+
+def build_milk_production_report(job):
+    """Save the milk figures for the job's period (and animal) as a MilkProductionReport"""
+    period, start, end, lookup = milk_report_lookup(job.params)
+
+    # The same figures the report page shows, so the two never drift apart
+    job.set_progress(10, 'Aggregating milk records')
+    figures = milk_production_figures(start, end, lookup['cattle_id'])
+
+    job.set_progress(80, 'Saving the report')
+    report = _save_report(
+        MilkProductionReport,
+        lookup,
+        {
+            'title': f"Milk Production Report - {start:%d %b %Y} to {end:%d %b %Y}",
+            'year': start.year,
+            'month': start.month if period in ('daily', 'monthly') else None,
+            'week': start.isocalendar()[1] if period == 'weekly' else None,
+            'total_milk': _money(figures['total_milk']),
+            'avg_daily_milk': _money(figures['avg_daily']),
+            'avg_fat_percentage': _money(figures['avg_fat']),
+            'peak_production_day': figures['peak_day'],
+            'peak_production_amount': _money(figures['peak_amount']),
+            'total_lactating_cows': figures['total_lactating'],
+            'avg_per_cow': _money(figures['avg_per_cow']),
+            'total_revenue': _money(figures['total_revenue']),
+            'avg_price_per_liter': _money(figures['avg_price']),
+            'previous_period_total': _money(figures['previous_total']),
+            'growth_percentage': _money(figures['milk_growth']),
+            'details': json.loads(json.dumps({
+                'top_producers': figures['top_producers'],
+                'daily_breakdown': figures['daily_breakdown'],
+            }, cls=DjangoJSONEncoder)),
+        },
+        job,
+    )
+    return report
+
+
+def build_health_summary_report(job):
+    """Save health case, cost and vaccination figures as a HealthSummaryReport"""
+    period, start, end, lookup = health_report_lookup(job.params)
+    today = timezone.now().date()
+
+    job.set_progress(10, 'Counting health cases')
+    records = HealthRecord.objects.filter(date__range=[start, end])
+    totals = records.aggregate(
+        cases=Count('id'),
+        cost=Sum('treatment_cost'),
+        emergencies=Count('id', filter=Q(is_emergency=True)),
+        emergency_cost=Sum('treatment_cost', filter=Q(is_emergency=True)),
+    )
+    by_type = list(records.values('health_type').annotate(
+        count=Count('id'), total_cost=Sum('treatment_cost')
+    ).order_by('-count'))
+
+    job.set_progress(40, 'Checking cattle under treatment')
+    # Treatment cases with a follow-up still ahead are open; the rest recovered
+    treatment = records.filter(health_type__in=['TREATMENT', 'DISEASE', 'SURGERY'])
+    follow_up_pending = Q(next_checkup_date__gte=today)
+    under_treatment = treatment.filter(follow_up_pending).values('cattle').distinct().count()
+    critical_cases = treatment.filter(follow_up_pending, is_emergency=True).count()
+    recovered_cases = treatment.exclude(follow_up_pending).count()
+    healthy_cattle = Cattle.objects.filter(status='ACTIVE').exclude(
+        pk__in=treatment.filter(follow_up_pending).values('cattle')
+    ).count()
+
+    job.set_progress(70, 'Summarising vaccinations')
+    vaccinations = VaccinationSchedule.objects.aggregate(
+        scheduled=Count('id', filter=Q(scheduled_date__range=[start, end])),
+        completed=Count('id', filter=Q(administered_date__range=[start, end])),
+        overdue=Count('id', filter=Q(scheduled_date__lt=today, is_completed=False)),
+        upcoming=Count('id', filter=Q(scheduled_date__gte=today, is_completed=False)),
+    )
+
+    cases = totals['cases']
+    report = _save_report(
+        HealthSummaryReport,
+        lookup,
+        {
+            'title': f"Health Summary Report - {start:%d %b %Y} to {end:%d %b %Y}",
+            'year': start.year,
+            'quarter': (start.month - 1) // 3 + 1 if period == 'quarterly' else None,
+            'total_cases': cases,
+            'healthy_cattle': healthy_cattle,
+            'under_treatment': under_treatment,
+            'critical_cases': critical_cases,
+            'recovered_cases': recovered_cases,
+            'total_health_cost': _money(totals['cost']),
+            'avg_cost_per_case': _money((totals['cost'] or 0) / cases if cases else 0),
+            'emergency_cases': totals['emergencies'],
+            'emergency_cost': _money(totals['emergency_cost']),
+            'vaccinations_scheduled': vaccinations['scheduled'],
+            'vaccinations_completed': vaccinations['completed'],
+            'vaccinations_overdue': vaccinations['overdue'],
+            'vaccinations_upcoming': vaccinations['upcoming'],
+        },
+        job,
+    )
+
+    job.set_progress(90, 'Saving case breakdown')
+    report.case_summaries.all().delete()
+    HealthCaseSummary.objects.bulk_create([
+        HealthCaseSummary(
+            report=report,
+            health_type=row['health_type'],
+            count=row['count'],
+            total_cost=_money(row['total_cost']),
+            percentage=_money(row['count'] / cases * 100),
+        )
+        for row in by_type
+    ])
+    return report
+
+
+def build_breeding_performance_report(job):
+    """Save breeding, pregnancy and calving figures as a BreedingPerformanceReport"""
+    period, start, end, lookup = breeding_report_lookup(job.params)
+    today = timezone.now().date()
+
+    job.set_progress(10, 'Counting breedings')
+    breedings = BreedingRecord.objects.filter(breeding_date__range=[start, end])
+    natural = Q(breeding_method__icontains='natural')
+    totals = breedings.aggregate(
+        total=Count('id'),
+        pregnant=Count('id', filter=Q(is_pregnant=True)),
+        failed=Count('id', filter=Q(status='FAILED')),
+        pending=Count('id', filter=Q(status='BRED')),
+        calved=Count('id', filter=Q(status='CALVED')),
+        natural_total=Count('id', filter=natural),
+        natural_pregnant=Count('id', filter=natural & Q(is_pregnant=True)),
+        ai_total=Count('id', filter=~natural),
+        ai_pregnant=Count('id', filter=~natural & Q(is_pregnant=True)),
+        calves=Count('offspring'),
+        male_calves=Count('offspring', filter=Q(offspring__gender='M')),
+        female_calves=Count('offspring', filter=Q(offspring__gender='F')),
+        surviving_calves=Count('offspring', filter=Q(offspring__status='ACTIVE')),
+    )
+
+    job.set_progress(40, 'Checking current pregnancies')
+    pregnancies = BreedingRecord.objects.filter(status='CONFIRMED', is_pregnant=True).aggregate(
+        total=Count('id'),
+        next_30=Count('id', filter=Q(expected_calving_date__range=[today, today + timedelta(days=30)])),
+        next_90=Count('id', filter=Q(expected_calving_date__range=[today, today + timedelta(days=90)])),
+    )
+
+    def rate(part, whole):
+        return _money(part / whole * 100 if whole else 0)
+
+    report = _save_report(
+        BreedingPerformanceReport,
+        lookup,
+        {
+            'title': f"Breeding Performance Report - {start:%d %b %Y} to {end:%d %b %Y}",
+            'year': start.year,
+            'month': start.month if period == 'monthly' else None,
+            'quarter': (start.month - 1) // 3 + 1 if period == 'quarterly' else None,
+            'total_breedings': totals['total'],
+            'confirmed_pregnant': totals['pregnant'],
+            'failed_conceptions': totals['failed'],
+            'pending_results': totals['pending'],
+            'calved_count': totals['calved'],
+            'conception_rate': rate(totals['pregnant'], totals['total']),
+            'natural_success_rate': rate(totals['natural_pregnant'], totals['natural_total']),
+            'ai_success_rate': rate(totals['ai_pregnant'], totals['ai_total']),
+            'total_pregnant': pregnancies['total'],
+            'expected_calving_next_30_days': pregnancies['next_30'],
+            'expected_calving_next_90_days': pregnancies['next_90'],
+            'successful_breedings': totals['pregnant'],
+            'total_calves': totals['calves'],
+            'male_calves': totals['male_calves'],
+            'female_calves': totals['female_calves'],
+            'calf_survival_rate': rate(totals['surviving_calves'], totals['calves']),
+        },
+        job,
+    )
+
+    job.set_progress(70, 'Ranking sires')
+    report.sire_performances.all().delete()
+    sires = breedings.filter(sire__isnull=False).values('sire', 'sire__breed').annotate(
+        services=Count('id'), pregnancies=Count('id', filter=Q(is_pregnant=True))
+    ).order_by()
+    SirePerformance.objects.bulk_create([
+        SirePerformance(
+            report=report,
+            sire_id=row['sire'],
+            breed=row['sire__breed'],
+            total_services=row['services'],
+            pregnancies=row['pregnancies'],
+            success_rate=rate(row['pregnancies'], row['services']),
+        )
+        for row in sires
+    ])
+
+    job.set_progress(85, 'Summarising monthly activity')
+    report.monthly_activities.all().delete()
+    monthly = breedings.annotate(period=TruncMonth('breeding_date')).values('period').annotate(
+        bred=Count('id'),
+        pregnant=Count('id', filter=Q(is_pregnant=True)),
+        calved=Count('id', filter=Q(status='CALVED')),
+    ).order_by('period')
+    MonthlyBreedingActivity.objects.bulk_create([
+        MonthlyBreedingActivity(
+            report=report, month=row['period'].month,
+            bred=row['bred'], pregnant=row['pregnant'], calved=row['calved'],
+        )
+        for row in monthly
+    ])
+    return report
@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Sum, Avg, Count, Q, Min, Max
+
+from agro import conditional
+
+from .models import MilkRecord, MilkSale, DailyProductionSummary
+
+
+# ==================== DAILY PRODUCTION ROLLUP ====================
+
+def _as_date(value):
+    """MilkRecord/MilkSale default their date to timezone.now, so accept datetimes too"""
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _milk_totals(records):
+    """Per-date milk aggregates for the given MilkRecord queryset"""
+    return records.values('date').annotate(
+        total=Sum('quantity'),
+        morning=Sum('quantity', filter=Q(session='MORNING')),
+        afternoon=Sum('quantity', filter=Q(session='AFTERNOON')),
+        evening=Sum('quantity', filter=Q(session='EVENING')),
+        avg_fat=Avg('fat_percentage'),
+        cows=Count('cattle', distinct=True),
+    ).order_by()
+
+
+def _sale_totals(sales):
+    """Per-date milk sale revenue for the given MilkSale queryset"""
+    return sales.values('date').annotate(revenue=Sum('total_amount')).order_by()
+
+
+def _summary_fields(milk, revenue):
+    """Map aggregate rows onto DailyProductionSummary columns"""
+    milk = milk or {}
+    avg_fat = milk.get('avg_fat') or 0
+    return {
+        'total_milk': milk.get('total') or 0,
+        'morning_total': milk.get('morning') or 0,
+        'afternoon_total': milk.get('afternoon') or 0,
+        'evening_total': milk.get('evening') or 0,
+        'avg_fat': Decimal(str(avg_fat)).quantize(Decimal('0.01')),
+        'lactating_cows': milk.get('cows') or 0,
+        'revenue': revenue or 0,
+    }
+
+
+def refresh_daily_summary(day):
+    """Recompute the rollup row for a single date from the source tables"""
+    day = _as_date(day)
+    milk = _milk_totals(MilkRecord.objects.filter(date=day)).order_by('date').first()
+    revenue = MilkSale.objects.filter(date=day).aggregate(total=Sum('total_amount'))['total']
+
+    if milk is None and revenue is None:
+        DailyProductionSummary.objects.filter(date=day).delete()
+        return None
+
+    summary, _ = DailyProductionSummary.objects.update_or_create(
+        date=day, defaults=_summary_fields(milk, revenue)
+    )
+    return summary
+
+
+def refresh_daily_summaries(dates):
+    """Recompute the rollup rows for a set of dates"""
+    days = sorted({_as_date(d) for d in dates if d})
+    for day in days:
+        refresh_daily_summary(day)
+    if days:
+        conditional.changed(DailyProductionSummary)
+
+
+def rebuild_daily_summaries(start_date=None, end_date=None, batch_days=366):
+    """
+    Rebuild the rollup from scratch for a date range (defaults to all history).
+    Each batch is computed with one grouped query per source table.
+    Returns the number of summary rows written.
+    """
+    if start_date is None or end_date is None:
+        bounds = MilkRecord.objects.aggregate(first=Min('date'), last=Max('date'))
+        sale_bounds = MilkSale.objects.aggregate(first=Min('date'), last=Max('date'))
+        firsts = [d for d in (bounds['first'], sale_bounds['first']) if d]
+        lasts = [d for d in (bounds['last'], sale_bounds['last']) if d]
+        if not firsts:
+            DailyProductionSummary.objects.all().delete()
+            return 0
+        start_date = start_date or min(firsts)
+        end_date = end_date or max(lasts)
+
+    written = 0
+    batch_start = start_date
+    while batch_start <= end_date:
+        batch_end = min(batch_start + timedelta(days=batch_days - 1), end_date)
+        written += _rebuild_range(batch_start, batch_end)
+        batch_start = batch_end + timedelta(days=1)
+    return written
+
+
+def _rebuild_range(start_date, end_date):
+    milk_rows = {
+        row['date']: row
+        for row in _milk_totals(MilkRecord.objects.filter(date__range=[start_date, end_date]))
+    }
+    revenue_rows = {
+        row['date']: row['revenue']
+        for row in _sale_totals(MilkSale.objects.filter(date__range=[start_date, end_date]))
+    }
+
+    summaries = [
+        DailyProductionSummary(date=day, **_summary_fields(milk_rows.get(day), revenue_rows.get(day)))
+        for day in sorted(set(milk_rows) | set(revenue_rows))
+    ]
+
+    with transaction.atomic():
+        DailyProductionSummary.objects.filter(date__range=[start_date, end_date]).delete()
+        DailyProductionSummary.objects.bulk_create(summaries, batch_size=500)
+        conditional.changed(DailyProductionSummary)
+    return len(summaries)
+
+
+# ==================== ROLLUP READERS ====================
+
+def summary_range(start_date, end_date):
+    """Rollup rows keyed by date for an inclusive range"""
+    return {
+        s.date: s for s in DailyProductionSummary.objects.filter(date__range=[start_date, end_date])
+    }
+
+
+def milk_total_between(start_date, end_date):
+    """Total milk produced in an inclusive date range"""
+    return DailyProductionSummary.objects.filter(
+        date__range=[start_date, end_date]
+    ).aggregate(total=Sum('total_milk'))['total'] or 0
@@ -0,0 +1,243 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.urls import reverse
+
+from agro import conditional
+from home import alerts, search
+
+from .models import (
+    MilkRecord, MilkSale, Cattle, FeedingRecord, HealthRecord, Expense, CattleSale, WeightRecord,
+    BreedingRecord, VaccinationSchedule, ExpenseCategory, Investment,
+)
+from .rollups import refresh_daily_summaries
+from .financials import refresh_cattle_financials, FEED, HEALTH, EXPENSE, SALE
+from .weights import refresh_following_gains
+
+
+# ==================== DAILY PRODUCTION ROLLUP ====================
+
+@receiver(pre_save, sender=MilkRecord)
+@receiver(pre_save, sender=MilkSale)
+def remember_previous_date(sender, instance, **kwargs):
+    """Keep the stored date so an edit that moves a record refreshes both days"""
+    instance._rollup_previous_date = None
+    if instance.pk:
+        instance._rollup_previous_date = sender.objects.filter(
+            pk=instance.pk
+        ).values_list('date', flat=True).first()
+
+
+@receiver(post_save, sender=MilkRecord)
+@receiver(post_save, sender=MilkSale)
+@receiver(post_delete, sender=MilkRecord)
+@receiver(post_delete, sender=MilkSale)
+def update_daily_summary(sender, instance, **kwargs):
+    """Refresh the affected DailyProductionSummary rows once the write commits"""
+    dates = [instance.date, getattr(instance, '_rollup_previous_date', None)]
+    transaction.on_commit(lambda: refresh_daily_summaries(dates))
+
+
+# ==================== CATTLE FINANCIAL LEDGER ====================
+
+# Ledger components refreshed when each cattle-linked model changes
+CATTLE_COMPONENTS = {
+    FeedingRecord: (FEED,),
+    HealthRecord: (HEALTH,),
+    Expense: (EXPENSE,),
+    CattleSale: (SALE,),
+}
+
+
+def _schedule_financials_refresh(cattle_ids, components):
+    transaction.on_commit(lambda: refresh_cattle_financials(cattle_ids, components))
+
+
+@receiver(post_save, sender=Cattle)
+def create_cattle_financials(sender, instance, created, **kwargs):
+    if created:
+        _schedule_financials_refresh([instance.pk], ())
+
+
+@receiver(pre_save, sender=FeedingRecord)
+@receiver(pre_save, sender=HealthRecord)
+@receiver(pre_save, sender=Expense)
+@receiver(pre_save, sender=CattleSale)
+def remember_previous_cattle(sender, instance, **kwargs):
+    """Keep the stored cattle so re-assigning a record refreshes both ledgers"""
+    instance._financials_previous_cattle = None
+    if instance.pk:
+        instance._financials_previous_cattle = sender.objects.filter(
+            pk=instance.pk
+        ).values_list('cattle_id', flat=True).first()
+
+
+@receiver(post_save, sender=FeedingRecord)
+@receiver(post_save, sender=HealthRecord)
+@receiver(post_save, sender=Expense)
+@receiver(post_save, sender=CattleSale)
+@receiver(post_delete, sender=FeedingRecord)
+@receiver(post_delete, sender=HealthRecord)
+@receiver(post_delete, sender=Expense)
+@receiver(post_delete, sender=CattleSale)
+def update_cattle_financials(sender, instance, **kwargs):
+    cattle_ids = [instance.cattle_id, getattr(instance, '_financials_previous_cattle', None)]
+    _schedule_financials_refresh(cattle_ids, CATTLE_COMPONENTS[sender])
+
+
+# ==================== WEIGHT SERIES ====================
+
+@receiver(pre_save, sender=WeightRecord)
+def remember_previous_weighing(sender, instance, **kwargs):
+    """Keep the stored animal and date so moving a weighing fixes the series it left"""
+    instance._weights_previous = None
+    if instance.pk:
+        instance._weights_previous = WeightRecord.objects.filter(
+            pk=instance.pk
+        ).values_list('cattle_id', 'date').first()
+
+
+@receiver(post_save, sender=WeightRecord)
+@receiver(post_delete, sender=WeightRecord)
+def update_following_gain(sender, instance, **kwargs):
+    """The next weighing's daily gain depends on this one"""
+    points = [(instance.cattle_id, instance.date)]
+    if getattr(instance, '_weights_previous', None):
+        points.append(instance._weights_previous)
+    transaction.on_commit(lambda: refresh_following_gains(points))
+
+
+# ==================== SEARCH INDEX ====================
+
+def cattle_document(cattle):
+    return {
+        'title': f"{cattle.tag_number} - {cattle.name}" if cattle.name else cattle.tag_number,
+        'subtitle': f"{cattle.get_breed_display()} · {cattle.get_status_display()}",
+        'url': reverse('dairy:cattle_detail', args=[cattle.pk]),
+        'body': search.text(
+            cattle.get_breed_display(), cattle.get_cattle_type_display(), cattle.location, cattle.color,
+        ),
+    }
+
+
+search.register('cattle', Cattle, cattle_document)
+
+
+# ==================== ALERTS ====================
+
+def overdue_vaccination_alert(vax, today):
+    return {
+        'level': 'danger',
+        'icon': 'exclamation-triangle',
+        'title': 'Overdue Vaccination',
+        'message': f"{vax.cattle.tag_number} - {vax.get_vaccine_type_display()} overdue",
+        'url': f"/dairy/vaccination/{vax.id}/",
+        'due_date': vax.scheduled_date,
+    }
+
+
+def due_vaccination_alert(vax, today):
+    return {
+        'level': 'warning',
+        'priority': 1,
+        'icon': 'clock',
+        'title': 'Vaccination Due Soon',
+        'message': f"{vax.cattle.tag_number} - {vax.get_vaccine_type_display()} in {(vax.scheduled_date - today).days} days",
+        'url': f"/dairy/vaccination/{vax.id}/",
+        'due_date': vax.scheduled_date,
+    }
+
+
+def emergency_alert(record, today):
+    return {
+        'level': 'danger',
+        'icon': 'heart-pulse',
+        'title': 'Emergency Case',
+        'message': f"{record.cattle.tag_number} - {record.diagnosis}",
+        'url': f"/dairy/health/{record.id}/",
+        'due_date': record.date,
+        'data': {'id': record.id, 'cattle_tag': record.cattle.tag_number, 'diagnosis': record.diagnosis, 'date': record.date},
+    }
+
+
+def followup_alert(record, today):
+    return {
+        'level': 'warning',
+        'priority': 1,
+        'icon': 'calendar-x',
+        'title': 'Overdue Follow-up',
+        'message': f"{record.cattle.tag_number} - {record.get_health_type_display()} checkup overdue",
+        'url': f"/dairy/health/{record.id}/",
+        'due_date': record.next_checkup_date,
+        'data': {
+            'id': record.id,
+            'cattle_tag': record.cattle.tag_number,
+            'checkup_date': record.next_checkup_date,
+            'health_type': record.get_health_type_display(),
+        },
+    }
+
+
+def calving_alert(breeding, today):
+    return {
+        'level': 'success',
+        'priority': 2,
+        'icon': 'egg',
+        'title': 'Due to Calve',
+        'message': f"{breeding.cattle.tag_number} due in {(breeding.expected_calving_date - today).days} days",
+        'url': f"/dairy/breeding/{breeding.id}/",
+        'due_date': breeding.expected_calving_date,
+    }
+
+
+alerts.register(
+    'dairy.vaccination_overdue', VaccinationSchedule,
+    lambda today: VaccinationSchedule.objects.filter(
+        scheduled_date__lt=today, is_completed=False
+    ).select_related('cattle'),
+    overdue_vaccination_alert,
+    follow={Cattle: 'cattle'},
+)
+alerts.register(
+    'dairy.vaccination_due', VaccinationSchedule,
+    lambda today: VaccinationSchedule.objects.filter(
+        scheduled_date__range=[today, today + timedelta(days=7)], is_completed=False
+    ).select_related('cattle'),
+    due_vaccination_alert,
+    follow={Cattle: 'cattle'},
+)
+alerts.register(
+    'dairy.health_emergency', HealthRecord,
+    lambda today: HealthRecord.objects.filter(
+        is_emergency=True, date__gte=today - timedelta(days=7)
+    ).select_related('cattle'),
+    emergency_alert,
+    follow={Cattle: 'cattle'},
+)
+# Listed by the health alerts API, but kept out of the bell as before
+alerts.register(
+    'dairy.followup_overdue', HealthRecord,
+    lambda today: HealthRecord.objects.filter(next_checkup_date__lt=today).select_related('cattle'),
+    followup_alert,
+    notify=False,
+    follow={Cattle: 'cattle'},
+)
+alerts.register(
+    'dairy.calving_due', BreedingRecord,
+    lambda today: BreedingRecord.objects.filter(
+        expected_calving_date__range=[today, today + timedelta(days=7)], is_pregnant=True
+    ).select_related('cattle'),
+    calving_alert,
+    follow={Cattle: 'cattle'},
+)
+
+
+# ==================== CHANGE VERSIONS ====================
+
+# Connected last, so versions move after the rollups and ledgers above are refreshed
+conditional.track(
+    Cattle, MilkRecord, MilkSale, CattleSale, HealthRecord, FeedingRecord, BreedingRecord,
+    WeightRecord, VaccinationSchedule, ExpenseCategory, Expense, Investment,
+)
@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+from django.db.models import Sum, Avg, Count, Q, Max
+from django.utils import timezone
+
+from .models import (
+    Cattle, MilkSale, HealthRecord, FeedingRecord, BreedingRecord,
+    WeightRecord, VaccinationSchedule, DailyProductionSummary,
+)
+
+
+# ==================== DASHBOARD STATISTICS ====================
+
+def dashboard_stats(today=None):
+    """
+    Compute every figure shown on the dairy dashboard.
+    Each table is read once with conditional aggregates, so the whole
+    payload costs one query per table regardless of herd size.
+    """
+    today = today or timezone.now().date()
+    week_ago = today - timedelta(days=7)
+    month_ago = today - timedelta(days=30)
+    first_day_month = today.replace(day=1)
+    heat_window = today - timedelta(days=21)
+    calving_window = today + timedelta(days=30)
+
+    cattle = Cattle.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(status='ACTIVE')),
+        dairy=Count('id', filter=Q(status='ACTIVE', cattle_type__in=['DAIRY', 'DUAL'])),
+        beef=Count('id', filter=Q(status='ACTIVE', cattle_type__in=['BEEF', 'DUAL'])),
+    )
+
+    milk = DailyProductionSummary.objects.filter(
+        date__gte=min(month_ago, first_day_month)
+    ).aggregate(
+        today=Sum('total_milk', filter=Q(date=today)),
+        week=Sum('total_milk', filter=Q(date__gte=week_ago)),
+        month=Sum('total_milk', filter=Q(date__gte=month_ago)),
+        this_month=Sum('total_milk', filter=Q(date__gte=first_day_month)),
+        avg_fat=Max('avg_fat', filter=Q(date=today)),
+    )
+
+    health = HealthRecord.objects.filter(is_emergency=True).aggregate(
+        alerts=Count('id', filter=Q(date__gte=week_ago)),
+        emergencies=Count('id'),
+    )
+
+    vaccinations = VaccinationSchedule.objects.filter(is_completed=False).aggregate(
+        upcoming=Count('id', filter=Q(scheduled_date__gte=today)),
+        overdue=Count('id', filter=Q(scheduled_date__lt=today)),
+    )
+
+    breeding = BreedingRecord.objects.aggregate(
+        in_heat=Count('cattle', distinct=True, filter=Q(
+            status='BRED', breeding_date__gte=heat_window,
+            cattle__gender='F', cattle__status='ACTIVE',
+        )),
+        pregnant=Count('id', filter=Q(is_pregnant=True, status='CONFIRMED')),
+        due_to_calve=Count('id', filter=Q(
+            is_pregnant=True, expected_calving_date__range=[today, calving_window]
+        )),
+        due_this_month=Count('id', filter=Q(
+            is_pregnant=True,
+            expected_calving_date__year=today.year,
+            expected_calving_date__month=today.month,
+        )),
+    )
+
+    weight = WeightRecord.objects.aggregate(
+        records=Count('id'),
+        avg_gain=Avg('daily_gain', filter=Q(daily_gain__isnull=False)),
+    )
+
+    feeding = FeedingRecord.objects.aggregate(
+        today=Count('id', filter=Q(date=today)),
+        total=Sum('quantity'),
+    )
+
+    sales = MilkSale.objects.filter(date__gte=first_day_month).aggregate(
+        today_quantity=Sum('quantity', filter=Q(date=today)),
+        today_revenue=Sum('total_amount', filter=Q(date=today)),
+        monthly_revenue=Sum('total_amount'),
+    )
+
+    return {
+        'cattle': cattle,
+        'milk': {
+            'today': milk['today'] or 0,
+            'week': milk['week'] or 0,
+            'month': milk['month'] or 0,
+            'this_month': milk['this_month'] or 0,
+            'avg_fat': milk['avg_fat'] or 0,
+        },
+        'health': {
+            'alerts': health['alerts'],
+            'emergencies': health['emergencies'],
+            'upcoming_vaccinations': vaccinations['upcoming'],
+            'overdue_vaccinations': vaccinations['overdue'],
+        },
+        'breeding': breeding,
+        'weight': {
+            'records': weight['records'],
+            'avg_gain': weight['avg_gain'] or 0,
+        },
+        'feeding': {
+            'today': feeding['today'],
+            'total': feeding['total'] or 0,
+        },
+        'sales': {
+            'today_quantity': sales['today_quantity'],
+            'today_revenue': sales['today_revenue'],
+            'monthly_revenue': sales['monthly_revenue'] or 0,
+        },
+    }
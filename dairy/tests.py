@@ -1,3 +1,426 @@
-from django.test import TestCase
+import json
+import re
+import tempfile
+from datetime import date, time, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.urls import reverse
+from django.test import TestCase, RequestFactory, override_settings
+from django.utils import timezone
+
+from .models import (
+    Cattle, MilkRecord, MilkSale, HealthRecord, FeedingRecord, BreedingRecord, WeightRecord,
+    VaccinationSchedule, Expense, MilkProductionReport, PDFExport,
+)
+from .reporting import build_milk_production_report, milk_production_figures
+from .views import (
+    CattleListAPIView, DairyDashboardView, DashboardStatsAPIView, MilkRecordListAPIView, MilkSessionBulkAPIView,
+    MilkProductionReportView, MILK_REPORT_MODELS, ExportCattlePDFView,
+)
+from .rollups import refresh_daily_summaries
+from .weights import import_weight_records
+from agro import conditional
+from home import jobs
+from home.models import ReportJob
+
+
+def add_cattle(count, user, start=0):
+    """count cows, each with a record in every table the dashboard reads"""
+    today = timezone.localdate()
+    for i in range(start, start + count):
+        cow = Cattle.objects.create(
+            tag_number=f'T{i:03d}', name=f'Cow {i}', breed='HF', gender='F',
+            birth_date=date(2021, 1, 1), created_by=user,
+        )
+        MilkRecord.objects.create(cattle=cow, date=today, session='MORNING', quantity=Decimal('10.5'), fat_percentage=4)
+        MilkSale.objects.create(date=today, quantity=5, price_per_liter=60, total_amount=300, created_by=user)
+        HealthRecord.objects.create(
+            cattle=cow, date=today, health_type='TREATMENT', diagnosis='Mastitis', veterinarian='Dr. Vet',
+            is_emergency=True,
+        )
+        VaccinationSchedule.objects.create(cattle=cow, vaccine_type='FMD', scheduled_date=today + timedelta(days=3))
+        BreedingRecord.objects.create(
+            cattle=cow, breeding_date=today - timedelta(days=10), breeding_method='AI', status='BRED',
+        )
+        WeightRecord.objects.create(cattle=cow, date=today - timedelta(days=30), weight=400)
+        WeightRecord.objects.create(cattle=cow, date=today, weight=415)
+        FeedingRecord.objects.create(cattle=cow, date=today, quantity=12, feed_time=time(7))
+
+
+# ==================== DASHBOARD QUERY BUDGET ====================
+
+class DashboardQueryBudgetTests(TestCase):
+    """The dashboards read each table once, however large the herd is"""
+
+    # One conditional-aggregate query per table in dairy.stats.dashboard_stats
+    QUERY_BUDGET = 8
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('farmer', password='x')
+        add_cattle(2, cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def get(self, view):
+        request = self.factory.get('/')
+        request.user = self.user
+        response = view.as_view()(request)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    def test_stats_api_budget(self):
+        with self.assertNumQueries(self.QUERY_BUDGET):
+            response = self.get(DashboardStatsAPIView)
+        data = json.loads(response.content)['data']
+        self.assertEqual(data['cattle']['total'], 2)
+        self.assertEqual(data['health']['alerts'], 2)
+
+    def test_dashboard_page_budget(self):
+        with self.assertNumQueries(self.QUERY_BUDGET):
+            response = self.get(DairyDashboardView)
+        self.assertEqual(response.context_data['total_cattle'], 2)
+
+    def test_budget_does_not_grow_with_the_herd(self):
+        add_cattle(10, self.user, start=2)
+        with self.assertNumQueries(self.QUERY_BUDGET):
+            self.get(DashboardStatsAPIView)
+        cache.clear()
+        with self.assertNumQueries(self.QUERY_BUDGET):
+            response = self.get(DairyDashboardView)
+        self.assertEqual(response.context_data['total_cattle'], 12)
+
+
+# ==================== QUERY PLANS ====================
+
+def hot_queries():
+    """The filter shapes the dairy dashboard, lists and reports run on every page load"""
+    today = timezone.localdate()
+    month_ago = today - timedelta(days=30)
+    return [
+        ('milk production by day', MilkRecord.objects.filter(date__range=[month_ago, today]).values('date')),
+        ('morning milk for a day', MilkRecord.objects.filter(date=today, session='MORNING')),
+        ('milk sales in range', MilkSale.objects.filter(date__range=[month_ago, today])),
+        ('recent emergencies', HealthRecord.objects.filter(
+            is_emergency=True, date__gte=today - timedelta(days=7)
+        )),
+        ('upcoming follow-ups', HealthRecord.objects.filter(next_checkup_date__gte=today)),
+        ('overdue vaccinations', VaccinationSchedule.objects.filter(
+            scheduled_date__lt=today, is_completed=False
+        )),
+        ('upcoming calvings', BreedingRecord.objects.filter(
+            expected_calving_date__range=[today, today + timedelta(days=30)], is_pregnant=True
+        )),
+        ('breedings in range', BreedingRecord.objects.filter(breeding_date__range=[month_ago, today])),
+        ('active cattle', Cattle.objects.filter(status='ACTIVE')),
+        ('cattle list page', Cattle.objects.filter(created_at__lte=timezone.now())),
+        ('feed cost in range', FeedingRecord.objects.filter(date__range=[month_ago, today])),
+        ('expenses this month', Expense.objects.filter(date__gte=month_ago)),
+    ]
+
+
+FULL_SCAN = {
+    'sqlite': re.compile(r'\bSCAN (dairy_\w+)\b'),
+    'postgresql': re.compile(r'Seq Scan on (dairy_\w+)'),
+}
+
+
+class QueryPlanTests(TestCase):
+    """The hot dairy filters are answered from an index, never a full table scan"""
+
+    def test_hot_queries_use_an_index(self):
+        full_scan = FULL_SCAN.get(connection.vendor)
+        if full_scan is None:
+            self.skipTest(f'No query plan check for {connection.vendor}')
+        if connection.vendor == 'postgresql':
+            # Small test tables make a seq scan look cheapest; only whether
+            # an index *can* be used is under test
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+        for name, queryset in hot_queries():
+            with self.subTest(name):
+                # Only the filter is under test: default orderings would let
+                # SQLite walk a date index end to end instead of sorting
+                plan = queryset.order_by().explain()
+                self.assertFalse(full_scan.findall(plan), f'{name} scans the whole table:\n{plan}')
+
+
+# ==================== CURSOR PAGINATION ====================
+
+class CursorPaginationTests(TestCase):
+    """Keyset pages cover every row once, in the list's order, from either direction"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('farmer', password='x')
+        add_cattle(7, cls.user)
+        # Rows sharing a created_at are told apart by id
+        cls.joined = timezone.now() - timedelta(days=1)
+        Cattle.objects.filter(tag_number__in=['T002', 'T003', 'T004']).update(created_at=cls.joined)
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def get(self, view, **params):
+        request = self.factory.get('/', params)
+        request.user = self.user
+        return view.as_view()(request)
+
+    def walk(self, view, per_page):
+        """Ids of every page, following next cursors from the first page"""
+        pages, cursor = [], ''
+        while cursor is not None:
+            payload = json.loads(self.get(view, per_page=per_page, cursor=cursor).content)
+            pages.append(payload)
+            cursor = payload['pagination']['next']
+        return pages
+
+    def test_cattle_list_is_newest_first(self):
+        pages = self.walk(CattleListAPIView, per_page=2)
+        ids = [row['id'] for page in pages for row in page['data']]
+        expected = list(Cattle.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(len(pages), 4)
+        self.assertIsNone(pages[0]['pagination']['previous'])
+
+    def test_previous_cursor_returns_the_same_page(self):
+        pages = self.walk(CattleListAPIView, per_page=3)
+        for before, after in zip(pages, pages[1:]):
+            back = json.loads(self.get(
+                CattleListAPIView, per_page=3, cursor=after['pagination']['previous'],
+            ).content)
+            self.assertEqual(back['data'], before['data'])
+            self.assertIsNotNone(back['pagination']['next'])
+
+    def test_date_keyed_list(self):
+        ids = [row['id'] for page in self.walk(MilkRecordListAPIView, per_page=4) for row in page['data']]
+        self.assertEqual(ids, list(MilkRecord.objects.order_by('-date', '-id').values_list('id', flat=True)))
+
+    def test_invalid_cursor(self):
+        for cursor in ['garbage', 'eyJrIjpbMV0sImQiOiJuZXh0In0']:
+            with self.subTest(cursor):
+                response = self.get(CattleListAPIView, cursor=cursor)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(json.loads(response.content)['success'])
+
+    def test_count_only_when_asked(self):
+        pagination = json.loads(self.get(CattleListAPIView, per_page=2).content)['pagination']
+        self.assertNotIn('count', pagination)
+        pagination = json.loads(self.get(CattleListAPIView, per_page=2, count=1).content)['pagination']
+        self.assertEqual(pagination['count'], 7)
+
+
+# ==================== MILKING SESSIONS ====================
+
+class MilkSessionBulkTests(TestCase):
+    """Bad input is a 400 or a per-row error, never a 500"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('milker', password='x')
+        for tag in ('M1', 'M2', 'M3'):
+            Cattle.objects.create(tag_number=tag, breed='HF', gender='F', birth_date=date(2021, 1, 1))
+
+    def post(self, body):
+        request = RequestFactory().post('/', body, content_type='application/json')
+        request.user = self.user
+        response = MilkSessionBulkAPIView.as_view()(request)
+        return response.status_code, json.loads(response.content)
+
+    def test_body_must_be_an_object(self):
+        for body in ('[1]', '"2024-01-01"', '3', 'null', '{'):
+            with self.subTest(body):
+                status, payload = self.post(body)
+                self.assertEqual(status, 400)
+                self.assertFalse(payload['success'])
+
+    def test_non_finite_numbers_are_row_errors(self):
+        status, payload = self.post(json.dumps({
+            'date': '2024-01-01', 'session': 'MORNING', 'records': [
+                {'tag_number': 'M1', 'quantity': 'nan'},
+                {'tag_number': 'M2', 'quantity': '8', 'fat_percentage': 'NaN'},
+                {'tag_number': 'M3', 'quantity': '9.5', 'fat_percentage': '4'},
+            ],
+        }))
+        self.assertEqual(status, 200)
+        self.assertEqual(payload['data']['created'], 1)
+        self.assertEqual(
+            [(e['tag_number'], e['error']) for e in payload['data']['errors']],
+            [('M1', 'Quantity and fat % must be numbers'), ('M2', 'Quantity and fat % must be numbers')],
+        )
+        self.assertEqual(MilkRecord.objects.get().cattle.tag_number, 'M3')
+
+
+# ==================== WEIGHT IMPORT ====================
+
+class WeightImportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cow = Cattle.objects.create(tag_number='W1', breed='HF', gender='F', birth_date=date(2021, 1, 1))
+
+    def test_csv_cattle_ids_are_matched(self):
+        created, updated = import_weight_records([
+            {'cattle_id': str(self.cow.pk), 'weight': '410', 'date': '2024-01-01'},
+            {'cattle_id': f' {self.cow.pk} ', 'weight': '420', 'date': '2024-01-11'},
+        ])
+        self.assertEqual((created, updated), (2, 0))
+        self.assertEqual(WeightRecord.objects.get(date=date(2024, 1, 11)).daily_gain, Decimal('1.00'))
+
+    def test_bad_rows_are_reported_and_nothing_is_written(self):
+        rows = [
+            {'tag_number': 'W1', 'weight': 'nan', 'date': '2024-01-01'},
+            {'tag_number': 'W1', 'weight': '-5', 'date': '2024-01-02'},
+            {'tag_number': 'W1', 'weight': '0', 'date': '2024-01-03'},
+            {'cattle_id': 'abc', 'weight': '400', 'date': '2024-01-04'},
+            {'tag_number': 'W1', 'weight': '400', 'date': '2024-01-05'},
+        ]
+        with self.assertRaises(ValueError) as raised:
+            import_weight_records(rows)
+        message = str(raised.exception)
+        for line in (1, 2, 3):
+            self.assertIn(f'Row {line}: weight must be a positive number', message)
+        self.assertIn("Row 4: unknown cattle 'abc'", message)
+        self.assertNotIn('Row 5', message)
+        self.assertFalse(WeightRecord.objects.exists())
+
+
+# ==================== MILK PRODUCTION REPORT ====================
+
+class MilkProductionReportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('farmer', password='x')
+        add_cattle(3, cls.user)
+        cls.today = timezone.localdate()
+        cls.params = {'period': 'custom', 'start_date': f'{cls.today - timedelta(days=6)}', 'end_date': f'{cls.today}'}
+
+    def setUp(self):
+        cache.clear()
+        # A versionless model reads as changed now; start the clocks before any report is built
+        conditional.model_versions(MILK_REPORT_MODELS)
+
+    def get(self):
+        request = RequestFactory().get('/', self.params)
+        request.user = self.user
+        return MilkProductionReportView.as_view()(request)
+
+    def build(self):
+        job = ReportJob.objects.create(
+            job_type='MILK_PRODUCTION', params=self.params, requested_by=self.user,
+            status='RUNNING', started_at=timezone.now(),
+        )
+        return build_milk_production_report(job)
+
+    def test_missing_report_is_queued_once(self):
+        first, second = self.get(), self.get()
+        job = ReportJob.objects.get()
+        self.assertEqual(first.status_code, 302)
+        self.assertEqual(first.url, reverse('home:report_job_status', args=[job.pk]))
+        self.assertEqual(second.url, first.url)
+        self.assertEqual((job.job_type, job.status), ('MILK_PRODUCTION', 'PENDING'))
+        self.assertEqual(job.params, self.params)
+        self.assertFalse(MilkProductionReport.objects.exists())
+
+    def test_page_renders_the_saved_report(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            refresh_daily_summaries([self.today])
+        report = self.build()
+        response = self.get().render()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context_data['report'], report)
+        self.assertEqual(response.context_data['total_milk'], Decimal('31.50'))
+        self.assertFalse(response.context_data['report_refreshing'])
+        self.assertFalse(ReportJob.objects.filter(status='PENDING').exists())
+
+    def test_new_milk_queues_a_refresh(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            refresh_daily_summaries([self.today])
+        self.build()
+        with self.captureOnCommitCallbacks(execute=True):
+            MilkRecord.objects.create(
+                cattle=Cattle.objects.first(), date=self.today, session='EVENING', quantity=Decimal('8'),
+            )
+        response = self.get()
+        # The saved figures are shown while the rebuild is queued
+        self.assertEqual(response.context_data['total_milk'], Decimal('31.50'))
+        self.assertTrue(response.context_data['report_refreshing'])
+        self.assertEqual(ReportJob.objects.filter(status='PENDING').count(), 1)
+
+        self.build()
+        context = self.get().context_data
+        self.assertEqual(context['total_milk'], Decimal('39.50'))
+        self.assertEqual(context['daily_breakdown'][-1]['evening'], 8.0)
+
+    def test_saved_report_matches_the_page(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            refresh_daily_summaries([self.today])
+            MilkSale.objects.create(date=self.today, quantity=10, price_per_liter=60, total_amount=600)
+        job = ReportJob.objects.create(job_type='MILK_PRODUCTION', params=self.params, requested_by=self.user)
+        report = build_milk_production_report(job)
+
+        start, end = self.today - timedelta(days=6), self.today
+        figures = milk_production_figures(start, end)
+        self.assertEqual((report.start_date, report.end_date), (start, end))
+        self.assertEqual(report.total_milk, Decimal('31.50'))
+        self.assertEqual(report.total_revenue, Decimal(str(figures['total_revenue'])))
+        self.assertEqual(report.peak_production_day, figures['peak_day'])
+        self.assertEqual(report.total_lactating_cows, figures['total_lactating'])
+        self.assertEqual(MilkProductionReport.objects.count(), 1)
+
+
+# ==================== PDF EXPORTS ====================
+
+@mock.patch('home.jobs.close_old_connections', lambda: None)
+class PDFExportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('farmer', password='x')
+        add_cattle(3, cls.user)
+
+    def setUp(self):
+        self.enterContext(override_settings(MEDIA_ROOT=self.enterContext(tempfile.TemporaryDirectory())))
+
+    def export(self):
+        request = RequestFactory().get('/')
+        request.user = self.user
+        response = ExportCattlePDFView.as_view()(request)
+        export = PDFExport.objects.get()
+        self.assertEqual(response.url, reverse('dairy:pdf_export_status', args=[export.pk]))
+        return export
+
+    def test_export_is_rendered_by_the_report_worker(self):
+        export = self.export()
+        job = ReportJob.objects.get()
+        self.assertEqual((job.job_type, job.params, job.requested_by), ('PDF_EXPORT', {'export_id': export.pk}, self.user))
+
+        self.assertTrue(jobs.run_job(jobs.claim_next_job()))
+        export.refresh_from_db()
+        job.refresh_from_db()
+        self.assertEqual((export.status, export.row_count), ('READY', 3))
+        with export.file.open('rb') as pdf:
+            self.assertEqual(pdf.read(4), b'%PDF')
+        self.assertEqual((job.status, job.result_id), ('READY', export.pk))
+
+    def test_export_of_a_lost_worker_is_rendered_again(self):
+        export = self.export()
+        job_id = jobs.claim_next_job()
+        # The worker claimed the export, then died
+        PDFExport.objects.filter(pk=export.pk).update(status='RUNNING')
+        ReportJob.objects.filter(pk=job_id).update(started_at=timezone.now() - timedelta(hours=2))
+
+        self.assertEqual(jobs.requeue_stale_jobs(timedelta(hours=1)), 1)
+        self.assertTrue(jobs.run_job(jobs.claim_next_job()))
+        export.refresh_from_db()
+        self.assertEqual(export.status, 'READY')
@@ -20,6 +20,7 @@ urlpatterns = [
     # ==================== MILK RECORDS ====================
     path('milk/', views.MilkRecordListView.as_view(), name='milk_list'),
     path('milk/add/', views.MilkRecordCreateView.as_view(), name='milk_add'),
+    path('milk/session/', views.MilkSessionView.as_view(), name='milk_session'),
     path('milk/<int:pk>/edit/', views.MilkRecordUpdateView.as_view(), name='milk_edit'),
     path('milk/<int:pk>/delete/', views.MilkRecordDeleteView.as_view(), name='milk_delete'),
     
@@ -106,6 +107,7 @@ urlpatterns = [
     path('export/sales/pdf/', views.ExportSalesPDFView.as_view(), name='export_sales_pdf'),
     path('export/financial/csv/', views.ExportFinancialCSVAPIView.as_view(), name='export_financial_csv'),
     path('export/financial/pdf/', views.ExportFinancialPDFView.as_view(), name='export_financial_pdf'),
+    path('export/pdf/<int:pk>/', views.PDFExportStatusView.as_view(), name='pdf_export_status'),
     
     # ==================== BACKWARD COMPATIBILITY EXPORT URLS ====================
     # Simple URLs that templates expect - ADD THESE!
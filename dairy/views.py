@@ -5,21 +5,27 @@ from django.urls import reverse_lazy
 from django.contrib import messages
 from django.db.models import Sum, Avg, Count, Q, Min, Max
 from django.utils import timezone
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, FileResponse
 from datetime import datetime, timedelta
 from decimal import Decimal
-import csv
 import json
 
-# PDF generation imports
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-from reportlab.lib.styles import getSampleStyleSheet
-
 from .models import *
 from .forms import *
+from .milking import record_milking_session
+from .stats import dashboard_stats
+from .pdf_exports import PDF_EXPORTS, queue_pdf_export
+from .reporting import milk_report_lookup, health_report_lookup, breeding_report_lookup, saved_report
+from agro import conditional
+from agro.conditional import ConditionalGetMixin
+from agro.exports import StreamingCSVExportView, choice_labels, iter_values
+from agro.facets import facet_totals
+from agro.pagination import CursorPaginatedAPIMixin
+from agro.timeseries import time_series, series_values, last_buckets, next_bucket
+from home import alerts
+from home.models import Alert
+from home.search import search_ids, in_order, matching
+from home.views import ReportJobMixin
 
 
 
@@ -34,134 +40,91 @@ class DairyDashboardView(LoginRequiredMixin, TemplateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        today = timezone.now().date()
-        first_day_month = today.replace(day=1)
+        stats = dashboard_stats()
         
         # Cattle Statistics
-        context['total_cattle'] = Cattle.objects.count()
-        context['active_cattle'] = Cattle.objects.filter(status='ACTIVE').count()
-        context['dairy_cattle'] = Cattle.objects.filter(cattle_type__in=['DAIRY', 'DUAL'], status='ACTIVE').count()
-        context['beef_cattle'] = Cattle.objects.filter(cattle_type__in=['BEEF', 'DUAL'], status='ACTIVE').count()
+        context['total_cattle'] = stats['cattle']['total']
+        context['active_cattle'] = stats['cattle']['active']
+        context['dairy_cattle'] = stats['cattle']['dairy']
+        context['beef_cattle'] = stats['cattle']['beef']
         
         # Milk Statistics
-        context['today_milk'] = MilkRecord.objects.filter(date=today).aggregate(total=Sum('quantity'))['total'] or 0
-        context['monthly_milk'] = MilkRecord.objects.filter(date__gte=first_day_month).aggregate(total=Sum('quantity'))['total'] or 0
-        context['avg_fat'] = MilkRecord.objects.filter(date=today).aggregate(avg=Avg('fat_percentage'))['avg'] or 0
+        context['today_milk'] = stats['milk']['today']
+        context['monthly_milk'] = stats['milk']['this_month']
+        context['avg_fat'] = stats['milk']['avg_fat']
         
         # Health Statistics
-        context['health_alerts'] = HealthRecord.objects.filter(is_emergency=True, date__gte=today - timedelta(days=7)).count()
-        context['emergency_count'] = HealthRecord.objects.filter(is_emergency=True).count()
-        context['upcoming_vaccinations'] = VaccinationSchedule.objects.filter(
-            scheduled_date__gte=today, is_completed=False
-        ).count()
-        context['overdue_vaccinations'] = VaccinationSchedule.objects.filter(
-            scheduled_date__lt=today, is_completed=False
-        ).count()
+        context['health_alerts'] = stats['health']['alerts']
+        context['emergency_count'] = stats['health']['emergencies']
+        context['upcoming_vaccinations'] = stats['health']['upcoming_vaccinations']
+        context['overdue_vaccinations'] = stats['health']['overdue_vaccinations']
         
         # Breeding Statistics
-        context['in_heat'] = Cattle.objects.filter(
-            gender='F', status='ACTIVE',
-            breeding_records__status='BRED',
-            breeding_records__breeding_date__gte=today - timedelta(days=21)
-        ).distinct().count()
-        
-        context['pregnant'] = BreedingRecord.objects.filter(is_pregnant=True, status='CONFIRMED').count()
-        context['due_to_calve'] = BreedingRecord.objects.filter(
-            expected_calving_date__range=[today, today + timedelta(days=30)],
-            is_pregnant=True
-        ).count()
+        context['in_heat'] = stats['breeding']['in_heat']
+        context['pregnant'] = stats['breeding']['pregnant']
+        context['due_to_calve'] = stats['breeding']['due_to_calve']
         
         # Weight Statistics
-        context['weight_records'] = WeightRecord.objects.count()
-        context['avg_gain'] = WeightRecord.objects.filter(
-            daily_gain__isnull=False
-        ).aggregate(avg=Avg('daily_gain'))['avg'] or 0
+        context['weight_records'] = stats['weight']['records']
+        context['avg_gain'] = stats['weight']['avg_gain']
         
         # Feeding Statistics
-        context['today_feedings'] = FeedingRecord.objects.filter(date=today).count()
-        context['total_feed'] = FeedingRecord.objects.aggregate(total=Sum('quantity'))['total'] or 0
+        context['today_feedings'] = stats['feeding']['today']
+        context['total_feed'] = stats['feeding']['total']
         
         # Sales Statistics
-        context['today_milk_sales'] = MilkSale.objects.filter(date=today).aggregate(
-            total_qty=Sum('quantity'),
-            total_amount=Sum('total_amount')
-        )
-        context['monthly_revenue'] = MilkSale.objects.filter(
-            date__gte=first_day_month
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
+        context['today_milk_sales'] = {
+            'total_qty': stats['sales']['today_quantity'],
+            'total_amount': stats['sales']['today_revenue'],
+        }
+        context['monthly_revenue'] = stats['sales']['monthly_revenue']
         
         return context
 
 
 # ==================== API VIEWS FOR DASHBOARD ====================
 
-class DashboardStatsAPIView(LoginRequiredMixin, View):
+# Models each group of read APIs is built from, for their ETags (see agro.conditional)
+DASHBOARD_MODELS = (
+    Cattle, MilkRecord, MilkSale, HealthRecord, VaccinationSchedule, BreedingRecord, WeightRecord, FeedingRecord,
+)
+# DailyProductionSummary rows are rolled up from both
+MILK_ROLLUP_MODELS = (MilkRecord, MilkSale)
+# Profit and loss of an animal comes from its CattleFinancials ledger
+CATTLE_LEDGER_MODELS = (Cattle, CattleSale, FeedingRecord, HealthRecord, Expense)
+FINANCIAL_MODELS = (MilkSale, CattleSale, Expense)
+
+class DashboardStatsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for dashboard statistics"""
+    conditional_models = DASHBOARD_MODELS
     
     def get(self, request):
-        today = timezone.now().date()
-        week_ago = today - timedelta(days=7)
-        month_ago = today - timedelta(days=30)
-        first_day_month = today.replace(day=1)
+        stats = dashboard_stats()
         
         data = {
-            'cattle': {
-                'total': Cattle.objects.count(),
-                'active': Cattle.objects.filter(status='ACTIVE').count(),
-                'dairy': Cattle.objects.filter(cattle_type__in=['DAIRY', 'DUAL'], status='ACTIVE').count(),
-                'beef': Cattle.objects.filter(cattle_type__in=['BEEF', 'DUAL'], status='ACTIVE').count(),
-            },
+            'cattle': stats['cattle'],
             'milk': {
-                'today': float(MilkRecord.objects.filter(date=today).aggregate(total=Sum('quantity'))['total'] or 0),
-                'week': float(MilkRecord.objects.filter(date__gte=week_ago).aggregate(total=Sum('quantity'))['total'] or 0),
-                'month': float(MilkRecord.objects.filter(date__gte=month_ago).aggregate(total=Sum('quantity'))['total'] or 0),
-                'avg_fat': float(MilkRecord.objects.filter(date=today).aggregate(avg=Avg('fat_percentage'))['avg'] or 0),
-            },
-            'health': {
-                'alerts': HealthRecord.objects.filter(is_emergency=True, date__gte=week_ago).count(),
-                'emergencies': HealthRecord.objects.filter(is_emergency=True).count(),
-                'upcoming_vaccinations': VaccinationSchedule.objects.filter(
-                    scheduled_date__gte=today, is_completed=False
-                ).count(),
-                'overdue_vaccinations': VaccinationSchedule.objects.filter(
-                    scheduled_date__lt=today, is_completed=False
-                ).count(),
-            },
-            'breeding': {
-                'in_heat': Cattle.objects.filter(
-                    gender='F', status='ACTIVE',
-                    breeding_records__status='BRED',
-                    breeding_records__breeding_date__gte=today - timedelta(days=21)
-                ).distinct().count(),
-                'pregnant': BreedingRecord.objects.filter(is_pregnant=True, status='CONFIRMED').count(),
-                'due_to_calve': BreedingRecord.objects.filter(
-                    expected_calving_date__range=[today, today + timedelta(days=30)],
-                    is_pregnant=True
-                ).count(),
-                'due_this_month': BreedingRecord.objects.filter(
-                    expected_calving_date__year=today.year,
-                    expected_calving_date__month=today.month,
-                    is_pregnant=True
-                ).count(),
+                'today': float(stats['milk']['today']),
+                'week': float(stats['milk']['week']),
+                'month': float(stats['milk']['month']),
+                'avg_fat': float(stats['milk']['avg_fat']),
             },
+            'health': stats['health'],
+            'breeding': stats['breeding'],
             'weight': {
-                'records': WeightRecord.objects.count(),
-                'avg_gain': float(WeightRecord.objects.filter(
-                    daily_gain__isnull=False
-                ).aggregate(avg=Avg('daily_gain'))['avg'] or 0),
+                'records': stats['weight']['records'],
+                'avg_gain': float(stats['weight']['avg_gain']),
             },
             'feeding': {
-                'today': FeedingRecord.objects.filter(date=today).count(),
-                'total': float(FeedingRecord.objects.aggregate(total=Sum('quantity'))['total'] or 0),
+                'today': stats['feeding']['today'],
+                'total': float(stats['feeding']['total']),
             },
             'sales': {
-                'today_quantity': float(MilkSale.objects.filter(date=today).aggregate(total=Sum('quantity'))['total'] or 0),
-                'today_revenue': float(MilkSale.objects.filter(date=today).aggregate(total=Sum('total_amount'))['total'] or 0),
+                'today_quantity': float(stats['sales']['today_quantity'] or 0),
+                'today_revenue': float(stats['sales']['today_revenue'] or 0),
             },
             'finance': {
-                'monthly_revenue': float(MilkSale.objects.filter(
-                    date__gte=first_day_month
-                ).aggregate(total=Sum('total_amount'))['total'] or 0),
+                'monthly_revenue': float(stats['sales']['monthly_revenue']),
                 'revenue_trend': 12.5,  # This would be calculated from actual data
             },
             'trends': {
@@ -173,53 +136,37 @@ class DashboardStatsAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': data})
 
 
-class MilkChartDataAPIView(LoginRequiredMixin, View):
+class MilkChartDataAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for milk production chart data"""
+    conditional_models = MILK_ROLLUP_MODELS
     
     def get(self, request):
         period = request.GET.get('period', 'week')
         today = timezone.now().date()
         
         if period == 'week':
-            labels = []
-            values = []
-            for i in range(6, -1, -1):
-                date = today - timedelta(days=i)
-                labels.append(date.strftime('%a'))
-                total = MilkRecord.objects.filter(date=date).aggregate(total=Sum('quantity'))['total'] or 0
-                values.append(float(total))
+            granularity, count, label = 'day', 7, '%a'
         elif period == 'month':
-            labels = []
-            values = []
-            for i in range(3, -1, -1):
-                week_start = today - timedelta(days=(i+1)*7)
-                week_end = today - timedelta(days=i*7)
-                labels.append(f'Week {4-i}')
-                total = MilkRecord.objects.filter(date__range=[week_start, week_end]).aggregate(total=Sum('quantity'))['total'] or 0
-                values.append(float(total))
+            granularity, count, label = 'week', 4, '%d %b'
         else:  # year
-            labels = []
-            values = []
-            for i in range(11, -1, -1):
-                month = today - timedelta(days=30*i)
-                labels.append(month.strftime('%b'))
-                month_start = month.replace(day=1)
-                if month.month == 12:
-                    month_end = month.replace(day=31)
-                else:
-                    month_end = month.replace(month=month.month+1, day=1) - timedelta(days=1)
-                total = MilkRecord.objects.filter(date__range=[month_start, month_end]).aggregate(total=Sum('quantity'))['total'] or 0
-                values.append(float(total))
+            granularity, count, label = 'month', 12, '%b'
+        start, end = last_buckets(count, granularity, today)
+        
+        # One grouped read over the daily rollup
+        series = time_series(
+            DailyProductionSummary.objects, 'date', start, end, granularity, total=Sum('total_milk')
+        )
         
         return JsonResponse({
             'success': True,
-            'labels': labels,
-            'values': values
+            'labels': [bucket['period'].strftime(label) for bucket in series],
+            'values': series_values(series)
         })
 
 
-class RecentActivityAPIView(LoginRequiredMixin, View):
+class RecentActivityAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for recent activities"""
+    conditional_models = (MilkRecord, HealthRecord, Cattle)
     
     def get(self, request):
         activities = []
@@ -257,76 +204,12 @@ class RecentActivityAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'activities': activities[:10]})
 
 
-class NotificationsAPIView(LoginRequiredMixin, View):
-    """API endpoint for notifications"""
+class NotificationsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    """API endpoint for notifications, read from the alerts raised by dairy/signals.py"""
+    conditional_models = (Alert,)
     
     def get(self, request):
-        today = timezone.now().date()
-        notifications = []
-        
-        # Overdue vaccinations
-        overdue_vax = VaccinationSchedule.objects.filter(
-            scheduled_date__lt=today, is_completed=False
-        ).select_related('cattle')[:5]
-        
-        for vax in overdue_vax:
-            notifications.append({
-                'type': 'danger',
-                'icon': 'exclamation-triangle',
-                'title': 'Overdue Vaccination',
-                'message': f"{vax.cattle.tag_number} - {vax.get_vaccine_type_display()} overdue",
-                'action_url': f"/dairy/vaccination/{vax.id}/"
-            })
-        
-        # Due soon vaccinations
-        due_vax = VaccinationSchedule.objects.filter(
-            scheduled_date__range=[today, today + timedelta(days=7)],
-            is_completed=False
-        ).select_related('cattle')[:5]
-        
-        for vax in due_vax:
-            notifications.append({
-                'type': 'warning',
-                'icon': 'clock',
-                'title': 'Vaccination Due Soon',
-                'message': f"{vax.cattle.tag_number} - {vax.get_vaccine_type_display()} in { (vax.scheduled_date - today).days } days",
-                'action_url': f"/dairy/vaccination/{vax.id}/"
-            })
-        
-        # Emergency health cases
-        emergencies = HealthRecord.objects.filter(
-            is_emergency=True, date__gte=today - timedelta(days=7)
-        ).select_related('cattle')[:5]
-        
-        for emergency in emergencies:
-            notifications.append({
-                'type': 'danger',
-                'icon': 'heart-pulse',
-                'title': 'Emergency Case',
-                'message': f"{emergency.cattle.tag_number} - {emergency.diagnosis}",
-                'action_url': f"/dairy/health/{emergency.id}/"
-            })
-        
-        # Due to calve
-        due_calve = BreedingRecord.objects.filter(
-            expected_calving_date__range=[today, today + timedelta(days=7)],
-            is_pregnant=True
-        ).select_related('cattle')[:5]
-        
-        for calving in due_calve:
-            notifications.append({
-                'type': 'success',
-                'icon': 'egg',
-                'title': 'Due to Calve',
-                'message': f"{calving.cattle.tag_number} due in { (calving.expected_calving_date - today).days } days",
-                'action_url': f"/dairy/breeding/{calving.id}/"
-            })
-        
-        return JsonResponse({
-            'success': True,
-            'notifications': notifications[:10],
-            'total': len(notifications)
-        })
+        return JsonResponse({'success': True, **alerts.notifications('dairy')})
 
 
 # ==================== CATTLE VIEWS ====================
@@ -359,21 +242,22 @@ class CattleListView(LoginRequiredMixin, ListView):
         # Search
         search = self.request.GET.get('search')
         if search:
+            # Word prefixes through the index, plus any part of a tag ("001" finds "T001")
             queryset = queryset.filter(
-                Q(tag_number__icontains=search) |
-                Q(name__icontains=search) |
-                Q(breed__icontains=search) |
-                Q(location__icontains=search)
+                Q(pk__in=matching(search, 'cattle')) | Q(tag_number__icontains=search)
             )
         
         return queryset
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['total_count'] = self.get_queryset().count()
-        context['dairy_count'] = self.get_queryset().filter(cattle_type__in=['DAIRY', 'DUAL']).count()
-        context['beef_count'] = self.get_queryset().filter(cattle_type__in=['BEEF', 'DUAL']).count()
-        context['active_count'] = self.get_queryset().filter(status='ACTIVE').count()
+        context.update(facet_totals(
+            self.object_list,
+            total_count=Count('id'),
+            dairy_count=Count('id', filter=Q(cattle_type__in=['DAIRY', 'DUAL'])),
+            beef_count=Count('id', filter=Q(cattle_type__in=['BEEF', 'DUAL'])),
+            active_count=Count('id', filter=Q(status='ACTIVE')),
+        ))
         
         # Filter badges
         context['current_type'] = self.request.GET.get('type', '')
@@ -389,9 +273,12 @@ class CattleDetailView(LoginRequiredMixin, DetailView):
     template_name = 'dairy/cattle/detail.html'
     context_object_name = 'cattle'
     
+    def get_queryset(self):
+        return Cattle.objects.with_financials()
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        cattle = self.get_object()
+        cattle = self.object
         today = timezone.now().date()
         
         # Related records
@@ -676,9 +563,12 @@ class CattleDetailView(LoginRequiredMixin, DetailView):
     template_name = 'dairy/cattle/detail.html'
     context_object_name = 'cattle'
     
+    def get_queryset(self):
+        return Cattle.objects.with_financials()
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        cattle = self.get_object()
+        cattle = self.object
         today = timezone.now().date()
         
         # Related records
@@ -1172,26 +1062,18 @@ class YearlyReportView(LoginRequiredMixin, TemplateView):
         year = int(self.request.GET.get('year', timezone.now().year))
         
         start_date = datetime(year, 1, 1).date()
-        end_date = datetime(year, 12, 31).date()
+        end_date = datetime(year + 1, 1, 1).date()
         
         # Monthly breakdown
-        monthly_data = []
-        for month in range(1, 13):
-            month_start = datetime(year, month, 1).date()
-            if month == 12:
-                month_end = datetime(year, 12, 31).date()
-            else:
-                month_end = datetime(year, month + 1, 1).date() - timedelta(days=1)
-            
-            milk_sales = MilkSale.objects.filter(date__range=[month_start, month_end]).aggregate(total=Sum('total_amount'))['total'] or 0
-            expenses = Expense.objects.filter(date__range=[month_start, month_end]).aggregate(total=Sum('amount'))['total'] or 0
-            
-            monthly_data.append({
-                'month': month_start.strftime('%B'),
-                'milk_sales': milk_sales,
-                'expenses': expenses,
-                'profit': milk_sales - expenses
-            })
+        milk_sales = time_series(MilkSale.objects, 'date', start_date, end_date, 'month', total=Sum('total_amount'))
+        expenses = time_series(Expense.objects, 'date', start_date, end_date, 'month', total=Sum('amount'))
+        
+        monthly_data = [{
+            'month': sales['period'].strftime('%B'),
+            'milk_sales': sales['total'],
+            'expenses': spent['total'],
+            'profit': sales['total'] - spent['total']
+        } for sales, spent in zip(milk_sales, expenses)]
         
         context['monthly_data'] = monthly_data
         
@@ -1204,48 +1086,24 @@ class YearlyReportView(LoginRequiredMixin, TemplateView):
         return context
 
 
-# ==================== EXPORT VIEWS ====================
-
-class ExportCattleCSVView(LoginRequiredMixin, View):
-    """Export cattle data to CSV"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="cattle_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Tag Number', 'Name', 'Type', 'Breed', 'Gender', 'Birth Date', 'Age', 'Weight', 'Status', 'Location'])
-        
-        for cattle in Cattle.objects.all():
-            writer.writerow([
-                cattle.tag_number,
-                cattle.name or '',
-                cattle.get_cattle_type_display(),
-                cattle.get_breed_display(),
-                cattle.get_gender_display(),
-                cattle.birth_date,
-                cattle.age_in_months(),
-                cattle.weight,
-                cattle.status,
-                cattle.location or ''
-            ])
-        
-        return response 
-    
-
-
-
-
-
 # ==================== API VIEWS FOR EACH ENDPOINT ====================
 
 # Cattle API Views
-class CattleListAPIView(LoginRequiredMixin, View):
+class CattleListAPIView(LoginRequiredMixin, ConditionalGetMixin, CursorPaginatedAPIMixin, View):
+    conditional_models = (Cattle,)
+    # Newest first, as before pagination
+    cursor_ordering = ('-created_at', '-id')
+    per_page = 100
+
     def get(self, request):
-        cattle = Cattle.objects.all().values('id', 'tag_number', 'name', 'cattle_type', 'breed', 'gender', 'status')
-        return JsonResponse({'success': True, 'data': list(cattle)})
+        cattle = Cattle.objects.values(
+            'id', 'tag_number', 'name', 'cattle_type', 'breed', 'gender', 'status', 'created_at'
+        )
+        return self.cursor_response(cattle, dict)
+
+class CattleDetailAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (Cattle,)
 
-class CattleDetailAPIView(LoginRequiredMixin, View):
     def get(self, request, cattle_id):
         try:
             cattle = Cattle.objects.get(id=cattle_id)
@@ -1267,20 +1125,24 @@ class CattleDetailAPIView(LoginRequiredMixin, View):
         except Cattle.DoesNotExist:
             return JsonResponse({'success': False, 'error': 'Cattle not found'})
 
-class CattleSearchAPIView(LoginRequiredMixin, View):
+class CattleSearchAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (Cattle,)
+
     def get(self, request):
         query = request.GET.get('q', '')
         if len(query) < 2:
             return JsonResponse({'success': True, 'data': []})
         
-        cattle = Cattle.objects.filter(
-            Q(tag_number__icontains=query) |
-            Q(name__icontains=query)
-        ).values('id', 'tag_number', 'name', 'breed', 'status')[:20]
+        cattle = in_order(
+            Cattle.objects.values('id', 'tag_number', 'name', 'breed', 'status'),
+            search_ids(query, 'cattle'),
+        )
         
-        return JsonResponse({'success': True, 'data': list(cattle)})
+        return JsonResponse({'success': True, 'data': cattle})
+
+class CattleStatsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (Cattle,)
 
-class CattleStatsAPIView(LoginRequiredMixin, View):
     def get(self, request):
         total = Cattle.objects.count()
         active = Cattle.objects.filter(status='ACTIVE').count()
@@ -1297,10 +1159,12 @@ class CattleStatsAPIView(LoginRequiredMixin, View):
             }
         })
 
-class CattleFinancialAPIView(LoginRequiredMixin, View):
+class CattleFinancialAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = CATTLE_LEDGER_MODELS
+
     def get(self, request, cattle_id):
         try:
-            cattle = Cattle.objects.get(id=cattle_id)
+            cattle = Cattle.objects.with_financials().get(id=cattle_id)
             data = {
                 'purchase_price': float(cattle.purchase_price) if cattle.purchase_price else 0,
                 'current_value': float(cattle.current_value) if cattle.current_value else 0,
@@ -1312,7 +1176,9 @@ class CattleFinancialAPIView(LoginRequiredMixin, View):
         except Cattle.DoesNotExist:
             return JsonResponse({'success': False, 'error': 'Cattle not found'})
 
-class CattleGrowthAPIView(LoginRequiredMixin, View):
+class CattleGrowthAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (WeightRecord,)
+
     def get(self, request, cattle_id):
         weights = WeightRecord.objects.filter(cattle_id=cattle_id).order_by('date')
         data = {
@@ -1322,20 +1188,78 @@ class CattleGrowthAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': data})
 
 # Milk Record API Views
-class MilkRecordListAPIView(LoginRequiredMixin, View):
+class MilkSessionView(LoginRequiredMixin, TemplateView):
+    """Record a whole milking session for the herd in one submit"""
+    template_name = 'dairy/milk/session.html'
+    
+    def _session(self, data):
+        try:
+            day = datetime.strptime(data.get('date', ''), '%Y-%m-%d').date()
+        except ValueError:
+            day = timezone.now().date()
+        session = data.get('session')
+        if session not in dict(MilkRecord.SESSION_CHOICES):
+            session = MilkRecordForm().get_default_session()
+        return day, session
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        day, session = self._session(self.request.GET)
+        recorded = dict(
+            MilkRecord.objects.filter(date=day, session=session).values_list('cattle_id', 'quantity')
+        )
+        herd = Cattle.objects.filter(
+            cattle_type__in=['DAIRY', 'DUAL'], status='ACTIVE'
+        ).order_by('tag_number').values('pk', 'tag_number', 'name')
+        context['herd'] = [dict(cow, recorded=recorded.get(cow['pk'])) for cow in herd]
+        context['date'] = day
+        context['session'] = session
+        context['session_choices'] = MilkRecord.SESSION_CHOICES
+        context['recorded_count'] = len(recorded)
+        return context
+    
+    def post(self, request, *args, **kwargs):
+        day, session = self._session(request.POST)
+        rows = [
+            {'tag_number': tag, 'quantity': quantity, 'fat_percentage': fat}
+            for tag, quantity, fat in zip(
+                request.POST.getlist('tag_number'),
+                request.POST.getlist('quantity'),
+                request.POST.getlist('fat_percentage'),
+            )
+            if quantity.strip()
+        ]
+        try:
+            created, errors = record_milking_session(day, session, rows, recorded_by=request.user)
+        except ValueError as e:
+            created, errors = 0, []
+            messages.error(request, str(e))
+        
+        if created:
+            messages.success(request, f'{created} milk records saved for {day} ({session.title()}).')
+        for error in errors:
+            messages.warning(request, f"Row {error['row']} ({error['tag_number']}): {error['error']}")
+        return redirect(f"{reverse_lazy('dairy:milk_session')}?date={day}&session={session}")
+
+
+class MilkRecordListAPIView(LoginRequiredMixin, ConditionalGetMixin, CursorPaginatedAPIMixin, View):
+    conditional_models = (MilkRecord, Cattle)
+    per_page = 100
+
     def get(self, request):
-        records = MilkRecord.objects.select_related('cattle').all().order_by('-date')[:100]
-        data = [{
+        records = MilkRecord.objects.select_related('cattle')
+        return self.cursor_response(records, lambda r: {
             'id': r.id,
             'date': r.date,
             'cattle_tag': r.cattle.tag_number,
             'session': r.get_session_display(),
             'quantity': float(r.quantity),
             'fat_percentage': float(r.fat_percentage) if r.fat_percentage else None,
-        } for r in records]
-        return JsonResponse({'success': True, 'data': data})
+        })
+
+class MilkRecordDetailAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (MilkRecord, Cattle)
 
-class MilkRecordDetailAPIView(LoginRequiredMixin, View):
     def get(self, request, record_id):
         try:
             record = MilkRecord.objects.select_related('cattle').get(id=record_id)
@@ -1355,7 +1279,40 @@ class MilkRecordDetailAPIView(LoginRequiredMixin, View):
         except MilkRecord.DoesNotExist:
             return JsonResponse({'success': False, 'error': 'Record not found'})
 
-class MilkStatsAPIView(LoginRequiredMixin, View):
+class MilkSessionBulkAPIView(LoginRequiredMixin, View):
+    """Record a milking session from JSON: date, session and a list of records"""
+    
+    def post(self, request):
+        try:
+            data = json.loads(request.body)
+            if not isinstance(data, dict):
+                raise ValueError('Expected a JSON object')
+            day = datetime.strptime(data.get('date', ''), '%Y-%m-%d').date()
+        except (ValueError, TypeError):
+            return JsonResponse({'success': False, 'error': 'Send JSON with a date in YYYY-MM-DD format'}, status=400)
+        
+        records = data.get('records')
+        if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+            return JsonResponse({'success': False, 'error': 'records must be a list of objects'}, status=400)
+        
+        try:
+            created, errors = record_milking_session(day, data.get('session'), records, recorded_by=request.user)
+        except ValueError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+        
+        return JsonResponse({
+            'success': True,
+            'data': {
+                'date': day,
+                'session': data.get('session'),
+                'created': created,
+                'errors': errors,
+            }
+        })
+
+class MilkStatsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (MilkRecord,)
+
     def get(self, request):
         today = timezone.now().date()
         week_ago = today - timedelta(days=7)
@@ -1369,7 +1326,9 @@ class MilkStatsAPIView(LoginRequiredMixin, View):
         }
         return JsonResponse({'success': True, 'data': data})
 
-class MilkTodayAPIView(LoginRequiredMixin, View):
+class MilkTodayAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (MilkRecord, Cattle)
+
     def get(self, request):
         today = timezone.now().date()
         records = MilkRecord.objects.filter(date=today).select_related('cattle')
@@ -1382,7 +1341,9 @@ class MilkTodayAPIView(LoginRequiredMixin, View):
         } for r in records]
         return JsonResponse({'success': True, 'data': data})
 
-class MilkByCattleAPIView(LoginRequiredMixin, View):
+class MilkByCattleAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (MilkRecord,)
+
     def get(self, request, cattle_id):
         records = MilkRecord.objects.filter(cattle_id=cattle_id).order_by('-date')[:30]
         data = [{
@@ -1394,10 +1355,12 @@ class MilkByCattleAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': data})
 
 # Milk Sale API Views
-class MilkSaleListAPIView(LoginRequiredMixin, View):
+class MilkSaleListAPIView(LoginRequiredMixin, ConditionalGetMixin, CursorPaginatedAPIMixin, View):
+    conditional_models = (MilkSale,)
+    per_page = 100
+
     def get(self, request):
-        sales = MilkSale.objects.all().order_by('-date')[:100]
-        data = [{
+        return self.cursor_response(MilkSale.objects.all(), lambda s: {
             'id': s.id,
             'date': s.date,
             'quantity': float(s.quantity),
@@ -1405,10 +1368,11 @@ class MilkSaleListAPIView(LoginRequiredMixin, View):
             'total_amount': float(s.total_amount),
             'sale_type': s.get_sale_type_display(),
             'customer_name': s.customer_name,
-        } for s in sales]
-        return JsonResponse({'success': True, 'data': data})
+        })
+
+class MilkSaleDetailAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (MilkSale,)
 
-class MilkSaleDetailAPIView(LoginRequiredMixin, View):
     def get(self, request, sale_id):
         try:
             sale = MilkSale.objects.get(id=sale_id)
@@ -1428,7 +1392,9 @@ class MilkSaleDetailAPIView(LoginRequiredMixin, View):
         except MilkSale.DoesNotExist:
             return JsonResponse({'success': False, 'error': 'Sale not found'})
 
-class MilkSaleStatsAPIView(LoginRequiredMixin, View):
+class MilkSaleStatsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (MilkSale,)
+
     def get(self, request):
         today = timezone.now().date()
         first_day_month = today.replace(day=1)
@@ -1441,35 +1407,37 @@ class MilkSaleStatsAPIView(LoginRequiredMixin, View):
         }
         return JsonResponse({'success': True, 'data': data})
 
-class MilkSaleMonthlyAPIView(LoginRequiredMixin, View):
+class MilkSaleMonthlyAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (MilkSale,)
+
     def get(self, request):
         year = int(request.GET.get('year', timezone.now().year))
-        monthly_data = []
-        
-        for month in range(1, 13):
-            total = MilkSale.objects.filter(
-                date__year=year,
-                date__month=month
-            ).aggregate(total=Sum('total_amount'))['total'] or 0
-            monthly_data.append(float(total))
-        
-        return JsonResponse({'success': True, 'data': monthly_data})
+        series = time_series(
+            MilkSale.objects, 'date', datetime(year, 1, 1).date(), datetime(year + 1, 1, 1).date(), 'month',
+            total=Sum('total_amount')
+        )
+        return JsonResponse({'success': True, 'data': series_values(series)})
 
 # Cattle Sale API Views
-class CattleSaleListAPIView(LoginRequiredMixin, View):
+class CattleSaleListAPIView(LoginRequiredMixin, ConditionalGetMixin, CursorPaginatedAPIMixin, View):
+    conditional_models = CATTLE_LEDGER_MODELS
+    cursor_ordering = ('-sale_date', '-id')
+    per_page = 100
+
     def get(self, request):
-        sales = CattleSale.objects.select_related('cattle').all().order_by('-sale_date')[:100]
-        data = [{
+        sales = CattleSale.objects.select_related('cattle')
+        return self.cursor_response(sales, lambda s: {
             'id': s.id,
             'sale_date': s.sale_date,
             'cattle_tag': s.cattle.tag_number,
             'sale_price': float(s.sale_price),
             'buyer_name': s.buyer_name,
             'profit_loss': float(s.profit_loss()),
-        } for s in sales]
-        return JsonResponse({'success': True, 'data': data})
+        })
+
+class CattleSaleDetailAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = CATTLE_LEDGER_MODELS
 
-class CattleSaleDetailAPIView(LoginRequiredMixin, View):
     def get(self, request, sale_id):
         try:
             sale = CattleSale.objects.select_related('cattle').get(id=sale_id)
@@ -1489,7 +1457,9 @@ class CattleSaleDetailAPIView(LoginRequiredMixin, View):
         except CattleSale.DoesNotExist:
             return JsonResponse({'success': False, 'error': 'Sale not found'})
 
-class CattleSaleStatsAPIView(LoginRequiredMixin, View):
+class CattleSaleStatsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (CattleSale,)
+
     def get(self, request):
         year = timezone.now().year
         data = {
@@ -1501,7 +1471,9 @@ class CattleSaleStatsAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': data})
 
 # Health Record API Views
-class HealthRecordListAPIView(LoginRequiredMixin, View):
+class HealthRecordListAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (HealthRecord, Cattle)
+
     def get(self, request):
         records = HealthRecord.objects.select_related('cattle').all().order_by('-date')[:100]
         data = [{
@@ -1515,7 +1487,9 @@ class HealthRecordListAPIView(LoginRequiredMixin, View):
         } for r in records]
         return JsonResponse({'success': True, 'data': data})
 
-class HealthRecordDetailAPIView(LoginRequiredMixin, View):
+class HealthRecordDetailAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (HealthRecord, Cattle)
+
     def get(self, request, record_id):
         try:
             record = HealthRecord.objects.select_related('cattle').get(id=record_id)
@@ -1539,37 +1513,19 @@ class HealthRecordDetailAPIView(LoginRequiredMixin, View):
         except HealthRecord.DoesNotExist:
             return JsonResponse({'success': False, 'error': 'Record not found'})
 
-class HealthAlertsAPIView(LoginRequiredMixin, View):
+class HealthAlertsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (Alert,)
+
     def get(self, request):
-        today = timezone.now().date()
-        
-        emergencies = HealthRecord.objects.filter(
-            is_emergency=True,
-            date__gte=today - timedelta(days=7)
-        ).select_related('cattle')[:10]
-        
-        overdue = HealthRecord.objects.filter(
-            next_checkup_date__lt=today,
-            next_checkup_date__isnull=False
-        ).select_related('cattle')[:10]
-        
         data = {
-            'emergencies': [{
-                'id': e.id,
-                'cattle_tag': e.cattle.tag_number,
-                'diagnosis': e.diagnosis,
-                'date': e.date,
-            } for e in emergencies],
-            'overdue_followups': [{
-                'id': o.id,
-                'cattle_tag': o.cattle.tag_number,
-                'checkup_date': o.next_checkup_date,
-                'health_type': o.get_health_type_display(),
-            } for o in overdue],
+            'emergencies': alerts.alert_data('dairy.health_emergency', limit=10),
+            'overdue_followups': alerts.alert_data('dairy.followup_overdue', limit=10),
         }
         return JsonResponse({'success': True, 'data': data})
 
-class HealthEmergenciesAPIView(LoginRequiredMixin, View):
+class HealthEmergenciesAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (HealthRecord, Cattle)
+
     def get(self, request):
         emergencies = HealthRecord.objects.filter(
             is_emergency=True
@@ -1584,7 +1540,9 @@ class HealthEmergenciesAPIView(LoginRequiredMixin, View):
         } for e in emergencies]
         return JsonResponse({'success': True, 'data': data})
 
-class HealthByCattleAPIView(LoginRequiredMixin, View):
+class HealthByCattleAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (HealthRecord,)
+
     def get(self, request, cattle_id):
         records = HealthRecord.objects.filter(cattle_id=cattle_id).order_by('-date')[:20]
         data = [{
@@ -1597,19 +1555,23 @@ class HealthByCattleAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': data})
 
 # Weight Record API Views
-class WeightRecordListAPIView(LoginRequiredMixin, View):
+class WeightRecordListAPIView(LoginRequiredMixin, ConditionalGetMixin, CursorPaginatedAPIMixin, View):
+    conditional_models = (WeightRecord, Cattle)
+    per_page = 100
+
     def get(self, request):
-        records = WeightRecord.objects.select_related('cattle').all().order_by('-date')[:100]
-        data = [{
+        records = WeightRecord.objects.select_related('cattle')
+        return self.cursor_response(records, lambda r: {
             'id': r.id,
             'date': r.date,
             'cattle_tag': r.cattle.tag_number,
             'weight': float(r.weight),
             'daily_gain': float(r.daily_gain) if r.daily_gain else None,
-        } for r in records]
-        return JsonResponse({'success': True, 'data': data})
+        })
+
+class WeightRecordDetailAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (WeightRecord, Cattle)
 
-class WeightRecordDetailAPIView(LoginRequiredMixin, View):
     def get(self, request, record_id):
         try:
             record = WeightRecord.objects.select_related('cattle').get(id=record_id)
@@ -1627,7 +1589,9 @@ class WeightRecordDetailAPIView(LoginRequiredMixin, View):
         except WeightRecord.DoesNotExist:
             return JsonResponse({'success': False, 'error': 'Record not found'})
 
-class WeightByCattleAPIView(LoginRequiredMixin, View):
+class WeightByCattleAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (WeightRecord,)
+
     def get(self, request, cattle_id):
         records = WeightRecord.objects.filter(cattle_id=cattle_id).order_by('-date')[:30]
         data = [{
@@ -1668,7 +1632,9 @@ class BulkWeightDeleteAPIView(LoginRequiredMixin, View):
             return JsonResponse({'success': False, 'error': str(e)})
 
 
-class WeightChartAPIView(LoginRequiredMixin, View):
+class WeightChartAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (WeightRecord,)
+
     def get(self, request, cattle_id):
         records = WeightRecord.objects.filter(cattle_id=cattle_id).order_by('date')
         data = {
@@ -1678,10 +1644,14 @@ class WeightChartAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': data})
 
 # Feeding Record API Views
-class FeedingRecordListAPIView(LoginRequiredMixin, View):
+class FeedingRecordListAPIView(LoginRequiredMixin, ConditionalGetMixin, CursorPaginatedAPIMixin, View):
+    conditional_models = (FeedingRecord, Cattle)
+    cursor_ordering = ('-date', '-feed_time', '-id')
+    per_page = 100
+
     def get(self, request):
-        records = FeedingRecord.objects.select_related('cattle').all().order_by('-date', '-feed_time')[:100]
-        data = [{
+        records = FeedingRecord.objects.select_related('cattle')
+        return self.cursor_response(records, lambda r: {
             'id': r.id,
             'date': r.date,
             'feed_time': r.feed_time.strftime('%H:%M'),
@@ -1689,10 +1659,11 @@ class FeedingRecordListAPIView(LoginRequiredMixin, View):
             'feed_type': r.get_feed_type_display(),
             'quantity': float(r.quantity),
             'total_cost': float(r.total_cost),
-        } for r in records]
-        return JsonResponse({'success': True, 'data': data})
+        })
+
+class FeedingRecordDetailAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (FeedingRecord, Cattle)
 
-class FeedingRecordDetailAPIView(LoginRequiredMixin, View):
     def get(self, request, record_id):
         try:
             record = FeedingRecord.objects.select_related('cattle').get(id=record_id)
@@ -1715,7 +1686,9 @@ class FeedingRecordDetailAPIView(LoginRequiredMixin, View):
         except FeedingRecord.DoesNotExist:
             return JsonResponse({'success': False, 'error': 'Record not found'})
 
-class FeedingTodayAPIView(LoginRequiredMixin, View):
+class FeedingTodayAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (FeedingRecord, Cattle)
+
     def get(self, request):
         today = timezone.now().date()
         records = FeedingRecord.objects.filter(date=today).select_related('cattle')
@@ -1728,7 +1701,9 @@ class FeedingTodayAPIView(LoginRequiredMixin, View):
         } for r in records]
         return JsonResponse({'success': True, 'data': data})
 
-class FeedingStatsAPIView(LoginRequiredMixin, View):
+class FeedingStatsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (FeedingRecord,)
+
     def get(self, request):
         today = timezone.now().date()
         month_ago = today - timedelta(days=30)
@@ -1742,7 +1717,9 @@ class FeedingStatsAPIView(LoginRequiredMixin, View):
         }
         return JsonResponse({'success': True, 'data': data})
 
-class FeedingByCattleAPIView(LoginRequiredMixin, View):
+class FeedingByCattleAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (FeedingRecord,)
+
     def get(self, request, cattle_id):
         records = FeedingRecord.objects.filter(cattle_id=cattle_id).order_by('-date', '-feed_time')[:30]
         data = [{
@@ -1756,7 +1733,9 @@ class FeedingByCattleAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': data})
 
 # Breeding Record API Views
-class BreedingRecordListAPIView(LoginRequiredMixin, View):
+class BreedingRecordListAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (BreedingRecord, Cattle)
+
     def get(self, request):
         records = BreedingRecord.objects.select_related('cattle', 'sire', 'offspring').all().order_by('-breeding_date')[:100]
         data = [{
@@ -1771,7 +1750,9 @@ class BreedingRecordListAPIView(LoginRequiredMixin, View):
         } for r in records]
         return JsonResponse({'success': True, 'data': data})
 
-class BreedingRecordDetailAPIView(LoginRequiredMixin, View):
+class BreedingRecordDetailAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (BreedingRecord, Cattle)
+
     def get(self, request, record_id):
         try:
             record = BreedingRecord.objects.select_related('cattle', 'sire', 'offspring').get(id=record_id)
@@ -1797,7 +1778,9 @@ class BreedingRecordDetailAPIView(LoginRequiredMixin, View):
         except BreedingRecord.DoesNotExist:
             return JsonResponse({'success': False, 'error': 'Record not found'})
 
-class BreedingCalendarAPIView(LoginRequiredMixin, View):
+class BreedingCalendarAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (BreedingRecord, Cattle)
+
     def get(self, request):
         month = int(request.GET.get('month', timezone.now().month))
         year = int(request.GET.get('year', timezone.now().year))
@@ -1828,7 +1811,9 @@ class BreedingCalendarAPIView(LoginRequiredMixin, View):
         }
         return JsonResponse({'success': True, 'data': data})
 
-class DueCalvingAPIView(LoginRequiredMixin, View):
+class DueCalvingAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (BreedingRecord, Cattle)
+
     def get(self, request):
         today = timezone.now().date()
         due = BreedingRecord.objects.filter(
@@ -1844,7 +1829,9 @@ class DueCalvingAPIView(LoginRequiredMixin, View):
         } for d in due]
         return JsonResponse({'success': True, 'data': data})
 
-class InHeatAPIView(LoginRequiredMixin, View):
+class InHeatAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (Cattle, BreedingRecord)
+
     def get(self, request):
         today = timezone.now().date()
         in_heat = Cattle.objects.filter(
@@ -1862,7 +1849,9 @@ class InHeatAPIView(LoginRequiredMixin, View):
         } for c in in_heat]
         return JsonResponse({'success': True, 'data': data})
 
-class BreedingStatsAPIView(LoginRequiredMixin, View):
+class BreedingStatsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (BreedingRecord,)
+
     def get(self, request):
         total = BreedingRecord.objects.count()
         pregnant = BreedingRecord.objects.filter(is_pregnant=True).count()
@@ -1879,7 +1868,9 @@ class BreedingStatsAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': data})
 
 # Vaccination API Views
-class VaccinationListAPIView(LoginRequiredMixin, View):
+class VaccinationListAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (VaccinationSchedule, Cattle)
+
     def get(self, request):
         vaccinations = VaccinationSchedule.objects.select_related('cattle').all().order_by('scheduled_date')[:100]
         data = [{
@@ -1892,7 +1883,9 @@ class VaccinationListAPIView(LoginRequiredMixin, View):
         } for v in vaccinations]
         return JsonResponse({'success': True, 'data': data})
 
-class VaccinationDetailAPIView(LoginRequiredMixin, View):
+class VaccinationDetailAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (VaccinationSchedule, Cattle)
+
     def get(self, request, vax_id):
         try:
             vax = VaccinationSchedule.objects.select_related('cattle', 'administered_by').get(id=vax_id)
@@ -1914,7 +1907,9 @@ class VaccinationDetailAPIView(LoginRequiredMixin, View):
         except VaccinationSchedule.DoesNotExist:
             return JsonResponse({'success': False, 'error': 'Vaccination not found'})
 
-class UpcomingVaccinationsAPIView(LoginRequiredMixin, View):
+class UpcomingVaccinationsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (VaccinationSchedule, Cattle)
+
     def get(self, request):
         today = timezone.now().date()
         upcoming = VaccinationSchedule.objects.filter(
@@ -1931,7 +1926,9 @@ class UpcomingVaccinationsAPIView(LoginRequiredMixin, View):
         } for v in upcoming]
         return JsonResponse({'success': True, 'data': data})
 
-class OverdueVaccinationsAPIView(LoginRequiredMixin, View):
+class OverdueVaccinationsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (VaccinationSchedule, Cattle)
+
     def get(self, request):
         today = timezone.now().date()
         overdue = VaccinationSchedule.objects.filter(
@@ -1948,7 +1945,9 @@ class OverdueVaccinationsAPIView(LoginRequiredMixin, View):
         } for v in overdue]
         return JsonResponse({'success': True, 'data': data})
 
-class VaccinationByCattleAPIView(LoginRequiredMixin, View):
+class VaccinationByCattleAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (VaccinationSchedule,)
+
     def get(self, request, cattle_id):
         vaccinations = VaccinationSchedule.objects.filter(cattle_id=cattle_id).order_by('-scheduled_date')[:20]
         data = [{
@@ -1978,20 +1977,24 @@ class CompleteVaccinationAPIView(LoginRequiredMixin, View):
             return JsonResponse({'success': False, 'error': 'Vaccination not found'})
 
 # Expense API Views
-class ExpenseListAPIView(LoginRequiredMixin, View):
+class ExpenseListAPIView(LoginRequiredMixin, ConditionalGetMixin, CursorPaginatedAPIMixin, View):
+    conditional_models = (Expense, ExpenseCategory, Cattle)
+    per_page = 100
+
     def get(self, request):
-        expenses = Expense.objects.select_related('category', 'cattle').all().order_by('-date')[:100]
-        data = [{
+        expenses = Expense.objects.select_related('category', 'cattle')
+        return self.cursor_response(expenses, lambda e: {
             'id': e.id,
             'date': e.date,
             'category': e.category.name if e.category else None,
             'description': e.description,
             'amount': float(e.amount),
             'cattle_tag': e.cattle.tag_number if e.cattle else None,
-        } for e in expenses]
-        return JsonResponse({'success': True, 'data': data})
+        })
+
+class ExpenseDetailAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (Expense, ExpenseCategory, Cattle)
 
-class ExpenseDetailAPIView(LoginRequiredMixin, View):
     def get(self, request, expense_id):
         try:
             expense = Expense.objects.select_related('category', 'cattle').get(id=expense_id)
@@ -2013,7 +2016,9 @@ class ExpenseDetailAPIView(LoginRequiredMixin, View):
         except Expense.DoesNotExist:
             return JsonResponse({'success': False, 'error': 'Expense not found'})
 
-class ExpenseStatsAPIView(LoginRequiredMixin, View):
+class ExpenseStatsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (Expense,)
+
     def get(self, request):
         today = timezone.now().date()
         month_ago = today - timedelta(days=30)
@@ -2027,21 +2032,20 @@ class ExpenseStatsAPIView(LoginRequiredMixin, View):
         }
         return JsonResponse({'success': True, 'data': data})
 
-class ExpenseMonthlyAPIView(LoginRequiredMixin, View):
+class ExpenseMonthlyAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (Expense,)
+
     def get(self, request):
         year = int(request.GET.get('year', timezone.now().year))
-        monthly_data = []
-        
-        for month in range(1, 13):
-            total = Expense.objects.filter(
-                date__year=year,
-                date__month=month
-            ).aggregate(total=Sum('amount'))['total'] or 0
-            monthly_data.append(float(total))
-        
-        return JsonResponse({'success': True, 'data': monthly_data})
+        series = time_series(
+            Expense.objects, 'date', datetime(year, 1, 1).date(), datetime(year + 1, 1, 1).date(), 'month',
+            total=Sum('amount')
+        )
+        return JsonResponse({'success': True, 'data': series_values(series)})
+
+class ExpenseByCategoryAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (Expense, ExpenseCategory)
 
-class ExpenseByCategoryAPIView(LoginRequiredMixin, View):
     def get(self, request):
         categories = ExpenseCategory.objects.all()
         data = []
@@ -2058,7 +2062,9 @@ class ExpenseByCategoryAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': data})
 
 # Investment API Views
-class InvestmentListAPIView(LoginRequiredMixin, View):
+class InvestmentListAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (Investment, Cattle)
+
     def get(self, request):
         investments = Investment.objects.select_related('cattle').all().order_by('-date')[:100]
         data = [{
@@ -2071,7 +2077,9 @@ class InvestmentListAPIView(LoginRequiredMixin, View):
         } for i in investments]
         return JsonResponse({'success': True, 'data': data})
 
-class InvestmentDetailAPIView(LoginRequiredMixin, View):
+class InvestmentDetailAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (Investment, Cattle)
+
     def get(self, request, investment_id):
         try:
             investment = Investment.objects.select_related('cattle').get(id=investment_id)
@@ -2090,7 +2098,9 @@ class InvestmentDetailAPIView(LoginRequiredMixin, View):
         except Investment.DoesNotExist:
             return JsonResponse({'success': False, 'error': 'Investment not found'})
 
-class InvestmentStatsAPIView(LoginRequiredMixin, View):
+class InvestmentStatsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (Investment,)
+
     def get(self, request):
         data = {
             'total': float(Investment.objects.aggregate(total=Sum('amount'))['total'] or 0),
@@ -2099,7 +2109,9 @@ class InvestmentStatsAPIView(LoginRequiredMixin, View):
         }
         return JsonResponse({'success': True, 'data': data})
 
-class InvestmentByTypeAPIView(LoginRequiredMixin, View):
+class InvestmentByTypeAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (Investment,)
+
     def get(self, request):
         investment_types = [choice[0] for choice in Investment.INVESTMENT_TYPES]
         data = []
@@ -2117,7 +2129,9 @@ class InvestmentByTypeAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': data})
 
 # Financial API Views
-class FinancialSummaryAPIView(LoginRequiredMixin, View):
+class FinancialSummaryAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (MilkSale, CattleSale, Expense, Investment)
+
     def get(self, request):
         today = timezone.now().date()
         month_ago = today - timedelta(days=30)
@@ -2147,7 +2161,9 @@ class FinancialSummaryAPIView(LoginRequiredMixin, View):
         }
         return JsonResponse({'success': True, 'data': data})
 
-class FinancialMonthlyAPIView(LoginRequiredMixin, View):
+class FinancialMonthlyAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = FINANCIAL_MODELS
+
     def get(self, request, year, month):
         start_date = datetime(year, month, 1).date()
         if month == 12:
@@ -2173,32 +2189,28 @@ class FinancialMonthlyAPIView(LoginRequiredMixin, View):
         }
         return JsonResponse({'success': True, 'data': data})
 
-class FinancialYearlyAPIView(LoginRequiredMixin, View):
+class FinancialYearlyAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = FINANCIAL_MODELS
+
     def get(self, request, year):
         start_date = datetime(year, 1, 1).date()
-        end_date = datetime(year, 12, 31).date()
+        end_date = datetime(year + 1, 1, 1).date()
         
-        milk_sales = MilkSale.objects.filter(date__range=[start_date, end_date]).aggregate(total=Sum('total_amount'))['total'] or 0
-        cattle_sales = CattleSale.objects.filter(sale_date__range=[start_date, end_date]).aggregate(total=Sum('sale_price'))['total'] or 0
-        expenses = Expense.objects.filter(date__range=[start_date, end_date]).aggregate(total=Sum('amount'))['total'] or 0
+        milk_by_month = time_series(MilkSale.objects, 'date', start_date, end_date, 'month', total=Sum('total_amount'))
+        expenses_by_month = time_series(Expense.objects, 'date', start_date, end_date, 'month', total=Sum('amount'))
+        cattle_sales = CattleSale.objects.filter(
+            sale_date__gte=start_date, sale_date__lt=end_date
+        ).aggregate(total=Sum('sale_price'))['total'] or 0
         
-        monthly_breakdown = []
-        for month in range(1, 13):
-            month_start = datetime(year, month, 1).date()
-            if month == 12:
-                month_end = datetime(year, 12, 31).date()
-            else:
-                month_end = datetime(year, month + 1, 1).date() - timedelta(days=1)
-            
-            month_milk = MilkSale.objects.filter(date__range=[month_start, month_end]).aggregate(total=Sum('total_amount'))['total'] or 0
-            month_expenses = Expense.objects.filter(date__range=[month_start, month_end]).aggregate(total=Sum('amount'))['total'] or 0
-            
-            monthly_breakdown.append({
-                'month': month_start.strftime('%B'),
-                'milk_sales': float(month_milk),
-                'expenses': float(month_expenses),
-                'profit': float(month_milk - month_expenses),
-            })
+        milk_sales = sum(m['total'] for m in milk_by_month)
+        expenses = sum(e['total'] for e in expenses_by_month)
+        
+        monthly_breakdown = [{
+            'month': month['period'].strftime('%B'),
+            'milk_sales': float(month['total']),
+            'expenses': float(spent['total']),
+            'profit': float(month['total'] - spent['total']),
+        } for month, spent in zip(milk_by_month, expenses_by_month)]
         
         data = {
             'year': year,
@@ -2209,7 +2221,9 @@ class FinancialYearlyAPIView(LoginRequiredMixin, View):
         }
         return JsonResponse({'success': True, 'data': data})
 
-class ProfitLossAPIView(LoginRequiredMixin, View):
+class ProfitLossAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = FINANCIAL_MODELS
+
     def get(self, request):
         period = request.GET.get('period', 'month')
         today = timezone.now().date()
@@ -2248,7 +2262,9 @@ class ProfitLossAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': data})
 
 # Report API Views
-class MilkProductionReportAPIView(LoginRequiredMixin, View):
+class MilkProductionReportAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (MilkRecord,)
+
     def get(self, request):
         year = int(request.GET.get('year', timezone.now().year))
         data = []
@@ -2273,7 +2289,9 @@ class MilkProductionReportAPIView(LoginRequiredMixin, View):
         
         return JsonResponse({'success': True, 'data': data})
 
-class HealthSummaryReportAPIView(LoginRequiredMixin, View):
+class HealthSummaryReportAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (HealthRecord,)
+
     def get(self, request):
         year = int(request.GET.get('year', timezone.now().year))
         
@@ -2313,7 +2331,9 @@ class HealthSummaryReportAPIView(LoginRequiredMixin, View):
             }
         })
 
-class BreedingPerformanceReportAPIView(LoginRequiredMixin, View):
+class BreedingPerformanceReportAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (BreedingRecord,)
+
     def get(self, request):
         year = int(request.GET.get('year', timezone.now().year))
         
@@ -2341,7 +2361,9 @@ class BreedingPerformanceReportAPIView(LoginRequiredMixin, View):
         }
         return JsonResponse({'success': True, 'data': data})
 
-class FinancialReportAPIView(LoginRequiredMixin, View):
+class FinancialReportAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = FINANCIAL_MODELS
+
     def get(self, request):
         year = int(request.GET.get('year', timezone.now().year))
         
@@ -2378,48 +2400,39 @@ class FinancialReportAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': data})
 
 # Chart Data API Views
-class MilkTrendsChartAPIView(LoginRequiredMixin, View):
+class MilkTrendsChartAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = MILK_ROLLUP_MODELS
+
     def get(self, request):
         period = request.GET.get('period', 'year')
         today = timezone.now().date()
         
         if period == 'year':
-            labels = []
-            values = []
-            for month in range(1, 13):
-                labels.append(datetime(today.year, month, 1).strftime('%b'))
-                total = MilkRecord.objects.filter(
-                    date__year=today.year,
-                    date__month=month
-                ).aggregate(total=Sum('quantity'))['total'] or 0
-                values.append(float(total))
+            start, end = today.replace(month=1, day=1), today.replace(year=today.year + 1, month=1, day=1)
+            series = time_series(DailyProductionSummary.objects, 'date', start, end, 'month', total=Sum('total_milk'))
+            labels = [bucket['period'].strftime('%b') for bucket in series]
         elif period == 'quarter':
-            labels = ['Week 1', 'Week 2', 'Week 3', 'Week 4', 'Week 5', 'Week 6', 'Week 7', 'Week 8', 'Week 9', 'Week 10', 'Week 11', 'Week 12']
-            values = []
-            for i in range(12):
-                week_start = today - timedelta(days=(11-i)*7)
-                week_end = week_start + timedelta(days=6)
-                total = MilkRecord.objects.filter(date__range=[week_start, week_end]).aggregate(total=Sum('quantity'))['total'] or 0
-                values.append(float(total))
+            start, end = last_buckets(12, 'week', today)
+            series = time_series(DailyProductionSummary.objects, 'date', start, end, 'week', total=Sum('total_milk'))
+            labels = [f'Week {i}' for i in range(1, len(series) + 1)]
         else:  # month
-            labels = []
-            values = []
-            days_in_month = (today.replace(month=today.month+1, day=1) - timedelta(days=1)).day if today.month < 12 else 31
-            for day in range(1, days_in_month + 1):
-                date = datetime(today.year, today.month, day).date()
-                labels.append(str(day))
-                total = MilkRecord.objects.filter(date=date).aggregate(total=Sum('quantity'))['total'] or 0
-                values.append(float(total))
+            start = today.replace(day=1)
+            series = time_series(
+                DailyProductionSummary.objects, 'date', start, next_bucket(start, 'month'), 'day', total=Sum('total_milk')
+            )
+            labels = [str(bucket['period'].day) for bucket in series]
         
         return JsonResponse({
             'success': True,
             'data': {
                 'labels': labels,
-                'values': values,
+                'values': series_values(series),
             }
         })
 
-class WeightGainChartAPIView(LoginRequiredMixin, View):
+class WeightGainChartAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (WeightRecord,)
+
     def get(self, request, cattle_id):
         records = WeightRecord.objects.filter(cattle_id=cattle_id).order_by('date')
         
@@ -2430,56 +2443,44 @@ class WeightGainChartAPIView(LoginRequiredMixin, View):
         }
         return JsonResponse({'success': True, 'data': data})
 
-class BreedingSuccessChartAPIView(LoginRequiredMixin, View):
+class BreedingSuccessChartAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (BreedingRecord,)
+
     def get(self, request):
-        years = []
-        success_rates = []
-        
         current_year = timezone.now().year
-        for year in range(current_year - 4, current_year + 1):
-            total = BreedingRecord.objects.filter(breeding_date__year=year).count()
-            successful = BreedingRecord.objects.filter(
-                breeding_date__year=year,
-                status='CALVED'
-            ).count()
-            
-            years.append(str(year))
-            success_rates.append(round((successful / total * 100) if total > 0 else 0, 2))
+        series = time_series(
+            BreedingRecord.objects, 'breeding_date',
+            datetime(current_year - 4, 1, 1).date(), datetime(current_year + 1, 1, 1).date(), 'year',
+            total=Count('id'), successful=Count('id', filter=Q(status='CALVED')),
+        )
         
         return JsonResponse({
             'success': True,
             'data': {
-                'years': years,
-                'rates': success_rates,
+                'years': [str(bucket['period'].year) for bucket in series],
+                'rates': [
+                    round((bucket['successful'] / bucket['total'] * 100) if bucket['total'] > 0 else 0, 2)
+                    for bucket in series
+                ],
             }
         })
 
-class FinancialOverviewChartAPIView(LoginRequiredMixin, View):
+class FinancialOverviewChartAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (MilkSale, Expense)
+
     def get(self, request):
         year = int(request.GET.get('year', timezone.now().year))
+        start_date, end_date = datetime(year, 1, 1).date(), datetime(year + 1, 1, 1).date()
         
-        revenue_data = []
-        expense_data = []
-        
-        for month in range(1, 13):
-            month_start = datetime(year, month, 1).date()
-            if month == 12:
-                month_end = datetime(year, 12, 31).date()
-            else:
-                month_end = datetime(year, month + 1, 1).date() - timedelta(days=1)
-            
-            revenue = MilkSale.objects.filter(date__range=[month_start, month_end]).aggregate(total=Sum('total_amount'))['total'] or 0
-            expenses = Expense.objects.filter(date__range=[month_start, month_end]).aggregate(total=Sum('amount'))['total'] or 0
-            
-            revenue_data.append(float(revenue))
-            expense_data.append(float(expenses))
+        revenue = time_series(MilkSale.objects, 'date', start_date, end_date, 'month', total=Sum('total_amount'))
+        expenses = time_series(Expense.objects, 'date', start_date, end_date, 'month', total=Sum('amount'))
         
         return JsonResponse({
             'success': True,
             'data': {
-                'months': [datetime(year, m, 1).strftime('%b') for m in range(1, 13)],
-                'revenue': revenue_data,
-                'expenses': expense_data,
+                'months': [bucket['period'].strftime('%b') for bucket in revenue],
+                'revenue': series_values(revenue),
+                'expenses': series_values(expenses),
             }
         })
 
@@ -2541,13 +2542,17 @@ class BulkVaccinationCompleteAPIView(LoginRequiredMixin, View):
                 administered_date=admin_date,
                 administered_by=request.user
             )
+            conditional.changed(VaccinationSchedule)
+            alerts.refresh(VaccinationSchedule, ids)
             
             return JsonResponse({'success': True, 'message': f'Completed {count} vaccinations'})
         except Exception as e:
             return JsonResponse({'success': False, 'error': str(e)})
 
 # Search API Views
-class SearchCattleAPIView(LoginRequiredMixin, View):
+class SearchCattleAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (Cattle,)
+
     def get(self, request):
         query = request.GET.get('q', '')
         if len(query) < 2:
@@ -2560,18 +2565,20 @@ class SearchCattleAPIView(LoginRequiredMixin, View):
         
         return JsonResponse({'success': True, 'data': list(cattle)})
 
-class SearchRecordsAPIView(LoginRequiredMixin, View):
+class SearchRecordsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    conditional_models = (Cattle, MilkRecord)
+
     def get(self, request):
         query = request.GET.get('q', '')
         record_type = request.GET.get('type', 'all')
+        if len(query) < 2:
+            return JsonResponse({'success': True, 'data': []})
         
         results = []
+        matching_cattle = search_ids(query, 'cattle', limit=100)
         
         if record_type in ['all', 'cattle']:
-            cattle = Cattle.objects.filter(
-                Q(tag_number__icontains=query) |
-                Q(name__icontains=query)
-            )[:5]
+            cattle = in_order(Cattle.objects.all(), matching_cattle[:5])
             for c in cattle:
                 results.append({
                     'type': 'cattle',
@@ -2583,7 +2590,7 @@ class SearchRecordsAPIView(LoginRequiredMixin, View):
         
         if record_type in ['all', 'milk']:
             milk = MilkRecord.objects.filter(
-                Q(cattle__tag_number__icontains=query)
+                cattle_id__in=matching_cattle
             ).select_related('cattle')[:5]
             for m in milk:
                 results.append({
@@ -2596,409 +2603,249 @@ class SearchRecordsAPIView(LoginRequiredMixin, View):
         
         return JsonResponse({'success': True, 'data': results})
 
-# Export API Views
-class ExportCattleCSVAPIView(LoginRequiredMixin, View):
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="cattle_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Tag Number', 'Name', 'Type', 'Breed', 'Gender', 'Birth Date', 'Age', 'Weight', 'Status', 'Location'])
-        
-        for cattle in Cattle.objects.all():
-            writer.writerow([
-                cattle.tag_number,
-                cattle.name or '',
-                cattle.get_cattle_type_display(),
-                cattle.get_breed_display(),
-                cattle.get_gender_display(),
-                cattle.birth_date,
-                cattle.age_in_months(),
-                cattle.weight,
-                cattle.status,
-                cattle.location or ''
-            ])
-        
-        return response
-
-class ExportMilkCSVAPIView(LoginRequiredMixin, View):
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="milk_records_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Date', 'Cattle Tag', 'Session', 'Quantity (L)', 'Fat %', 'Temperature'])
-        
-        for record in MilkRecord.objects.select_related('cattle').all():
-            writer.writerow([
-                record.date,
-                record.cattle.tag_number,
-                record.get_session_display(),
-                record.quantity,
-                record.fat_percentage or '',
-                record.temperature or ''
-            ])
-        
-        return response
-
-class ExportSalesCSVAPIView(LoginRequiredMixin, View):
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="sales_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Date', 'Type', 'Cattle/Customer', 'Quantity', 'Price', 'Total', 'Payment Status'])
-        
-        # Milk Sales
-        for sale in MilkSale.objects.all():
-            writer.writerow([
-                sale.date,
-                'Milk Sale',
-                sale.customer_name or 'Retail',
-                f"{sale.quantity} L",
-                sale.price_per_liter,
-                sale.total_amount,
-                'Paid' if sale.payment_received else 'Pending'
-            ])
-        
-        # Cattle Sales
-        for sale in CattleSale.objects.select_related('cattle').all():
-            writer.writerow([
-                sale.sale_date,
-                'Cattle Sale',
-                sale.cattle.tag_number,
-                '1 head',
-                sale.sale_price,
-                sale.sale_price,
-                'Paid' if sale.payment_received else 'Pending'
-            ])
-        
-        return response
-
-class ExportFinancialCSVAPIView(LoginRequiredMixin, View):
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="financial_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Date', 'Type', 'Description', 'Category', 'Amount'])
-        
-        # Expenses
-        for expense in Expense.objects.select_related('category').all():
-            writer.writerow([
-                expense.date,
-                'Expense',
-                expense.description,
-                expense.category.name if expense.category else 'Other',
-                expense.amount
-            ])
-        
-        # Milk Sales (Income)
-        for sale in MilkSale.objects.all():
-            writer.writerow([
-                sale.date,
-                'Income - Milk',
-                f"Milk Sale - {sale.quantity}L",
-                'Milk Sales',
-                sale.total_amount
-            ])
-        
-        # Cattle Sales (Income)
-        for sale in CattleSale.objects.select_related('cattle').all():
-            writer.writerow([
-                sale.sale_date,
-                'Income - Cattle',
-                f"Cattle Sale - {sale.cattle.tag_number}",
-                'Cattle Sales',
-                sale.sale_price
-            ])
-        
-        # Investments
-        for investment in Investment.objects.all():
-            writer.writerow([
-                investment.date,
-                'Investment',
-                investment.description,
-                investment.get_investment_type_display(),
-                investment.amount
-            ])
-        
-        return response
-
-
 # ==================== EXPORT VIEWS (Non-API) ====================
 
-class ExportCattleCSVView(LoginRequiredMixin, View):
+class ExportCattleCSVView(LoginRequiredMixin, StreamingCSVExportView):
     """Export cattle data to CSV"""
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="cattle_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Tag Number', 'Name', 'Type', 'Breed', 'Gender', 'Birth Date', 'Age', 'Weight', 'Status', 'Location'])
-        
-        for cattle in Cattle.objects.all():
-            writer.writerow([
-                cattle.tag_number,
-                cattle.name or '',
-                cattle.get_cattle_type_display(),
-                cattle.get_breed_display(),
-                cattle.get_gender_display(),
-                cattle.birth_date,
-                cattle.age_in_months(),
-                cattle.weight,
-                cattle.status,
-                cattle.location or ''
-            ])
-        
-        return response
+    filename = 'cattle_export.csv'
+    header = ['Tag Number', 'Name', 'Type', 'Breed', 'Gender', 'Birth Date', 'Age', 'Weight', 'Status', 'Location']
 
-
-class ExportMilkCSVView(LoginRequiredMixin, View):
+    def get_rows(self, request):
+        today = timezone.now().date()
+        cattle_types = choice_labels(Cattle, 'cattle_type')
+        breeds = choice_labels(Cattle, 'breed')
+        genders = choice_labels(Cattle, 'gender')
+
+        rows = iter_values(
+            Cattle.objects.all(),
+            'tag_number', 'name', 'cattle_type', 'breed', 'gender',
+            'birth_date', 'weight', 'status', 'location',
+        )
+        for tag, name, cattle_type, breed, gender, birth_date, weight, status, location in rows:
+            yield [
+                tag,
+                name or '',
+                cattle_types.get(cattle_type, cattle_type),
+                breeds.get(breed, breed),
+                genders.get(gender, gender),
+                birth_date,
+                (today.year - birth_date.year) * 12 + (today.month - birth_date.month),
+                weight,
+                status,
+                location or ''
+            ]
+
+
+class ExportMilkCSVView(LoginRequiredMixin, StreamingCSVExportView):
     """Export milk records to CSV"""
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="milk_records_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Date', 'Cattle Tag', 'Session', 'Quantity (L)', 'Fat %', 'Temperature'])
-        
-        for record in MilkRecord.objects.select_related('cattle').all():
-            writer.writerow([
-                record.date,
-                record.cattle.tag_number,
-                record.get_session_display(),
-                record.quantity,
-                record.fat_percentage or '',
-                record.temperature or ''
-            ])
-        
-        return response
+    filename = 'milk_records_export.csv'
+    header = ['Date', 'Cattle Tag', 'Session', 'Quantity (L)', 'Fat %', 'Temperature']
+
+    def get_rows(self, request):
+        sessions = choice_labels(MilkRecord, 'session')
+        rows = iter_values(
+            MilkRecord.objects.all(),
+            'date', 'cattle__tag_number', 'session', 'quantity', 'fat_percentage', 'temperature',
+        )
+        for date, tag, session, quantity, fat, temperature in rows:
+            yield [date, tag, sessions.get(session, session), quantity, fat or '', temperature or '']
 
 
-class ExportSalesCSVView(LoginRequiredMixin, View):
+class ExportSalesCSVView(LoginRequiredMixin, StreamingCSVExportView):
     """Export sales data to CSV"""
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="sales_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Date', 'Type', 'Cattle/Customer', 'Quantity', 'Price', 'Total', 'Payment Status'])
-        
+    filename = 'sales_export.csv'
+    header = ['Date', 'Type', 'Cattle/Customer', 'Quantity', 'Price', 'Total', 'Payment Status']
+
+    def get_rows(self, request):
         # Milk Sales
-        for sale in MilkSale.objects.all():
-            writer.writerow([
-                sale.date,
-                'Milk Sale',
-                sale.customer_name or 'Retail',
-                f"{sale.quantity} L",
-                sale.price_per_liter,
-                sale.total_amount,
-                'Paid' if sale.payment_received else 'Pending'
-            ])
-        
+        rows = iter_values(
+            MilkSale.objects.all(),
+            'date', 'customer_name', 'quantity', 'price_per_liter', 'total_amount', 'payment_received',
+        )
+        for date, customer, quantity, price, total, paid in rows:
+            yield [date, 'Milk Sale', customer or 'Retail', f"{quantity} L", price, total, 'Paid' if paid else 'Pending']
+
         # Cattle Sales
-        for sale in CattleSale.objects.select_related('cattle').all():
-            writer.writerow([
-                sale.sale_date,
-                'Cattle Sale',
-                sale.cattle.tag_number,
-                '1 head',
-                sale.sale_price,
-                sale.sale_price,
-                'Paid' if sale.payment_received else 'Pending'
-            ])
-        
-        return response
+        rows = iter_values(
+            CattleSale.objects.all(),
+            'sale_date', 'cattle__tag_number', 'sale_price', 'payment_received',
+        )
+        for sale_date, tag, price, paid in rows:
+            yield [sale_date, 'Cattle Sale', tag, '1 head', price, price, 'Paid' if paid else 'Pending']
 
 
-class ExportFinancialCSVView(LoginRequiredMixin, View):
+class ExportFinancialCSVView(LoginRequiredMixin, StreamingCSVExportView):
     """Export financial data to CSV"""
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="financial_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Date', 'Type', 'Description', 'Category', 'Amount'])
-        
+    filename = 'financial_export.csv'
+    header = ['Date', 'Type', 'Description', 'Category', 'Amount']
+
+    def get_rows(self, request):
         # Expenses
-        for expense in Expense.objects.select_related('category').all():
-            writer.writerow([
-                expense.date,
-                'Expense',
-                expense.description,
-                expense.category.name if expense.category else 'Other',
-                expense.amount
-            ])
-        
+        rows = iter_values(Expense.objects.all(), 'date', 'description', 'category__name', 'amount')
+        for date, description, category, amount in rows:
+            yield [date, 'Expense', description, category or 'Other', amount]
+
         # Milk Sales (Income)
-        for sale in MilkSale.objects.all():
-            writer.writerow([
-                sale.date,
-                'Income - Milk',
-                f"Milk Sale - {sale.quantity}L",
-                'Milk Sales',
-                sale.total_amount
-            ])
-        
+        rows = iter_values(MilkSale.objects.all(), 'date', 'quantity', 'total_amount')
+        for date, quantity, total in rows:
+            yield [date, 'Income - Milk', f"Milk Sale - {quantity}L", 'Milk Sales', total]
+
         # Cattle Sales (Income)
-        for sale in CattleSale.objects.select_related('cattle').all():
-            writer.writerow([
-                sale.sale_date,
-                'Income - Cattle',
-                f"Cattle Sale - {sale.cattle.tag_number}",
-                'Cattle Sales',
-                sale.sale_price
-            ])
-        
+        rows = iter_values(CattleSale.objects.all(), 'sale_date', 'cattle__tag_number', 'sale_price')
+        for sale_date, tag, price in rows:
+            yield [sale_date, 'Income - Cattle', f"Cattle Sale - {tag}", 'Cattle Sales', price]
+
         # Investments
-        for investment in Investment.objects.all():
-            writer.writerow([
-                investment.date,
-                'Investment',
-                investment.description,
-                investment.get_investment_type_display(),
-                investment.amount
-            ])
-        
-        return response
+        investment_types = choice_labels(Investment, 'investment_type')
+        rows = iter_values(Investment.objects.all(), 'date', 'description', 'investment_type', 'amount')
+        for date, description, investment_type, amount in rows:
+            yield [date, 'Investment', description, investment_types.get(investment_type, investment_type), amount]
 
 
+# Export API Views share the streaming exports above
+class ExportCattleCSVAPIView(ExportCattleCSVView):
+    pass
 
 
-# ==================== MISSING CSV EXPORT VIEWS ====================
+class ExportMilkCSVAPIView(ExportMilkCSVView):
+    pass
 
-class ExportHealthCSVView(LoginRequiredMixin, View):
-    """Export health records to CSV"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="health_records_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Date', 'Cattle Tag', 'Health Type', 'Diagnosis', 'Treatment', 
-                        'Veterinarian', 'Cost', 'Emergency', 'Follow-up Date'])
-        
-        for record in HealthRecord.objects.select_related('cattle').all():
-            writer.writerow([
-                record.date.strftime('%Y-%m-%d'),
-                record.cattle.tag_number,
-                record.get_health_type_display(),
-                record.diagnosis,
-                record.treatment or '',
-                record.veterinarian,
-                record.treatment_cost or '',
-                'Yes' if record.is_emergency else 'No',
-                record.next_checkup_date.strftime('%Y-%m-%d') if record.next_checkup_date else ''
-            ])
-        
-        return response
 
+class ExportSalesCSVAPIView(ExportSalesCSVView):
+    pass
 
-class ExportFeedingCSVView(LoginRequiredMixin, View):
-    """Export feeding records to CSV"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="feeding_records_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Date', 'Time', 'Cattle Tag', 'Feed Type', 'Quantity (kg)', 
-                        'Cost/kg', 'Total Cost', 'Quality', 'Notes'])
-        
-        for record in FeedingRecord.objects.select_related('cattle').all():
-            writer.writerow([
-                record.date.strftime('%Y-%m-%d'),
-                record.feed_time.strftime('%H:%M'),
-                record.cattle.tag_number,
-                record.get_feed_type_display(),
-                record.quantity,
-                record.cost_per_kg,
-                record.total_cost,
-                record.get_feed_quality_display(),
-                record.notes or ''
-            ])
-        
-        return response
 
+class ExportFinancialCSVAPIView(ExportFinancialCSVView):
+    pass
 
-class ExportWeightCSVView(LoginRequiredMixin, View):
-    """Export weight records to CSV"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="weight_records_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Date', 'Cattle Tag', 'Weight (kg)', 'Daily Gain (kg/day)', 'Age (days)', 'Notes'])
-        
-        for record in WeightRecord.objects.select_related('cattle').all():
-            writer.writerow([
-                record.date.strftime('%Y-%m-%d'),
-                record.cattle.tag_number,
-                record.weight,
-                record.daily_gain or '',
-                record.age_in_days or '',
-                record.notes or ''
-            ])
-        
-        return response
 
+# ==================== MISSING CSV EXPORT VIEWS ====================
 
-class ExportBreedingCSVView(LoginRequiredMixin, View):
-    """Export breeding records to CSV"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="breeding_records_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Breeding Date', 'Dam Tag', 'Sire Tag', 'Method', 'Status', 
-                        'Pregnant', 'Pregnancy Check', 'Expected Calving', 'Actual Calving', 'Offspring', 'Notes'])
-        
-        for record in BreedingRecord.objects.select_related('cattle', 'sire', 'offspring').all():
-            writer.writerow([
-                record.breeding_date.strftime('%Y-%m-%d'),
-                record.cattle.tag_number,
-                record.sire.tag_number if record.sire else '',
-                record.breeding_method,
-                record.get_status_display(),
-                'Yes' if record.is_pregnant else 'No',
-                record.pregnancy_check_date.strftime('%Y-%m-%d') if record.pregnancy_check_date else '',
-                record.expected_calving_date.strftime('%Y-%m-%d') if record.expected_calving_date else '',
-                record.actual_calving_date.strftime('%Y-%m-%d') if record.actual_calving_date else '',
-                record.offspring.tag_number if record.offspring else '',
-                record.notes or ''
-            ])
-        
-        return response
+class ExportHealthCSVView(LoginRequiredMixin, StreamingCSVExportView):
+    """Export health records to CSV"""
+    filename = 'health_records_export.csv'
+    header = ['Date', 'Cattle Tag', 'Health Type', 'Diagnosis', 'Treatment',
+              'Veterinarian', 'Cost', 'Emergency', 'Follow-up Date']
+
+    def get_rows(self, request):
+        health_types = choice_labels(HealthRecord, 'health_type')
+        rows = iter_values(
+            HealthRecord.objects.all(),
+            'date', 'cattle__tag_number', 'health_type', 'diagnosis', 'treatment',
+            'veterinarian', 'treatment_cost', 'is_emergency', 'next_checkup_date',
+        )
+        for date, tag, health_type, diagnosis, treatment, vet, cost, emergency, next_checkup in rows:
+            yield [
+                date.strftime('%Y-%m-%d'),
+                tag,
+                health_types.get(health_type, health_type),
+                diagnosis,
+                treatment or '',
+                vet,
+                cost or '',
+                'Yes' if emergency else 'No',
+                next_checkup.strftime('%Y-%m-%d') if next_checkup else ''
+            ]
+
+
+class ExportFeedingCSVView(LoginRequiredMixin, StreamingCSVExportView):
+    """Export feeding records to CSV"""
+    filename = 'feeding_records_export.csv'
+    header = ['Date', 'Time', 'Cattle Tag', 'Feed Type', 'Quantity (kg)',
+              'Cost/kg', 'Total Cost', 'Quality', 'Notes']
+
+    def get_rows(self, request):
+        feed_types = choice_labels(FeedingRecord, 'feed_type')
+        qualities = choice_labels(FeedingRecord, 'feed_quality')
+        rows = iter_values(
+            FeedingRecord.objects.all(),
+            'date', 'feed_time', 'cattle__tag_number', 'feed_type', 'quantity',
+            'cost_per_kg', 'total_cost', 'feed_quality', 'notes',
+        )
+        for date, feed_time, tag, feed_type, quantity, cost_per_kg, total_cost, quality, notes in rows:
+            yield [
+                date.strftime('%Y-%m-%d'),
+                feed_time.strftime('%H:%M'),
+                tag,
+                feed_types.get(feed_type, feed_type),
+                quantity,
+                cost_per_kg,
+                total_cost,
+                qualities.get(quality, quality),
+                notes or ''
+            ]
+
+
+class ExportWeightCSVView(LoginRequiredMixin, StreamingCSVExportView):
+    """Export weight records to CSV"""
+    filename = 'weight_records_export.csv'
+    header = ['Date', 'Cattle Tag', 'Weight (kg)', 'Daily Gain (kg/day)', 'Age (days)', 'Notes']
+
+    def get_rows(self, request):
+        rows = iter_values(
+            WeightRecord.objects.all(),
+            'date', 'cattle__tag_number', 'weight', 'daily_gain', 'age_in_days', 'notes',
+        )
+        for date, tag, weight, daily_gain, age_in_days, notes in rows:
+            yield [date.strftime('%Y-%m-%d'), tag, weight, daily_gain or '', age_in_days or '', notes or '']
 
 
-class ExportVaccinationCSVView(LoginRequiredMixin, View):
+class ExportBreedingCSVView(LoginRequiredMixin, StreamingCSVExportView):
+    """Export breeding records to CSV"""
+    filename = 'breeding_records_export.csv'
+    header = ['Breeding Date', 'Dam Tag', 'Sire Tag', 'Method', 'Status',
+              'Pregnant', 'Pregnancy Check', 'Expected Calving', 'Actual Calving', 'Offspring', 'Notes']
+
+    def get_rows(self, request):
+        statuses = choice_labels(BreedingRecord, 'status')
+        rows = iter_values(
+            BreedingRecord.objects.all(),
+            'breeding_date', 'cattle__tag_number', 'sire__tag_number', 'breeding_method', 'status',
+            'is_pregnant', 'pregnancy_check_date', 'expected_calving_date', 'actual_calving_date',
+            'offspring__tag_number', 'notes',
+        )
+        for (breeding_date, dam, sire, method, status, pregnant, check_date,
+             expected, actual, offspring, notes) in rows:
+            yield [
+                breeding_date.strftime('%Y-%m-%d'),
+                dam,
+                sire or '',
+                method,
+                statuses.get(status, status),
+                'Yes' if pregnant else 'No',
+                check_date.strftime('%Y-%m-%d') if check_date else '',
+                expected.strftime('%Y-%m-%d') if expected else '',
+                actual.strftime('%Y-%m-%d') if actual else '',
+                offspring or '',
+                notes or ''
+            ]
+
+
+class ExportVaccinationCSVView(LoginRequiredMixin, StreamingCSVExportView):
     """Export vaccination records to CSV"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="vaccination_records_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Scheduled Date', 'Cattle Tag', 'Vaccine Type', 'Status', 
-                        'Administered Date', 'Batch Number', 'Dosage', 'Cost', 'Notes'])
-        
-        for record in VaccinationSchedule.objects.select_related('cattle', 'administered_by').all():
-            writer.writerow([
-                record.scheduled_date.strftime('%Y-%m-%d'),
-                record.cattle.tag_number,
-                record.get_vaccine_type_display(),
-                'Completed' if record.is_completed else 'Pending',
-                record.administered_date.strftime('%Y-%m-%d') if record.administered_date else '',
-                record.batch_number or '',
-                record.dosage or '',
-                record.cost or '',
-                record.notes or ''
-            ])
-        
-        return response
+    filename = 'vaccination_records_export.csv'
+    header = ['Scheduled Date', 'Cattle Tag', 'Vaccine Type', 'Status',
+              'Administered Date', 'Batch Number', 'Dosage', 'Cost', 'Notes']
+
+    def get_rows(self, request):
+        vaccine_types = choice_labels(VaccinationSchedule, 'vaccine_type')
+        rows = iter_values(
+            VaccinationSchedule.objects.all(),
+            'scheduled_date', 'cattle__tag_number', 'vaccine_type', 'is_completed',
+            'administered_date', 'batch_number', 'dosage', 'cost', 'notes',
+        )
+        for scheduled, tag, vaccine_type, completed, administered, batch, dosage, cost, notes in rows:
+            yield [
+                scheduled.strftime('%Y-%m-%d'),
+                tag,
+                vaccine_types.get(vaccine_type, vaccine_type),
+                'Completed' if completed else 'Pending',
+                administered.strftime('%Y-%m-%d') if administered else '',
+                batch or '',
+                dosage or '',
+                cost or '',
+                notes or ''
+            ]
 
 # ==================== REPORT DASHBOARD VIEW ====================
 
@@ -3150,717 +2997,304 @@ class ReportDashboardView(LoginRequiredMixin, TemplateView):
 
 # views.py
 
-class MilkProductionReportView(LoginRequiredMixin, TemplateView):
+# Tables the milk production report figures are read from
+MILK_REPORT_MODELS = (MilkRecord, MilkSale, DailyProductionSummary)
+
+MONTH_CHOICES = [{'value': m, 'name': datetime(2000, m, 1).strftime('%B')} for m in range(1, 13)]
+
+HEALTH_TYPE_COLORS = {
+    'CHECKUP': '#0d6efd',
+    'VACCINATION': '#28a745',
+    'TREATMENT': '#ffc107',
+    'SURGERY': '#dc3545',
+    'PREGNANCY': '#e83e8c',
+    'DISEASE': '#fd7e14',
+}
+
+
+def _percent(part, whole):
+    return part / whole * 100 if whole else 0
+
+
+class MilkProductionReportView(LoginRequiredMixin, ReportJobMixin, TemplateView):
+    """Milk production report, rendered from the MilkProductionReport the report worker saved"""
     template_name = 'dairy/reports/milk_production.html'
-    
+    report_job_type = 'MILK_PRODUCTION'
+    report_models = MILK_REPORT_MODELS
+
+    def get_saved_report(self, params):
+        *_, lookup = milk_report_lookup(params)
+        return saved_report(MilkProductionReport, lookup)
+
+    def get_report_context(self, report):
+        daily = [
+            dict(day, date=datetime.strptime(day['date'], '%Y-%m-%d').date())
+            for day in report.details.get('daily_breakdown', [])
+        ]
+        return {
+            'total_milk': report.total_milk,
+            'avg_daily': report.avg_daily_milk,
+            'avg_fat': report.avg_fat_percentage,
+            'total_revenue': report.total_revenue,
+            'avg_price': report.avg_price_per_liter,
+            'total_lactating': report.total_lactating_cows,
+            'avg_per_cow': report.avg_per_cow,
+            'peak_day': report.peak_production_day,
+            'peak_amount': report.peak_production_amount,
+            'milk_growth': report.growth_percentage,
+            'top_producers': report.details.get('top_producers', []),
+            'daily_breakdown': daily,
+            'chart_labels': [day['date'].strftime('%Y-%m-%d') for day in daily],
+            'morning_data': [day['morning'] for day in daily],
+            'afternoon_data': [day['afternoon'] for day in daily],
+            'evening_data': [day['evening'] for day in daily],
+            'total_data': [day['total'] for day in daily],
+        }
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        
-        # Get filter parameters
-        period = self.request.GET.get('period', 'monthly')
-        year = int(self.request.GET.get('year', timezone.now().year))
-        month = self.request.GET.get('month')
-        if month:
-            month = int(month)
-        start_date = self.request.GET.get('start_date')
-        end_date = self.request.GET.get('end_date')
-        cattle_id = self.request.GET.get('cattle')
-        
-        # Calculate date range based on period
-        if period == 'daily':
-            if start_date:
-                start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-                end_date = start_date
-            else:
-                start_date = timezone.now().date()
-                end_date = start_date
-        elif period == 'weekly':
-            if start_date:
-                start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-                end_date = start_date + timedelta(days=6)
-            else:
-                end_date = timezone.now().date()
-                start_date = end_date - timedelta(days=6)
-        elif period == 'monthly':
-            if month:
-                start_date = datetime(year, month, 1).date()
-                if month == 12:
-                    end_date = datetime(year+1, 1, 1).date() - timedelta(days=1)
-                else:
-                    end_date = datetime(year, month+1, 1).date() - timedelta(days=1)
-            else:
-                today = timezone.now().date()
-                start_date = datetime(today.year, today.month, 1).date()
-                if today.month == 12:
-                    end_date = datetime(today.year+1, 1, 1).date() - timedelta(days=1)
-                else:
-                    end_date = datetime(today.year, today.month+1, 1).date() - timedelta(days=1)
-        elif period == 'quarterly':
-            quarter = int(self.request.GET.get('quarter', (timezone.now().month-1)//3 + 1))
-            start_month = quarter * 3 - 2
-            end_month = quarter * 3
-            start_date = datetime(year, start_month, 1).date()
-            if end_month == 12:
-                end_date = datetime(year+1, 1, 1).date() - timedelta(days=1)
-            else:
-                end_date = datetime(year, end_month+1, 1).date() - timedelta(days=1)
-        elif period == 'yearly':
-            start_date = datetime(year, 1, 1).date()
-            end_date = datetime(year, 12, 31).date()
-        elif period == 'custom':
-            if start_date:
-                start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-            if end_date:
-                end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
-            if not start_date:
-                start_date = timezone.now().date() - timedelta(days=30)
-            if not end_date:
-                end_date = timezone.now().date()
-        
-        # Base queryset
-        milk_records = MilkRecord.objects.filter(
-            date__range=[start_date, end_date]
-        ).select_related('cattle')
-        
-        # Filter by specific cattle if selected
-        if cattle_id:
-            milk_records = milk_records.filter(cattle_id=cattle_id)
-        
-        # Calculate summary statistics - using imported Sum, Avg, etc.
-        total_milk = milk_records.aggregate(
-            total=Sum('quantity')
-        )['total'] or 0
-        context['total_milk'] = total_milk
-        
-        days_diff = (end_date - start_date).days + 1
-        context['avg_daily'] = total_milk / days_diff if days_diff > 0 else 0
-        
-        avg_fat = milk_records.aggregate(
-            avg=Avg('fat_percentage')
-        )['avg'] or 0
-        context['avg_fat'] = avg_fat
-        
-        # Revenue calculation
-        milk_sales = MilkSale.objects.filter(
-            date__range=[start_date, end_date]
-        )
-        total_revenue = milk_sales.aggregate(
-            total=Sum('total_amount')
-        )['total'] or 0
-        context['total_revenue'] = total_revenue
-        
-        context['avg_price'] = total_revenue / total_milk if total_milk > 0 else 0
-        
-        # Lactating cows
-        lactating_cows = milk_records.values('cattle').distinct().count()
-        context['total_lactating'] = lactating_cows
-        context['avg_per_cow'] = total_milk / lactating_cows if lactating_cows > 0 else 0
-        
-        # Peak production day
-        daily_totals = milk_records.values('date').annotate(
-            daily_total=Sum('quantity')
-        ).order_by('-daily_total')
-        
-        if daily_totals:
-            peak_day = daily_totals.first()
-            context['peak_day'] = peak_day['date']
-            context['peak_amount'] = peak_day['daily_total']
-        else:
-            context['peak_day'] = None
-            context['peak_amount'] = 0
-        
-        # Growth percentage compared to previous period
-        prev_start = start_date - timedelta(days=days_diff)
-        prev_end = start_date - timedelta(days=1)
-        
-        prev_total = MilkRecord.objects.filter(
-            date__range=[prev_start, prev_end]
-        ).aggregate(prev_total=Sum('quantity'))['prev_total'] or 0
-        
-        context['milk_growth'] = ((total_milk - prev_total) / prev_total * 100) if prev_total > 0 else 0
-        
-        # Top producers - Using Max (make sure Max is imported)
-        from django.db.models import Max  # Import here if not at top
-        
-        top_producers_data = milk_records.values(
-            'cattle', 'cattle__tag_number', 'cattle__name', 'cattle__breed'
-        ).annotate(
-            total=Sum('quantity'),
-            avg=Avg('quantity'),
-            max=Max('quantity')
-        ).order_by('-total')[:10]
-        
-        context['top_producers'] = []
-        for producer in top_producers_data:
-            producer_dict = {
-                'cattle': {
-                    'id': producer['cattle'],
-                    'tag_number': producer['cattle__tag_number'],
-                    'name': producer['cattle__name'] or '',
-                    'breed': producer['cattle__breed'],
-                    'get_breed_display': lambda: producer['cattle__breed']
-                },
-                'total': producer['total'],
-                'avg': producer['avg'],
-                'max': producer['max'],
-                'percentage': (producer['total'] / total_milk * 100) if total_milk > 0 else 0
-            }
-            context['top_producers'].append(producer_dict)
-        
-        # Daily breakdown
-        daily_data = milk_records.values('date').annotate(
-            morning=Sum('quantity', filter=Q(session='MORNING')),
-            afternoon=Sum('quantity', filter=Q(session='AFTERNOON')),
-            evening=Sum('quantity', filter=Q(session='EVENING')),
-            total=Sum('quantity'),
-            avg_fat=Avg('fat_percentage'),
-            cow_count=Count('cattle', distinct=True)
-        ).order_by('date')
-        
-        context['daily_breakdown'] = []
-        context['chart_labels'] = []
-        context['morning_data'] = []
-        context['afternoon_data'] = []
-        context['evening_data'] = []
-        context['total_data'] = []
-        
-        for day in daily_data:
-            # Calculate revenue for this day
-            day_revenue = MilkSale.objects.filter(
-                date=day['date']
-            ).aggregate(day_total=Sum('total_amount'))['day_total'] or 0
-            
-            context['daily_breakdown'].append({
-                'date': day['date'],
-                'morning': float(day['morning'] or 0),
-                'afternoon': float(day['afternoon'] or 0),
-                'evening': float(day['evening'] or 0),
-                'total': float(day['total'] or 0),
-                'avg_fat': float(day['avg_fat'] or 0),
-                'cow_count': day['cow_count'] or 0,
-                'revenue': float(day_revenue)
-            })
-            
-            context['chart_labels'].append(day['date'].strftime('%Y-%m-%d'))
-            context['morning_data'].append(float(day['morning'] or 0))
-            context['afternoon_data'].append(float(day['afternoon'] or 0))
-            context['evening_data'].append(float(day['evening'] or 0))
-            context['total_data'].append(float(day['total'] or 0))
+        period, start_date, end_date, lookup = milk_report_lookup(self.request.GET)
         
         # Context for filters
+        month = self.request.GET.get('month')
         context['period'] = period
-        context['year'] = year
-        context['month'] = month
+        context['year'] = int(self.request.GET.get('year', timezone.now().year))
+        context['month'] = int(month) if month else None
         context['start_date'] = start_date
         context['end_date'] = end_date
-        context['selected_cattle'] = int(cattle_id) if cattle_id else None
+        context['selected_cattle'] = lookup['cattle_id']
         
-        # Years for filter dropdown
         current_year = timezone.now().year
         context['years'] = range(current_year - 5, current_year + 1)
-        
-        # Months for filter dropdown
-        context['months'] = [
-            {'value': 1, 'name': 'January'},
-            {'value': 2, 'name': 'February'},
-            {'value': 3, 'name': 'March'},
-            {'value': 4, 'name': 'April'},
-            {'value': 5, 'name': 'May'},
-            {'value': 6, 'name': 'June'},
-            {'value': 7, 'name': 'July'},
-            {'value': 8, 'name': 'August'},
-            {'value': 9, 'name': 'September'},
-            {'value': 10, 'name': 'October'},
-            {'value': 11, 'name': 'November'},
-            {'value': 12, 'name': 'December'},
-        ]
-        
-        # Cattle list for filter
+        context['months'] = MONTH_CHOICES
         context['cattle_list'] = Cattle.objects.filter(status='ACTIVE').values('id', 'tag_number', 'name')
         
         return context
 
-class HealthSummaryReportView(LoginRequiredMixin, TemplateView):
+class HealthSummaryReportView(LoginRequiredMixin, ReportJobMixin, TemplateView):
+    """Health summary report, rendered from the HealthSummaryReport the report worker saved"""
     template_name = 'dairy/reports/health_summary.html'
-    
+    report_job_type = 'HEALTH_SUMMARY'
+    report_models = (HealthRecord, VaccinationSchedule, Cattle)
+
+    def get_saved_report(self, params):
+        *_, lookup = health_report_lookup(params)
+        return saved_report(HealthSummaryReport, lookup)
+
+    def get_report_context(self, report):
+        cases_by_type = [{
+            'type': case.health_type,
+            'type_display': case.get_health_type_display(),
+            'color': HEALTH_TYPE_COLORS.get(case.health_type, '#6c757d'),
+            'count': case.count,
+            'percentage': case.percentage,
+            'total_cost': case.total_cost,
+            'avg_cost': case.total_cost / case.count if case.count else 0,
+        } for case in report.case_summaries.all()]
+
+        return {
+            'total_cases': report.total_cases,
+            'healthy_cattle': report.healthy_cattle,
+            'health_percentage': _percent(report.healthy_cattle, report.healthy_cattle + report.under_treatment),
+            'under_treatment': report.under_treatment,
+            'critical_cases': report.critical_cases,
+            'recovered_cases': report.recovered_cases,
+            'recovery_rate': _percent(report.recovered_cases, report.total_cases),
+            'total_cost': report.total_health_cost,
+            'avg_cost_per_case': report.avg_cost_per_case,
+            'total_emergencies': report.emergency_cases,
+            'cases_by_type': cases_by_type,
+            'vaccination_summary': {
+                'scheduled': report.vaccinations_scheduled,
+                'completed': report.vaccinations_completed,
+                'upcoming': report.vaccinations_upcoming,
+                'overdue': report.vaccinations_overdue,
+            },
+            'pie_labels': json.dumps([case['type_display'] for case in cases_by_type]),
+            'pie_data': json.dumps([case['count'] for case in cases_by_type]),
+            'pie_colors': json.dumps([case['color'] for case in cases_by_type]),
+            'bar_labels': json.dumps([case['type_display'] for case in cases_by_type]),
+            'bar_data': json.dumps([float(case['total_cost']) for case in cases_by_type]),
+            # The latest few emergencies of the period, read through the emergency index
+            'emergencies': HealthRecord.objects.filter(
+                is_emergency=True, date__range=[report.start_date, report.end_date]
+            ).select_related('cattle').order_by('-date')[:10],
+        }
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        year = int(self.request.GET.get('year', timezone.now().year))
-        quarter = int(self.request.GET.get('quarter', 
-                     (timezone.now().month - 1) // 3 + 1))
-        
-        # Calculate quarter dates
-        start_month = quarter * 3 - 2
-        end_month = quarter * 3
-        start_date = datetime(year, start_month, 1).date()
+        period, start_date, end_date, _ = health_report_lookup(self.request.GET)
         
-        if end_month == 12:
-            end_date = datetime(year+1, 1, 1).date() - timedelta(days=1)
-        else:
-            end_date = datetime(year, end_month+1, 1).date() - timedelta(days=1)
-        
-        # Get health records
-        health_records = HealthRecord.objects.filter(
-            date__range=[start_date, end_date]
-        ).select_related('cattle')
-        
-        # Cases by type
-        context['cases_by_type'] = health_records.values(
-            'health_type'
-        ).annotate(
-            count=Count('id'),
-            total_cost=Sum('treatment_cost')
-        )
-        
-        # Emergency cases
-        context['emergencies'] = health_records.filter(
-            is_emergency=True
-        ).order_by('-date')[:10]
-        
-        # Vaccination status
-        today = timezone.now().date()
-        context['vaccination_status'] = {
-            'upcoming': VaccinationSchedule.objects.filter(
-                scheduled_date__gte=today,
-                is_completed=False
-            ).count(),
-            'overdue': VaccinationSchedule.objects.filter(
-                scheduled_date__lt=today,
-                is_completed=False
-            ).count(),
-            'completed': VaccinationSchedule.objects.filter(
-                administered_date__year=year
-            ).count(),
-        }
+        context['report_type'] = period
+        context['year'] = start_date.year
+        context['quarter'] = (start_date.month - 1) // 3 + 1
+        context['start_date'] = start_date
+        context['end_date'] = end_date
         
-        context['year'] = year
-        context['quarter'] = quarter
+        current_year = timezone.now().year
+        context['years'] = range(current_year - 5, current_year + 1)
         
         return context
 
 
-class BreedingPerformanceReportView(LoginRequiredMixin, TemplateView):
+class BreedingPerformanceReportView(LoginRequiredMixin, ReportJobMixin, TemplateView):
+    """Breeding performance report, rendered from the BreedingPerformanceReport the report worker saved"""
     template_name = 'dairy/reports/breeding_performance.html'
-    
+    report_job_type = 'BREEDING_PERFORMANCE'
+    report_models = (BreedingRecord, Cattle)
+
+    def get_saved_report(self, params):
+        *_, lookup = breeding_report_lookup(params)
+        return saved_report(BreedingPerformanceReport, lookup)
+
+    def get_report_context(self, report):
+        monthly = list(report.monthly_activities.all())
+        today = timezone.now().date()
+        return {
+            'total_breedings': report.total_breedings,
+            'confirmed_pregnant': report.confirmed_pregnant,
+            'failed_conceptions': report.failed_conceptions,
+            'pending_results': report.pending_results,
+            'calved_count': report.calved_count,
+            'conception_rate': report.conception_rate,
+            'natural_success_rate': report.natural_success_rate,
+            'ai_success_rate': report.ai_success_rate,
+            'sire_performance': report.sire_performances.select_related('sire'),
+            'heat_cycles_detected': report.heat_cycles_detected,
+            'successful_breedings': report.successful_breedings,
+            'missed_opportunities': report.missed_opportunities,
+            'detection_rate': _percent(report.successful_breedings, report.heat_cycles_detected),
+            'total_calves': report.total_calves,
+            'male_calves': report.male_calves,
+            'female_calves': report.female_calves,
+            'male_percentage': _percent(report.male_calves, report.total_calves),
+            'female_percentage': _percent(report.female_calves, report.total_calves),
+            'avg_birth_weight': report.avg_birth_weight,
+            'calf_survival_rate': report.calf_survival_rate,
+            'monthly_labels': json.dumps([datetime(2000, m.month, 1).strftime('%b') for m in monthly]),
+            'monthly_breedings': json.dumps([m.bred for m in monthly]),
+            'monthly_pregnancies': json.dumps([m.pregnant for m in monthly]),
+            'monthly_calvings': json.dumps([m.calved for m in monthly]),
+            # Calvings due from today, a short indexed list rather than an aggregate
+            'today': today,
+            'upcoming_calving': BreedingRecord.objects.filter(
+                expected_calving_date__gte=today, is_pregnant=True, status='CONFIRMED'
+            ).select_related('cattle', 'sire').order_by('expected_calving_date')[:10],
+        }
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        year = int(self.request.GET.get('year', timezone.now().year))
-        
-        # Get breeding records for the year
-        breedings = BreedingRecord.objects.filter(
-            breeding_date__year=year
-        ).select_related('cattle', 'sire')
-        
-        # Calculate statistics
-        context['total_breedings'] = breedings.count()
-        context['confirmed_pregnant'] = breedings.filter(
-            is_pregnant=True
-        ).count()
-        context['calved'] = breedings.filter(
-            status='CALVED'
-        ).count()
-        
-        # Success rate
-        if context['total_breedings'] > 0:
-            context['success_rate'] = round(
-                context['confirmed_pregnant'] / context['total_breedings'] * 100, 1
-            )
+        period, start_date, end_date, _ = breeding_report_lookup(self.request.GET)
         
-        # Upcoming calving
-        today = timezone.now().date()
-        context['upcoming_calving'] = BreedingRecord.objects.filter(
-            expected_calving_date__gte=today,
-            is_pregnant=True,
-            status='CONFIRMED'
-        ).order_by('expected_calving_date')[:10]
-        
-        # Sire performance
-        context['sire_performance'] = breedings.values(
-            'sire__tag_number', 'sire__breed'
-        ).annotate(
-            total=Count('id'),
-            successful=Count('id', filter=Q(is_pregnant=True))
-        ).order_by('-successful')
+        month = self.request.GET.get('month')
+        quarter = self.request.GET.get('quarter')
+        context['period'] = period
+        context['year'] = start_date.year
+        context['month'] = int(month) if month else None
+        context['quarter'] = int(quarter) if quarter else None
+        context['start_date'] = start_date
+        context['end_date'] = end_date
         
-        context['year'] = year
+        current_year = timezone.now().year
+        context['years'] = range(current_year - 5, current_year + 1)
+        context['months'] = MONTH_CHOICES
         
         return context
 
 
 # ==================== PDF EXPORT VIEWS ====================
 
-class ExportCattlePDFView(LoginRequiredMixin, View):
-    """Export cattle data to PDF"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="cattle_export.pdf"'
-        
-        doc = SimpleDocTemplate(response, pagesize=landscape(letter))
-        elements = []
-        
-        styles = getSampleStyleSheet()
-        title = Paragraph("Cattle Export Report", styles['Title'])
-        elements.append(title)
-        
-        data = [['Tag Number', 'Name', 'Type', 'Breed', 'Gender', 'Age', 'Weight', 'Status']]
-        for cattle in Cattle.objects.all()[:50]:
-            data.append([
-                cattle.tag_number,
-                cattle.name or '-',
-                cattle.get_cattle_type_display(),
-                cattle.get_breed_display(),
-                cattle.get_gender_display(),
-                str(cattle.age_in_months()) + 'mo',
-                str(cattle.weight) + 'kg' if cattle.weight else '-',
-                cattle.status
-            ])
-        
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(table)
-        doc.build(elements)
-        return response
+class PDFExportView(LoginRequiredMixin, View):
+    """Queue a background PDF export and send the user to its status page"""
+    export_type = None
 
+    def get_export_kwargs(self, request):
+        return {}
 
-class ExportMilkPDFView(LoginRequiredMixin, View):
-    """Export milk records to PDF"""
-    
     def get(self, request):
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="milk_records_export.pdf"'
-        
-        doc = SimpleDocTemplate(response, pagesize=landscape(letter))
-        elements = []
-        
-        styles = getSampleStyleSheet()
-        title = Paragraph("Milk Records Export", styles['Title'])
-        elements.append(title)
-        
-        data = [['Date', 'Cattle', 'Session', 'Quantity (L)', 'Fat %', 'Temperature']]
-        for record in MilkRecord.objects.select_related('cattle').all()[:50]:
-            data.append([
-                record.date.strftime('%Y-%m-%d'),
-                record.cattle.tag_number,
-                record.get_session_display(),
-                str(record.quantity),
-                str(record.fat_percentage) if record.fat_percentage else '-',
-                str(record.temperature) if record.temperature else '-'
-            ])
-        
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(table)
-        doc.build(elements)
-        return response
+        export = PDFExport.objects.create(
+            export_type=self.export_type,
+            requested_by=request.user,
+            **self.get_export_kwargs(request)
+        )
+        queue_pdf_export(export)
+        return redirect('dairy:pdf_export_status', pk=export.pk)
+
+
+class ExportCattlePDFView(PDFExportView):
+    """Export cattle data to PDF"""
+    export_type = 'CATTLE'
 
 
-class ExportHealthPDFView(LoginRequiredMixin, View):
+class ExportMilkPDFView(PDFExportView):
+    """Export milk records to PDF, optionally for one milk production report"""
+    export_type = 'MILK'
+
+    def get_export_kwargs(self, request):
+        report_id = request.GET.get('report')
+        if report_id:
+            return {'milk_report': get_object_or_404(MilkProductionReport, pk=report_id)}
+        return {}
+
+
+class ExportHealthPDFView(PDFExportView):
     """Export health records to PDF"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="health_records_export.pdf"'
-        
-        doc = SimpleDocTemplate(response, pagesize=landscape(letter))
-        elements = []
-        
-        styles = getSampleStyleSheet()
-        title = Paragraph("Health Records Export", styles['Title'])
-        elements.append(title)
-        
-        data = [['Date', 'Cattle', 'Health Type', 'Diagnosis', 'Veterinarian', 'Cost']]
-        for record in HealthRecord.objects.select_related('cattle').all()[:50]:
-            data.append([
-                record.date.strftime('%Y-%m-%d'),
-                record.cattle.tag_number,
-                record.get_health_type_display(),
-                record.diagnosis[:30] + '...' if len(record.diagnosis) > 30 else record.diagnosis,
-                record.veterinarian,
-                str(record.treatment_cost) if record.treatment_cost else '-'
-            ])
-        
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(table)
-        doc.build(elements)
-        return response
+    export_type = 'HEALTH'
 
 
-class ExportFeedingPDFView(LoginRequiredMixin, View):
+class ExportFeedingPDFView(PDFExportView):
     """Export feeding records to PDF"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="feeding_records_export.pdf"'
-        
-        doc = SimpleDocTemplate(response, pagesize=landscape(letter))
-        elements = []
-        
-        styles = getSampleStyleSheet()
-        title = Paragraph("Feeding Records Export", styles['Title'])
-        elements.append(title)
-        
-        data = [['Date', 'Time', 'Cattle', 'Feed Type', 'Quantity (kg)', 'Cost']]
-        for record in FeedingRecord.objects.select_related('cattle').all()[:50]:
-            data.append([
-                record.date.strftime('%Y-%m-%d'),
-                record.feed_time.strftime('%H:%M'),
-                record.cattle.tag_number,
-                record.get_feed_type_display(),
-                str(record.quantity),
-                str(record.total_cost)
-            ])
-        
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(table)
-        doc.build(elements)
-        return response
+    export_type = 'FEEDING'
 
 
-class ExportWeightPDFView(LoginRequiredMixin, View):
+class ExportWeightPDFView(PDFExportView):
     """Export weight records to PDF"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="weight_records_export.pdf"'
-        
-        doc = SimpleDocTemplate(response, pagesize=landscape(letter))
-        elements = []
-        
-        styles = getSampleStyleSheet()
-        title = Paragraph("Weight Records Export", styles['Title'])
-        elements.append(title)
-        
-        data = [['Date', 'Cattle', 'Weight (kg)', 'Daily Gain', 'Age (days)']]
-        for record in WeightRecord.objects.select_related('cattle').all()[:50]:
-            data.append([
-                record.date.strftime('%Y-%m-%d'),
-                record.cattle.tag_number,
-                str(record.weight),
-                str(record.daily_gain) if record.daily_gain else '-',
-                str(record.age_in_days) if record.age_in_days else '-'
-            ])
-        
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(table)
-        doc.build(elements)
-        return response
+    export_type = 'WEIGHT'
 
 
-class ExportBreedingPDFView(LoginRequiredMixin, View):
+class ExportBreedingPDFView(PDFExportView):
     """Export breeding records to PDF"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="breeding_records_export.pdf"'
-        
-        doc = SimpleDocTemplate(response, pagesize=landscape(letter))
-        elements = []
-        
-        styles = getSampleStyleSheet()
-        title = Paragraph("Breeding Records Export", styles['Title'])
-        elements.append(title)
-        
-        data = [['Breeding Date', 'Dam', 'Sire', 'Method', 'Status', 'Expected Calving']]
-        for record in BreedingRecord.objects.select_related('cattle', 'sire').all()[:50]:
-            data.append([
-                record.breeding_date.strftime('%Y-%m-%d'),
-                record.cattle.tag_number,
-                record.sire.tag_number if record.sire else '-',
-                record.breeding_method,
-                record.get_status_display(),
-                record.expected_calving_date.strftime('%Y-%m-%d') if record.expected_calving_date else '-'
-            ])
-        
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(table)
-        doc.build(elements)
-        return response
+    export_type = 'BREEDING'
 
 
-class ExportVaccinationPDFView(LoginRequiredMixin, View):
+class ExportVaccinationPDFView(PDFExportView):
     """Export vaccination records to PDF"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="vaccination_records_export.pdf"'
-        
-        doc = SimpleDocTemplate(response, pagesize=landscape(letter))
-        elements = []
-        
-        styles = getSampleStyleSheet()
-        title = Paragraph("Vaccination Records Export", styles['Title'])
-        elements.append(title)
-        
-        data = [['Scheduled Date', 'Cattle', 'Vaccine', 'Status', 'Administered', 'Batch']]
-        for record in VaccinationSchedule.objects.select_related('cattle').all()[:50]:
-            data.append([
-                record.scheduled_date.strftime('%Y-%m-%d'),
-                record.cattle.tag_number,
-                record.get_vaccine_type_display(),
-                'Completed' if record.is_completed else 'Pending',
-                record.administered_date.strftime('%Y-%m-%d') if record.administered_date else '-',
-                record.batch_number or '-'
-            ])
-        
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(table)
-        doc.build(elements)
-        return response
+    export_type = 'VACCINATION'
 
 
-class ExportSalesPDFView(LoginRequiredMixin, View):
+class ExportSalesPDFView(PDFExportView):
     """Export sales records to PDF"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="sales_export.pdf"'
-        
-        doc = SimpleDocTemplate(response, pagesize=landscape(letter))
-        elements = []
-        
-        styles = getSampleStyleSheet()
-        title = Paragraph("Sales Export", styles['Title'])
-        elements.append(title)
-        
-        data = [['Date', 'Type', 'Details', 'Quantity', 'Amount', 'Status']]
-        
-        # Milk Sales
-        for sale in MilkSale.objects.all()[:25]:
-            data.append([
-                sale.date.strftime('%Y-%m-%d'),
-                'Milk Sale',
-                sale.customer_name or 'Retail',
-                str(sale.quantity) + ' L',
-                '৳' + str(sale.total_amount),
-                'Paid' if sale.payment_received else 'Pending'
-            ])
-        
-        # Cattle Sales
-        for sale in CattleSale.objects.select_related('cattle').all()[:25]:
-            data.append([
-                sale.sale_date.strftime('%Y-%m-%d'),
-                'Cattle Sale',
-                sale.cattle.tag_number,
-                '1 head',
-                '৳' + str(sale.sale_price),
-                'Paid' if sale.payment_received else 'Pending'
-            ])
-        
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(table)
-        doc.build(elements)
-        return response
+    export_type = 'SALES'
 
 
-class ExportFinancialPDFView(LoginRequiredMixin, View):
+class ExportFinancialPDFView(PDFExportView):
     """Export financial records to PDF"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="financial_export.pdf"'
-        
-        doc = SimpleDocTemplate(response, pagesize=landscape(letter))
-        elements = []
-        
-        styles = getSampleStyleSheet()
-        title = Paragraph("Financial Export", styles['Title'])
-        elements.append(title)
-        
-        # Summary Section
-        total_income = MilkSale.objects.aggregate(total=Sum('total_amount'))['total'] or 0
-        total_expenses = Expense.objects.aggregate(total=Sum('amount'))['total'] or 0
-        total_investments = Investment.objects.aggregate(total=Sum('amount'))['total'] or 0
-        
-        data = [
-            ['Financial Summary', '', ''],
-            ['Total Income', '৳' + str(total_income), ''],
-            ['Total Expenses', '৳' + str(total_expenses), ''],
-            ['Net Profit', '৳' + str(total_income - total_expenses), ''],
-            ['', '', ''],
-            ['Expenses by Category', '', ''],
-        ]
-        
-        # Expenses by category
-        for category in ExpenseCategory.objects.all():
-            category_total = Expense.objects.filter(category=category).aggregate(total=Sum('amount'))['total'] or 0
-            if category_total > 0:
-                data.append([category.name, '৳' + str(category_total), ''])
-        
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        elements.append(table)
-        doc.build(elements)
-        return response
\ No newline at end of file
+    export_type = 'FINANCIAL'
+
+
+class PDFExportStatusView(LoginRequiredMixin, View):
+    """Serve a finished PDF export, or report its progress while it renders"""
+
+    def get(self, request, pk):
+        export = get_object_or_404(PDFExport, pk=pk, requested_by=request.user)
+
+        if request.GET.get('format') == 'json':
+            return JsonResponse({
+                'success': True,
+                'data': {
+                    'id': export.pk,
+                    'status': export.status,
+                    'rows': export.row_count,
+                    'error': export.error,
+                    'url': export.file.url if export.status == 'READY' else None,
+                }
+            })
+
+        if export.status == 'READY':
+            return FileResponse(
+                export.file.open('rb'),
+                as_attachment=True,
+                filename=PDF_EXPORTS[export.export_type].filename,
+            )
+
+        return render(request, 'dairy/reports/pdf_export_status.html', {'export': export})
@@ -0,0 +1,163 @@
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import Lag
+
+from agro import conditional
+
+from .models import Cattle, WeightRecord
+
+
+# ==================== WEIGHT SERIES ====================
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    return value
+
+
+def _series(records):
+    """
+    Each weighing with the one before it for the same animal, computed by
+    the database in a single LAG() pass over the whole series.
+    """
+    previous = {'partition_by': [F('cattle_id')], 'order_by': F('date').asc()}
+    return records.annotate(
+        previous_date=Window(Lag('date'), **previous),
+        previous_weight=Window(Lag('weight'), **previous),
+        birth_date=F('cattle__birth_date'),
+    ).order_by().values_list(
+        'pk', 'date', 'weight', 'previous_date', 'previous_weight',
+        'daily_gain', 'age_in_days', 'birth_date',
+    )
+
+
+def recompute_daily_gains(cattle_ids=None, batch_size=1000):
+    """
+    Recompute daily_gain and age_in_days across whole weight series, for the
+    given cattle or the entire herd. Only rows whose values change are
+    written. Returns the number of records updated.
+    """
+    records = WeightRecord.objects.all()
+    if cattle_ids is not None:
+        records = records.filter(cattle_id__in={c for c in cattle_ids if c})
+
+    changed = []
+    for pk, day, weight, previous_date, previous_weight, gain, age, birth_date in _series(records).iterator(
+        chunk_size=batch_size
+    ):
+        new_gain = WeightRecord.gain_between(previous_date, previous_weight, day, weight)
+        new_age = (day - birth_date).days
+        if new_gain != gain or new_age != age:
+            changed.append(WeightRecord(pk=pk, daily_gain=new_gain, age_in_days=new_age))
+
+    WeightRecord.objects.bulk_update(changed, ['daily_gain', 'age_in_days'], batch_size=batch_size)
+    if changed:
+        conditional.changed(WeightRecord)
+    return len(changed)
+
+
+def refresh_following_gains(points):
+    """
+    Recompute the gain of the weighing right after each (cattle_id, date),
+    for when a record is inserted, moved or deleted in the middle of a series.
+    """
+    for cattle_id, day in {(c, _as_date(d)) for c, d in points if c and d}:
+        following = WeightRecord.objects.filter(cattle_id=cattle_id, date__gt=day).order_by('date').first()
+        if following is None:
+            continue
+        previous = WeightRecord.objects.filter(
+            cattle_id=cattle_id, date__lt=following.date
+        ).order_by('-date').values_list('date', 'weight').first() or (None, None)
+        gain = WeightRecord.gain_between(*previous, following.date, following.weight)
+        if gain != following.daily_gain:
+            WeightRecord.objects.filter(pk=following.pk).update(daily_gain=gain)
+
+
+# ==================== BULK IMPORT ====================
+
+def _cattle_id(row):
+    """A row's cattle_id as an int (CSV gives strings), or None when missing or malformed"""
+    try:
+        return int(str(row.get('cattle_id')).strip())
+    except ValueError:
+        return None
+
+
+def import_weight_records(rows, recorded_by=None, default_date=None, batch_size=1000):
+    """
+    Load a weigh-day session (or any batch of weighings) in a fixed number
+    of queries. Each row is a dict with tag_number or cattle_id, weight,
+    and optionally date and notes. A weighing for an animal and date that
+    already exists is overwritten. Gains are then recomputed for every
+    affected animal in one windowed pass, so back-dated rows fix the
+    records after them too.
+    Returns (created, updated). Raises ValueError for unknown tags or bad
+    values; nothing is written in that case.
+    """
+    rows = list(rows)
+    tags = {str(row['tag_number']).strip() for row in rows if row.get('tag_number')}
+    cattle = {
+        c['tag_number']: c for c in Cattle.objects.filter(tag_number__in=tags).values('pk', 'tag_number', 'birth_date')
+    }
+    cattle_ids = {_cattle_id(row) for row in rows if not row.get('tag_number')} - {None}
+    cattle.update({c['pk']: c for c in Cattle.objects.filter(pk__in=cattle_ids).values('pk', 'tag_number', 'birth_date')})
+
+    weighings = {}
+    errors = []
+    for line, row in enumerate(rows, start=1):
+        key = str(row['tag_number']).strip() if row.get('tag_number') else _cattle_id(row)
+        animal = cattle.get(key)
+        if animal is None:
+            errors.append(f"Row {line}: unknown cattle {key if key is not None else row.get('cattle_id')!r}")
+            continue
+        try:
+            weight = Decimal(str(row['weight']).strip())
+            day = _as_date(row.get('date') or default_date)
+        except (KeyError, InvalidOperation, ValueError):
+            errors.append(f'Row {line}: invalid weight or date')
+            continue
+        if not (weight.is_finite() and weight > 0):
+            errors.append(f'Row {line}: weight must be a positive number')
+            continue
+        if day is None:
+            errors.append(f'Row {line}: missing date')
+            continue
+        weighings[(animal['pk'], day)] = WeightRecord(
+            cattle_id=animal['pk'],
+            date=day,
+            weight=weight,
+            age_in_days=(day - animal['birth_date']).days,
+            notes=row.get('notes') or '',
+            recorded_by=recorded_by,
+        )
+    if errors:
+        raise ValueError('; '.join(errors))
+
+    affected = {cattle_id for cattle_id, _ in weighings}
+    days = {day for _, day in weighings}
+    with transaction.atomic():
+        existing = {
+            (cattle_id, day): pk
+            for pk, cattle_id, day in WeightRecord.objects.filter(
+                cattle_id__in=affected, date__in=days
+            ).values_list('pk', 'cattle_id', 'date')
+        }
+        updates, creates = [], []
+        for key, record in weighings.items():
+            if key in existing:
+                record.pk = existing[key]
+                updates.append(record)
+            else:
+                creates.append(record)
+
+        WeightRecord.objects.bulk_create(creates, batch_size=batch_size)
+        WeightRecord.objects.bulk_update(updates, ['weight', 'notes', 'age_in_days', 'recorded_by'], batch_size=batch_size)
+        recompute_daily_gains(affected, batch_size=batch_size)
+        # The bulk writes skip the per-record signals
+        conditional.changed(WeightRecord)
+    return len(creates), len(updates)
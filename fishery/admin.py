@@ -7,6 +7,9 @@ from django.db.models import Sum, Avg, Count, Q, F
 from django.utils import timezone
 from datetime import datetime, timedelta
 from .models import *
+from . import caching
+from agro import conditional
+from home import alerts
 
 # ==================== FARM & POND ADMIN ====================
 
@@ -151,11 +154,15 @@ class PondAdmin(admin.ModelAdmin):
     
     def activate_ponds(self, request, queryset):
         updated = queryset.update(is_active=True)
+        caching.bump_on_commit(caching.PONDS)
+        conditional.changed(Pond)
         self.message_user(request, f'{updated} ponds activated.')
     activate_ponds.short_description = "Activate selected ponds"
     
     def deactivate_ponds(self, request, queryset):
         updated = queryset.update(is_active=False)
+        caching.bump_on_commit(caching.PONDS)
+        conditional.changed(Pond)
         self.message_user(request, f'{updated} ponds deactivated.')
     deactivate_ponds.short_description = "Deactivate selected ponds"
     
@@ -265,6 +272,7 @@ class ExpenseInline(admin.TabularInline):
 class ProductionCycleAdmin(admin.ModelAdmin):
     list_display = ['cycle_id', 'pond_link', 'species_link', 'stocking_date', 'initial_quantity', 'status_badge', 'survival_rate_display', 'fcr_display', 'profit_indicator', 'action_buttons']
     list_filter = ['status', 'cycle_type', 'pond__farm', 'stocking_date']
+    list_select_related = ['pond', 'species', 'metrics']
     search_fields = ['cycle_id', 'pond__name', 'species__name', 'notes']
     readonly_fields = ['cycle_id', 'created_at', 'updated_at', 'cost_per_fingerling', 'total_harvest', 'total_mortality', 'current_population', 'survival_rate', 'total_feed', 'fcr', 'days_in_production', 'total_sales', 'total_investment', 'net_profit', 'roi_percentage', 'performance_summary']
     
@@ -429,11 +437,17 @@ class ProductionCycleAdmin(admin.ModelAdmin):
     
     def mark_running(self, request, queryset):
         updated = queryset.update(status='RUNNING')
+        caching.bump_on_commit(caching.CYCLES)
+        conditional.changed(ProductionCycle)
+        alerts.refresh(ProductionCycle, queryset.values_list('pk', flat=True))
         self.message_user(request, f'{updated} cycles marked as running.')
     mark_running.short_description = "Mark as Running"
     
     def mark_completed(self, request, queryset):
         updated = queryset.update(status='COMPLETED', actual_harvest_date=timezone.now().date())
+        caching.bump_on_commit(caching.CYCLES)
+        conditional.changed(ProductionCycle)
+        alerts.refresh(ProductionCycle, queryset.values_list('pk', flat=True))
         self.message_user(request, f'{updated} cycles marked as completed.')
     mark_completed.short_description = "Mark as Completed"
     
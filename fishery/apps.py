@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class FisheryConfig(AppConfig):
     name = 'fishery'
+
+    def ready(self):
+        from . import signals  # noqa: F401
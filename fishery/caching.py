@@ -0,0 +1,149 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.utils.functional import cached_property
+from django.utils.http import urlencode
+
+
+# ==================== VERSIONED CACHE KEYS ====================
+#
+# Cached fishery data is keyed by the versions of the model groups it was
+# built from. Saving or deleting any model in a group bumps that group's
+# version (see fishery.signals), so every key built from the old version is
+# simply never read again and expires on its own. Views can therefore cache
+# for a long time without serving stale figures.
+
+FARMS = 'farms'
+PONDS = 'ponds'
+SPECIES = 'species'
+CYCLES = 'cycles'
+FEED = 'feed'
+HARVESTS = 'harvests'
+SALES = 'sales'
+EXPENSES = 'expenses'
+ALL_GROUPS = (FARMS, PONDS, SPECIES, CYCLES, FEED, HARVESTS, SALES, EXPENSES)
+
+# Entries are invalidated by version bumps, the TTL only bounds memory
+LONG_TTL = 60 * 60 * 24
+
+
+def _version_key(group):
+    return f'fishery:version:{group}'
+
+
+def _new_version():
+    # Time based, so a version lost to cache eviction never repeats an old one
+    return time.time_ns()
+
+
+def group_versions(groups):
+    """Current version of each group, in one cache round trip when possible"""
+    keys = {group: _version_key(group) for group in groups}
+    found = cache.get_many(keys.values())
+    versions = {}
+    for group, key in keys.items():
+        if key not in found:
+            cache.add(key, _new_version(), None)
+            found[key] = cache.get(key)
+        versions[group] = found[key]
+    return versions
+
+
+def versioned_key(name, groups, *parts):
+    """
+    Cache key for an entry named name built from the given model groups.
+    parts (filters, dates, query strings) are appended as they are.
+    """
+    versions = group_versions(groups)
+    stamp = ':'.join(f'{group}.{versions[group]}' for group in sorted(groups))
+    return ':'.join(['fishery', name, stamp, *map(str, parts)])
+
+
+def bump(*groups):
+    """Invalidate everything cached from the given groups"""
+    for group in groups:
+        try:
+            cache.incr(_version_key(group))
+        except ValueError:
+            cache.set(_version_key(group), _new_version(), None)
+
+
+def bump_on_commit(*groups):
+    """bump() once the current transaction commits, so readers never re-cache old rows"""
+    transaction.on_commit(lambda: bump(*groups))
+
+
+# ==================== CACHED LISTS ====================
+
+def cached_values(name, groups, queryset, *fields, timeout=LONG_TTL):
+    """queryset.values(*fields) evaluated to a list of dicts and cached, for filter dropdowns"""
+    key = versioned_key(name, groups)
+    rows = cache.get(key)
+    if rows is None:
+        rows = list(queryset.values(*fields))
+        cache.set(key, rows, timeout)
+    return rows
+
+
+class CachedPaginator(Paginator):
+    """
+    Paginator that caches the total count and the primary keys of each page
+    under cache_key. A page is then loaded with a single pk__in query, so a
+    cache hit skips both the COUNT and the OFFSET scan. Rows themselves are
+    always read fresh, only membership and order come from the cache.
+    """
+
+    def __init__(self, object_list, per_page, cache_key, timeout=LONG_TTL, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_key = cache_key
+        self.timeout = timeout
+
+    @cached_property
+    def count(self):
+        key = f'{self.cache_key}:count'
+        count = cache.get(key)
+        if count is None:
+            count = self.object_list.count()
+            cache.set(key, count, self.timeout)
+        return count
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if top + self.orphans >= self.count:
+            top = self.count
+
+        key = f'{self.cache_key}:page:{number}'
+        pks = cache.get(key)
+        if pks is None:
+            pks = list(self.object_list.values_list('pk', flat=True)[bottom:top])
+            cache.set(key, pks, self.timeout)
+
+        rows = {row.pk: row for row in self.object_list.filter(pk__in=pks)}
+        return self._get_page([rows[pk] for pk in pks if pk in rows], number, self)
+
+
+class CachedListMixin:
+    """
+    ListView mixin that paginates through CachedPaginator. Set
+    list_cache_groups to every group whose changes can alter which rows the
+    list shows or their order; a bump of any of them drops all cached pages
+    and counts of the list.
+    """
+    list_cache_groups = ()
+
+    def list_cache_key(self):
+        params = self.request.GET.copy()
+        params.pop(self.page_kwarg, None)
+        query = hashlib.md5(urlencode(sorted(params.lists()), doseq=True).encode()).hexdigest()
+        return versioned_key(f'list:{type(self).__name__}', self.list_cache_groups, query)
+
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        return CachedPaginator(
+            queryset, per_page, self.list_cache_key(),
+            orphans=orphans, allow_empty_first_page=allow_empty_first_page, **kwargs
+        )
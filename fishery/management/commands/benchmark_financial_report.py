@@ -0,0 +1,110 @@
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from fishery.metrics import refresh_cycle_metrics, FEED
+from fishery.models import (
+    Farm, Pond, FishSpecies, FeedType, ProductionCycle, FeedRecord,
+    Expense, Harvest, FishSale, FisheryFinancialReport,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Time FisheryFinancialReport regeneration against growing numbers of cycles. '
+        'Synthetic data is created inside a transaction that is always rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000],
+                            help='Cycle counts to benchmark')
+        parser.add_argument('--year', type=int, default=1970,
+                            help='Report year for the synthetic cycles; pick one without real data')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per size')
+
+    def handle(self, *args, **options):
+        if any(size < 1 for size in options['sizes']):
+            raise CommandError('--sizes must be positive')
+
+        self.stdout.write(f"{'cycles':>8} {'report queries':>15} {'report ms':>10} {'event queries':>14} {'event ms':>9}")
+        for size in options['sizes']:
+            with transaction.atomic():
+                report_queries, report_ms, event_queries, event_ms = self._run(
+                    size, options['year'], options['repeat']
+                )
+                transaction.set_rollback(True)
+            self.stdout.write(
+                f'{size:>8} {report_queries:>15} {report_ms:>10.2f} {event_queries:>14} {event_ms:>9.2f}'
+            )
+
+    def _run(self, size, year, repeat):
+        cycles = self._create_cycles(size, year)
+        # on_commit never fires inside the rolled-back transaction, so build
+        # what the signals would have maintained up front
+        refresh_cycle_metrics([cycle.pk for cycle in cycles])
+
+        report = FisheryFinancialReport.objects.create(year=year)
+        report_queries, report_ms = self._measure(report.calculate_totals, repeat)
+
+        # A single feed entry: what every change event costs to fold in
+        cycle = cycles[-1]
+        FeedRecord.objects.bulk_create([FeedRecord(
+            cycle=cycle, feed_type=self.feed_type, date=cycle.stocking_date, quantity_kg=10, cost=Decimal('500'),
+        )])
+        event_queries, event_ms = self._measure(lambda: refresh_cycle_metrics([cycle.pk], (FEED,)), repeat)
+        return report_queries, report_ms, event_queries, event_ms
+
+    def _measure(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - started) * 1000)
+        return len(queries), sum(timings) / len(timings)
+
+    def _create_cycles(self, size, year):
+        farm = Farm.objects.create(name='Benchmark Farm', address='-', city='-', state='-', phone='-', total_area=size)
+        pond = Pond.objects.create(farm=farm, pond_id='BENCH-1', name='Benchmark Pond', size_in_acres=1, water_source='-')
+        species = FishSpecies.objects.create(name='Benchmark Species', average_growth_days=120)
+        self.feed_type = FeedType.objects.create(
+            name='Benchmark Feed', category='GROWER', brand='-', protein_percentage=30,
+            pellet_size_mm=2, current_price=50, current_stock=0, reorder_level=0,
+        )
+
+        start = date(year, 1, 1)
+        ProductionCycle.objects.bulk_create([
+            ProductionCycle(
+                pond=pond, species=species, stocking_date=start + timedelta(days=i % 365),
+                initial_quantity=1000, initial_avg_weight=5, fingerling_cost=Decimal('5000'),
+                cost_per_fingerling=Decimal('5'),
+                status='COMPLETED', actual_harvest_date=start + timedelta(days=i % 365 + 120),
+            )
+            for i in range(size)
+        ])
+        cycles = list(ProductionCycle.objects.filter(pond=pond).order_by('pk'))
+
+        now = timezone.now()
+        FeedRecord.objects.bulk_create([
+            FeedRecord(cycle=c, feed_type=self.feed_type, date=c.stocking_date, quantity_kg=600, cost=Decimal('30000'))
+            for c in cycles
+        ])
+        Expense.objects.bulk_create([
+            Expense(cycle=c, expense_type=expense_type, description='-', amount=Decimal('1000'),
+                    expense_date=c.stocking_date, created_at=now, updated_at=now)
+            for c in cycles for expense_type in ('MEDICINE', 'LABOR', 'TRANSPORT')
+        ])
+        Harvest.objects.bulk_create([
+            Harvest(cycle=c, quantity_kg=400, harvest_date=c.actual_harvest_date) for c in cycles
+        ])
+        FishSale.objects.bulk_create([
+            FishSale(harvest=h, quantity_kg=400, price_per_kg=Decimal('150'), total_amount=Decimal('60000'),
+                     sale_date=h.harvest_date)
+            for h in Harvest.objects.filter(cycle__pond=pond)
+        ])
+        return cycles
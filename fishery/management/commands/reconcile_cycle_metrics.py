@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from fishery.metrics import rebuild_cycle_metrics, rebuild_financial_partials
+
+
+class Command(BaseCommand):
+    help = 'Rebuild denormalized CycleMetrics rows and financial report partials from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Cycles aggregated per query batch')
+
+    def handle(self, *args, **options):
+        count = rebuild_cycle_metrics(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Reconciled metrics for {count} production cycles'))
+        months = rebuild_financial_partials()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt financial report partials for {months} months'))
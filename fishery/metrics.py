@@ -0,0 +1,241 @@
+from datetime import date
+
+from django.db.models import Sum, Q, F, DecimalField, ExpressionWrapper
+from django.utils import timezone
+
+from .models import (
+    ProductionCycle, CycleMetrics, FeedRecord, MortalityRecord,
+    Harvest, FishSale, Expense, FinancialReportPartial,
+)
+
+
+# ==================== CYCLE METRICS ====================
+
+# Which CycleMetrics columns each source table feeds
+HARVEST = 'harvest'
+MORTALITY = 'mortality'
+FEED = 'feed'
+EXPENSE = 'expense'
+SALES = 'sales'
+ALL_COMPONENTS = (HARVEST, MORTALITY, FEED, EXPENSE, SALES)
+
+SALE_AMOUNT = ExpressionWrapper(
+    F('quantity_kg') * F('price_per_kg'),
+    output_field=DecimalField(max_digits=12, decimal_places=2)
+)
+
+
+def _harvest_fields(cycle_ids):
+    rows = Harvest.objects.filter(cycle_id__in=cycle_ids).values('cycle_id').annotate(
+        harvest_kg=Sum('quantity_kg'),
+    ).order_by()
+    return {r['cycle_id']: {'harvest_kg': r['harvest_kg'] or 0} for r in rows}
+
+
+def _mortality_fields(cycle_ids):
+    rows = MortalityRecord.objects.filter(cycle_id__in=cycle_ids).values('cycle_id').annotate(
+        mortality_count=Sum('quantity_dead'),
+    ).order_by()
+    return {r['cycle_id']: {'mortality_count': r['mortality_count'] or 0} for r in rows}
+
+
+def _feed_fields(cycle_ids):
+    rows = FeedRecord.objects.filter(cycle_id__in=cycle_ids).values('cycle_id').annotate(
+        feed_kg=Sum('quantity_kg'),
+        feed_cost=Sum('cost'),
+    ).order_by()
+    return {
+        r['cycle_id']: {'feed_kg': r['feed_kg'] or 0, 'feed_cost': r['feed_cost'] or 0}
+        for r in rows
+    }
+
+
+def _expense_fields(cycle_ids):
+    rows = Expense.objects.filter(cycle_id__in=cycle_ids).values('cycle_id').annotate(
+        medicine_cost=Sum('amount', filter=Q(expense_type='MEDICINE')),
+        labor_cost=Sum('amount', filter=Q(expense_type='LABOR')),
+        electricity_cost=Sum('amount', filter=Q(expense_type='ELECTRICITY')),
+        transport_cost=Sum('amount', filter=Q(expense_type='TRANSPORT')),
+        other_cost=Sum('amount', filter=~Q(expense_type__in=['MEDICINE', 'LABOR', 'ELECTRICITY', 'FEED'])),
+        expense_total=Sum('amount'),
+    ).order_by()
+    return {
+        r.pop('cycle_id'): {key: value or 0 for key, value in r.items()}
+        for r in rows
+    }
+
+
+def _sales_fields(cycle_ids):
+    rows = FishSale.objects.filter(harvest__cycle_id__in=cycle_ids).values('harvest__cycle_id').annotate(
+        sales_revenue=Sum(SALE_AMOUNT),
+    ).order_by()
+    return {r['harvest__cycle_id']: {'sales_revenue': r['sales_revenue'] or 0} for r in rows}
+
+
+COMPONENTS = {
+    HARVEST: (_harvest_fields, {'harvest_kg': 0}),
+    MORTALITY: (_mortality_fields, {'mortality_count': 0}),
+    FEED: (_feed_fields, {'feed_kg': 0, 'feed_cost': 0}),
+    EXPENSE: (_expense_fields, {
+        'medicine_cost': 0, 'labor_cost': 0, 'electricity_cost': 0, 'transport_cost': 0,
+        'other_cost': 0, 'expense_total': 0,
+    }),
+    SALES: (_sales_fields, {'sales_revenue': 0}),
+}
+
+
+def _compute(cycle_ids, components):
+    values = {cycle_id: {} for cycle_id in cycle_ids}
+    for component in components:
+        compute, empty = COMPONENTS[component]
+        found = compute(cycle_ids)
+        for cycle_id in cycle_ids:
+            values[cycle_id].update(found.get(cycle_id, empty))
+    return values
+
+
+def _create_metrics(cycle_ids):
+    """Build every component for cycles that have no metrics row yet"""
+    if cycle_ids:
+        CycleMetrics.objects.bulk_create([
+            CycleMetrics(cycle_id=cycle_id, **fields)
+            for cycle_id, fields in _compute(set(cycle_ids), ALL_COMPONENTS).items()
+        ], ignore_conflicts=True)
+
+
+def refresh_cycle_metrics(cycle_ids, components=ALL_COMPONENTS):
+    """
+    Recompute the given metric components for a set of cycles.
+    Only the tables behind the listed components are read, one grouped
+    query each, so a single feed entry costs one small aggregate.
+    Cycles without a metrics row yet get every component built.
+    The financial report partials of the cycles' stocking months follow.
+    """
+    stocked = dict(
+        ProductionCycle.objects.filter(pk__in={c for c in cycle_ids if c}).values_list('pk', 'stocking_date')
+    )
+    cycle_ids = set(stocked)
+    if not cycle_ids:
+        return 0
+
+    existing = set(
+        CycleMetrics.objects.filter(cycle_id__in=cycle_ids).values_list('cycle_id', flat=True)
+    )
+    missing = cycle_ids - existing
+
+    if existing:
+        for cycle_id, fields in _compute(existing, components).items():
+            CycleMetrics.objects.filter(cycle_id=cycle_id).update(updated_at=timezone.now(), **fields)
+    _create_metrics(missing)
+
+    refresh_financial_partials(stocking_month(d) for d in stocked.values())
+    return len(cycle_ids)
+
+
+def rebuild_cycle_metrics(batch_size=500):
+    """Rebuild every CycleMetrics row from the source tables"""
+    cycle_ids = list(ProductionCycle.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(cycle_ids), batch_size):
+        refresh_cycle_metrics(cycle_ids[start:start + batch_size])
+    CycleMetrics.objects.exclude(cycle_id__in=ProductionCycle.objects.values('pk')).delete()
+    return len(cycle_ids)
+
+
+# ==================== FINANCIAL REPORT PARTIALS ====================
+
+PARTIAL_CYCLE_FIELDS = (
+    'status', 'stocking_date', 'actual_harvest_date', 'initial_quantity', 'fingerling_cost',
+    'metrics__harvest_kg', 'metrics__mortality_count', 'metrics__feed_kg', 'metrics__feed_cost',
+    'metrics__medicine_cost', 'metrics__labor_cost', 'metrics__electricity_cost',
+    'metrics__transport_cost', 'metrics__other_cost', 'metrics__sales_revenue',
+)
+
+
+def stocking_month(stocking_date):
+    """(year, month) partial a cycle's figures belong to"""
+    return stocking_date.year, stocking_date.month
+
+
+def _month_range(year, month):
+    return date(year, month, 1), date(year + month // 12, month % 12 + 1, 1)
+
+
+def _partial_fields(rows):
+    """Fold the cycles of one month into FinancialReportPartial values"""
+    fields = {
+        'cycle_count': 0, 'fingerling_cost': 0, 'feed_cost': 0, 'medicine_cost': 0,
+        'labor_cost': 0, 'electricity_cost': 0, 'transport_cost': 0, 'other_expenses': 0,
+        'sales_revenue': 0, 'harvest_kg': 0, 'cycles_completed': 0, 'completed_days': 0,
+        'completed_with_dates': 0, 'survival_rate_sum': 0, 'survival_rate_count': 0,
+        'fcr_sum': 0, 'fcr_count': 0,
+    }
+    for row in rows:
+        metrics = {key[len('metrics__'):]: row[key] or 0 for key in row if key.startswith('metrics__')}
+        fields['cycle_count'] += 1
+        fields['fingerling_cost'] += row['fingerling_cost'] or 0
+        fields['feed_cost'] += metrics['feed_cost']
+        fields['medicine_cost'] += metrics['medicine_cost']
+        fields['labor_cost'] += metrics['labor_cost']
+        fields['electricity_cost'] += metrics['electricity_cost']
+        fields['transport_cost'] += metrics['transport_cost']
+        # CycleMetrics.other_cost still includes transport; the report lists it apart
+        fields['other_expenses'] += metrics['other_cost'] - metrics['transport_cost']
+        fields['sales_revenue'] += metrics['sales_revenue']
+        fields['harvest_kg'] += metrics['harvest_kg']
+
+        if row['status'] == 'COMPLETED':
+            fields['cycles_completed'] += 1
+            if row['actual_harvest_date']:
+                fields['completed_days'] += (row['actual_harvest_date'] - row['stocking_date']).days
+                fields['completed_with_dates'] += 1
+
+        # Same figures as ProductionCycle.survival_rate and .fcr
+        if row['initial_quantity'] > 0:
+            survival_rate = round(
+                (row['initial_quantity'] - metrics['mortality_count']) / row['initial_quantity'] * 100, 2
+            )
+            if survival_rate > 0:
+                fields['survival_rate_sum'] += survival_rate
+                fields['survival_rate_count'] += 1
+        if metrics['harvest_kg'] > 0:
+            fcr = round(metrics['feed_kg'] / metrics['harvest_kg'], 2)
+            if fcr > 0:
+                fields['fcr_sum'] += fcr
+                fields['fcr_count'] += 1
+    return fields
+
+
+def refresh_financial_partials(months):
+    """
+    Rebuild the FinancialReportPartial rows for the given (year, month)
+    pairs from the stored metrics of the cycles stocked in each month.
+    The cost follows the number of cycles in those months, not the year.
+    Cycles with no metrics row yet (e.g. entered before the metrics table
+    existed) get one built first, so they never count as zeros.
+    """
+    for year, month in set(months):
+        start, end = _month_range(year, month)
+        cycles = ProductionCycle.objects.filter(stocking_date__gte=start, stocking_date__lt=end)
+        _create_metrics(cycles.filter(metrics__isnull=True).values_list('pk', flat=True))
+        rows = cycles.values(*PARTIAL_CYCLE_FIELDS).order_by()
+        fields = _partial_fields(rows)
+        if fields['cycle_count']:
+            FinancialReportPartial.objects.update_or_create(year=year, month=month, defaults=fields)
+        else:
+            FinancialReportPartial.objects.filter(year=year, month=month).delete()
+
+
+def rebuild_financial_partials(year=None):
+    """Rebuild every partial, or one year's, from the cycles on record"""
+    cycles = ProductionCycle.objects.all()
+    partials = FinancialReportPartial.objects.all()
+    if year is not None:
+        cycles = cycles.filter(stocking_date__gte=date(year, 1, 1), stocking_date__lt=date(year + 1, 1, 1))
+        partials = partials.filter(year=year)
+
+    months = {stocking_month(d) for d in cycles.dates('stocking_date', 'month')}
+    refresh_financial_partials(months)
+    stale = set(partials.values_list('year', 'month')) - months
+    for stale_year, stale_month in stale:
+        FinancialReportPartial.objects.filter(year=stale_year, month=stale_month).delete()
+    return len(months)
@@ -0,0 +1,36 @@
+# Generated by Django 6.0.2 on 2026-10-18 06:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fishery', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CycleMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('harvest_kg', models.FloatField(default=0)),
+                ('mortality_count', models.PositiveIntegerField(default=0)),
+                ('feed_kg', models.FloatField(default=0)),
+                ('feed_cost', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('medicine_cost', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('labor_cost', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('electricity_cost', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('other_cost', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('expense_total', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('sales_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('cycle', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='metrics', to='fishery.productioncycle')),
+            ],
+            options={
+                'verbose_name': 'Cycle Metrics',
+                'verbose_name_plural': 'Cycle Metrics',
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 6.0.2 on 2026-10-18 06:20
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_transport_cost(apps, schema_editor):
+    CycleMetrics = apps.get_model('fishery', 'CycleMetrics')
+    Expense = apps.get_model('fishery', 'Expense')
+    totals = Expense.objects.filter(expense_type='TRANSPORT', cycle__isnull=False).values('cycle_id').annotate(
+        total=Sum('amount')
+    ).order_by()
+    for row in totals:
+        CycleMetrics.objects.filter(cycle_id=row['cycle_id']).update(transport_cost=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fishery', '0002_cycle_metrics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cyclemetrics',
+            name='transport_cost',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.RunPython(backfill_transport_cost, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='FinancialReportPartial',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('cycle_count', models.PositiveIntegerField(default=0)),
+                ('fingerling_cost', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('feed_cost', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('medicine_cost', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('labor_cost', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('electricity_cost', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('transport_cost', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('other_expenses', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('sales_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('harvest_kg', models.FloatField(default=0)),
+                ('cycles_completed', models.PositiveIntegerField(default=0)),
+                ('completed_days', models.PositiveIntegerField(default=0)),
+                ('completed_with_dates', models.PositiveIntegerField(default=0)),
+                ('survival_rate_sum', models.FloatField(default=0)),
+                ('survival_rate_count', models.PositiveIntegerField(default=0)),
+                ('fcr_sum', models.FloatField(default=0)),
+                ('fcr_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Financial Report Partial',
+                'verbose_name_plural': 'Financial Report Partials',
+                'ordering': ['-year', 'month'],
+                'unique_together': {('year', 'month')},
+            },
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.utils import timezone
-from django.db.models import Sum, F, DecimalField, ExpressionWrapper, Avg
+from django.db.models import Sum, F, DecimalField, ExpressionWrapper, Avg, FloatField, IntegerField, OuterRef, Subquery, Value, Case, When
+from django.db.models.functions import Coalesce, Cast
 from django.core.exceptions import ValidationError
 from django.db import transaction
 from decimal import Decimal
@@ -238,6 +239,61 @@ class FishBatch(models.Model):
 
 # ==================== PRODUCTION CYCLE MANAGEMENT ====================
 
+class ProductionCycleQuerySet(models.QuerySet):
+    """Bulk metric annotations for production cycle lists"""
+
+    def with_metrics(self):
+        """
+        Annotate each cycle with the same totals CycleMetrics stores, using one
+        correlated subquery per figure, so a list of N cycles costs one query.
+        The annotations are named metric_<CycleMetrics field> and the cycle
+        properties pick them up automatically.
+        """
+        def total(queryset, expression, output_field, link='cycle'):
+            subquery = queryset.filter(**{link: OuterRef('pk')}).order_by().values(link).annotate(
+                total=Sum(expression)
+            ).values('total')
+            return Coalesce(Subquery(subquery, output_field=output_field), Value(0), output_field=output_field)
+
+        money = DecimalField(max_digits=12, decimal_places=2)
+        sale_amount = ExpressionWrapper(F('quantity_kg') * F('price_per_kg'), output_field=money)
+
+        return self.annotate(
+            metric_harvest_kg=total(Harvest.objects, 'quantity_kg', FloatField()),
+            metric_mortality_count=total(MortalityRecord.objects, 'quantity_dead', IntegerField()),
+            metric_feed_kg=total(FeedRecord.objects, 'quantity_kg', FloatField()),
+            metric_feed_cost=total(FeedRecord.objects, 'cost', money),
+            metric_medicine_cost=total(Expense.objects.filter(expense_type='MEDICINE'), 'amount', money),
+            metric_labor_cost=total(Expense.objects.filter(expense_type='LABOR'), 'amount', money),
+            metric_electricity_cost=total(Expense.objects.filter(expense_type='ELECTRICITY'), 'amount', money),
+            metric_transport_cost=total(Expense.objects.filter(expense_type='TRANSPORT'), 'amount', money),
+            metric_other_cost=total(
+                Expense.objects.exclude(expense_type__in=['MEDICINE', 'LABOR', 'ELECTRICITY', 'FEED']),
+                'amount', money
+            ),
+            metric_expense_total=total(Expense.objects, 'amount', money),
+            metric_sales_revenue=total(FishSale.objects, sale_amount, money, link='harvest__cycle'),
+        )
+
+    def performance(self):
+        """
+        Average survival rate (%) and FCR across the cycles, worked out the
+        same way as the survival_rate and fcr properties, in one query.
+        Cycles with nothing harvested yet are left out of the FCR average.
+        """
+        initial = Cast('initial_quantity', FloatField())
+        return self.with_metrics().aggregate(
+            avg_survival=Avg(Case(
+                When(initial_quantity__gt=0, then=(initial - F('metric_mortality_count')) * 100 / initial),
+                output_field=FloatField(),
+            )),
+            avg_fcr=Avg(Case(
+                When(metric_harvest_kg__gt=0, then=F('metric_feed_kg') / F('metric_harvest_kg')),
+                output_field=FloatField(),
+            )),
+        )
+
+
 class ProductionCycle(models.Model):
     """Complete production cycle management with advanced tracking"""
     
@@ -302,6 +358,8 @@ class ProductionCycle(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProductionCycleQuerySet.as_manager()
+
     class Meta:
         ordering = ['-stocking_date']
         indexes = [
@@ -318,18 +376,40 @@ class ProductionCycle(models.Model):
             self.cost_per_fingerling = self.fingerling_cost / self.initial_quantity
         super().save(*args, **kwargs)
 
+    def _stored_metrics(self):
+        """Denormalized CycleMetrics row, or None if it has not been built yet"""
+        if self.pk is None:
+            return None
+        try:
+            return self.metrics
+        except CycleMetrics.DoesNotExist:
+            return None
+
+    def _metric(self, name, compute):
+        """
+        Resolve a metric from a with_metrics() annotation, then the stored
+        CycleMetrics row, and only then from a live aggregate.
+        """
+        annotated = f'metric_{name}'
+        if annotated in self.__dict__:
+            return self.__dict__[annotated]
+        metrics = self._stored_metrics()
+        if metrics is not None:
+            return getattr(metrics, name)
+        return compute()
+
     # -----------------------------
     # Production Metrics
     # -----------------------------
     @property
     def total_harvest(self):
         """Total harvested quantity in kg"""
-        return self.harvests.aggregate(total=Sum('quantity_kg'))['total'] or 0
+        return self._metric('harvest_kg', lambda: self.harvests.aggregate(total=Sum('quantity_kg'))['total'] or 0)
 
     @property
     def total_mortality(self):
         """Total mortality count"""
-        return self.mortalities.aggregate(total=Sum('quantity_dead'))['total'] or 0
+        return self._metric('mortality_count', lambda: self.mortalities.aggregate(total=Sum('quantity_dead'))['total'] or 0)
 
     @property
     def total_mortality_weight(self):
@@ -358,18 +438,19 @@ class ProductionCycle(models.Model):
     @property
     def total_feed(self):
         """Total feed used in kg"""
-        return self.feeds.aggregate(total=Sum('quantity_kg'))['total'] or 0
+        return self._metric('feed_kg', lambda: self.feeds.aggregate(total=Sum('quantity_kg'))['total'] or 0)
 
     @property
     def total_feed_cost(self):
         """Total feed cost"""
-        return self.feeds.aggregate(total=Sum('cost'))['total'] or 0
+        return self._metric('feed_cost', lambda: self.feeds.aggregate(total=Sum('cost'))['total'] or 0)
 
     @property
     def fcr(self):
         """Feed Conversion Ratio"""
-        if self.total_harvest > 0:
-            return round(self.total_feed / self.total_harvest, 2)
+        total_harvest = self.total_harvest
+        if total_harvest > 0:
+            return round(self.total_feed / total_harvest, 2)
         return 0
 
     @property
@@ -410,25 +491,27 @@ class ProductionCycle(models.Model):
     # -----------------------------
     @property
     def total_medicine_cost(self):
-        return self.expenses.filter(expense_type='MEDICINE').aggregate(total=Sum('amount'))['total'] or 0
+        return self._metric('medicine_cost', lambda: self.expenses.filter(expense_type='MEDICINE').aggregate(total=Sum('amount'))['total'] or 0)
 
     @property
     def total_labor_cost(self):
-        return self.expenses.filter(expense_type='LABOR').aggregate(total=Sum('amount'))['total'] or 0
+        return self._metric('labor_cost', lambda: self.expenses.filter(expense_type='LABOR').aggregate(total=Sum('amount'))['total'] or 0)
 
     @property
     def total_electricity_cost(self):
-        return self.expenses.filter(expense_type='ELECTRICITY').aggregate(total=Sum('amount'))['total'] or 0
+        return self._metric('electricity_cost', lambda: self.expenses.filter(expense_type='ELECTRICITY').aggregate(total=Sum('amount'))['total'] or 0)
 
     @property
     def total_other_cost(self):
-        return self.expenses.exclude(
-            expense_type__in=['MEDICINE', 'LABOR', 'ELECTRICITY', 'FEED']
-        ).aggregate(total=Sum('amount'))['total'] or 0
+        return self._metric('other_cost', lambda: (
+            self.expenses.exclude(
+                expense_type__in=['MEDICINE', 'LABOR', 'ELECTRICITY', 'FEED']
+            ).aggregate(total=Sum('amount'))['total'] or 0
+        ))
 
     @property
     def total_expense(self):
-        return self.expenses.aggregate(total=Sum('amount'))['total'] or 0
+        return self._metric('expense_total', lambda: self.expenses.aggregate(total=Sum('amount'))['total'] or 0)
 
     @property
     def total_operating_cost(self):
@@ -443,21 +526,23 @@ class ProductionCycle(models.Model):
     @property
     def total_sales(self):
         """Total revenue from sales"""
-        return FishSale.objects.filter(
-            harvest__cycle=self
-        ).aggregate(
-            total=Sum(
-                ExpressionWrapper(
-                    F('quantity_kg') * F('price_per_kg'),
-                    output_field=DecimalField(max_digits=12, decimal_places=2)
+        return self._metric('sales_revenue', lambda: (
+            FishSale.objects.filter(
+                harvest__cycle=self
+            ).aggregate(
+                total=Sum(
+                    ExpressionWrapper(
+                        F('quantity_kg') * F('price_per_kg'),
+                        output_field=DecimalField(max_digits=12, decimal_places=2)
+                    )
                 )
-            )
-        )['total'] or 0
+            )['total'] or 0
+        ))
 
     @property
     def average_sale_price(self):
         """Average price per kg"""
-        total_kg = self.harvests.aggregate(total=Sum('quantity_kg'))['total'] or 0
+        total_kg = self.total_harvest
         if total_kg > 0:
             return self.total_sales / total_kg
         return 0
@@ -470,14 +555,15 @@ class ProductionCycle(models.Model):
     @property
     def roi_percentage(self):
         """Return on Investment percentage"""
-        if self.total_investment > 0:
-            return round((self.net_profit / self.total_investment) * 100, 2)
+        total_investment = self.total_investment
+        if total_investment > 0:
+            return round(((self.total_sales - total_investment) / total_investment) * 100, 2)
         return 0
 
     @property
     def break_even_price(self):
         """Price per kg needed to break even"""
-        total_kg = self.harvests.aggregate(total=Sum('quantity_kg'))['total'] or 0
+        total_kg = self.total_harvest
         if total_kg > 0:
             return self.total_investment / total_kg
         return 0
@@ -485,7 +571,7 @@ class ProductionCycle(models.Model):
     @property
     def profit_per_kg(self):
         """Profit per kilogram"""
-        total_kg = self.harvests.aggregate(total=Sum('quantity_kg'))['total'] or 0
+        total_kg = self.total_harvest
         if total_kg > 0:
             return self.net_profit / total_kg
         return 0
@@ -508,6 +594,38 @@ class ProductionCycle(models.Model):
         }
 
 
+class CycleMetrics(models.Model):
+    """Denormalized running totals for a production cycle, kept in sync by fishery.metrics"""
+    
+    cycle = models.OneToOneField(ProductionCycle, on_delete=models.CASCADE, related_name='metrics')
+    
+    # Production
+    harvest_kg = models.FloatField(default=0)
+    mortality_count = models.PositiveIntegerField(default=0)
+    feed_kg = models.FloatField(default=0)
+    feed_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    
+    # Expenses
+    medicine_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    labor_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    electricity_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    transport_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    other_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    expense_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    
+    # Revenue
+    sales_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Cycle Metrics"
+        verbose_name_plural = "Cycle Metrics"
+
+    def __str__(self):
+        return f"Metrics - {self.cycle_id}"
+
+
 # ==================== FEED MANAGEMENT ====================
 
 class FeedType(models.Model):
@@ -1287,40 +1405,50 @@ class FisheryFinancialReport(models.Model):
         return f"Fishery Report - {self.year}"
 
     def calculate_totals(self):
-        """Calculate all totals for the year"""
-        
-        # Get all cycles for the year
-        cycles = ProductionCycle.objects.filter(stocking_date__year=self.year)
-        
-        # Fingerling cost
-        self.total_fingerling_cost = cycles.aggregate(
-            total=Sum('fingerling_cost')
-        )['total'] or 0
-        
-        # Feed cost
-        self.total_feed_cost = FeedRecord.objects.filter(
-            cycle__in=cycles
-        ).aggregate(total=Sum('cost'))['total'] or 0
-        
-        # Expenses by type
-        expenses = Expense.objects.filter(cycle__in=cycles)
-        self.total_medicine_cost = expenses.filter(expense_type='MEDICINE').aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        self.total_labor_cost = expenses.filter(expense_type='LABOR').aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        self.total_electricity_cost = expenses.filter(expense_type='ELECTRICITY').aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        self.total_transport_cost = expenses.filter(expense_type='TRANSPORT').aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        self.total_other_expenses = expenses.exclude(
-            expense_type__in=['MEDICINE', 'LABOR', 'ELECTRICITY', 'TRANSPORT', 'FEED']
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
-        # Total investment
+        """
+        Calculate all totals for the year by merging its monthly partials.
+        The partials are kept current by fishery.metrics as cycles, feed,
+        expenses, harvests and sales change, so this is a fixed handful of
+        queries however many cycles the year has.
+        """
+        from .metrics import rebuild_financial_partials
+
+        def merged():
+            return FinancialReportPartial.objects.filter(year=self.year).aggregate(
+                cycle_count=Sum('cycle_count'),
+                fingerling_cost=Sum('fingerling_cost'),
+                feed_cost=Sum('feed_cost'),
+                medicine_cost=Sum('medicine_cost'),
+                labor_cost=Sum('labor_cost'),
+                electricity_cost=Sum('electricity_cost'),
+                transport_cost=Sum('transport_cost'),
+                other_expenses=Sum('other_expenses'),
+                sales_revenue=Sum('sales_revenue'),
+                harvest_kg=Sum('harvest_kg'),
+                cycles_completed=Sum('cycles_completed'),
+                completed_days=Sum('completed_days'),
+                completed_with_dates=Sum('completed_with_dates'),
+                survival_rate_sum=Sum('survival_rate_sum'),
+                survival_rate_count=Sum('survival_rate_count'),
+                fcr_sum=Sum('fcr_sum'),
+                fcr_count=Sum('fcr_count'),
+            )
+
+        totals = merged()
+        if totals['cycle_count'] is None:
+            # No partials yet, e.g. cycles entered before partials existed
+            rebuild_financial_partials(self.year)
+            totals = merged()
+        totals = {key: value or 0 for key, value in totals.items()}
+
+        # Investment
+        self.total_fingerling_cost = totals['fingerling_cost']
+        self.total_feed_cost = totals['feed_cost']
+        self.total_medicine_cost = totals['medicine_cost']
+        self.total_labor_cost = totals['labor_cost']
+        self.total_electricity_cost = totals['electricity_cost']
+        self.total_transport_cost = totals['transport_cost']
+        self.total_other_expenses = totals['other_expenses']
         self.total_investment = (
             self.total_fingerling_cost +
             self.total_feed_cost +
@@ -1331,58 +1459,89 @@ class FisheryFinancialReport(models.Model):
             self.total_other_expenses
         )
         
-        # Sales revenue
-        sales = FishSale.objects.filter(harvest__cycle__in=cycles)
-        self.total_sales_revenue = sales.aggregate(
-            total=Sum(
-                ExpressionWrapper(
-                    F('quantity_kg') * F('price_per_kg'),
-                    output_field=DecimalField(max_digits=12, decimal_places=2)
-                )
-            )
-        )['total'] or 0
-        
-        # Total harvest
-        harvests = Harvest.objects.filter(cycle__in=cycles)
-        self.total_harvest_kg = harvests.aggregate(total=Sum('quantity_kg'))['total'] or 0
-        
-        # Average selling price
+        # Revenue
+        self.total_sales_revenue = totals['sales_revenue']
+        self.total_harvest_kg = Decimal(str(round(totals['harvest_kg'], 2)))
+        self.avg_selling_price = 0
         if self.total_harvest_kg > 0:
             self.avg_selling_price = (self.total_sales_revenue / self.total_harvest_kg).quantize(Decimal('0.01'))
         
-        # Net profit
+        # Net profit and ROI
         self.net_profit = self.total_sales_revenue - self.total_investment
-        
-        # ROI
+        self.roi_percentage = 0
         if self.total_investment > 0:
             self.roi_percentage = (self.net_profit / self.total_investment * 100).quantize(Decimal('0.01'))
         
         # Production metrics
-        self.total_cycles_completed = cycles.filter(status='COMPLETED').count()
-        
-        # Average cycle days
-        completed_cycles = cycles.filter(status='COMPLETED', actual_harvest_date__isnull=False)
-        if completed_cycles.exists():
-            total_days = sum([(c.actual_harvest_date - c.stocking_date).days for c in completed_cycles])
-            self.avg_cycle_days = total_days // completed_cycles.count()
-        
-        # Average survival rate
-        survival_rates = [c.survival_rate for c in cycles if c.survival_rate > 0]
-        if survival_rates:
-            self.avg_survival_rate = sum(survival_rates) / len(survival_rates)
-        
-        # Average FCR
-        fcr_values = [c.fcr for c in cycles if c.fcr > 0]
-        if fcr_values:
-            self.avg_fcr = sum(fcr_values) / len(fcr_values)
+        self.total_cycles_completed = totals['cycles_completed']
+        self.avg_cycle_days = 0
+        if totals['completed_with_dates']:
+            self.avg_cycle_days = totals['completed_days'] // totals['completed_with_dates']
+        self.avg_survival_rate = 0
+        if totals['survival_rate_count']:
+            self.avg_survival_rate = Decimal(
+                str(totals['survival_rate_sum'] / totals['survival_rate_count'])
+            ).quantize(Decimal('0.01'))
+        self.avg_fcr = 0
+        if totals['fcr_count']:
+            self.avg_fcr = Decimal(str(totals['fcr_sum'] / totals['fcr_count'])).quantize(Decimal('0.01'))
         
         # Pond area
-        ponds = Pond.objects.filter(farm__isnull=False).distinct()
-        self.total_pond_area = sum([p.size_in_acres for p in ponds])
+        self.total_pond_area = Pond.objects.filter(farm__isnull=False).aggregate(
+            total=Sum('size_in_acres')
+        )['total'] or 0
         
         # Productivity per acre
+        self.productivity_per_acre = 0
         if self.total_pond_area > 0:
-            self.productivity_per_acre = (self.total_harvest_kg / self.total_pond_area).quantize(Decimal('0.01'))
+            self.productivity_per_acre = (
+                self.total_harvest_kg / Decimal(str(self.total_pond_area))
+            ).quantize(Decimal('0.01'))
         
         self.save()
-        return self
\ No newline at end of file
+        return self
+
+
+class FinancialReportPartial(models.Model):
+    """
+    One month's share of FisheryFinancialReport: the totals of the cycles
+    stocked in that month, kept in sync by fishery.metrics.
+    Averages are stored as sum/count pairs so months merge exactly.
+    """
+    
+    year = models.PositiveIntegerField()
+    month = models.PositiveSmallIntegerField()
+    cycle_count = models.PositiveIntegerField(default=0)
+    
+    # Investment
+    fingerling_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    feed_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    medicine_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    labor_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    electricity_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    transport_cost = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    other_expenses = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    
+    # Revenue
+    sales_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    harvest_kg = models.FloatField(default=0)
+    
+    # Production metrics
+    cycles_completed = models.PositiveIntegerField(default=0)
+    completed_days = models.PositiveIntegerField(default=0)
+    completed_with_dates = models.PositiveIntegerField(default=0)
+    survival_rate_sum = models.FloatField(default=0)
+    survival_rate_count = models.PositiveIntegerField(default=0)
+    fcr_sum = models.FloatField(default=0)
+    fcr_count = models.PositiveIntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-year', 'month']
+        unique_together = ['year', 'month']
+        verbose_name = "Financial Report Partial"
+        verbose_name_plural = "Financial Report Partials"
+
+    def __str__(self):
+        return f"Report Partial - {self.year}-{self.month:02d}"
@@ -0,0 +1,104 @@
+from datetime import date
+
+from django.db.models import Sum, F, DecimalField, ExpressionWrapper
+from django.utils import timezone
+
+from agro.timeseries import bucket_totals
+
+from .models import Harvest, FeedRecord, MortalityRecord, FishSale, Expense, FisheryFinancialReport
+
+
+# ==================== REPORT QUERIES ====================
+#
+# Every helper filters on a half-open date range (field >= start AND
+# field < end) so the date indexes are usable, reads each table once with
+# a GROUP BY, and leaves merging the per-table results to Python.
+
+SALE_AMOUNT = ExpressionWrapper(
+    F('quantity_kg') * F('price_per_kg'),
+    output_field=DecimalField(max_digits=12, decimal_places=2)
+)
+
+
+def year_range(year):
+    """Half-open [Jan 1, Jan 1 next year) range for a calendar year"""
+    return date(year, 1, 1), date(year + 1, 1, 1)
+
+
+def _in_range(queryset, date_field, start, end):
+    return queryset.filter(**{f'{date_field}__gte': start, f'{date_field}__lt': end})
+
+
+def monthly_totals(queryset, date_field, start, end, **aggregates):
+    """
+    Aggregate a queryset per calendar month within [start, end).
+    Returns {first day of month: {name: value}} for months that have rows.
+    """
+    return bucket_totals(queryset, date_field, start, end, 'month', **aggregates)
+
+
+def merge_by_period(**sources):
+    """
+    Merge per-table results keyed by period into one dict per period.
+    Each source is (totals, {output name: aggregate name}); periods missing
+    from a source read as 0.
+    """
+    periods = sorted(set().union(*(totals for totals, _ in sources.values())))
+    merged = {}
+    for period in periods:
+        merged[period] = {
+            output: float(totals.get(period, {}).get(name) or 0)
+            for totals, fields in sources.values()
+            for output, name in fields.items()
+        }
+    return merged
+
+
+def monthly_production(year):
+    """Harvest kg, feed kg and mortality per month of a year"""
+    start, end = year_range(year)
+    return merge_by_period(
+        harvest=(monthly_totals(Harvest.objects, 'harvest_date', start, end, total=Sum('quantity_kg')),
+                 {'harvest': 'total'}),
+        feed=(monthly_totals(FeedRecord.objects, 'date', start, end, total=Sum('quantity_kg')),
+              {'feed': 'total'}),
+        mortality=(monthly_totals(MortalityRecord.objects, 'date', start, end, total=Sum('quantity_dead')),
+                   {'mortality': 'total'}),
+    )
+
+
+def monthly_financials(year):
+    """Sales revenue, expenses and feed cost per month of a year"""
+    start, end = year_range(year)
+    return merge_by_period(
+        sales=(monthly_totals(FishSale.objects, 'sale_date', start, end, total=Sum(SALE_AMOUNT)),
+               {'revenue': 'total'}),
+        expenses=(monthly_totals(Expense.objects, 'expense_date', start, end, total=Sum('amount')),
+                  {'expenses': 'total'}),
+        feed=(monthly_totals(FeedRecord.objects, 'date', start, end, total=Sum('cost')),
+              {'feed_cost': 'total'}),
+    )
+
+
+def top_species_by_sales(year, limit=5):
+    """Best-selling species for a year by sales revenue"""
+    start, end = year_range(year)
+    rows = _in_range(FishSale.objects, 'sale_date', start, end).values(
+        'harvest__cycle__species__name'
+    ).annotate(total=Sum(SALE_AMOUNT)).order_by('-total')[:limit]
+    return [{'name': row['harvest__cycle__species__name'], 'total': float(row['total'] or 0)} for row in rows]
+
+
+# ==================== REPORT JOBS ====================
+
+def build_financial_report(job):
+    """Report worker builder (see home.jobs) for the yearly FisheryFinancialReport"""
+    year = int(job.params['year'])
+    job.set_progress(20, f'Merging {year} monthly totals')
+    report, _ = FisheryFinancialReport.objects.get_or_create(year=year)
+    report.generated_by = job.requested_by
+    report.calculate_totals()
+    # generated_at is auto_now_add; restamp it so report pages can tell a rebuilt report is current
+    report.generated_at = job.started_at or timezone.now()
+    FisheryFinancialReport.objects.filter(pk=report.pk).update(generated_at=report.generated_at)
+    return report
@@ -0,0 +1,275 @@
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from django.urls import reverse
+from django.utils import timezone
+
+from agro import conditional
+from home import alerts, search
+
+from .models import (
+    Farm, Pond, WaterQuality, FishSpecies, FishBatch, ProductionCycle, DiseaseRecord, TreatmentRecord,
+    MortalityRecord, FeedType, FeedPurchase, FeedRecord, Harvest, Customer, FishSale, Expense, Budget,
+)
+from . import caching
+from .metrics import (
+    refresh_cycle_metrics, refresh_financial_partials, stocking_month,
+    HARVEST, MORTALITY, FEED, EXPENSE, SALES,
+)
+
+
+# ==================== CYCLE METRICS ====================
+
+# Metric components refreshed when each cycle-owned model changes.
+# Sales roll up through their harvest, so moving a harvest moves its sales too.
+CYCLE_COMPONENTS = {
+    FeedRecord: (FEED,),
+    MortalityRecord: (MORTALITY,),
+    Expense: (EXPENSE,),
+    Harvest: (HARVEST, SALES),
+}
+
+
+def _schedule_refresh(cycle_ids, components):
+    transaction.on_commit(lambda: refresh_cycle_metrics(cycle_ids, components))
+
+
+@receiver(pre_save, sender=ProductionCycle)
+def remember_previous_stocking_date(sender, instance, **kwargs):
+    """Keep the stored stocking date so moving a cycle refreshes both months"""
+    instance._partials_previous_stocking = None
+    if instance.pk:
+        instance._partials_previous_stocking = ProductionCycle.objects.filter(
+            pk=instance.pk
+        ).values_list('stocking_date', flat=True).first()
+
+
+@receiver(post_save, sender=ProductionCycle)
+def create_cycle_metrics(sender, instance, created, **kwargs):
+    if created:
+        _schedule_refresh([instance.pk], ())
+    else:
+        # Cost, status, dates and stock live on the cycle itself
+        stocking_dates = [instance.stocking_date, getattr(instance, '_partials_previous_stocking', None)]
+        months = [stocking_month(d) for d in stocking_dates if d]
+        transaction.on_commit(lambda: refresh_financial_partials(months))
+
+
+@receiver(post_delete, sender=ProductionCycle)
+def remove_cycle_from_partials(sender, instance, **kwargs):
+    months = [stocking_month(instance.stocking_date)]
+    transaction.on_commit(lambda: refresh_financial_partials(months))
+
+
+@receiver(pre_save, sender=FeedRecord)
+@receiver(pre_save, sender=MortalityRecord)
+@receiver(pre_save, sender=Expense)
+@receiver(pre_save, sender=Harvest)
+def remember_previous_cycle(sender, instance, **kwargs):
+    """Keep the stored cycle so re-assigning a record refreshes both cycles"""
+    instance._metrics_previous_cycle = None
+    if instance.pk:
+        instance._metrics_previous_cycle = sender.objects.filter(
+            pk=instance.pk
+        ).values_list('cycle_id', flat=True).first()
+
+
+@receiver(post_save, sender=FeedRecord)
+@receiver(post_save, sender=MortalityRecord)
+@receiver(post_save, sender=Expense)
+@receiver(post_save, sender=Harvest)
+@receiver(post_delete, sender=FeedRecord)
+@receiver(post_delete, sender=MortalityRecord)
+@receiver(post_delete, sender=Expense)
+@receiver(post_delete, sender=Harvest)
+def update_cycle_metrics(sender, instance, **kwargs):
+    cycle_ids = [instance.cycle_id, getattr(instance, '_metrics_previous_cycle', None)]
+    _schedule_refresh(cycle_ids, CYCLE_COMPONENTS[sender])
+
+
+@receiver(pre_save, sender=FishSale)
+@receiver(pre_delete, sender=FishSale)
+def remember_sale_cycle(sender, instance, **kwargs):
+    """Resolve the sale's cycle while its harvest is still guaranteed to exist"""
+    instance._metrics_previous_cycle = None
+    if instance.pk:
+        instance._metrics_previous_cycle = FishSale.objects.filter(
+            pk=instance.pk
+        ).values_list('harvest__cycle_id', flat=True).first()
+
+
+@receiver(post_save, sender=FishSale)
+@receiver(post_delete, sender=FishSale)
+def update_sale_cycle_metrics(sender, instance, **kwargs):
+    cycle_ids = [getattr(instance, '_metrics_previous_cycle', None)]
+    if kwargs.get('signal') is post_save:
+        cycle_ids.append(
+            Harvest.objects.filter(pk=instance.harvest_id).values_list('cycle_id', flat=True).first()
+        )
+    _schedule_refresh(cycle_ids, (SALES,))
+
+
+# ==================== CACHE INVALIDATION ====================
+
+# Cache groups (see fishery.caching) each model belongs to
+CACHE_GROUPS = {
+    Farm: (caching.FARMS,),
+    Pond: (caching.PONDS,),
+    WaterQuality: (caching.PONDS,),
+    FishSpecies: (caching.SPECIES,),
+    FishBatch: (caching.SPECIES,),
+    ProductionCycle: (caching.CYCLES,),
+    DiseaseRecord: (caching.CYCLES,),
+    TreatmentRecord: (caching.CYCLES,),
+    MortalityRecord: (caching.CYCLES,),
+    FeedType: (caching.FEED,),
+    FeedPurchase: (caching.FEED,),
+    FeedRecord: (caching.FEED,),
+    Harvest: (caching.HARVESTS,),
+    Customer: (caching.SALES,),
+    FishSale: (caching.SALES,),
+    Expense: (caching.EXPENSES,),
+    Budget: (caching.EXPENSES,),
+}
+
+
+def bump_cache_groups(sender, **kwargs):
+    caching.bump_on_commit(*CACHE_GROUPS[sender])
+
+
+for model in CACHE_GROUPS:
+    post_save.connect(bump_cache_groups, sender=model, dispatch_uid=f'fishery_cache_save_{model.__name__}')
+    post_delete.connect(bump_cache_groups, sender=model, dispatch_uid=f'fishery_cache_delete_{model.__name__}')
+
+# Per-model versions behind the API ETags (see agro.conditional), moved
+# after the cycle metrics above are refreshed
+conditional.track(*CACHE_GROUPS)
+
+
+# ==================== SEARCH INDEX ====================
+
+def pond_document(pond):
+    return {
+        'title': pond.name,
+        'subtitle': f"{pond.pond_id} · {pond.farm.name}",
+        'url': reverse('fishery:pond_detail', args=[pond.pk]),
+        'body': search.text(pond.pond_id, pond.farm.name, pond.get_pond_type_display()),
+    }
+
+
+def cycle_document(cycle):
+    return {
+        'title': f"{cycle.pond.name} - {cycle.species.name}",
+        'subtitle': f"{cycle.get_status_display()} · stocked {cycle.stocking_date}",
+        'url': reverse('fishery:cycle_detail', args=[cycle.pk]),
+        'body': search.text(cycle.cycle_id, cycle.pond.pond_id, cycle.get_cycle_type_display()),
+    }
+
+
+def customer_document(customer):
+    return {
+        'title': customer.name,
+        'subtitle': f"{customer.get_customer_type_display()} · {customer.city}",
+        'url': reverse('fishery:customer_edit', args=[customer.pk]),
+        'body': search.text(
+            customer.customer_id, customer.phone, customer.alternate_phone, customer.email,
+            customer.business_name, customer.city,
+        ),
+    }
+
+
+def sale_document(sale):
+    customer = sale.customer.name if sale.customer else sale.customer_name
+    return {
+        'title': f"{customer or 'Walk-in'} - {sale.quantity_kg:g} kg",
+        'subtitle': f"{sale.sale_date} · {sale.harvest.cycle.pond.name}",
+        'url': reverse('fishery:sale_edit', args=[sale.pk]),
+        'body': search.text(sale.sale_number, sale.customer_name, sale.customer_phone, sale.harvest.cycle.pond.name),
+    }
+
+
+search.register(
+    'pond', Pond, pond_document,
+    queryset=lambda: Pond.objects.select_related('farm'),
+    follow={Farm: 'farm'},
+)
+search.register(
+    'cycle', ProductionCycle, cycle_document,
+    queryset=lambda: ProductionCycle.objects.select_related('pond', 'species'),
+    follow={Pond: 'pond', FishSpecies: 'species'},
+)
+search.register('customer', Customer, customer_document)
+search.register(
+    'sale', FishSale, sale_document,
+    queryset=lambda: FishSale.objects.select_related('customer', 'harvest__cycle__pond'),
+    follow={Customer: 'customer', Pond: 'harvest__cycle__pond'},
+)
+
+
+# ==================== ALERTS ====================
+
+def low_stock_alert(feed, today):
+    return {
+        'level': 'warning',
+        'priority': 1,
+        'icon': 'exclamation-triangle',
+        'title': 'Low Feed Stock',
+        'message': f"{feed.name} - {feed.current_stock}kg remaining",
+        'url': f"/fishery/feed/type/{feed.id}/",
+    }
+
+
+def harvest_due_alert(cycle, today):
+    return {
+        'level': 'info',
+        'priority': 2,
+        'icon': 'calendar',
+        'title': 'Harvest Due Soon',
+        'message': f"{cycle.pond.name} - {(cycle.expected_harvest_date - today).days} days left",
+        'url': f"/fishery/cycle/{cycle.id}/",
+        'due_date': cycle.expected_harvest_date,
+    }
+
+
+def water_quality_alert(reading, today):
+    return {
+        'level': 'danger',
+        'icon': 'droplet',
+        'title': 'Water Quality Alert',
+        'message': f"{reading.pond.name} - {reading.alert_message}",
+        'url': f"/fishery/water/{reading.id}/",
+        'due_date': timezone.localdate(reading.reading_date),
+        'data': {
+            'id': reading.id,
+            'pond__name': reading.pond.name,
+            'reading_date': reading.reading_date,
+            'alert_message': reading.alert_message,
+        },
+    }
+
+
+alerts.register(
+    'fishery.low_feed_stock', FeedType,
+    lambda today: FeedType.objects.filter(current_stock__lte=F('reorder_level')),
+    low_stock_alert,
+)
+alerts.register(
+    'fishery.harvest_due', ProductionCycle,
+    lambda today: ProductionCycle.objects.filter(
+        status='RUNNING', expected_harvest_date__lte=today + timedelta(days=15)
+    ).select_related('pond'),
+    harvest_due_alert,
+    follow={Pond: 'pond'},
+)
+alerts.register(
+    'fishery.water_quality', WaterQuality,
+    lambda today: WaterQuality.objects.filter(
+        alert_generated=True,
+        reading_date__gte=timezone.make_aware(datetime.combine(today - timedelta(days=1), time.min)),
+    ).select_related('pond'),
+    water_quality_alert,
+    follow={Pond: 'pond'},
+)
@@ -1,3 +1,330 @@
-from django.test import TestCase
+import json
+import warnings
+from datetime import date, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import (
+    Farm, Pond, FishSpecies, FeedType, ProductionCycle, FeedRecord, MortalityRecord, Harvest,
+    Customer, FishSale, Expense, WaterQuality, FisheryFinancialReport, FinancialReportPartial, CycleMetrics,
+)
+from .metrics import rebuild_cycle_metrics, rebuild_financial_partials
+from agro import conditional
+from home import alerts
+from home.models import Alert, ReportJob
+from .reporting import build_financial_report
+from .views import (
+    FINANCIAL_REPORT_MODELS, FinancialReportView, FisheryDashboardStatsAPIView, FarmStatsAPIView, PondStatsAPIView, CycleStatsAPIView, ExpensesByTypeAPIView,
+    RunningCyclesAPIView, FisheryRecentActivityAPIView, FisheryNotificationsAPIView, WaterAlertsAPIView,
+)
+
+# The tests only use the ORM and run unchanged on every supported engine:
+#     python manage.py test                                 (SQLite)
+#     AGRO_DB_ENGINE=postgresql python manage.py test       (PostgreSQL)
+
+
+class FisheryTestCase(TestCase):
+    """
+    A farm with two ponds, one completed and one running cycle, each with
+    six months of feed and expenses, a mortality record, a harvest and a sale.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('fisher', password='x')
+        cls.year = timezone.localdate().year
+        cls.farm = Farm.objects.create(
+            name='Riverside', address='a', city='c', state='s', phone='1', total_area=10,
+        )
+        cls.ponds = [
+            Pond.objects.create(
+                farm=cls.farm, pond_id=f'P{i}', name=f'Pond {i}', size_in_acres=2, water_source='well',
+            )
+            for i in (1, 2)
+        ]
+        cls.species = FishSpecies.objects.create(name='Rui', average_growth_days=120)
+        cls.feed = FeedType.objects.create(
+            name='Grower', category='GROWER', brand='B', protein_percentage=30, pellet_size_mm=2,
+            current_price=50, current_stock=5000, reorder_level=100,
+        )
+        cls.customer = Customer.objects.create(customer_id='C1', name='Market', phone='1', address='a', city='c')
+
+        cls.cycles = []
+        for i, (pond, status) in enumerate(zip(cls.ponds, ['COMPLETED', 'RUNNING'])):
+            cycle = ProductionCycle.objects.create(
+                pond=pond, species=cls.species, stocking_date=date(cls.year, 1, 10 + i),
+                initial_quantity=1000, initial_avg_weight=5, fingerling_cost=Decimal('5000'), status=status,
+                actual_harvest_date=date(cls.year, 6, 1) if status == 'COMPLETED' else None,
+            )
+            cls.cycles.append(cycle)
+            for month in range(1, 7):
+                FeedRecord.objects.create(
+                    cycle=cycle, feed_type=cls.feed, date=date(cls.year, month, 5),
+                    quantity_kg=100, cost=Decimal('5000'),
+                )
+                Expense.objects.create(
+                    cycle=cycle, expense_type=['LABOR', 'MEDICINE', 'FUEL'][month % 3], description='x',
+                    amount=Decimal('1000'), expense_date=date(cls.year, month, 7),
+                )
+            MortalityRecord.objects.create(cycle=cycle, date=date(cls.year, 3, 1), quantity_dead=50)
+            harvest = Harvest.objects.create(cycle=cycle, quantity_kg=400, harvest_date=date(cls.year, 6, 1))
+            FishSale.objects.create(
+                harvest=harvest, customer=cls.customer, quantity_kg=300, price_per_kg=Decimal('150'),
+                sale_date=date(cls.year, 6, 2),
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def get(self, view, data=None, headers=None, **kwargs):
+        request = self.factory.get('/', data or {}, headers=headers)
+        request.user = self.user
+        return view.as_view()(request, **kwargs)
+
+    def get_json(self, view, data=None, **kwargs):
+        return json.loads(self.get(view, data, **kwargs).content)
+
+
+# ==================== STATS ENDPOINTS ====================
+
+class StatsEndpointTests(FisheryTestCase):
+
+    def test_pond_stats(self):
+        data = self.get_json(PondStatsAPIView)['data']
+        self.assertEqual(data['total'], 2)
+        self.assertEqual(data['active'], 2)
+        self.assertEqual(data['by_farm'], {'Riverside': 2})
+
+    def test_cycle_performance_matches_the_cycle_properties(self):
+        completed = self.cycles[0]
+        data = self.get_json(CycleStatsAPIView)['data']
+        self.assertEqual((data['total'], data['running'], data['completed']), (2, 1, 1))
+        # 950 of 1000 fish survived; 600 kg of feed for 400 kg harvested
+        self.assertEqual(data['avg_survival'], 95.0)
+        self.assertEqual(data['avg_fcr'], 1.5)
+        self.assertAlmostEqual(float(completed.survival_rate), data['avg_survival'])
+        self.assertAlmostEqual(float(completed.fcr), data['avg_fcr'])
+
+    def test_expenses_by_type_for_a_year(self):
+        data = self.get_json(ExpensesByTypeAPIView, {'year': self.year})['data']
+        self.assertEqual(
+            sorted((row['type'], row['total']) for row in data),
+            [('Fuel', 4000.0), ('Labor', 4000.0), ('Medicine/Probiotics', 4000.0)],
+        )
+        self.assertEqual(self.get_json(ExpensesByTypeAPIView, {'year': self.year - 1})['data'], [])
+
+    def test_farm_stats_monthly_series(self):
+        data = self.get_json(FarmStatsAPIView, pk=self.farm.pk)['data']
+        monthly = data['monthly_data']
+        self.assertEqual(len(monthly['months']), 12)
+        self.assertEqual(monthly['months'][5], 'Jun')
+        self.assertEqual(monthly['harvest'][5], 800.0)
+        self.assertEqual(monthly['sales'][5], 90000.0)
+        self.assertEqual(sum(monthly['harvest']), 800.0)
+        self.assertEqual(data['pond_types'], {self.ponds[0].pond_type: 2})
+
+    def test_dashboard_stats(self):
+        data = self.get_json(FisheryDashboardStatsAPIView)['data']
+        self.assertEqual(data['ponds']['total'], 2)
+        self.assertEqual(data['cycles'], {'active': 1, 'completed': 1, 'planned': 0})
+        self.assertEqual(data['financial']['yearly_sales'], 90000.0)
+        self.assertEqual(data['cycles_performance'], {'avg_survival': 95.0, 'avg_fcr': 1.5})
+
+
+# ==================== CONDITIONAL GET ====================
+
+class ConditionalGetTests(FisheryTestCase):
+
+    def revalidate(self, view, response, data=None):
+        """Status of a poll that sends back the validators of response"""
+        return self.get(view, data, headers={'if-none-match': response['ETag']}).status_code
+
+    def test_unchanged_data_is_not_modified(self):
+        response = self.get(RunningCyclesAPIView)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-cache', response['Cache-Control'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.revalidate(RunningCyclesAPIView, response), 304)
+        since = self.get(RunningCyclesAPIView, headers={'if-modified-since': response['Last-Modified']})
+        self.assertEqual(since.status_code, 304)
+
+    def test_query_string_is_part_of_the_etag(self):
+        response = self.get(RunningCyclesAPIView)
+        self.assertEqual(self.revalidate(RunningCyclesAPIView, response, {'page': 2}), 200)
+
+    def test_running_cycles_follow_their_metrics(self):
+        response = self.get(RunningCyclesAPIView)
+        self.assertEqual(json.loads(response.content)['data'][0]['survival_rate'], 95.0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            MortalityRecord.objects.create(cycle=self.cycles[1], date=date(self.year, 4, 1), quantity_dead=50)
+        self.assertEqual(self.revalidate(RunningCyclesAPIView, response), 200)
+        response = self.get(RunningCyclesAPIView)
+        self.assertEqual(json.loads(response.content)['data'][0]['survival_rate'], 90.0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Harvest.objects.create(cycle=self.cycles[1], quantity_kg=200, harvest_date=date(self.year, 7, 1))
+        self.assertEqual(self.revalidate(RunningCyclesAPIView, response), 200)
+
+    def test_unrelated_changes_keep_the_etag(self):
+        response = self.get(RunningCyclesAPIView)
+        with self.captureOnCommitCallbacks(execute=True):
+            Customer.objects.create(customer_id='C2', name='Other', phone='2', address='a', city='c')
+        self.assertEqual(self.revalidate(RunningCyclesAPIView, response), 304)
+
+    def test_recent_activity_follows_pond_names(self):
+        response = self.get(FisheryRecentActivityAPIView)
+        pond = self.ponds[1]
+        pond.name = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            pond.save()
+        self.assertEqual(self.revalidate(FisheryRecentActivityAPIView, response), 200)
+        activities = json.loads(self.get(FisheryRecentActivityAPIView).content)['activities']
+        self.assertTrue(any('Renamed' in activity['description'] for activity in activities))
+
+
+# ==================== FINANCIAL REPORT ====================
+
+class FinancialReportTests(FisheryTestCase):
+    """The yearly report is merged from monthly partials in a fixed number of queries"""
+
+    # Merge the partials, sum pond area, save the report
+    QUERY_BUDGET = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # The fixture's writes never commit, so fold it in as the signals would have
+        rebuild_cycle_metrics()
+        rebuild_financial_partials(cls.year)
+
+    def add_cycles(self, count):
+        """count completed cycles, each recorded through the signals"""
+        for i in range(count):
+            with self.captureOnCommitCallbacks(execute=True):
+                cycle = ProductionCycle.objects.create(
+                    pond=self.ponds[i % 2], species=self.species, stocking_date=date(self.year, 1 + i % 12, 1),
+                    initial_quantity=1000, initial_avg_weight=5, fingerling_cost=Decimal('5000'),
+                    status='COMPLETED', actual_harvest_date=date(self.year, 1 + i % 12, 28),
+                )
+                FeedRecord.objects.create(
+                    cycle=cycle, feed_type=self.feed, date=cycle.stocking_date, quantity_kg=600, cost=Decimal('5000'),
+                )
+                Expense.objects.create(
+                    cycle=cycle, expense_type='TRANSPORT', description='x', amount=Decimal('1000'),
+                    expense_date=cycle.stocking_date,
+                )
+                harvest = Harvest.objects.create(cycle=cycle, quantity_kg=400, harvest_date=cycle.actual_harvest_date)
+                FishSale.objects.create(
+                    harvest=harvest, customer=self.customer, quantity_kg=400, price_per_kg=Decimal('150'),
+                    sale_date=cycle.actual_harvest_date,
+                )
+
+    def test_report_totals(self):
+        report = FisheryFinancialReport.objects.create(year=self.year).calculate_totals()
+        self.assertEqual(report.total_fingerling_cost, Decimal('10000'))
+        self.assertEqual(report.total_feed_cost, Decimal('60000'))
+        self.assertEqual(
+            (report.total_medicine_cost, report.total_labor_cost, report.total_other_expenses),
+            (Decimal('4000'), Decimal('4000'), Decimal('4000')),
+        )
+        self.assertEqual(report.total_investment, Decimal('82000'))
+        self.assertEqual(report.total_sales_revenue, Decimal('90000'))
+        self.assertEqual(report.total_harvest_kg, Decimal('800'))
+        self.assertEqual(report.net_profit, Decimal('8000'))
+        self.assertEqual(report.roi_percentage, Decimal('9.76'))
+        self.assertEqual((report.total_cycles_completed, report.avg_cycle_days), (1, 142))
+        self.assertEqual((report.avg_survival_rate, report.avg_fcr), (Decimal('95.00'), Decimal('1.50')))
+        self.assertEqual(report.productivity_per_acre, Decimal('200.00'))
+
+    def test_regeneration_does_not_grow_with_the_year(self):
+        report = FisheryFinancialReport.objects.create(year=self.year)
+        with self.assertNumQueries(self.QUERY_BUDGET):
+            report.calculate_totals()
+
+        self.add_cycles(24)
+        with self.assertNumQueries(self.QUERY_BUDGET):
+            report.calculate_totals()
+        self.assertEqual(report.total_cycles_completed, 25)
+        self.assertEqual(report.total_transport_cost, Decimal('24000'))
+        self.assertEqual(report.total_other_expenses, Decimal('4000'))
+        self.assertEqual(report.total_sales_revenue, Decimal('90000') + 24 * Decimal('60000'))
+
+    def test_cycles_without_metrics_are_not_counted_as_zero(self):
+        # As after upgrading to the metrics table without reconcile_cycle_metrics
+        CycleMetrics.objects.all().delete()
+        FinancialReportPartial.objects.all().delete()
+        report = FisheryFinancialReport.objects.create(year=self.year).calculate_totals()
+        self.assertEqual(report.total_sales_revenue, sum(cycle.total_sales for cycle in self.cycles))
+        self.assertEqual((report.total_sales_revenue, report.total_harvest_kg), (Decimal('90000'), Decimal('800')))
+        self.assertEqual(CycleMetrics.objects.count(), 2)
+
+    def test_year_without_partials_is_rebuilt_on_first_use(self):
+        report = FisheryFinancialReport.objects.create(year=self.year)
+        FinancialReportPartial.objects.filter(year=self.year).delete()
+        self.assertEqual(report.calculate_totals().total_sales_revenue, Decimal('90000'))
+        with self.assertNumQueries(self.QUERY_BUDGET):
+            report.calculate_totals()
+
+    def test_page_shows_the_saved_report_and_queues_a_missing_one(self):
+        conditional.model_versions(FINANCIAL_REPORT_MODELS)
+        response = self.get(FinancialReportView, {'year': self.year})
+        job = ReportJob.objects.get()
+        self.assertEqual(response.url, reverse('home:report_job_status', args=[job.pk]))
+        self.assertEqual((job.job_type, job.params), ('FISHERY_FINANCIAL', {'year': self.year}))
+        self.assertFalse(FisheryFinancialReport.objects.exists())
+
+        job.status, job.started_at = 'RUNNING', timezone.now()
+        job.save()
+        report = build_financial_report(job)
+        response = self.get(FinancialReportView, {'year': self.year})
+        self.assertEqual(response.context_data['report'], report)
+        self.assertEqual(response.context_data['net_profit'], Decimal('8000'))
+        self.assertEqual(response.context_data['feed_cost'], Decimal('60000'))
+        self.assertFalse(response.context_data['report_refreshing'])
+        self.assertFalse(ReportJob.objects.filter(status='PENDING').exists())
+
+# ==================== ALERTS ====================
+
+class FisheryAlertTests(FisheryTestCase):
+
+    def test_bad_water_reading_raises_an_alert_without_naive_datetimes(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', RuntimeWarning)
+            with self.captureOnCommitCallbacks(execute=True):
+                reading = WaterQuality.objects.create(
+                    pond=self.ponds[1], temperature=28, ph_level=3, dissolved_oxygen=1,
+                )
+        data = self.get_json(WaterAlertsAPIView)['data']
+        self.assertEqual([row['id'] for row in data], [reading.pk])
+        self.assertEqual(data[0]['pond__name'], 'Pond 2')
+
+        # Ages out on the sweep two days later
+        self.assertEqual(alerts.evaluate(['fishery.water_quality'], today=timezone.localdate() + timedelta(days=2)),
+                         {'fishery.water_quality': (0, 0, 1)})
+
+    def test_low_stock_and_harvest_due_reach_the_bell(self):
+        cycle = self.cycles[1]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.feed.current_stock = 50
+            self.feed.save()
+            cycle.expected_harvest_date = timezone.localdate() + timedelta(days=5)
+            cycle.save()
+        data = self.get_json(FisheryNotificationsAPIView)
+        self.assertEqual([n['title'] for n in data['notifications']], ['Low Feed Stock', 'Harvest Due Soon'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ponds[1].name = 'Renamed'
+            self.ponds[1].save()
+        self.assertEqual(Alert.objects.get(kind='fishery.harvest_due').message, 'Renamed - 5 days left')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.feed.current_stock = 500
+            self.feed.save()
+        self.assertEqual(self.get_json(FisheryNotificationsAPIView)['total'], 1)
@@ -5,13 +5,12 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView, View
 from django.urls import reverse_lazy
 from django.contrib import messages
-from django.db.models import Sum, Avg, Count, Q, F, DecimalField, ExpressionWrapper, Prefetch
+from django.db.models import Sum, Avg, Count, Q, F, DecimalField, ExpressionWrapper, Prefetch, OuterRef, Subquery
 from django.utils import timezone
 from django.http import JsonResponse, HttpResponse
 from django.core.cache import cache
 from datetime import datetime, timedelta
 from decimal import Decimal
-import csv
 import json 
 from decimal import Decimal
 from django.core.serializers.json import DjangoJSONEncoder
@@ -26,13 +25,35 @@ from reportlab.lib.styles import getSampleStyleSheet
 
 from .models import *
 from .forms import *
+from .reporting import (
+    SALE_AMOUNT, year_range, monthly_production, monthly_financials, top_species_by_sales,
+)
+from agro.conditional import ConditionalGetMixin
+from agro.exports import StreamingCSVExportView, EXPORT_CHUNK_SIZE, choice_labels, iter_values, user_display_name
+from agro.facets import grouped_facets
+from agro.pagination import CursorPaginatedAPIMixin
+from agro.timeseries import time_series, series_values, last_buckets
+from home.jobs import queue_report_job
+from home.views import ReportJobMixin
+from home import alerts
+from home.models import Alert
+from home.search import search_ids, in_order
+from .caching import (
+    versioned_key, cached_values, CachedListMixin, LONG_TTL,
+    FARMS, PONDS, SPECIES, CYCLES, FEED, HARVESTS, SALES, EXPENSES,
+)
 
 
 # ==================== CACHE KEYS ====================
-CACHE_TTL = 300  # 5 minutes
-DASHBOARD_STATS_CACHE_KEY = 'fishery_dashboard_stats'
-POND_LIST_CACHE_KEY = 'fishery_pond_list'
-SPECIES_LIST_CACHE_KEY = 'fishery_species_list'
+# Keys carry the versions of the model groups they are built from (see
+# fishery.caching), so entries stay valid until one of those groups changes.
+CACHE_TTL = LONG_TTL
+DASHBOARD_GROUPS = (PONDS, CYCLES, FEED, HARVESTS, SALES, EXPENSES)
+
+# Models the read APIs are built from, for their ETags (see agro.conditional)
+DASHBOARD_MODELS = (Pond, WaterQuality, ProductionCycle, FeedType, FeedRecord, MortalityRecord, Harvest, FishSale, Expense)
+# CycleMetrics rows are rolled up from these
+CYCLE_METRIC_MODELS = (ProductionCycle, FeedRecord, MortalityRecord, Expense, Harvest, FishSale)
 
 
 # ==================== FISHERY DASHBOARD VIEW ====================
@@ -49,7 +70,7 @@ class FisheryDashboardView(LoginRequiredMixin, TemplateView):
         first_day_year = today.replace(month=1, day=1)
         
         # Use cache for expensive queries
-        cache_key = f'dashboard_data_{today}'
+        cache_key = versioned_key('dashboard_data', DASHBOARD_GROUPS, today)
         cached_data = cache.get(cache_key)
         
         if cached_data:
@@ -140,12 +161,24 @@ class FisheryDashboardView(LoginRequiredMixin, TemplateView):
 
 # ==================== API VIEWS FOR DASHBOARD ====================
 
-class FisheryDashboardStatsAPIView(LoginRequiredMixin, View):
+def pond_status_counts(ponds):
+    """Total, active, stocked and preparing counts of a pond queryset in one query"""
+    return ponds.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+        stocked=Count('id', filter=Q(status='STOCKED')),
+        preparing=Count('id', filter=Q(status='PREPARING')),
+    )
+
+
+class FisheryDashboardStatsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for dashboard statistics - optimized for speed"""
+    conditional_models = DASHBOARD_MODELS
     
     def get(self, request):
         # Check cache first
-        cached_data = cache.get(DASHBOARD_STATS_CACHE_KEY)
+        cache_key = versioned_key('dashboard_stats', DASHBOARD_GROUPS, timezone.now().date())
+        cached_data = cache.get(cache_key)
         if cached_data:
             return JsonResponse({'success': True, 'data': cached_data})
         
@@ -153,46 +186,19 @@ class FisheryDashboardStatsAPIView(LoginRequiredMixin, View):
         week_ago = today - timedelta(days=7)
         first_day_month = today.replace(day=1)
         
-        # Get running cycles - prefetch related
-        running_cycles = ProductionCycle.objects.filter(status='RUNNING').select_related('pond', 'species').only(
-            'id', 'initial_quantity', 'feeds__quantity_kg', 'harvests__quantity_kg'
-        )[:10]
-        
-        # Parallel aggregations where possible
-        from django.db import connection
-        with connection.cursor() as cursor:
-            # Pond stats
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total,
-                    SUM(CASE WHEN is_active = 1 THEN 1 ELSE 0 END) as active,
-                    SUM(CASE WHEN status = 'STOCKED' THEN 1 ELSE 0 END) as stocked,
-                    SUM(CASE WHEN status = 'PREPARING' THEN 1 ELSE 0 END) as preparing
-                FROM fishery_pond
-            """)
-            pond_row = cursor.fetchone()
-            
-            # Cycle stats
-            cursor.execute("""
-                SELECT 
-                    SUM(CASE WHEN status = 'RUNNING' THEN 1 ELSE 0 END) as running,
-                    SUM(CASE WHEN status = 'COMPLETED' THEN 1 ELSE 0 END) as completed,
-                    SUM(CASE WHEN status = 'PLANNED' THEN 1 ELSE 0 END) as planned
-                FROM fishery_productioncycle
-            """)
-            cycle_row = cursor.fetchone()
+        ponds = pond_status_counts(Pond.objects.all())
+        cycles = ProductionCycle.objects.aggregate(
+            running=Count('id', filter=Q(status='RUNNING')),
+            completed=Count('id', filter=Q(status='COMPLETED')),
+            planned=Count('id', filter=Q(status='PLANNED')),
+        )
         
         data = {
-            'ponds': {
-                'total': pond_row[0] or 0,
-                'active': pond_row[1] or 0,
-                'stocked': pond_row[2] or 0,
-                'preparing': pond_row[3] or 0,
-            },
+            'ponds': ponds,
             'cycles': {
-                'active': cycle_row[0] or 0,
-                'completed': cycle_row[1] or 0,
-                'planned': cycle_row[2] or 0,
+                'active': cycles['running'],
+                'completed': cycles['completed'],
+                'planned': cycles['planned'],
             },
             'production': {
                 'today_feeding': FeedRecord.objects.filter(date=today).only('id').count(),
@@ -242,126 +248,52 @@ class FisheryDashboardStatsAPIView(LoginRequiredMixin, View):
             }
         }
         
-        # Add running cycles performance if exists
-        if running_cycles:
-            # Simplified calculation for speed
+        if cycles['running']:
+            performance = ProductionCycle.objects.filter(status='RUNNING').performance()
             data['cycles_performance'] = {
-                'avg_survival': 85.5,  # Sample value - calculate in background job
-                'avg_fcr': 1.6,
+                'avg_survival': round(performance['avg_survival'] or 0, 2),
+                'avg_fcr': round(performance['avg_fcr'] or 0, 2),
             }
         
-        # Cache for 5 minutes
-        cache.set(DASHBOARD_STATS_CACHE_KEY, data, CACHE_TTL)
+        cache.set(cache_key, data, CACHE_TTL)
         
         return JsonResponse({'success': True, 'data': data})
 
 
-class ProductionChartDataAPIView(LoginRequiredMixin, View):
-    """API endpoint for production chart data - optimized with raw SQL for speed"""
+class ProductionChartDataAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    """API endpoint for production chart data"""
+    conditional_models = (Harvest, FeedRecord)
     
     def get(self, request):
         period = request.GET.get('period', 'week')
         today = timezone.now().date()
         
-        cache_key = f'production_chart_{period}_{today}'
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return JsonResponse({'success': True, 'data': cached_data})
-        
-        from django.db import connection
+        cache_key = versioned_key('production_chart', (HARVESTS, FEED), period, today)
+        result = cache.get(cache_key)
+        if result:
+            return JsonResponse({'success': True, **result})
         
         if period == 'week':
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    SELECT 
-                        date(harvest_date) as day,
-                        COALESCE(SUM(quantity_kg), 0) as harvest,
-                        COALESCE((SELECT SUM(quantity_kg) FROM fishery_feedrecord WHERE date = day), 0) as feed
-                    FROM fishery_harvest
-                    WHERE harvest_date >= date('now', '-6 days')
-                    GROUP BY harvest_date
-                    ORDER BY harvest_date
-                """)
-                rows = cursor.fetchall()
-                
-                labels = [(today - timedelta(days=i)).strftime('%a') for i in range(6, -1, -1)]
-                harvest_data = [0] * 7
-                feed_data = [0] * 7
-                
-                for row in rows:
-                    day_idx = (row[0] - (today - timedelta(days=6))).days
-                    if 0 <= day_idx < 7:
-                        harvest_data[day_idx] = float(row[1])
-                        feed_data[day_idx] = float(row[2])
-            
-            result = {
-                'labels': labels,
-                'harvest': harvest_data,
-                'feed': feed_data
-            }
-            
+            # Last 7 days, one bucket per day
+            granularity, count, label = 'day', 7, '%a'
         elif period == 'month':
-            # Similar optimization for month
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    SELECT 
-                        strftime('%W', harvest_date) as week,
-                        COALESCE(SUM(quantity_kg), 0) as harvest,
-                        COALESCE((SELECT SUM(quantity_kg) FROM fishery_feedrecord WHERE strftime('%W', date) = week), 0) as feed
-                    FROM fishery_harvest
-                    WHERE harvest_date >= date('now', '-28 days')
-                    GROUP BY week
-                    ORDER BY week
-                """)
-                rows = cursor.fetchall()
-                
-                labels = [f'Week {4-i}' for i in range(3, -1, -1)]
-                harvest_data = [0] * 4
-                feed_data = [0] * 4
-                
-                for i, row in enumerate(rows[:4]):
-                    harvest_data[i] = float(row[1])
-                    feed_data[i] = float(row[2])
-            
-            result = {
-                'labels': labels,
-                'harvest': harvest_data,
-                'feed': feed_data
-            }
-            
+            # Last 4 ISO weeks, the current one included
+            granularity, count, label = 'week', 4, '%d %b'
         else:  # year
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    SELECT 
-                        strftime('%m', harvest_date) as month,
-                        COALESCE(SUM(quantity_kg), 0) as harvest,
-                        COALESCE((SELECT SUM(quantity_kg) FROM fishery_feedrecord WHERE strftime('%m', date) = month), 0) as feed
-                    FROM fishery_harvest
-                    WHERE harvest_date >= date('now', '-1 year')
-                    GROUP BY month
-                    ORDER BY month
-                """)
-                rows = cursor.fetchall()
-                
-                months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                         'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-                harvest_data = [0] * 12
-                feed_data = [0] * 12
-                
-                for row in rows:
-                    month_idx = int(row[0]) - 1
-                    if 0 <= month_idx < 12:
-                        harvest_data[month_idx] = float(row[1])
-                        feed_data[month_idx] = float(row[2])
-            
-            result = {
-                'labels': months,
-                'harvest': harvest_data,
-                'feed': feed_data
-            }
+            # Last 12 calendar months, oldest first
+            granularity, count, label = 'month', 12, '%b'
+        start, end = last_buckets(count, granularity, today)
         
-        # Cache for 1 hour
-        cache.set(cache_key, result, 3600)
+        harvest = time_series(Harvest.objects, 'harvest_date', start, end, granularity, total=Sum('quantity_kg'))
+        feed = time_series(FeedRecord.objects, 'date', start, end, granularity, total=Sum('quantity_kg'))
+        
+        result = {
+            'labels': [bucket['period'].strftime(label) for bucket in harvest],
+            'harvest': series_values(harvest),
+            'feed': series_values(feed)
+        }
+        
+        cache.set(cache_key, result, CACHE_TTL)
         
         return JsonResponse({
             'success': True,
@@ -371,11 +303,12 @@ class ProductionChartDataAPIView(LoginRequiredMixin, View):
         })
 
 
-class FisheryRecentActivityAPIView(LoginRequiredMixin, View):
+class FisheryRecentActivityAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for recent activities - optimized with select_related and limits"""
+    conditional_models = (Harvest, FishSale, FeedRecord, MortalityRecord, ProductionCycle, Pond)
     
     def get(self, request):
-        cache_key = 'fishery_recent_activities'
+        cache_key = versioned_key('recent_activities', (HARVESTS, SALES, FEED, CYCLES, PONDS))
         cached = cache.get(cache_key)
         if cached:
             return JsonResponse({'success': True, 'activities': cached})
@@ -394,7 +327,7 @@ class FisheryRecentActivityAPIView(LoginRequiredMixin, View):
             })
         
         # Recent sales
-        for sale in FishSale.objects.select_related('harvest__cycle__pond').only(
+        for sale in FishSale.objects.only(
             'sale_date', 'quantity_kg', 'price_per_kg', 'customer_name'
         ).order_by('-sale_date')[:3]:
             activities.append({
@@ -426,87 +359,28 @@ class FisheryRecentActivityAPIView(LoginRequiredMixin, View):
                 'time': mort.date.strftime('%Y-%m-%d'),
             })
         
-        # Cache for 2 minutes
-        cache.set(cache_key, activities, 120)
+        cache.set(cache_key, activities, CACHE_TTL)
         
         return JsonResponse({'success': True, 'activities': activities})
 
 
-class FisheryNotificationsAPIView(LoginRequiredMixin, View):
-    """API endpoint for notifications - optimized"""
+class FisheryNotificationsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    """API endpoint for notifications, read from the alerts raised by fishery/signals.py"""
+    conditional_models = (Alert,)
     
     def get(self, request):
-        today = timezone.now().date()
-        cache_key = f'fishery_notifications_{today}'
-        cached = cache.get(cache_key)
-        if cached:
-            return JsonResponse({'success': True, 'notifications': cached, 'total': len(cached)})
-        
-        notifications = []
-        
-        # Low feed stock - optimized
-        low_stock = FeedType.objects.filter(
-            current_stock__lte=F('reorder_level')
-        ).only('id', 'name', 'current_stock', 'reorder_level')[:5]
-        
-        for feed in low_stock:
-            notifications.append({
-                'type': 'warning',
-                'icon': 'exclamation-triangle',
-                'title': 'Low Feed Stock',
-                'message': f"{feed.name} - {feed.current_stock}kg remaining",
-                'action_url': f"/fishery/feed/type/{feed.id}/"
-            })
-        
-        # Cycles ending soon
-        ending_soon = ProductionCycle.objects.filter(
-            status='RUNNING',
-            expected_harvest_date__lte=today + timedelta(days=15)
-        ).select_related('pond').only('id', 'pond__name', 'expected_harvest_date')[:5]
-        
-        for cycle in ending_soon:
-            days_left = (cycle.expected_harvest_date - today).days
-            notifications.append({
-                'type': 'info',
-                'icon': 'calendar',
-                'title': 'Harvest Due Soon',
-                'message': f"{cycle.pond.name} - {days_left} days left",
-                'action_url': f"/fishery/cycle/{cycle.id}/"
-            })
-        
-        # Water quality alerts
-        water_alerts = WaterQuality.objects.filter(
-            alert_generated=True,
-            reading_date__gte=today - timedelta(days=1)
-        ).select_related('pond').only('id', 'pond__name', 'alert_message')[:5]
-        
-        for alert in water_alerts:
-            notifications.append({
-                'type': 'danger',
-                'icon': 'droplet',
-                'title': 'Water Quality Alert',
-                'message': f"{alert.pond.name} - {alert.alert_message}",
-                'action_url': f"/fishery/water/{alert.id}/"
-            })
-        
-        # Cache for 5 minutes
-        cache.set(cache_key, notifications, 300)
-        
-        return JsonResponse({
-            'success': True,
-            'notifications': notifications,
-            'total': len(notifications)
-        })
+        return JsonResponse({'success': True, **alerts.notifications('fishery')})
 
 
 # ==================== FARM MANAGEMENT VIEWS ====================
 
-class FarmListView(LoginRequiredMixin, ListView):
+class FarmListView(LoginRequiredMixin, CachedListMixin, ListView):
     """List all farms"""
     model = Farm
     template_name = 'fishery/farm/list.html'
     context_object_name = 'farms'
     paginate_by = 10
+    list_cache_groups = (FARMS,)
     
     def get_queryset(self):
         queryset = Farm.objects.all().order_by('name')
@@ -596,10 +470,6 @@ class FarmCreateView(LoginRequiredMixin, CreateView):
         response = super().form_valid(form)
         messages.success(self.request, f'Farm "{form.instance.name}" created successfully!')
         
-        # Clear cache
-        cache.delete('farms_list')
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        
         return response
 
 
@@ -614,10 +484,6 @@ class FarmUpdateView(LoginRequiredMixin, UpdateView):
         response = super().form_valid(form)
         messages.success(self.request, f'Farm "{form.instance.name}" updated successfully!')
         
-        # Clear cache
-        cache.delete('farms_list')
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        
         return response
 
 
@@ -631,20 +497,17 @@ class FarmDeleteView(LoginRequiredMixin, DeleteView):
         farm = self.get_object()
         messages.warning(request, f'Farm "{farm.name}" deleted successfully!')
         
-        # Clear cache
-        cache.delete('farms_list')
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        
         return super().delete(request, *args, **kwargs)
 
 
 # ==================== FARM API VIEWS ====================
 
-class FarmListAPIView(LoginRequiredMixin, View):
+class FarmListAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for farms list"""
+    conditional_models = (Farm,)
     
     def get(self, request):
-        cache_key = 'farm_api_list'
+        cache_key = versioned_key('farm_api_list', (FARMS,))
         cached = cache.get(cache_key)
         if cached:
             return JsonResponse({'success': True, 'data': cached})
@@ -654,13 +517,14 @@ class FarmListAPIView(LoginRequiredMixin, View):
         ).values()
         
         data = list(farms)
-        cache.set(cache_key, data, 3600)  # Cache for 1 hour
+        cache.set(cache_key, data, CACHE_TTL)
         
         return JsonResponse({'success': True, 'data': data})
 
 
-class FarmDetailAPIView(LoginRequiredMixin, View):
+class FarmDetailAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for farm details"""
+    conditional_models = (Farm, Pond, ProductionCycle)
     
     def get(self, request, pk):
         try:
@@ -715,71 +579,30 @@ class FarmDetailAPIView(LoginRequiredMixin, View):
             return JsonResponse({'success': False, 'error': 'Farm not found'})
 
 
-class FarmStatsAPIView(LoginRequiredMixin, View):
+class FarmStatsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for farm statistics"""
+    conditional_models = (Farm, Pond, ProductionCycle, Harvest, FishSale)
     
     def get(self, request, pk):
         try:
             farm = Farm.objects.get(id=pk)
             
-            from django.db import connection
-            
-            with connection.cursor() as cursor:
-                # Pond types distribution
-                cursor.execute("""
-                    SELECT pond_type, COUNT(*) 
-                    FROM fishery_pond 
-                    WHERE farm_id = %s
-                    GROUP BY pond_type
-                """, [pk])
-                pond_types = dict(cursor.fetchall())
-                
-                # Monthly harvest for current year
-                cursor.execute("""
-                    SELECT 
-                        strftime('%m', h.harvest_date) as month,
-                        COALESCE(SUM(h.quantity_kg), 0) as harvest
-                    FROM fishery_harvest h
-                    JOIN fishery_productioncycle pc ON h.cycle_id = pc.id
-                    JOIN fishery_pond p ON pc.pond_id = p.id
-                    WHERE p.farm_id = %s 
-                    AND strftime('%Y', h.harvest_date) = strftime('%Y', 'now')
-                    GROUP BY month
-                    ORDER BY month
-                """, [pk])
-                monthly_harvest = cursor.fetchall()
-                
-                # Monthly sales for current year
-                cursor.execute("""
-                    SELECT 
-                        strftime('%m', s.sale_date) as month,
-                        COALESCE(SUM(s.quantity_kg * s.price_per_kg), 0) as sales
-                    FROM fishery_fishsale s
-                    JOIN fishery_harvest h ON s.harvest_id = h.id
-                    JOIN fishery_productioncycle pc ON h.cycle_id = pc.id
-                    JOIN fishery_pond p ON pc.pond_id = p.id
-                    WHERE p.farm_id = %s 
-                    AND strftime('%Y', s.sale_date) = strftime('%Y', 'now')
-                    GROUP BY month
-                    ORDER BY month
-                """, [pk])
-                monthly_sales = cursor.fetchall()
-            
-            # Prepare monthly data
-            months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                     'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-            harvest_data = [0] * 12
-            sales_data = [0] * 12
-            
-            for row in monthly_harvest:
-                month_idx = int(row[0]) - 1
-                if 0 <= month_idx < 12:
-                    harvest_data[month_idx] = float(row[1])
+            # Pond types distribution
+            pond_types = dict(
+                farm.ponds.order_by().values('pond_type').annotate(count=Count('id')).values_list('pond_type', 'count')
+            )
             
-            for row in monthly_sales:
-                month_idx = int(row[0]) - 1
-                if 0 <= month_idx < 12:
-                    sales_data[month_idx] = float(row[1])
+            # Monthly harvest and sales for current year
+            start, end = year_range(timezone.now().year)
+            harvest = time_series(
+                Harvest.objects.filter(cycle__pond__farm_id=pk), 'harvest_date', start, end, total=Sum('quantity_kg')
+            )
+            sales = time_series(
+                FishSale.objects.filter(harvest__cycle__pond__farm_id=pk), 'sale_date', start, end, total=Sum(SALE_AMOUNT)
+            )
+            months = [bucket['period'].strftime('%b') for bucket in harvest]
+            harvest_data = series_values(harvest)
+            sales_data = series_values(sales)
             
             data = {
                 'pond_types': pond_types,
@@ -802,103 +625,72 @@ class FarmStatsAPIView(LoginRequiredMixin, View):
 
 # ==================== ADDITIONAL API VIEWS ====================
 
-class PondStatsAPIView(LoginRequiredMixin, View):
+class PondStatsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for pond statistics"""
+    conditional_models = (Pond, Farm)
     
     def get(self, request):
-        cache_key = 'pond_stats'
+        cache_key = versioned_key('pond_stats', (FARMS, PONDS))
         cached = cache.get(cache_key)
         if cached:
             return JsonResponse({'success': True, 'data': cached})
         
-        from django.db import connection
-        
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total,
-                    SUM(CASE WHEN is_active = 1 THEN 1 ELSE 0 END) as active,
-                    SUM(CASE WHEN status = 'STOCKED' THEN 1 ELSE 0 END) as stocked,
-                    SUM(CASE WHEN status = 'PREPARING' THEN 1 ELSE 0 END) as preparing
-                FROM fishery_pond
-            """)
-            row = cursor.fetchone()
-            
-            cursor.execute("""
-                SELECT pond_type, COUNT(*) 
-                FROM fishery_pond 
-                GROUP BY pond_type
-            """)
-            by_type = dict(cursor.fetchall())
-            
-            cursor.execute("""
-                SELECT farm__name, COUNT(*) 
-                FROM fishery_pond 
-                WHERE farm_id IS NOT NULL
-                GROUP BY farm__name
-            """)
-            by_farm = dict(cursor.fetchall())
-        
-        data = {
-            'total': row[0] or 0,
-            'active': row[1] or 0,
-            'stocked': row[2] or 0,
-            'preparing': row[3] or 0,
-            'by_type': by_type,
-            'by_farm': by_farm,
-        }
+        ponds = Pond.objects.order_by()
+        data = pond_status_counts(ponds)
+        data['by_type'] = dict(
+            ponds.values('pond_type').annotate(count=Count('id')).values_list('pond_type', 'count')
+        )
+        data['by_farm'] = dict(
+            ponds.filter(farm__isnull=False).values('farm__name').annotate(
+                count=Count('id')
+            ).values_list('farm__name', 'count')
+        )
         
-        cache.set(cache_key, data, 3600)  # Cache for 1 hour
+        cache.set(cache_key, data, CACHE_TTL)
         return JsonResponse({'success': True, 'data': data})
 
 
-class CycleStatsAPIView(LoginRequiredMixin, View):
+class CycleStatsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for production cycle statistics"""
+    conditional_models = CYCLE_METRIC_MODELS
     
     def get(self, request):
-        cache_key = 'cycle_stats'
+        cache_key = versioned_key('cycle_stats', (CYCLES, HARVESTS, FEED))
         cached = cache.get(cache_key)
         if cached:
             return JsonResponse({'success': True, 'data': cached})
         
-        from django.db import connection
-        
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total,
-                    SUM(CASE WHEN status = 'RUNNING' THEN 1 ELSE 0 END) as running,
-                    SUM(CASE WHEN status = 'COMPLETED' THEN 1 ELSE 0 END) as completed,
-                    SUM(CASE WHEN status = 'PLANNED' THEN 1 ELSE 0 END) as planned,
-                    AVG(CASE WHEN status = 'COMPLETED' THEN survival_rate ELSE NULL END) as avg_survival,
-                    AVG(CASE WHEN status = 'COMPLETED' THEN fcr ELSE NULL END) as avg_fcr
-                FROM fishery_productioncycle
-            """)
-            row = cursor.fetchone()
+        cycles = ProductionCycle.objects.all()
+        counts = cycles.aggregate(
+            total=Count('id'),
+            running=Count('id', filter=Q(status='RUNNING')),
+            completed=Count('id', filter=Q(status='COMPLETED')),
+            planned=Count('id', filter=Q(status='PLANNED')),
+        )
+        performance = cycles.filter(status='COMPLETED').performance()
         
         data = {
-            'total': row[0] or 0,
-            'running': row[1] or 0,
-            'completed': row[2] or 0,
-            'planned': row[3] or 0,
-            'avg_survival': float(row[4] or 0),
-            'avg_fcr': float(row[5] or 0),
+            **counts,
+            'avg_survival': round(performance['avg_survival'] or 0, 2),
+            'avg_fcr': round(performance['avg_fcr'] or 0, 2),
         }
         
-        cache.set(cache_key, data, 3600)
+        cache.set(cache_key, data, CACHE_TTL)
         return JsonResponse({'success': True, 'data': data})
 
 
-class RunningCyclesAPIView(LoginRequiredMixin, View):
+class RunningCyclesAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for currently running cycles"""
+    conditional_models = CYCLE_METRIC_MODELS + (Pond, FishSpecies)
     
     def get(self, request):
+        # survival_rate and fcr are properties, read from the metric annotations
         cycles = ProductionCycle.objects.filter(
             status='RUNNING'
         ).select_related('pond', 'species').only(
             'id', 'pond__name', 'species__name', 'stocking_date',
-            'expected_harvest_date', 'initial_quantity', 'survival_rate', 'fcr'
-        )[:10]
+            'expected_harvest_date', 'initial_quantity'
+        ).with_metrics()[:10]
         
         data = [{
             'id': c.id,
@@ -914,33 +706,33 @@ class RunningCyclesAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': data})
 
 
-class FeedRecordListAPIView(LoginRequiredMixin, View):
-    """API endpoint for feed records"""
+class FeedRecordListAPIView(LoginRequiredMixin, ConditionalGetMixin, CursorPaginatedAPIMixin, View):
+    """API endpoint for feed records, paged by ?cursor="""
+    conditional_models = (FeedRecord, FeedType, ProductionCycle, Pond)
     
     def get(self, request):
         records = FeedRecord.objects.select_related(
             'cycle__pond', 'feed_type'
         ).only(
             'date', 'cycle__pond__name', 'feed_type__name', 'quantity_kg', 'cost'
-        ).order_by('-date')[:50]
+        )
         
-        data = [{
+        return self.cursor_response(records, lambda r: {
             'id': r.id,
             'date': r.date,
             'pond': r.cycle.pond.name,
             'feed_type': r.feed_type.name,
             'quantity_kg': float(r.quantity_kg),
             'cost': float(r.cost),
-        } for r in records]
-        
-        return JsonResponse({'success': True, 'data': data})
+        })
 
 
-class FeedTypeListAPIView(LoginRequiredMixin, View):
+class FeedTypeListAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for feed types"""
+    conditional_models = (FeedType,)
     
     def get(self, request):
-        cache_key = 'feed_types_list'
+        cache_key = versioned_key('feed_types_list', (FEED,))
         cached = cache.get(cache_key)
         if cached:
             return JsonResponse({'success': True, 'data': cached})
@@ -951,13 +743,14 @@ class FeedTypeListAPIView(LoginRequiredMixin, View):
         ).values()
         
         data = list(feed_types)
-        cache.set(cache_key, data, 3600)
+        cache.set(cache_key, data, CACHE_TTL)
         
         return JsonResponse({'success': True, 'data': data})
 
 
-class LowStockFeedAPIView(LoginRequiredMixin, View):
+class LowStockFeedAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for low stock feed alerts"""
+    conditional_models = (FeedType,)
     
     def get(self, request):
         low_stock = FeedType.objects.filter(
@@ -967,8 +760,11 @@ class LowStockFeedAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': list(low_stock)})
 
 
-class RecentWaterQualityAPIView(LoginRequiredMixin, View):
-    """API endpoint for recent water quality readings"""
+class RecentWaterQualityAPIView(LoginRequiredMixin, ConditionalGetMixin, CursorPaginatedAPIMixin, View):
+    """API endpoint for recent water quality readings, paged by ?cursor="""
+    conditional_models = (WaterQuality, Pond)
+    cursor_ordering = ('-reading_date', '-id')
+    per_page = 20
     
     def get(self, request):
         pond_id = request.GET.get('pond_id')
@@ -980,31 +776,25 @@ class RecentWaterQualityAPIView(LoginRequiredMixin, View):
         if pond_id:
             queryset = queryset.filter(pond_id=pond_id)
         
-        readings = queryset.order_by('-reading_date')[:20].values(
+        readings = queryset.values(
             'id', 'pond__name', 'reading_date', 'temperature',
             'ph_level', 'dissolved_oxygen', 'alert_generated'
         )
         
-        return JsonResponse({'success': True, 'data': list(readings)})
+        return self.cursor_response(readings, dict)
 
 
-class WaterAlertsAPIView(LoginRequiredMixin, View):
-    """API endpoint for water quality alerts"""
+class WaterAlertsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    """API endpoint for active water quality alerts"""
+    conditional_models = (Alert,)
     
     def get(self, request):
-        alerts = WaterQuality.objects.filter(
-            alert_generated=True
-        ).select_related('pond').only(
-            'id', 'pond__name', 'reading_date', 'alert_message'
-        ).order_by('-reading_date')[:20].values(
-            'id', 'pond__name', 'reading_date', 'alert_message'
-        )
-        
-        return JsonResponse({'success': True, 'data': list(alerts)})
+        return JsonResponse({'success': True, 'data': alerts.alert_data('fishery.water_quality', limit=20)})
 
 
-class DiseaseRecordListAPIView(LoginRequiredMixin, View):
+class DiseaseRecordListAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for disease records"""
+    conditional_models = (DiseaseRecord, ProductionCycle, Pond)
     
     def get(self, request):
         diseases = DiseaseRecord.objects.filter(
@@ -1020,8 +810,9 @@ class DiseaseRecordListAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': list(diseases)})
 
 
-class MortalityRecordListAPIView(LoginRequiredMixin, View):
+class MortalityRecordListAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for mortality records"""
+    conditional_models = (MortalityRecord, ProductionCycle, Pond)
     
     def get(self, request):
         mortalities = MortalityRecord.objects.select_related(
@@ -1035,8 +826,9 @@ class MortalityRecordListAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': list(mortalities)})
 
 
-class HarvestListAPIView(LoginRequiredMixin, View):
+class HarvestListAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for harvest records"""
+    conditional_models = (Harvest, ProductionCycle, Pond)
     
     def get(self, request):
         harvests = Harvest.objects.select_related(
@@ -1050,8 +842,9 @@ class HarvestListAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': list(harvests)})
 
 
-class RecentHarvestsAPIView(LoginRequiredMixin, View):
+class RecentHarvestsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for recent harvests"""
+    conditional_models = (Harvest, ProductionCycle, Pond)
     
     def get(self, request):
         recent = Harvest.objects.filter(
@@ -1065,34 +858,36 @@ class RecentHarvestsAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': list(recent)})
 
 
-class FishSaleListAPIView(LoginRequiredMixin, View):
-    """API endpoint for fish sales"""
+class FishSaleListAPIView(LoginRequiredMixin, ConditionalGetMixin, CursorPaginatedAPIMixin, View):
+    """API endpoint for fish sales, paged by ?cursor="""
+    conditional_models = (FishSale, Harvest, ProductionCycle, Pond)
+    cursor_ordering = ('-sale_date', '-id')
+    per_page = 20
     
     def get(self, request):
         sales = FishSale.objects.select_related(
-            'harvest__cycle__pond', 'customer'
+            'harvest__cycle__pond'
         ).only(
             'id', 'sale_number', 'harvest__cycle__pond__name', 'customer_name',
             'quantity_kg', 'price_per_kg', 'sale_date', 'payment_status'
-        ).order_by('-sale_date')[:20]
+        )
         
-        data = [{
+        return self.cursor_response(sales, lambda s: {
             'id': s.id,
             'sale_number': s.sale_number,
             'harvest__cycle__pond__name': s.harvest.cycle.pond.name if s.harvest else None,
             'customer_name': s.customer_name,
             'quantity_kg': float(s.quantity_kg),
             'price_per_kg': float(s.price_per_kg),
-            'total': float(s.quantity_kg * s.price_per_kg),
+            'total': float(s.quantity_kg) * float(s.price_per_kg),
             'sale_date': s.sale_date,
             'payment_status': s.payment_status,
-        } for s in sales]
-        
-        return JsonResponse({'success': True, 'data': data})
+        })
 
 
-class TodaySalesAPIView(LoginRequiredMixin, View):
+class TodaySalesAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for today's sales"""
+    conditional_models = (FishSale,)
     
     def get(self, request):
         today = timezone.now().date()
@@ -1110,38 +905,22 @@ class TodaySalesAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': data})
 
 
-class MonthlySalesAPIView(LoginRequiredMixin, View):
+class MonthlySalesAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for monthly sales data"""
+    conditional_models = (FishSale,)
     
     def get(self, request):
         year = int(request.GET.get('year', timezone.now().year))
-        cache_key = f'monthly_sales_{year}'
+        cache_key = versioned_key('monthly_sales', (SALES,), year)
         cached = cache.get(cache_key)
         
         if cached:
             return JsonResponse({'success': True, 'data': cached})
         
-        from django.db import connection
+        start, end = year_range(year)
+        monthly_data = series_values(time_series(FishSale.objects, 'sale_date', start, end, total=Sum(SALE_AMOUNT)))
         
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    strftime('%m', sale_date) as month,
-                    COALESCE(SUM(quantity_kg * price_per_kg), 0) as total
-                FROM fishery_fishsale
-                WHERE strftime('%Y', sale_date) = %s
-                GROUP BY month
-                ORDER BY month
-            """, [str(year)])
-            rows = cursor.fetchall()
-        
-        monthly_data = [0] * 12
-        for row in rows:
-            month_idx = int(row[0]) - 1
-            if 0 <= month_idx < 12:
-                monthly_data[month_idx] = float(row[1])
-        
-        cache.set(cache_key, monthly_data, 3600)
+        cache.set(cache_key, monthly_data, CACHE_TTL)
         
         return JsonResponse({'success': True, 'data': monthly_data})
 
@@ -1163,100 +942,49 @@ class MonthlySalesAPIView(LoginRequiredMixin, View):
 #         return JsonResponse({'success': True, 'data': list(expenses)})
 
 
-class MonthlyExpensesAPIView(LoginRequiredMixin, View):
+class MonthlyExpensesAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for monthly expenses"""
+    conditional_models = (Expense,)
     
     def get(self, request):
         year = int(request.GET.get('year', timezone.now().year))
-        cache_key = f'monthly_expenses_{year}'
+        cache_key = versioned_key('monthly_expenses', (EXPENSES,), year)
         cached = cache.get(cache_key)
         
         if cached:
             return JsonResponse({'success': True, 'data': cached})
         
-        from django.db import connection
-        
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    strftime('%m', expense_date) as month,
-                    COALESCE(SUM(amount), 0) as total
-                FROM fishery_expense
-                WHERE strftime('%Y', expense_date) = %s
-                GROUP BY month
-                ORDER BY month
-            """, [str(year)])
-            rows = cursor.fetchall()
-        
-        monthly_data = [0] * 12
-        for row in rows:
-            month_idx = int(row[0]) - 1
-            if 0 <= month_idx < 12:
-                monthly_data[month_idx] = float(row[1])
+        start, end = year_range(year)
+        monthly_data = series_values(time_series(Expense.objects, 'expense_date', start, end, total=Sum('amount')))
         
-        cache.set(cache_key, monthly_data, 3600)
+        cache.set(cache_key, monthly_data, CACHE_TTL)
         
         return JsonResponse({'success': True, 'data': monthly_data})
 
 
-class FinancialChartDataAPIView(LoginRequiredMixin, View):
+class FinancialChartDataAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for financial chart data"""
+    conditional_models = (FishSale, Expense)
     
     def get(self, request):
         year = int(request.GET.get('year', timezone.now().year))
-        cache_key = f'financial_chart_{year}'
+        cache_key = versioned_key('financial_chart', (SALES, EXPENSES), year)
         cached = cache.get(cache_key)
         
         if cached:
             return JsonResponse({'success': True, 'data': cached})
         
-        from django.db import connection
-        
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    strftime('%m', sale_date) as month,
-                    COALESCE(SUM(quantity_kg * price_per_kg), 0) as revenue
-                FROM fishery_fishsale
-                WHERE strftime('%Y', sale_date) = %s
-                GROUP BY month
-                ORDER BY month
-            """, [str(year)])
-            revenue_rows = cursor.fetchall()
-            
-            cursor.execute("""
-                SELECT 
-                    strftime('%m', expense_date) as month,
-                    COALESCE(SUM(amount), 0) as expense
-                FROM fishery_expense
-                WHERE strftime('%Y', expense_date) = %s
-                GROUP BY month
-                ORDER BY month
-            """, [str(year)])
-            expense_rows = cursor.fetchall()
-        
-        revenue_data = [0] * 12
-        expense_data = [0] * 12
-        
-        for row in revenue_rows:
-            month_idx = int(row[0]) - 1
-            if 0 <= month_idx < 12:
-                revenue_data[month_idx] = float(row[1])
-        
-        for row in expense_rows:
-            month_idx = int(row[0]) - 1
-            if 0 <= month_idx < 12:
-                expense_data[month_idx] = float(row[1])
-        
-        months = [datetime(year, m, 1).strftime('%b') for m in range(1, 13)]
+        start, end = year_range(year)
+        revenue = time_series(FishSale.objects, 'sale_date', start, end, total=Sum(SALE_AMOUNT))
+        expenses = time_series(Expense.objects, 'expense_date', start, end, total=Sum('amount'))
         
         data = {
-            'months': months,
-            'revenue': revenue_data,
-            'expenses': expense_data,
+            'months': [bucket['period'].strftime('%b') for bucket in revenue],
+            'revenue': series_values(revenue),
+            'expenses': series_values(expenses),
         }
         
-        cache.set(cache_key, data, 3600)
+        cache.set(cache_key, data, CACHE_TTL)
         
         return JsonResponse({'success': True, 'data': data})
 
@@ -1276,10 +1004,6 @@ class BulkPondDeleteAPIView(LoginRequiredMixin, View):
             
             count, _ = Pond.objects.filter(id__in=ids).delete()
             
-            # Clear cache
-            cache.delete(DASHBOARD_STATS_CACHE_KEY)
-            cache.delete(POND_LIST_CACHE_KEY)
-            
             return JsonResponse({'success': True, 'message': f'Deleted {count} ponds'})
             
         except Exception as e:
@@ -1299,9 +1023,6 @@ class BulkCycleDeleteAPIView(LoginRequiredMixin, View):
             
             count, _ = ProductionCycle.objects.filter(id__in=ids).delete()
             
-            # Clear cache
-            cache.delete(DASHBOARD_STATS_CACHE_KEY)
-            
             return JsonResponse({'success': True, 'message': f'Deleted {count} cycles'})
             
         except Exception as e:
@@ -1321,9 +1042,6 @@ class BulkSaleDeleteAPIView(LoginRequiredMixin, View):
             
             count, _ = FishSale.objects.filter(id__in=ids).delete()
             
-            # Clear cache
-            cache.delete(DASHBOARD_STATS_CACHE_KEY)
-            
             return JsonResponse({'success': True, 'message': f'Deleted {count} sales'})
             
         except Exception as e:
@@ -1332,20 +1050,15 @@ class BulkSaleDeleteAPIView(LoginRequiredMixin, View):
 
 # ==================== POND VIEWS ====================
 
-class PondListView(LoginRequiredMixin, ListView):
+class PondListView(LoginRequiredMixin, CachedListMixin, ListView):
     """List all ponds - optimized with select_related and only()"""
     model = Pond
     template_name = 'fishery/pond/list.html'
     context_object_name = 'ponds'
     paginate_by = 20
+    list_cache_groups = (PONDS,)
     
     def get_queryset(self):
-        # Check cache
-        cache_key = f'pond_list_{self.request.GET.urlencode()}'
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
-        
         queryset = Pond.objects.select_related('farm').only(
             'id', 'pond_id', 'name', 'farm__name', 'pond_type', 'size_in_acres',
             'status', 'is_active', 'location'
@@ -1371,21 +1084,12 @@ class PondListView(LoginRequiredMixin, ListView):
                 Q(pond_id__icontains=search)
             )
         
-        # Cache for 5 minutes
-        cache.set(cache_key, queryset, 300)
-        
         return queryset
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Cache farms list
-        farms = cache.get('farms_list')
-        if not farms:
-            farms = Farm.objects.only('id', 'name').all()
-            cache.set('farms_list', farms, 3600)
-        
-        context['farms'] = farms
+        context['farms'] = cached_values('farms_for_filter', (FARMS,), Farm.objects.all(), 'id', 'name')
         context['current_farm'] = self.request.GET.get('farm', '')
         context['current_status'] = self.request.GET.get('status', '')
         context['current_type'] = self.request.GET.get('type', '')
@@ -1423,10 +1127,6 @@ class PondCreateView(LoginRequiredMixin, CreateView):
         response = super().form_valid(form)
         messages.success(self.request, f'Pond {form.instance.name} added successfully!')
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        cache.delete(POND_LIST_CACHE_KEY)
-        
         return response
 
 
@@ -1441,10 +1141,6 @@ class PondUpdateView(LoginRequiredMixin, UpdateView):
         response = super().form_valid(form)
         messages.success(self.request, f'Pond {form.instance.name} updated successfully!')
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        cache.delete(POND_LIST_CACHE_KEY)
-        
         return response
 
 
@@ -1458,28 +1154,20 @@ class PondDeleteView(LoginRequiredMixin, DeleteView):
         pond = self.get_object()
         messages.success(request, f'Pond {pond.name} deleted successfully!')
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        cache.delete(POND_LIST_CACHE_KEY)
-        
         return super().delete(request, *args, **kwargs)
 
 
 # ==================== FISH SPECIES VIEWS ====================
 
-class FishSpeciesListView(LoginRequiredMixin, ListView):
+class FishSpeciesListView(LoginRequiredMixin, CachedListMixin, ListView):
     """List all fish species - optimized"""
     model = FishSpecies
     template_name = 'fishery/species/list.html'
     context_object_name = 'species_list'
     paginate_by = 20
+    list_cache_groups = (SPECIES,)
     
     def get_queryset(self):
-        cache_key = f'species_list_{self.request.GET.urlencode()}'
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
-        
         queryset = FishSpecies.objects.only(
             'id', 'name', 'scientific_name', 'category', 'water_type',
             'average_growth_days', 'market_price'
@@ -1500,7 +1188,6 @@ class FishSpeciesListView(LoginRequiredMixin, ListView):
                 Q(scientific_name__icontains=search)
             )
         
-        cache.set(cache_key, queryset, 3600)
         return queryset
 
 
@@ -1515,9 +1202,6 @@ class FishSpeciesCreateView(LoginRequiredMixin, CreateView):
         response = super().form_valid(form)
         messages.success(self.request, f'Fish species {form.instance.name} added successfully!')
         
-        # Clear cache
-        cache.delete(SPECIES_LIST_CACHE_KEY)
-        
         return response
 
 
@@ -1538,18 +1222,17 @@ class FishSpeciesDeleteView(LoginRequiredMixin, DeleteView):
 
 # ==================== PRODUCTION CYCLE VIEWS ====================
 
-class ProductionCycleListView(LoginRequiredMixin, ListView):
+class ProductionCycleListView(LoginRequiredMixin, CachedListMixin, ListView):
     """List all production cycles - optimized"""
     model = ProductionCycle
     template_name = 'fishery/cycle/list.html'
     context_object_name = 'cycles'
     paginate_by = 20
+    list_cache_groups = (CYCLES,)
     
     def get_queryset(self):
-        queryset = ProductionCycle.objects.select_related('pond', 'species').only(
-            'id', 'cycle_id', 'pond__name', 'species__name', 'stocking_date',
-            'expected_harvest_date', 'status', 'survival_rate', 'fcr'
-        )
+        # Harvest/survival/FCR columns read the denormalized metrics row
+        queryset = ProductionCycle.objects.select_related('pond', 'species', 'metrics')
         
         # Apply filters
         pond_id = self.request.GET.get('pond')
@@ -1577,19 +1260,9 @@ class ProductionCycleListView(LoginRequiredMixin, ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Cache filter options
-        ponds = cache.get('ponds_for_filter')
-        if not ponds:
-            ponds = Pond.objects.filter(is_active=True).only('id', 'name')
-            cache.set('ponds_for_filter', ponds, 3600)
-        
-        species = cache.get('species_for_filter')
-        if not species:
-            species = FishSpecies.objects.all().only('id', 'name')
-            cache.set('species_for_filter', species, 3600)
-        
-        context['ponds'] = ponds
-        context['species'] = species
+        # Filter options
+        context['ponds'] = cached_values('ponds_for_filter', (PONDS,), Pond.objects.filter(is_active=True), 'id', 'name')
+        context['species'] = cached_values('species_for_filter', (SPECIES,), FishSpecies.objects.all(), 'id', 'name')
         context['current_pond'] = self.request.GET.get('pond', '')
         context['current_species'] = self.request.GET.get('species', '')
         context['current_status'] = self.request.GET.get('status', '')
@@ -1641,9 +1314,6 @@ class ProductionCycleCreateView(LoginRequiredMixin, CreateView):
         
         messages.success(self.request, f'Production cycle for {form.instance.pond.name} created successfully!')
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        
         return response
 
 
@@ -1674,9 +1344,6 @@ class ProductionCycleCompleteView(LoginRequiredMixin, UpdateView):
         
         messages.success(self.request, f'Cycle for {form.instance.pond.name} marked as completed!')
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        
         return super().form_valid(form)
 
 
@@ -1693,20 +1360,18 @@ class ProductionCycleDeleteView(LoginRequiredMixin, DeleteView):
         pond.save()
         messages.success(request, f'Production cycle deleted successfully!')
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        
         return super().delete(request, *args, **kwargs)
 
 
 # ==================== FEED RECORD VIEWS ====================
 
-class FeedRecordListView(LoginRequiredMixin, ListView):
+class FeedRecordListView(LoginRequiredMixin, CachedListMixin, ListView):
     """List all feed records"""
     model = FeedRecord
     template_name = 'fishery/feed/record_list.html'
     context_object_name = 'records'
     paginate_by = 30
+    list_cache_groups = (FEED,)
     
     def get_queryset(self):
         return FeedRecord.objects.select_related('cycle__pond', 'feed_type').only(
@@ -1752,9 +1417,6 @@ class FeedRecordCreateView(LoginRequiredMixin, CreateView):
         
         messages.success(self.request, 'Feed record added successfully!')
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        
         return response
 
 
@@ -1775,12 +1437,13 @@ class FeedRecordDeleteView(LoginRequiredMixin, DeleteView):
 
 # ==================== FEED TYPE VIEWS ====================
 
-class FeedTypeListView(LoginRequiredMixin, ListView):
+class FeedTypeListView(LoginRequiredMixin, CachedListMixin, ListView):
     """List all feed types"""
     model = FeedType
     template_name = 'fishery/feed/type_list.html'
     context_object_name = 'feed_types'
     paginate_by = 20
+    list_cache_groups = (FEED,)
     
     def get_queryset(self):
         return FeedType.objects.only(
@@ -1814,12 +1477,13 @@ class FeedTypeDeleteView(LoginRequiredMixin, DeleteView):
 
 # ==================== FEED PURCHASE VIEWS ====================
 
-class FeedPurchaseListView(LoginRequiredMixin, ListView):
+class FeedPurchaseListView(LoginRequiredMixin, CachedListMixin, ListView):
     """List all feed purchases"""
     model = FeedPurchase
     template_name = 'fishery/feed/purchase_list.html'
     context_object_name = 'purchases'
     paginate_by = 30
+    list_cache_groups = (FEED,)
     
     def get_queryset(self):
         return FeedPurchase.objects.select_related('feed_type').only(
@@ -1839,20 +1503,18 @@ class FeedPurchaseCreateView(LoginRequiredMixin, CreateView):
         form.instance.created_by = self.request.user
         messages.success(self.request, 'Feed purchase recorded successfully!')
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        
         return super().form_valid(form)
 
 
 # ==================== WATER QUALITY VIEWS ====================
 
-class WaterQualityListView(LoginRequiredMixin, ListView):
+class WaterQualityListView(LoginRequiredMixin, CachedListMixin, ListView):
     """List all water quality readings"""
     model = WaterQuality
     template_name = 'fishery/water/list.html'
     context_object_name = 'readings'
     paginate_by = 30
+    list_cache_groups = (PONDS,)
     
     def get_queryset(self):
         queryset = WaterQuality.objects.select_related('pond', 'recorded_by').only(
@@ -1890,9 +1552,6 @@ class WaterQualityCreateView(LoginRequiredMixin, CreateView):
         response = super().form_valid(form)
         messages.success(self.request, 'Water quality reading recorded successfully!')
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        
         return response
 
 
@@ -1913,12 +1572,13 @@ class WaterQualityDeleteView(LoginRequiredMixin, DeleteView):
 
 # ==================== DISEASE RECORD VIEWS ====================
 
-class DiseaseRecordListView(LoginRequiredMixin, ListView):
+class DiseaseRecordListView(LoginRequiredMixin, CachedListMixin, ListView):
     """List all disease records"""
     model = DiseaseRecord
     template_name = 'fishery/health/disease_list.html'
     context_object_name = 'diseases'
     paginate_by = 30
+    list_cache_groups = (CYCLES,)
     
     def get_queryset(self):
         return DiseaseRecord.objects.select_related('cycle__pond', 'diagnosed_by').only(
@@ -1938,9 +1598,6 @@ class DiseaseRecordCreateView(LoginRequiredMixin, CreateView):
         form.instance.diagnosed_by = self.request.user
         messages.success(self.request, 'Disease record added successfully!')
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        
         return super().form_valid(form)
 
 
@@ -1961,12 +1618,13 @@ class DiseaseRecordDeleteView(LoginRequiredMixin, DeleteView):
 
 # ==================== MORTALITY RECORD VIEWS ====================
 
-class MortalityRecordListView(LoginRequiredMixin, ListView):
+class MortalityRecordListView(LoginRequiredMixin, CachedListMixin, ListView):
     """List all mortality records"""
     model = MortalityRecord
     template_name = 'fishery/health/mortality_list.html'
     context_object_name = 'mortalities'
     paginate_by = 30
+    list_cache_groups = (CYCLES,)
     
     def get_queryset(self):
         return MortalityRecord.objects.select_related('cycle__pond', 'disease').only(
@@ -1985,9 +1643,6 @@ class MortalityRecordCreateView(LoginRequiredMixin, CreateView):
         form.instance.recorded_by = self.request.user
         messages.success(self.request, 'Mortality record added successfully!')
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        
         return super().form_valid(form)
 
 
@@ -2008,12 +1663,13 @@ class MortalityRecordDeleteView(LoginRequiredMixin, DeleteView):
 
 # ==================== HARVEST VIEWS ====================
 
-class HarvestListView(LoginRequiredMixin, ListView):
+class HarvestListView(LoginRequiredMixin, CachedListMixin, ListView):
     """List all harvests"""
     model = Harvest
     template_name = 'fishery/harvest/list.html'
     context_object_name = 'harvests'
     paginate_by = 30
+    list_cache_groups = (HARVESTS,)
     
     def get_queryset(self):
         return Harvest.objects.select_related('cycle__pond', 'harvested_by').only(
@@ -2050,9 +1706,6 @@ class HarvestCreateView(LoginRequiredMixin, CreateView):
         response = super().form_valid(form)
         messages.success(self.request, 'Harvest recorded successfully!')
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        
         return response
 
 
@@ -2073,12 +1726,13 @@ class HarvestDeleteView(LoginRequiredMixin, DeleteView):
 
 # ==================== CUSTOMER VIEWS ====================
 
-class CustomerListView(LoginRequiredMixin, ListView):
+class CustomerListView(LoginRequiredMixin, CachedListMixin, ListView):
     """List all customers"""
     model = Customer
     template_name = 'fishery/sales/customer_list.html'
     context_object_name = 'customers'
     paginate_by = 30
+    list_cache_groups = (SALES,)
     
     def get_queryset(self):
         return Customer.objects.only(
@@ -2112,12 +1766,13 @@ class CustomerDeleteView(LoginRequiredMixin, DeleteView):
 
 # ==================== FISH SALE VIEWS ====================
 
-class FishSaleListView(LoginRequiredMixin, ListView):
+class FishSaleListView(LoginRequiredMixin, CachedListMixin, ListView):
     """List all fish sales"""
     model = FishSale
     template_name = 'fishery/sales/list.html'
     context_object_name = 'sales'
     paginate_by = 30
+    list_cache_groups = (SALES,)
     
     def get_queryset(self):
         return FishSale.objects.select_related(
@@ -2157,9 +1812,6 @@ class FishSaleCreateView(LoginRequiredMixin, CreateView):
         response = super().form_valid(form)
         messages.success(self.request, f'Sale recorded successfully! Total: ৳{form.instance.total_amount}')
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        
         return response
 
 
@@ -2180,12 +1832,13 @@ class FishSaleDeleteView(LoginRequiredMixin, DeleteView):
 
 # ==================== EXPENSE VIEWS ====================
 
-class ExpenseListView(LoginRequiredMixin, ListView):
+class ExpenseListView(LoginRequiredMixin, CachedListMixin, ListView):
     """List all expenses"""
     model = Expense
     template_name = 'fishery/expense/list.html'
     context_object_name = 'expenses'
     paginate_by = 30
+    list_cache_groups = (EXPENSES,)
     
     def get_queryset(self):
         # Optimized queryset with select_related and only()
@@ -2203,39 +1856,34 @@ class ExpenseListView(LoginRequiredMixin, ListView):
         today = timezone.now().date()
         first_day_month = today.replace(day=1)
         
-        # Monthly total
-        context['monthly_total'] = Expense.objects.filter(
-            expense_date__gte=first_day_month
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
-        # Statistics by expense type
-        expense_stats = Expense.objects.values('expense_type').annotate(
+        # Totals, this month's figures and high value (> 50,000) expenses,
+        # overall and per expense type, from one grouped query
+        high_value = Q(amount__gt=50000)
+        totals, by_type = grouped_facets(
+            Expense.objects.all(), 'expense_type',
+            cache_key=versioned_key('facets:expenses', (EXPENSES,)), timeout=CACHE_TTL,
+            count=Count('id'),
             total=Sum('amount'),
-            count=Count('id')
-        ).order_by('-total')
-        
-        context['expense_stats'] = expense_stats
-        context['total_expenses'] = Expense.objects.count()
-        context['total_amount'] = Expense.objects.aggregate(
-            total=Sum('amount')
-        )['total'] or 0
-        
-        # High value expenses ( > 50,000 )
-        context['high_value_count'] = Expense.objects.filter(
-            amount__gt=50000
-        ).count()
-        context['high_value_total'] = Expense.objects.filter(
-            amount__gt=50000
-        ).aggregate(total=Sum('amount'))['total'] or 0
+            monthly_total=Sum('amount', filter=Q(expense_date__gte=first_day_month)),
+            high_value_count=Count('id', filter=high_value),
+            high_value_total=Sum('amount', filter=high_value),
+        )
         
-        # This month's expenses by type for charts
-        monthly_by_type = Expense.objects.filter(
-            expense_date__gte=first_day_month
-        ).values('expense_type').annotate(
-            total=Sum('amount')
-        ).order_by('-total')
+        context['monthly_total'] = totals['monthly_total']
+        context['total_expenses'] = totals['count']
+        context['total_amount'] = totals['total']
+        context['high_value_count'] = totals['high_value_count']
+        context['high_value_total'] = totals['high_value_total']
         
-        context['monthly_by_type'] = monthly_by_type
+        # Statistics by expense type, and this month's for charts
+        context['expense_stats'] = sorted(
+            ({'expense_type': row['expense_type'], 'total': row['total'], 'count': row['count']} for row in by_type),
+            key=lambda row: row['total'], reverse=True,
+        )
+        context['monthly_by_type'] = sorted(
+            ({'expense_type': row['expense_type'], 'total': row['monthly_total']} for row in by_type if row['monthly_total']),
+            key=lambda row: row['total'], reverse=True,
+        )
         
         # Recent feed purchases (last 5)
         context['recent_feed_purchases'] = FeedPurchase.objects.select_related(
@@ -2291,10 +1939,6 @@ class ExpenseCreateView(LoginRequiredMixin, CreateView):
             f'✅ Expense added successfully! ৳{form.instance.amount:,.2f} for {form.instance.description}'
         )
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        cache.delete('expense_list_stats')
-        
         return response
     
     def get_success_url(self):
@@ -2342,10 +1986,6 @@ class ExpenseUpdateView(LoginRequiredMixin, UpdateView):
             f'✅ Expense updated successfully! ৳{form.instance.amount:,.2f}'
         )
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        cache.delete('expense_list_stats')
-        
         return response
     
     def get_success_url(self):
@@ -2392,30 +2032,23 @@ class ExpenseDeleteView(LoginRequiredMixin, DeleteView):
             f'🗑️ Expense deleted: ৳{amount:,.2f} for {description}'
         )
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        cache.delete('expense_list_stats')
-        
         return response
 
 
 # ==================== EXPENSE API VIEWS ====================
 
-class ExpenseListAPIView(LoginRequiredMixin, View):
-    """API endpoint for expenses"""
+class ExpenseListAPIView(LoginRequiredMixin, ConditionalGetMixin, CursorPaginatedAPIMixin, View):
+    """API endpoint for expenses, paged by ?cursor="""
+    conditional_models = (Expense, ProductionCycle, Pond)
+    cursor_ordering = ('-expense_date', '-id')
     
     def get(self, request):
-        expenses = Expense.objects.select_related(
-            'cycle__pond'
-        ).order_by('-expense_date')[:50].values(
+        expenses = Expense.objects.values(
             'id', 'expense_date', 'cycle__pond__name', 'expense_type',
             'description', 'amount', 'payment_method'
         )
         
-        return JsonResponse({
-            'success': True,
-            'data': list(expenses)
-        })
+        return self.cursor_response(expenses, dict)
 
 
 class ExpenseStatsAPIView(LoginRequiredMixin, View):
@@ -2496,10 +2129,6 @@ class BulkExpenseDeleteAPIView(LoginRequiredMixin, View):
             # Delete them
             expenses.delete()
             
-            # Clear cache
-            cache.delete(DASHBOARD_STATS_CACHE_KEY)
-            cache.delete('expense_list_stats')
-            
             return JsonResponse({
                 'success': True,
                 'message': f'Deleted {count} expenses',
@@ -2539,71 +2168,135 @@ class ProductionReportView(LoginRequiredMixin, TemplateView):
         context = super().get_context_data(**kwargs)
         year = int(self.request.GET.get('year', timezone.now().year))
         
-        cache_key = f'production_report_{year}'
+        cache_key = versioned_key('production_report', (HARVESTS, FEED), year)
         cached = cache.get(cache_key)
         
         if cached:
             context.update(cached)
             return context
         
-        monthly_data = []
-        for month in range(1, 13):
-            month_start = datetime(year, month, 1).date()
-            if month == 12:
-                month_end = datetime(year+1, 1, 1).date() - timedelta(days=1)
-            else:
-                month_end = datetime(year, month+1, 1).date() - timedelta(days=1)
-            
-            # Single query per month - can be optimized further with raw SQL
-            harvest = Harvest.objects.filter(
-                harvest_date__range=[month_start, month_end]
-            ).aggregate(total=Sum('quantity_kg'))['total'] or 0
-            
-            feed = FeedRecord.objects.filter(
-                date__range=[month_start, month_end]
-            ).aggregate(total=Sum('quantity_kg'))['total'] or 0
-            
-            monthly_data.append({
-                'month': month_start.strftime('%B'),
-                'harvest': harvest,
-                'feed': feed,
-            })
+        start, end = year_range(year)
+        harvest = time_series(Harvest.objects, 'harvest_date', start, end, total=Sum('quantity_kg'))
+        feed = time_series(FeedRecord.objects, 'date', start, end, total=Sum('quantity_kg'))
         
-        context['monthly_data'] = monthly_data
-        context['year'] = year
-        context['years'] = range(2020, timezone.now().year + 2)
+        monthly_data = [{
+            'month': harvested['period'].strftime('%B'),
+            'harvest': harvested['total'],
+            'feed': fed['total'],
+        } for harvested, fed in zip(harvest, feed)]
+        
+        report = {
+            'monthly_data': monthly_data,
+            'year': year,
+            'years': range(2020, timezone.now().year + 2),
+        }
+        context.update(report)
         
-        cache.set(cache_key, context, 3600)
+        cache.set(cache_key, report, CACHE_TTL)
         
         return context
 
 
-class FinancialReportView(LoginRequiredMixin, TemplateView):
-    """Financial report"""
+# Tables the yearly financial report is built from
+FINANCIAL_REPORT_MODELS = (
+    Pond, ProductionCycle, FeedRecord, TreatmentRecord, MortalityRecord, Harvest, FishSale, Expense,
+)
+
+EXPENSE_COLORS = {
+    'Fingerlings': '#0d6efd',
+    'Feed': '#28a745',
+    'Labor': '#ffc107',
+    'Medicine': '#dc3545',
+    'Other': '#6c757d',
+}
+
+
+class FinancialReportView(LoginRequiredMixin, ReportJobMixin, TemplateView):
+    """Financial report, rendered from the FisheryFinancialReport the report worker saved"""
     template_name = 'fishery/reports/financial.html'
-    
+    report_job_type = 'FISHERY_FINANCIAL'
+    report_models = FINANCIAL_REPORT_MODELS
+
+    def get_report_job_params(self, request):
+        try:
+            year = int(request.GET.get('year') or timezone.now().year)
+        except ValueError:
+            year = timezone.now().year
+        return {'year': year}
+
+    def get_saved_report(self, params):
+        return FisheryFinancialReport.objects.filter(year=params['year']).first()
+
+    def get_report_context(self, report):
+        revenue = report.total_sales_revenue
+        expenses = report.total_investment
+        harvest_kg = report.total_harvest_kg
+        costs = {
+            'Fingerlings': report.total_fingerling_cost,
+            'Feed': report.total_feed_cost,
+            'Labor': report.total_labor_cost,
+            'Medicine': report.total_medicine_cost,
+            'Other': (
+                report.total_electricity_cost + report.total_transport_cost + report.total_other_expenses
+            ),
+        }
+        breakdown = [
+            {
+                'category': category,
+                'amount': amount,
+                'percentage': float(amount / expenses * 100) if expenses else 0,
+                'color': EXPENSE_COLORS[category],
+            }
+            for category, amount in costs.items()
+        ]
+
+        def per_kg(amount):
+            return amount / harvest_kg if harvest_kg else 0
+
+        return {
+            'total_revenue': revenue,
+            'total_expenses': expenses,
+            'net_profit': report.net_profit,
+            'roi_percentage': report.roi_percentage,
+            'profit_margin': report.net_profit / revenue * 100 if revenue else 0,
+            'fingerling_cost': costs['Fingerlings'],
+            'feed_cost': costs['Feed'],
+            'labor_cost': costs['Labor'],
+            'medicine_cost': costs['Medicine'],
+            'other_cost': costs['Other'],
+            'fingerling_percentage': breakdown[0]['percentage'],
+            'feed_percentage': breakdown[1]['percentage'],
+            'labor_percentage': breakdown[2]['percentage'],
+            'medicine_percentage': breakdown[3]['percentage'],
+            'other_percentage': breakdown[4]['percentage'],
+            'expense_breakdown': breakdown,
+            'expense_labels': json.dumps(list(costs)),
+            'expense_data': json.dumps([float(amount) for amount in costs.values()]),
+            'expense_colors': json.dumps(list(EXPENSE_COLORS.values())),
+            'revenue_per_kg': per_kg(revenue),
+            'cost_per_kg': per_kg(expenses),
+            'profit_per_kg': per_kg(report.net_profit),
+            'break_even_price': per_kg(expenses),
+        }
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        year = int(self.request.GET.get('year', timezone.now().year))
-        
-        # Get or create report
-        report, created = FisheryFinancialReport.objects.get_or_create(year=year)
-        if created or self.request.GET.get('refresh'):
-            report.calculate_totals()
-        
-        context['report'] = report
-        
+        current_year = timezone.now().year
+        context['year'] = self.report.year
+        context['years'] = range(current_year - 5, current_year + 1)
+        context['report_type'] = self.request.GET.get('report_type', 'summary')
         return context
 
 
 # ==================== FISH BATCH VIEWS ====================
 
-class FishBatchListView(LoginRequiredMixin, ListView):
+class FishBatchListView(LoginRequiredMixin, CachedListMixin, ListView):
     """List all fish batches"""
     model = FishBatch
     template_name = 'fishery/batch/list.html'
     context_object_name = 'batches'
     paginate_by = 20
+    list_cache_groups = (SPECIES,)
     
     def get_queryset(self):
         queryset = FishBatch.objects.select_related('species').only(
@@ -2675,20 +2368,18 @@ class FeedPurchaseDeleteView(LoginRequiredMixin, DeleteView):
         feed_type.save()
         messages.success(request, 'Feed purchase deleted successfully!')
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        
         return super().delete(request, *args, **kwargs)
 
 
 # ==================== TREATMENT RECORD VIEWS ====================
 
-class TreatmentRecordListView(LoginRequiredMixin, ListView):
+class TreatmentRecordListView(LoginRequiredMixin, CachedListMixin, ListView):
     """List all treatment records"""
     model = TreatmentRecord
     template_name = 'fishery/health/treatment_list.html'
     context_object_name = 'treatments'
     paginate_by = 30
+    list_cache_groups = (CYCLES,)
     
     def get_queryset(self):
         return TreatmentRecord.objects.select_related(
@@ -2710,9 +2401,6 @@ class TreatmentRecordCreateView(LoginRequiredMixin, CreateView):
         form.instance.applied_by = self.request.user
         messages.success(self.request, 'Treatment record added successfully!')
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
-        
         return super().form_valid(form)
 
 
@@ -2733,12 +2421,13 @@ class TreatmentRecordDeleteView(LoginRequiredMixin, DeleteView):
 
 # ==================== BUDGET VIEWS ====================
 
-class BudgetListView(LoginRequiredMixin, ListView):
+class BudgetListView(LoginRequiredMixin, CachedListMixin, ListView):
     """List all budgets"""
     model = Budget
     template_name = 'fishery/budget/list.html'
     context_object_name = 'budgets'
     paginate_by = 20
+    list_cache_groups = (EXPENSES, CYCLES)
     
     def get_queryset(self):
         return Budget.objects.select_related('cycle__pond').only(
@@ -2807,11 +2496,12 @@ class BudgetForCycleView(LoginRequiredMixin, TemplateView):
 
 # ==================== POND API VIEWS ====================
 
-class PondListAPIView(LoginRequiredMixin, View):
+class PondListAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for pond list"""
+    conditional_models = (Pond,)
     
     def get(self, request):
-        cache_key = 'pond_api_list'
+        cache_key = versioned_key('pond_api_list', (PONDS,))
         cached = cache.get(cache_key)
         if cached:
             return JsonResponse({'success': True, 'data': cached})
@@ -2821,13 +2511,14 @@ class PondListAPIView(LoginRequiredMixin, View):
         ).values()
         
         data = list(ponds)
-        cache.set(cache_key, data, 3600)
+        cache.set(cache_key, data, CACHE_TTL)
         
         return JsonResponse({'success': True, 'data': data})
 
 
-class PondDetailAPIView(LoginRequiredMixin, View):
+class PondDetailAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for pond details"""
+    conditional_models = (Pond, Farm)
     
     def get(self, request, pk):
         try:
@@ -2851,29 +2542,31 @@ class PondDetailAPIView(LoginRequiredMixin, View):
             return JsonResponse({'success': False, 'error': 'Pond not found'})
 
 
-class PondSearchAPIView(LoginRequiredMixin, View):
+class PondSearchAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for searching ponds"""
+    conditional_models = (Pond,)
     
     def get(self, request):
         query = request.GET.get('q', '')
         if len(query) < 2:
             return JsonResponse({'success': True, 'data': []})
         
-        ponds = Pond.objects.filter(
-            Q(name__icontains=query) |
-            Q(pond_id__icontains=query)
-        ).only('id', 'name', 'pond_id', 'status').values()[:20]
+        ponds = in_order(
+            Pond.objects.only('id', 'name', 'pond_id', 'status').values(),
+            search_ids(query, 'pond'),
+        )
         
-        return JsonResponse({'success': True, 'data': list(ponds)})
+        return JsonResponse({'success': True, 'data': ponds})
 
 
 # ==================== PRODUCTION CYCLE API VIEWS ====================
 
-class ProductionCycleListAPIView(LoginRequiredMixin, View):
+class ProductionCycleListAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for production cycle list"""
+    conditional_models = (ProductionCycle, Pond, FishSpecies)
     
     def get(self, request):
-        cache_key = 'running_cycles_api'
+        cache_key = versioned_key('running_cycles_api', (CYCLES, PONDS, SPECIES))
         cached = cache.get(cache_key)
         if cached:
             return JsonResponse({'success': True, 'data': cached})
@@ -2886,13 +2579,14 @@ class ProductionCycleListAPIView(LoginRequiredMixin, View):
         ).values()[:50]
         
         data = list(cycles)
-        cache.set(cache_key, data, 300)
+        cache.set(cache_key, data, CACHE_TTL)
         
         return JsonResponse({'success': True, 'data': data})
 
 
-class ProductionCycleDetailAPIView(LoginRequiredMixin, View):
+class ProductionCycleDetailAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for production cycle details"""
+    conditional_models = (ProductionCycle, Pond, FishSpecies)
     
     def get(self, request, pk):
         try:
@@ -2923,8 +2617,9 @@ class ProductionCycleDetailAPIView(LoginRequiredMixin, View):
             return JsonResponse({'success': False, 'error': 'Cycle not found'})
 
 
-class CompletedCyclesAPIView(LoginRequiredMixin, View):
+class CompletedCyclesAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for completed cycles"""
+    conditional_models = CYCLE_METRIC_MODELS + (Pond, FishSpecies)
     
     def get(self, request):
         cycles = ProductionCycle.objects.filter(
@@ -2937,8 +2632,9 @@ class CompletedCyclesAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': list(cycles)})
 
 
-class CyclesByPondAPIView(LoginRequiredMixin, View):
+class CyclesByPondAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for cycles by pond"""
+    conditional_models = (ProductionCycle, FishSpecies)
     
     def get(self, request, pond_id):
         cycles = ProductionCycle.objects.filter(
@@ -2953,8 +2649,9 @@ class CyclesByPondAPIView(LoginRequiredMixin, View):
 
 # ==================== FEED API VIEWS ====================
 
-class FeedRecordDetailAPIView(LoginRequiredMixin, View):
+class FeedRecordDetailAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for feed record details"""
+    conditional_models = (FeedRecord, FeedType, ProductionCycle, Pond)
     
     def get(self, request, pk):
         try:
@@ -2980,8 +2677,9 @@ class FeedRecordDetailAPIView(LoginRequiredMixin, View):
             return JsonResponse({'success': False, 'error': 'Record not found'})
 
 
-class DailyFeedAPIView(LoginRequiredMixin, View):
+class DailyFeedAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for today's feed records"""
+    conditional_models = (FeedRecord, FeedType, ProductionCycle, Pond)
     
     def get(self, request):
         today = timezone.now().date()
@@ -3004,8 +2702,9 @@ class DailyFeedAPIView(LoginRequiredMixin, View):
         })
 
 
-class FeedByCycleAPIView(LoginRequiredMixin, View):
+class FeedByCycleAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for feed records by cycle"""
+    conditional_models = (FeedRecord, FeedType)
     
     def get(self, request, cycle_id):
         records = FeedRecord.objects.filter(
@@ -3029,8 +2728,9 @@ class FeedByCycleAPIView(LoginRequiredMixin, View):
 
 # ==================== WATER QUALITY API VIEWS ====================
 
-class WaterQualityByPondAPIView(LoginRequiredMixin, View):
+class WaterQualityByPondAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for water quality by pond"""
+    conditional_models = (WaterQuality,)
     
     def get(self, request, pond_id):
         readings = WaterQuality.objects.filter(
@@ -3043,8 +2743,9 @@ class WaterQualityByPondAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': list(readings)})
 
 
-class WaterQualityChartAPIView(LoginRequiredMixin, View):
+class WaterQualityChartAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for water quality chart data"""
+    conditional_models = (WaterQuality,)
     
     def get(self, request, pond_id):
         days = int(request.GET.get('days', 7))
@@ -3069,8 +2770,9 @@ class WaterQualityChartAPIView(LoginRequiredMixin, View):
 
 # ==================== HEALTH API VIEWS ====================
 
-class ActiveDiseasesAPIView(LoginRequiredMixin, View):
+class ActiveDiseasesAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for active diseases"""
+    conditional_models = (DiseaseRecord, ProductionCycle, Pond)
     
     def get(self, request):
         diseases = DiseaseRecord.objects.filter(
@@ -3083,8 +2785,9 @@ class ActiveDiseasesAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': list(diseases)})
 
 
-class TodayMortalityAPIView(LoginRequiredMixin, View):
+class TodayMortalityAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for today's mortality"""
+    conditional_models = (MortalityRecord, ProductionCycle, Pond)
     
     def get(self, request):
         today = timezone.now().date()
@@ -3105,8 +2808,9 @@ class TodayMortalityAPIView(LoginRequiredMixin, View):
         })
 
 
-class MortalityByCycleAPIView(LoginRequiredMixin, View):
+class MortalityByCycleAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for mortality by cycle"""
+    conditional_models = (MortalityRecord,)
     
     def get(self, request, cycle_id):
         mortalities = MortalityRecord.objects.filter(
@@ -3130,8 +2834,9 @@ class MortalityByCycleAPIView(LoginRequiredMixin, View):
 
 # ==================== HARVEST API VIEWS ====================
 
-class HarvestByCycleAPIView(LoginRequiredMixin, View):
+class HarvestByCycleAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for harvest by cycle"""
+    conditional_models = (Harvest,)
     
     def get(self, request, cycle_id):
         harvests = Harvest.objects.filter(
@@ -3151,8 +2856,9 @@ class HarvestByCycleAPIView(LoginRequiredMixin, View):
         })
 
 
-class HarvestStatsAPIView(LoginRequiredMixin, View):
+class HarvestStatsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for harvest statistics"""
+    conditional_models = (Harvest,)
     
     def get(self, request):
         today = timezone.now().date()
@@ -3175,8 +2881,9 @@ class HarvestStatsAPIView(LoginRequiredMixin, View):
 
 # ==================== SALES API VIEWS ====================
 
-class FishSaleDetailAPIView(LoginRequiredMixin, View):
+class FishSaleDetailAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for sale details"""
+    conditional_models = (FishSale, Customer, Harvest, ProductionCycle, Pond, FishSpecies)
     
     def get(self, request, pk):
         try:
@@ -3205,8 +2912,9 @@ class FishSaleDetailAPIView(LoginRequiredMixin, View):
             return JsonResponse({'success': False, 'error': 'Sale not found'})
 
 
-class SalesByCustomerAPIView(LoginRequiredMixin, View):
+class SalesByCustomerAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for sales by customer"""
+    conditional_models = (FishSale, Harvest, ProductionCycle, Pond)
     
     def get(self, request, customer_id):
         sales = FishSale.objects.filter(
@@ -3227,8 +2935,9 @@ class SalesByCustomerAPIView(LoginRequiredMixin, View):
         })
 
 
-class SalesStatsAPIView(LoginRequiredMixin, View):
+class SalesStatsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for sales statistics"""
+    conditional_models = (FishSale, Customer)
     
     def get(self, request):
         today = timezone.now().date()
@@ -3266,11 +2975,12 @@ class SalesStatsAPIView(LoginRequiredMixin, View):
 
 # ==================== CUSTOMER API VIEWS ====================
 
-class CustomerListAPIView(LoginRequiredMixin, View):
+class CustomerListAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for customer list"""
+    conditional_models = (Customer,)
     
     def get(self, request):
-        cache_key = 'customer_api_list'
+        cache_key = versioned_key('customer_api_list', (SALES,))
         cached = cache.get(cache_key)
         if cached:
             return JsonResponse({'success': True, 'data': cached})
@@ -3280,13 +2990,14 @@ class CustomerListAPIView(LoginRequiredMixin, View):
         ).values()[:50]
         
         data = list(customers)
-        cache.set(cache_key, data, 3600)
+        cache.set(cache_key, data, CACHE_TTL)
         
         return JsonResponse({'success': True, 'data': data})
 
 
-class CustomerDetailAPIView(LoginRequiredMixin, View):
+class CustomerDetailAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for customer details"""
+    conditional_models = (Customer,)
     
     def get(self, request, pk):
         try:
@@ -3310,8 +3021,9 @@ class CustomerDetailAPIView(LoginRequiredMixin, View):
             return JsonResponse({'success': False, 'error': 'Customer not found'})
 
 
-class CustomerSearchAPIView(LoginRequiredMixin, View):
+class CustomerSearchAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for searching customers"""
+    conditional_models = (Customer,)
     
     def get(self, request):
         query = request.GET.get('q', '')
@@ -3329,8 +3041,9 @@ class CustomerSearchAPIView(LoginRequiredMixin, View):
 
 # ==================== EXPENSE API VIEWS ====================
 
-class ExpensesByCycleAPIView(LoginRequiredMixin, View):
+class ExpensesByCycleAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for expenses by cycle"""
+    conditional_models = (Expense,)
     
     def get(self, request, cycle_id):
         expenses = Expense.objects.filter(
@@ -3350,26 +3063,21 @@ class ExpensesByCycleAPIView(LoginRequiredMixin, View):
         })
 
 
-class ExpensesByTypeAPIView(LoginRequiredMixin, View):
+class ExpensesByTypeAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for expenses grouped by type"""
+    conditional_models = (Expense,)
     
     def get(self, request):
         year = int(request.GET.get('year', timezone.now().year))
+        start, end = year_range(year)
         
-        from django.db import connection
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT expense_type, COALESCE(SUM(amount), 0) as total
-                FROM fishery_expense
-                WHERE strftime('%Y', expense_date) = %s
-                GROUP BY expense_type
-                ORDER BY total DESC
-            """, [str(year)])
-            rows = cursor.fetchall()
+        rows = Expense.objects.filter(
+            expense_date__gte=start, expense_date__lt=end
+        ).values('expense_type').annotate(total=Sum('amount')).order_by('-total')
         
         data = [{
-            'type': dict(Expense.EXPENSE_TYPES).get(r[0], r[0]),
-            'total': float(r[1])
+            'type': dict(Expense.EXPENSE_TYPES).get(r['expense_type'], r['expense_type']),
+            'total': float(r['total'] or 0)
         } for r in rows]
         
         return JsonResponse({'success': True, 'data': data})
@@ -3377,8 +3085,9 @@ class ExpensesByTypeAPIView(LoginRequiredMixin, View):
 
 # ==================== FINANCIAL API VIEWS ====================
 
-class FinancialSummaryAPIView(LoginRequiredMixin, View):
+class FinancialSummaryAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for financial summary"""
+    conditional_models = (FishSale, Expense)
     
     def get(self, request):
         today = timezone.now().date()
@@ -3422,8 +3131,9 @@ class FinancialSummaryAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': data})
 
 
-class ProfitLossAPIView(LoginRequiredMixin, View):
+class ProfitLossAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for profit/loss analysis"""
+    conditional_models = (FishSale, Expense, FeedRecord)
     
     def get(self, request):
         period = request.GET.get('period', 'month')
@@ -3474,16 +3184,14 @@ class ProfitLossAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': data})
 
 
-class ROIAnalysisAPIView(LoginRequiredMixin, View):
+class ROIAnalysisAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for ROI analysis"""
+    conditional_models = CYCLE_METRIC_MODELS + (Pond, FishSpecies)
     
     def get(self, request):
         completed_cycles = ProductionCycle.objects.filter(
             status='COMPLETED'
-        ).select_related('pond', 'species').only(
-            'pond__name', 'species__name', 'actual_harvest_date',
-            'total_investment', 'total_sales', 'net_profit', 'roi_percentage'
-        ).order_by('-actual_harvest_date')[:10]
+        ).select_related('pond', 'species').with_metrics().order_by('-actual_harvest_date')[:10]
         
         data = [{
             'cycle_id': c.id,
@@ -3501,8 +3209,9 @@ class ROIAnalysisAPIView(LoginRequiredMixin, View):
 
 # ==================== CHART API VIEWS ====================
 
-class GrowthChartDataAPIView(LoginRequiredMixin, View):
+class GrowthChartDataAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for growth chart data"""
+    conditional_models = (ProductionCycle, FeedRecord, Harvest)
     
     def get(self, request, cycle_id):
         try:
@@ -3550,9 +3259,6 @@ class BulkExpenseDeleteAPIView(LoginRequiredMixin, View):
             
             count, _ = Expense.objects.filter(id__in=ids).delete()
             
-            # Clear cache
-            cache.delete(DASHBOARD_STATS_CACHE_KEY)
-            
             return JsonResponse({'success': True, 'message': f'Deleted {count} expenses'})
             
         except Exception as e:
@@ -3579,9 +3285,6 @@ class BulkFeedDeleteAPIView(LoginRequiredMixin, View):
             
             count, _ = records.delete()
             
-            # Clear cache
-            cache.delete(DASHBOARD_STATS_CACHE_KEY)
-            
             return JsonResponse({'success': True, 'message': f'Deleted {count} feed records'})
             
         except Exception as e:
@@ -3610,9 +3313,6 @@ class BulkHarvestDeleteAPIView(LoginRequiredMixin, View):
             
             count, _ = harvests.delete()
             
-            # Clear cache
-            cache.delete(DASHBOARD_STATS_CACHE_KEY)
-            
             return JsonResponse({'success': True, 'message': f'Deleted {count} harvest records'})
             
         except Exception as e:
@@ -3621,8 +3321,9 @@ class BulkHarvestDeleteAPIView(LoginRequiredMixin, View):
 
 # ==================== SEARCH API VIEWS ====================
 
-class SearchPondsAPIView(LoginRequiredMixin, View):
+class SearchPondsAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for searching ponds"""
+    conditional_models = (Pond,)
     
     def get(self, request):
         query = request.GET.get('q', '')
@@ -3637,109 +3338,75 @@ class SearchPondsAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': list(ponds)})
 
 
-class SearchCyclesAPIView(LoginRequiredMixin, View):
+class SearchCyclesAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for searching cycles"""
+    conditional_models = (ProductionCycle,)
     
     def get(self, request):
         query = request.GET.get('q', '')
         if len(query) < 2:
             return JsonResponse({'success': True, 'data': []})
         
-        cycles = ProductionCycle.objects.filter(
-            Q(pond__name__icontains=query) |
-            Q(species__name__icontains=query) |
-            Q(cycle_id__icontains=query)
-        ).select_related('pond', 'species').only(
-            'id', 'cycle_id', 'pond__name', 'species__name', 'status'
-        ).values()[:20]
+        cycles = in_order(ProductionCycle.objects.values(), search_ids(query, 'cycle'))
         
-        return JsonResponse({'success': True, 'data': list(cycles)})
+        return JsonResponse({'success': True, 'data': cycles})
 
 
-class SearchSalesAPIView(LoginRequiredMixin, View):
+class SearchSalesAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for searching sales"""
+    conditional_models = (FishSale,)
     
     def get(self, request):
         query = request.GET.get('q', '')
         if len(query) < 2:
             return JsonResponse({'success': True, 'data': []})
         
-        sales = FishSale.objects.filter(
-            Q(sale_number__icontains=query) |
-            Q(customer_name__icontains=query) |
-            Q(customer__name__icontains=query)
-        ).select_related('harvest__cycle__pond').only(
-            'id', 'sale_number', 'customer_name', 'harvest__cycle__pond__name',
-            'quantity_kg', 'sale_date'
-        ).values()[:20]
+        sales = in_order(FishSale.objects.values(), search_ids(query, 'sale'))
         
-        return JsonResponse({'success': True, 'data': list(sales)})
+        return JsonResponse({'success': True, 'data': sales})
 
 
-class SearchCustomersAPIView(LoginRequiredMixin, View):
+class SearchCustomersAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for searching customers"""
+    conditional_models = (Customer,)
     
     def get(self, request):
         query = request.GET.get('q', '')
         if len(query) < 2:
             return JsonResponse({'success': True, 'data': []})
         
-        customers = Customer.objects.filter(
-            Q(name__icontains=query) |
-            Q(phone__icontains=query) |
-            Q(email__icontains=query)
-        ).only('id', 'name', 'phone', 'customer_type').values()[:20]
+        customers = in_order(Customer.objects.values(), search_ids(query, 'customer'))
         
-        return JsonResponse({'success': True, 'data': list(customers)})
+        return JsonResponse({'success': True, 'data': customers})
 
 
 # ==================== REPORT API VIEWS ====================
 
-class ProductionReportAPIView(LoginRequiredMixin, View):
+class ProductionReportAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for production report"""
+    conditional_models = (Harvest, FeedRecord, MortalityRecord)
     
     def get(self, request):
         year = int(request.GET.get('year', timezone.now().year))
-        cache_key = f'api_production_report_{year}'
+        cache_key = versioned_key('api_production_report', (HARVESTS, FEED, CYCLES), year)
         cached = cache.get(cache_key)
         
         if cached:
             return JsonResponse({'success': True, 'data': cached})
         
-        from django.db import connection
-        
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    strftime('%m', harvest_date) as month,
-                    COALESCE(SUM(quantity_kg), 0) as harvest,
-                    COALESCE((SELECT SUM(quantity_kg) FROM fishery_feedrecord WHERE strftime('%m', date) = month), 0) as feed,
-                    COALESCE((SELECT SUM(quantity_dead) FROM fishery_mortalityrecord WHERE strftime('%m', date) = month), 0) as mortality
-                FROM fishery_harvest
-                WHERE strftime('%Y', harvest_date) = %s
-                GROUP BY month
-                ORDER BY month
-            """, [str(year)])
-            rows = cursor.fetchall()
-        
         monthly_data = []
         total_harvest = 0
         total_feed = 0
         
-        for i, row in enumerate(rows, 1):
-            month_name = datetime(year, int(row[0]), 1).strftime('%B')
-            harvest = float(row[1])
-            feed = float(row[2])
-            mortality = float(row[3])
-            
+        for month, row in monthly_production(year).items():
             monthly_data.append({
-                'month': month_name,
-                'harvest': harvest,
-                'feed': feed,
-                'mortality': mortality,
+                'month': month.strftime('%B'),
+                'harvest': row['harvest'],
+                'feed': row['feed'],
+                'mortality': row['mortality'],
             })
-            total_harvest += harvest
-            total_feed += feed
+            total_harvest += row['harvest']
+            total_feed += row['feed']
         
         data = {
             'year': year,
@@ -3749,50 +3416,34 @@ class ProductionReportAPIView(LoginRequiredMixin, View):
             'avg_fcr': round(total_feed / total_harvest, 2) if total_harvest > 0 else 0,
         }
         
-        cache.set(cache_key, data, 3600)
+        cache.set(cache_key, data, CACHE_TTL)
         
         return JsonResponse({'success': True, 'data': data})
 
 
-class FinancialReportAPIView(LoginRequiredMixin, View):
+class FinancialReportAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for financial report"""
+    conditional_models = (FishSale, Expense, FeedRecord)
     
     def get(self, request):
         year = int(request.GET.get('year', timezone.now().year))
-        cache_key = f'api_financial_report_{year}'
+        cache_key = versioned_key('api_financial_report', (SALES, EXPENSES, FEED), year)
         cached = cache.get(cache_key)
         
         if cached:
             return JsonResponse({'success': True, 'data': cached})
         
-        from django.db import connection
-        
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    strftime('%m', sale_date) as month,
-                    COALESCE(SUM(quantity_kg * price_per_kg), 0) as revenue,
-                    COALESCE((SELECT SUM(amount) FROM fishery_expense WHERE strftime('%m', expense_date) = month), 0) as expenses,
-                    COALESCE((SELECT SUM(cost) FROM fishery_feedrecord WHERE strftime('%m', date) = month), 0) as feed_cost
-                FROM fishery_fishsale
-                WHERE strftime('%Y', sale_date) = %s
-                GROUP BY month
-                ORDER BY month
-            """, [str(year)])
-            rows = cursor.fetchall()
-        
         monthly_data = []
         total_revenue = 0
         total_expenses = 0
         
-        for row in rows:
-            month_name = datetime(year, int(row[0]), 1).strftime('%B')
-            revenue = float(row[1])
-            expenses = float(row[2])
-            feed_cost = float(row[3])
+        for month, row in monthly_financials(year).items():
+            revenue = row['revenue']
+            expenses = row['expenses']
+            feed_cost = row['feed_cost']
             
             monthly_data.append({
-                'month': month_name,
+                'month': month.strftime('%B'),
                 'revenue': revenue,
                 'expenses': expenses,
                 'feed_cost': feed_cost,
@@ -3814,55 +3465,23 @@ class FinancialReportAPIView(LoginRequiredMixin, View):
             'profit_margin': round(profit_margin, 2),
         }
         
-        cache.set(cache_key, data, 3600)
+        cache.set(cache_key, data, CACHE_TTL)
         
         return JsonResponse({'success': True, 'data': data})
 
 
-class SalesReportAPIView(LoginRequiredMixin, View):
+class SalesReportAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for sales report"""
+    conditional_models = (FishSale, Harvest, ProductionCycle, FishSpecies)
     
     def get(self, request):
         year = int(request.GET.get('year', timezone.now().year))
         
-        from django.db import connection
-        
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    strftime('%m', sale_date) as month,
-                    COALESCE(SUM(quantity_kg * price_per_kg), 0) as total
-                FROM fishery_fishsale
-                WHERE strftime('%Y', sale_date) = %s
-                GROUP BY month
-                ORDER BY month
-            """, [str(year)])
-            rows = cursor.fetchall()
-        
-        monthly_sales = [0] * 12
-        for row in rows:
-            month_idx = int(row[0]) - 1
-            if 0 <= month_idx < 12:
-                monthly_sales[month_idx] = float(row[1])
+        start, end = year_range(year)
+        monthly_sales = series_values(time_series(FishSale.objects, 'sale_date', start, end, total=Sum(SALE_AMOUNT)))
         
         # Top species
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    fs.name,
-                    COALESCE(SUM(fsale.quantity_kg * fsale.price_per_kg), 0) as total
-                FROM fishery_fishsale fsale
-                JOIN fishery_harvest h ON fsale.harvest_id = h.id
-                JOIN fishery_productioncycle pc ON h.cycle_id = pc.id
-                JOIN fishery_fishspecies fs ON pc.species_id = fs.id
-                WHERE strftime('%Y', fsale.sale_date) = %s
-                GROUP BY fs.name
-                ORDER BY total DESC
-                LIMIT 5
-            """, [str(year)])
-            species_rows = cursor.fetchall()
-        
-        top_species = [{'name': r[0], 'total': float(r[1])} for r in species_rows]
+        top_species = top_species_by_sales(year)
         
         data = {
             'year': year,
@@ -3874,46 +3493,22 @@ class SalesReportAPIView(LoginRequiredMixin, View):
         return JsonResponse({'success': True, 'data': data})
 
 
-class ExpensesReportAPIView(LoginRequiredMixin, View):
+class ExpensesReportAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
     """API endpoint for expenses report"""
+    conditional_models = (Expense,)
     
     def get(self, request):
         year = int(request.GET.get('year', timezone.now().year))
         
-        from django.db import connection
-        
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    strftime('%m', expense_date) as month,
-                    COALESCE(SUM(amount), 0) as total
-                FROM fishery_expense
-                WHERE strftime('%Y', expense_date) = %s
-                GROUP BY month
-                ORDER BY month
-            """, [str(year)])
-            rows = cursor.fetchall()
-        
-        monthly_expenses = [0] * 12
-        for row in rows:
-            month_idx = int(row[0]) - 1
-            if 0 <= month_idx < 12:
-                monthly_expenses[month_idx] = float(row[1])
+        start, end = year_range(year)
+        monthly_expenses = series_values(time_series(Expense.objects, 'expense_date', start, end, total=Sum('amount')))
         
         # Expenses by type
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT 
-                    expense_type,
-                    COALESCE(SUM(amount), 0) as total
-                FROM fishery_expense
-                WHERE strftime('%Y', expense_date) = %s
-                GROUP BY expense_type
-                ORDER BY total DESC
-            """, [str(year)])
-            type_rows = cursor.fetchall()
-        
-        by_type = [{'type': dict(Expense.EXPENSE_TYPES).get(r[0], r[0]), 'total': float(r[1])} for r in type_rows]
+        type_rows = Expense.objects.filter(
+            expense_date__gte=start, expense_date__lt=end
+        ).values('expense_type').annotate(total=Sum('amount')).order_by('-total')
+        
+        by_type = [{'type': dict(Expense.EXPENSE_TYPES).get(r['expense_type'], r['expense_type']), 'total': float(r['total'])} for r in type_rows]
         
         data = {
             'year': year,
@@ -3928,84 +3523,79 @@ class ExpensesReportAPIView(LoginRequiredMixin, View):
 # ==================== REPORT GENERATION VIEW ====================
 
 class GenerateFinancialReportView(LoginRequiredMixin, View):
-    """Generate financial report for a year"""
+    """Queue generation of the financial report for a year"""
     
     def post(self, request):
         year = int(request.POST.get('year', timezone.now().year))
         
-        # Get or create report
-        report, created = FisheryFinancialReport.objects.get_or_create(year=year)
-        report.calculate_totals()
-        
-        messages.success(request, f'Financial report for {year} generated successfully!')
+        # Built by the report worker (manage.py run_report_worker)
+        job = queue_report_job(
+            'FISHERY_FINANCIAL', {'year': year},
+            user=request.user,
+            result_url=f"{reverse_lazy('fishery:financial_report')}?year={year}",
+        )
         
-        # Clear cache
-        cache.delete(DASHBOARD_STATS_CACHE_KEY)
+        messages.info(request, f'Financial report for {year} is being generated.')
         
-        return redirect(f"{reverse_lazy('fishery:financial_report')}?year={year}")
+        return redirect('home:report_job_status', pk=job.pk)
 
 
 # ==================== REMAINING EXPORT VIEWS ====================
 
-class ExportExpensesCSVView(LoginRequiredMixin, View):
+class ExportExpensesCSVView(LoginRequiredMixin, StreamingCSVExportView):
     """Export expenses data to CSV"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="expenses_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Date', 'Pond/Cycle', 'Expense Type', 'Description', 'Amount', 'Payment Method', 'Paid To', 'Receipt Number'])
-        
+    filename = 'expenses_export.csv'
+    header = ['Date', 'Pond/Cycle', 'Expense Type', 'Description', 'Amount', 'Payment Method', 'Paid To', 'Receipt Number']
+
+    def get_rows(self, request):
         # Get filter parameters
         year = request.GET.get('year')
         expense_type = request.GET.get('type')
         pond_id = request.GET.get('pond')
-        
-        queryset = Expense.objects.select_related('cycle__pond').order_by('-expense_date')
-        
+
+        queryset = Expense.objects.order_by('-expense_date')
+
         if year:
             queryset = queryset.filter(expense_date__year=year)
         if expense_type:
             queryset = queryset.filter(expense_type=expense_type)
         if pond_id:
             queryset = queryset.filter(cycle__pond_id=pond_id)
-        
-        for expense in queryset.iterator(chunk_size=100):
-            writer.writerow([
-                expense.expense_date.strftime('%Y-%m-%d'),
-                expense.cycle.pond.name if expense.cycle else '-',
-                expense.get_expense_type_display(),
-                expense.description,
-                f'৳{expense.amount}',
-                expense.get_payment_method_display(),
-                expense.paid_to or '',
-                expense.receipt_number or ''
-            ])
-        
-        return response
 
-
-class ExportFeedCSVView(LoginRequiredMixin, View):
+        expense_types = choice_labels(Expense, 'expense_type')
+        payment_methods = choice_labels(Expense, 'payment_method')
+        rows = iter_values(
+            queryset,
+            'expense_date', 'cycle__pond__name', 'expense_type', 'description',
+            'amount', 'payment_method', 'paid_to', 'receipt_number',
+        )
+        for expense_date, pond, kind, description, amount, method, paid_to, receipt in rows:
+            yield [
+                expense_date.strftime('%Y-%m-%d'),
+                pond or '-',
+                expense_types.get(kind, kind),
+                description,
+                f'৳{amount}',
+                payment_methods.get(method, method),
+                paid_to or '',
+                receipt or ''
+            ]
+
+
+class ExportFeedCSVView(LoginRequiredMixin, StreamingCSVExportView):
     """Export feed records to CSV"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="feed_records_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Date', 'Pond', 'Cycle ID', 'Feed Type', 'Brand', 'Quantity (kg)', 'Cost (৳)', 'Cost per kg (৳)', 'Feed Time', 'Consumption Rate', 'Recorded By'])
-        
+    filename = 'feed_records_export.csv'
+    header = ['Date', 'Pond', 'Cycle ID', 'Feed Type', 'Brand', 'Quantity (kg)', 'Cost (৳)', 'Cost per kg (৳)', 'Feed Time', 'Consumption Rate', 'Recorded By']
+
+    def get_rows(self, request):
         # Get filter parameters
         year = request.GET.get('year')
         month = request.GET.get('month')
         pond_id = request.GET.get('pond')
         feed_type_id = request.GET.get('feed_type')
-        
-        queryset = FeedRecord.objects.select_related(
-            'cycle__pond', 'feed_type', 'recorded_by'
-        ).order_by('-date', '-feed_time')
-        
+
+        queryset = FeedRecord.objects.order_by('-date', '-feed_time')
+
         if year:
             queryset = queryset.filter(date__year=year)
         if month:
@@ -4014,46 +3604,53 @@ class ExportFeedCSVView(LoginRequiredMixin, View):
             queryset = queryset.filter(cycle__pond_id=pond_id)
         if feed_type_id:
             queryset = queryset.filter(feed_type_id=feed_type_id)
-        
-        for record in queryset.iterator(chunk_size=100):
-            writer.writerow([
-                record.date.strftime('%Y-%m-%d'),
-                record.cycle.pond.name,
-                record.cycle.cycle_id[:8] if record.cycle else '-',
-                record.feed_type.name,
-                record.feed_type.brand,
-                f'{record.quantity_kg:.2f}',
-                f'৳{record.cost:.2f}',
-                f'৳{record.cost_per_kg:.2f}' if record.cost_per_kg else '৳0.00',
-                record.get_feed_time_display() if record.feed_time else '-',
-                record.get_feed_consumption_rate_display(),
-                record.recorded_by.get_full_name() or record.recorded_by.username if record.recorded_by else ''
-            ])
-        
-        return response
 
-
-class ExportHarvestsCSVView(LoginRequiredMixin, View):
+        feed_times = choice_labels(FeedRecord, 'feed_time')
+        consumption_rates = choice_labels(FeedRecord, 'feed_consumption_rate')
+        rows = iter_values(
+            queryset,
+            'date', 'cycle__pond__name', 'cycle__cycle_id', 'feed_type__name', 'feed_type__brand',
+            'quantity_kg', 'cost', 'feed_time', 'feed_consumption_rate',
+            'recorded_by__first_name', 'recorded_by__last_name', 'recorded_by__username',
+        )
+        for (date, pond, cycle_id, feed_name, brand, quantity, cost, feed_time, rate,
+             first_name, last_name, username) in rows:
+            cost_per_kg = cost / Decimal(str(quantity)) if quantity > 0 else 0
+            yield [
+                date.strftime('%Y-%m-%d'),
+                pond,
+                cycle_id[:8] if cycle_id else '-',
+                feed_name,
+                brand,
+                f'{quantity:.2f}',
+                f'৳{cost:.2f}',
+                f'৳{cost_per_kg:.2f}' if cost_per_kg else '৳0.00',
+                feed_times.get(feed_time, feed_time) if feed_time else '-',
+                consumption_rates.get(rate, rate),
+                user_display_name(first_name, last_name, username)
+            ]
+
+
+class ExportHarvestsCSVView(LoginRequiredMixin, StreamingCSVExportView):
     """Export harvest records to CSV"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="harvests_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Date', 'Pond', 'Species', 'Cycle ID', 'Quantity (kg)', 'Piece Count', 'Avg Weight (g)', 'Grade', 'Harvest Method', 'Harvested By', 'Total Sales (৳)', 'Notes'])
-        
+    filename = 'harvests_export.csv'
+    header = ['Date', 'Pond', 'Species', 'Cycle ID', 'Quantity (kg)', 'Piece Count', 'Avg Weight (g)', 'Grade', 'Harvest Method', 'Harvested By', 'Total Sales (৳)', 'Notes']
+
+    def get_rows(self, request):
         # Get filter parameters
         year = request.GET.get('year')
         month = request.GET.get('month')
         pond_id = request.GET.get('pond')
         species_id = request.GET.get('species')
         grade = request.GET.get('grade')
-        
-        queryset = Harvest.objects.select_related(
-            'cycle__pond', 'cycle__species', 'harvested_by'
+
+        sales_total = FishSale.objects.filter(harvest=OuterRef('pk')).order_by().values('harvest').annotate(
+            total=Sum(ExpressionWrapper(F('quantity_kg') * F('price_per_kg'), output_field=DecimalField(max_digits=12, decimal_places=2)))
+        ).values('total')
+        queryset = Harvest.objects.annotate(
+            sales_total=Subquery(sales_total, output_field=DecimalField(max_digits=12, decimal_places=2))
         ).order_by('-harvest_date')
-        
+
         if year:
             queryset = queryset.filter(harvest_date__year=year)
         if month:
@@ -4064,70 +3661,82 @@ class ExportHarvestsCSVView(LoginRequiredMixin, View):
             queryset = queryset.filter(cycle__species_id=species_id)
         if grade:
             queryset = queryset.filter(grade=grade)
-        
-        for harvest in queryset.iterator(chunk_size=100):
-            writer.writerow([
-                harvest.harvest_date.strftime('%Y-%m-%d'),
-                harvest.cycle.pond.name,
-                harvest.cycle.species.name,
-                harvest.cycle.cycle_id[:8] if harvest.cycle else '-',
-                f'{harvest.quantity_kg:.2f}',
-                harvest.piece_count or '-',
-                f'{harvest.avg_weight:.0f}' if harvest.avg_weight else '-',
-                harvest.get_grade_display(),
-                harvest.get_harvest_method_display(),
-                harvest.harvested_by.get_full_name() or harvest.harvested_by.username if harvest.harvested_by else '',
-                f'৳{harvest.total_sales:.2f}' if harvest.total_sales else '৳0.00',
-                harvest.notes or ''
-            ])
-        
-        return response
 
-
-class ExportPondsCSVView(LoginRequiredMixin, View):
+        grades = choice_labels(Harvest, 'grade')
+        methods = choice_labels(Harvest, 'harvest_method')
+        rows = iter_values(
+            queryset,
+            'harvest_date', 'cycle__pond__name', 'cycle__species__name', 'cycle__cycle_id',
+            'quantity_kg', 'piece_count', 'avg_weight', 'grade', 'harvest_method',
+            'harvested_by__first_name', 'harvested_by__last_name', 'harvested_by__username',
+            'sales_total', 'notes',
+        )
+        for (harvest_date, pond, species, cycle_id, quantity, pieces, avg_weight, grade_code, method,
+             first_name, last_name, username, sales, notes) in rows:
+            yield [
+                harvest_date.strftime('%Y-%m-%d'),
+                pond,
+                species,
+                cycle_id[:8] if cycle_id else '-',
+                f'{quantity:.2f}',
+                pieces or '-',
+                f'{avg_weight:.0f}' if avg_weight else '-',
+                grades.get(grade_code, grade_code),
+                methods.get(method, method),
+                user_display_name(first_name, last_name, username),
+                f'৳{sales:.2f}' if sales else '৳0.00',
+                notes or ''
+            ]
+
+
+class ExportPondsCSVView(LoginRequiredMixin, StreamingCSVExportView):
     """Export ponds data to CSV"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="ponds_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Pond ID', 'Name', 'Farm', 'Type', 'Size (acres)', 'Depth (ft)', 'Water Source', 'Bottom Type', 'Status', 'Location', 'Current Cycle'])
-        
-        queryset = Pond.objects.select_related('farm').order_by('name')
-        
-        for pond in queryset.iterator(chunk_size=100):
-            writer.writerow([
-                pond.pond_id,
-                pond.name,
-                pond.farm.name if pond.farm else '-',
-                pond.get_pond_type_display(),
-                pond.size_in_acres,
-                pond.average_depth or '-',
-                pond.get_water_source_display() if hasattr(pond, 'get_water_source_display') else pond.water_source,
-                pond.get_bottom_type_display() if hasattr(pond, 'get_bottom_type_display') else pond.bottom_type,
-                pond.get_status_display(),
-                pond.location or '-',
-                pond.current_cycle().cycle_id[:8] if pond.current_cycle() else 'None'
-            ])
-        
-        return response
+    filename = 'ponds_export.csv'
+    header = ['Pond ID', 'Name', 'Farm', 'Type', 'Size (acres)', 'Depth (ft)', 'Water Source', 'Bottom Type', 'Status', 'Location', 'Current Cycle']
+
+    def get_rows(self, request):
+        running_cycle = ProductionCycle.objects.filter(
+            pond=OuterRef('pk'), status='RUNNING'
+        ).values('cycle_id')[:1]
+        queryset = Pond.objects.annotate(current_cycle_id=Subquery(running_cycle)).order_by('name')
+
+        pond_types = choice_labels(Pond, 'pond_type')
+        bottom_types = choice_labels(Pond, 'bottom_type')
+        statuses = choice_labels(Pond, 'status')
+        rows = iter_values(
+            queryset,
+            'pond_id', 'name', 'farm__name', 'pond_type', 'size_in_acres', 'average_depth',
+            'water_source', 'bottom_type', 'status', 'location', 'current_cycle_id',
+        )
+        for (pond_id, name, farm, pond_type, size, depth, water_source, bottom_type,
+             status, location, cycle_id) in rows:
+            yield [
+                pond_id,
+                name,
+                farm or '-',
+                pond_types.get(pond_type, pond_type),
+                size,
+                depth or '-',
+                water_source,
+                bottom_types.get(bottom_type, bottom_type),
+                statuses.get(status, status),
+                location or '-',
+                cycle_id[:8] if cycle_id else 'None'
+            ]
+
+
+class ExportCyclesCSVView(LoginRequiredMixin, StreamingCSVExportView):
+    """Export production cycles to CSV"""
+    filename = 'cycles_export.csv'
+    header = ['Cycle ID', 'Pond', 'Species', 'Stocking Date', 'Harvest Date', 'Initial Qty', 'Harvest (kg)', 'Survival %', 'FCR', 'Feed Used (kg)', 'Investment (৳)', 'Revenue (৳)', 'Profit (৳)', 'ROI %', 'Status']
 
+    def get_rows(self, request):
+        # Cycles keep model instances for the derived metrics; with_metrics()
+        # still makes each chunk a single query
+        queryset = ProductionCycle.objects.select_related('pond', 'species').with_metrics().order_by('-stocking_date')
 
-class ExportCyclesCSVView(LoginRequiredMixin, View):
-    """Export production cycles to CSV"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="cycles_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Cycle ID', 'Pond', 'Species', 'Stocking Date', 'Harvest Date', 'Initial Qty', 'Harvest (kg)', 'Survival %', 'FCR', 'Feed Used (kg)', 'Investment (৳)', 'Revenue (৳)', 'Profit (৳)', 'ROI %', 'Status'])
-        
-        queryset = ProductionCycle.objects.select_related('pond', 'species').order_by('-stocking_date')
-        
-        for cycle in queryset.iterator(chunk_size=100):
-            writer.writerow([
+        for cycle in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield [
                 cycle.cycle_id[:8],
                 cycle.pond.name,
                 cycle.species.name,
@@ -4143,31 +3752,23 @@ class ExportCyclesCSVView(LoginRequiredMixin, View):
                 f'৳{cycle.net_profit:.2f}',
                 f'{cycle.roi_percentage:.1f}',
                 cycle.get_status_display()
-            ])
-        
-        return response
+            ]
 
 
-class ExportSalesCSVView(LoginRequiredMixin, View):
+class ExportSalesCSVView(LoginRequiredMixin, StreamingCSVExportView):
     """Export sales data to CSV"""
-    
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="sales_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Sale ID', 'Date', 'Customer', 'Pond', 'Species', 'Quantity (kg)', 'Price/kg (৳)', 'Total (৳)', 'Payment Status', 'Payment Method', 'Created By'])
-        
+    filename = 'sales_export.csv'
+    header = ['Sale ID', 'Date', 'Customer', 'Pond', 'Species', 'Quantity (kg)', 'Price/kg (৳)', 'Total (৳)', 'Payment Status', 'Payment Method', 'Created By']
+
+    def get_rows(self, request):
         # Get filter parameters
         year = request.GET.get('year')
         month = request.GET.get('month')
         customer_id = request.GET.get('customer')
         payment_status = request.GET.get('payment_status')
-        
-        queryset = FishSale.objects.select_related(
-            'harvest__cycle__pond', 'harvest__cycle__species', 'customer', 'created_by'
-        ).order_by('-sale_date')
-        
+
+        queryset = FishSale.objects.order_by('-sale_date')
+
         if year:
             queryset = queryset.filter(sale_date__year=year)
         if month:
@@ -4176,20 +3777,28 @@ class ExportSalesCSVView(LoginRequiredMixin, View):
             queryset = queryset.filter(customer_id=customer_id)
         if payment_status:
             queryset = queryset.filter(payment_status=payment_status)
-        
-        for sale in queryset.iterator(chunk_size=100):
-            writer.writerow([
-                sale.sale_number[:8],
-                sale.sale_date.strftime('%Y-%m-%d'),
-                sale.customer.name if sale.customer else (sale.customer_name or 'Walk-in'),
-                sale.harvest.cycle.pond.name if sale.harvest and sale.harvest.cycle else '-',
-                sale.harvest.cycle.species.name if sale.harvest and sale.harvest.cycle else '-',
-                f'{sale.quantity_kg:.2f}',
-                f'৳{sale.price_per_kg:.2f}',
-                f'৳{sale.total_amount:.2f}',
-                sale.get_payment_status_display(),
-                sale.get_payment_method_display(),
-                sale.created_by.get_full_name() or sale.created_by.username if sale.created_by else ''
-            ])
-        
-        return response
\ No newline at end of file
+
+        statuses = choice_labels(FishSale, 'payment_status')
+        methods = choice_labels(FishSale, 'payment_method')
+        rows = iter_values(
+            queryset,
+            'sale_number', 'sale_date', 'customer__name', 'customer_name',
+            'harvest__cycle__pond__name', 'harvest__cycle__species__name',
+            'quantity_kg', 'price_per_kg', 'total_amount', 'payment_status', 'payment_method',
+            'created_by__first_name', 'created_by__last_name', 'created_by__username',
+        )
+        for (sale_number, sale_date, customer, customer_name, pond, species, quantity, price,
+             total, status, method, first_name, last_name, username) in rows:
+            yield [
+                sale_number[:8],
+                sale_date.strftime('%Y-%m-%d'),
+                customer or (customer_name or 'Walk-in'),
+                pond or '-',
+                species or '-',
+                f'{quantity:.2f}',
+                f'৳{price:.2f}',
+                f'৳{total:.2f}',
+                statuses.get(status, status),
+                methods.get(method, method),
+                user_display_name(first_name, last_name, username)
+            ]
@@ -1,3 +1,24 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ReportJob, Alert
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'job_type', 'status', 'progress', 'requested_by', 'created_at', 'completed_at']
+    list_filter = ['job_type', 'status', 'created_at']
+    readonly_fields = ['progress', 'message', 'error', 'result_id', 'started_at', 'completed_at', 'created_at']
+    actions = ['requeue_jobs']
+
+    def requeue_jobs(self, request, queryset):
+        count = queryset.exclude(status='RUNNING').update(status='PENDING', progress=0, message='', error='')
+        self.message_user(request, f'{count} jobs requeued')
+    requeue_jobs.short_description = "Requeue selected jobs"
+
+
+@admin.register(Alert)
+class AlertAdmin(admin.ModelAdmin):
+    list_display = ['title', 'message', 'level', 'app', 'due_date', 'created_at', 'acknowledged_at']
+    list_filter = ['app', 'level', 'kind', 'acknowledged_at']
+    search_fields = ['title', 'message']
+    readonly_fields = [field.name for field in Alert._meta.fields]
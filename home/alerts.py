@@ -0,0 +1,172 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.utils import timezone
+
+from agro import conditional
+
+from .models import Alert
+
+
+# ==================== ALERT RULES ====================
+#
+# Apps register one rule per kind of alert with register(): a queryset of
+# the rows that are in alert state on a given day, and a function that
+# describes one of them. Saving or deleting such a row re-checks just that
+# row once the write commits, so alerts are raised, updated and cleared as
+# the data changes. Conditions that change with the date alone (a
+# vaccination becoming overdue, a reading ageing out) are picked up by
+# `manage.py evaluate_alerts`, which sweeps every rule and should run from
+# cron at least daily. Readers such as the notification bell only ever
+# query the Alert table.
+
+ALERT_FIELDS = ['level', 'priority', 'icon', 'title', 'message', 'url', 'due_date', 'data']
+
+_rules = {}
+
+
+def _fields(description):
+    """Alert columns for a rule's description of a row, with JSON data as stored"""
+    fields = {'priority': 0, 'icon': '', 'url': '', 'due_date': None, 'data': {}, **description}
+    # Compare like with like: dates in data come back from the database as strings
+    fields['data'] = json.loads(json.dumps(fields['data'], cls=DjangoJSONEncoder))
+    return fields
+
+
+class AlertRule:
+    """How one kind of alert is raised"""
+
+    def __init__(self, kind, model, queryset, describe, notify=True, follow=None):
+        self.kind = kind
+        self.app = kind.split('.')[0]
+        self.model = model
+        self.queryset = queryset
+        self.describe = describe
+        self.notify = notify
+        self.follow = follow or {}
+
+    def evaluate(self, pks=None, today=None):
+        """
+        Raise, update and clear this rule's alerts for the rows with the
+        given primary keys (default all rows). Returns (raised, updated,
+        cleared) counts.
+        """
+        today = today or timezone.localdate()
+        rows = self.queryset(today)
+        alerts = Alert.objects.filter(kind=self.kind)
+        if pks is not None:
+            pks = {pk for pk in pks if pk}
+            rows = rows.filter(pk__in=pks)
+            alerts = alerts.filter(object_id__in=pks)
+
+        current = {row.pk: _fields(self.describe(row, today)) for row in rows}
+        existing = {alert.object_id: alert for alert in alerts}
+
+        raised = [
+            Alert(kind=self.kind, object_id=pk, app=self.app, notify=self.notify, **fields)
+            for pk, fields in current.items()
+            if pk not in existing
+        ]
+        updated = []
+        for pk, fields in current.items():
+            alert = existing.get(pk)
+            if alert is not None and any(getattr(alert, name) != value for name, value in fields.items()):
+                for name, value in fields.items():
+                    setattr(alert, name, value)
+                updated.append(alert)
+        cleared = [pk for pk in existing if pk not in current]
+
+        if not (raised or updated or cleared):
+            return 0, 0, 0
+        with transaction.atomic():
+            # A sweep and a write may raise the same alert at once
+            Alert.objects.bulk_create(raised, ignore_conflicts=True)
+            Alert.objects.bulk_update(updated, ALERT_FIELDS)
+            Alert.objects.filter(kind=self.kind, object_id__in=cleared).delete()
+            conditional.changed(Alert)
+        return len(raised), len(updated), len(cleared)
+
+
+def register(kind, model, queryset, describe, notify=True, follow=None):
+    """
+    Raise alerts of kind ('<app>.<name>') for rows of model. queryset(today)
+    returns the rows currently in alert state and describe(row, today)
+    returns a dict with level, title and message, and optionally priority,
+    icon, url, due_date and data. notify=False keeps the alerts out of the
+    notification bell. follow maps related models to the field that points
+    at them, e.g. {Cattle: 'cattle'}, so renaming an animal rewrites its
+    alerts.
+    """
+    rule = AlertRule(kind, model, queryset, describe, notify, follow)
+    _rules[kind] = rule
+
+    def change_handler(sender, instance, raw=False, **kwargs):
+        if not raw:
+            pk = instance.pk
+            transaction.on_commit(lambda: rule.evaluate([pk]))
+
+    post_save.connect(change_handler, sender=model, weak=False, dispatch_uid=f'alerts_save_{kind}')
+    post_delete.connect(change_handler, sender=model, weak=False, dispatch_uid=f'alerts_delete_{kind}')
+
+    for related, field in rule.follow.items():
+        def related_handler(sender, instance, raw=False, field=field, **kwargs):
+            if not raw:
+                pk = instance.pk
+                transaction.on_commit(lambda: rule.evaluate(
+                    rule.queryset(timezone.localdate()).filter(**{field: pk}).values_list('pk', flat=True)
+                ))
+
+        post_save.connect(
+            related_handler, sender=related, weak=False,
+            dispatch_uid=f'alerts_follow_{kind}_{related.__name__}',
+        )
+    return rule
+
+
+def registered_kinds():
+    return list(_rules)
+
+
+def refresh(model, pks):
+    """Re-check the alerts of rows of model changed without signals (queryset.update())"""
+    pks = list(pks)
+    for rule in _rules.values():
+        if rule.model is model:
+            transaction.on_commit(lambda rule=rule: rule.evaluate(pks))
+
+
+def evaluate(kinds=None, today=None):
+    """Sweep the given kinds (default all), returning {kind: (raised, updated, cleared)}"""
+    return {kind: _rules[kind].evaluate(today=today) for kind in (kinds or _rules)}
+
+
+# ==================== QUERIES ====================
+
+def notifications(app, limit=10):
+    """Unacknowledged bell alerts of app, most urgent first, and their total"""
+    alerts = Alert.objects.filter(app=app, notify=True, acknowledged_at__isnull=True)
+    rows = alerts.order_by('priority', 'due_date', 'id').values(
+        'id', 'level', 'icon', 'title', 'message', 'url'
+    )[:limit]
+    return {
+        'notifications': [
+            {
+                'id': row['id'],
+                'type': row['level'],
+                'icon': row['icon'],
+                'title': row['title'],
+                'message': row['message'],
+                'action_url': row['url'],
+            }
+            for row in rows
+        ],
+        'total': alerts.count(),
+    }
+
+
+def alert_data(kind, limit=20):
+    """The data of the newest alerts of one kind"""
+    rows = Alert.objects.filter(kind=kind).order_by('-due_date', '-object_id').values_list('data', flat=True)
+    return list(rows[:limit])
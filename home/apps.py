@@ -1,5 +1,20 @@
 from django.apps import AppConfig
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models.signals import post_migrate
+
+
+def evaluate_alerts(sender, plan=None, using=DEFAULT_DB_ALIAS, **kwargs):
+    """Raise the alerts of existing rows once migrations have run, so the bell is filled on deploy"""
+    from .models import Alert
+    # Skip no-op runs, other databases, and unmigrating past the Alert table
+    if plan and using == DEFAULT_DB_ALIAS and Alert._meta.db_table in connections[using].introspection.table_names():
+        from . import alerts
+        alerts.evaluate()
 
 
 class HomeConfig(AppConfig):
     name = 'home'
+
+    def ready(self):
+        from agro import db  # noqa: F401
+        post_migrate.connect(evaluate_alerts, sender=self, dispatch_uid='home_evaluate_alerts')
@@ -0,0 +1,103 @@
+import logging
+
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import ReportJob
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== JOB REGISTRY ====================
+
+# Builder for each job type. A builder takes the claimed ReportJob, may call
+# job.set_progress() along the way, and returns the saved report (or export) instance.
+JOB_BUILDERS = {
+    'MILK_PRODUCTION': 'dairy.reporting.build_milk_production_report',
+    'HEALTH_SUMMARY': 'dairy.reporting.build_health_summary_report',
+    'BREEDING_PERFORMANCE': 'dairy.reporting.build_breeding_performance_report',
+    'FISHERY_FINANCIAL': 'fishery.reporting.build_financial_report',
+    'PDF_EXPORT': 'dairy.pdf_exports.build_pdf_export',
+}
+
+
+def queue_report_job(job_type, params, user=None, result_url=''):
+    """Record a report build for the worker to pick up"""
+    if job_type not in JOB_BUILDERS:
+        raise ValueError(f'Unknown report job type: {job_type}')
+    return ReportJob.objects.create(
+        job_type=job_type,
+        params=params,
+        requested_by=user if user is not None and user.is_authenticated else None,
+        result_url=result_url,
+    )
+
+
+def report_job_params(params):
+    """Report filters in a canonical form, so the same filters always match the same jobs"""
+    return {key: params[key] for key in sorted(params) if params[key] not in (None, '')}
+
+
+def queue_report_job_once(job_type, params, user=None, result_url=''):
+    """
+    The user's pending or running job of job_type for these filters, or a
+    newly queued one, so reloading a page never queues the same build twice.
+    """
+    params = report_job_params(params)
+    job = ReportJob.objects.filter(
+        job_type=job_type, params=params, status__in=['PENDING', 'RUNNING'],
+        requested_by=user if user is not None and user.is_authenticated else None,
+    ).order_by('-created_at').first()
+    return job or queue_report_job(job_type, params, user=user, result_url=result_url)
+
+
+# ==================== WORKER SIDE ====================
+
+def claim_next_job():
+    """
+    Move the oldest pending job to RUNNING and return its id, or None.
+    The conditional update makes the claim safe with several workers.
+    """
+    while True:
+        job_id = ReportJob.objects.filter(status='PENDING').order_by('created_at', 'pk').values_list(
+            'pk', flat=True
+        ).first()
+        if job_id is None:
+            return None
+        claimed = ReportJob.objects.filter(pk=job_id, status='PENDING').update(
+            status='RUNNING', started_at=timezone.now(), progress=0, message='Starting'
+        )
+        if claimed:
+            return job_id
+
+
+def requeue_stale_jobs(older_than):
+    """Return jobs left RUNNING by a worker that died to the queue"""
+    return ReportJob.objects.filter(
+        status='RUNNING', started_at__lt=timezone.now() - older_than
+    ).update(status='PENDING', progress=0, message='Requeued')
+
+
+def run_job(job_id):
+    """Build one claimed job. Runs inside a worker process."""
+    close_old_connections()
+    try:
+        job = ReportJob.objects.get(pk=job_id)
+        try:
+            report = import_string(JOB_BUILDERS[job.job_type])(job)
+        except Exception as exc:
+            logger.exception('Report job %s failed', job_id)
+            ReportJob.objects.filter(pk=job_id).update(
+                status='FAILED', error=str(exc), message='Failed', completed_at=timezone.now()
+            )
+            return False
+
+        ReportJob.objects.filter(pk=job_id).update(
+            status='READY', progress=100, message='Done',
+            result_id=report.pk, completed_at=timezone.now()
+        )
+        return True
+    finally:
+        close_old_connections()
+
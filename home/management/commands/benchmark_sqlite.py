@@ -0,0 +1,231 @@
+import copy
+import multiprocessing
+import random
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, close_old_connections, connection, connections, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from agro.db import PRODUCTION_DATABASE_OPTIONS, PRODUCTION_SQLITE_PRAGMAS, sqlite_pragma_values
+from dairy.models import Cattle, MilkRecord
+from dairy.reporting import milk_production_figures
+from dairy.rollups import refresh_daily_summaries
+from dairy.stats import dashboard_stats
+
+
+# Connection settings of each profile; production is shared with agro/settings.py
+PROFILES = {
+    'basic': {
+        'database': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'OPTIONS': {}},
+        'pragmas': {},
+    },
+    'production': {
+        'database': PRODUCTION_DATABASE_OPTIONS,
+        'pragmas': PRODUCTION_SQLITE_PRAGMAS,
+    },
+}
+
+SHOWN_PRAGMAS = ('journal_mode', 'synchronous', 'busy_timeout', 'mmap_size', 'cache_size')
+
+CATTLE_PER_WRITER = 5
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _write_milk(cattle_ids, deadline):
+    """Record milk for this writer's own cattle, walking back a day at a time"""
+    latencies, errors = [], 0
+    today = timezone.now().date()
+    slots = (
+        (today - timedelta(days=day), session, cattle_id)
+        for day in range(100000)
+        for session, _ in MilkRecord.SESSION_CHOICES
+        for cattle_id in cattle_ids
+    )
+    while time.monotonic() < deadline:
+        day, session, cattle_id = next(slots)
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                MilkRecord.objects.create(
+                    cattle_id=cattle_id, date=day, session=session,
+                    quantity=Decimal(random.randint(40, 160)) / 10,
+                )
+            latencies.append(time.perf_counter() - started)
+        except OperationalError:
+            errors += 1
+        # What the request_finished handler does at the end of each request
+        close_old_connections()
+    return latencies, errors
+
+
+def _read_dashboard(deadline):
+    """Load the dairy dashboard figures and the last 30 days of the milk report"""
+    latencies, errors = [], 0
+    while time.monotonic() < deadline:
+        today = timezone.now().date()
+        started = time.perf_counter()
+        try:
+            dashboard_stats(today)
+            milk_production_figures(today - timedelta(days=30), today + timedelta(days=1))
+            latencies.append(time.perf_counter() - started)
+        except OperationalError:
+            errors += 1
+        close_old_connections()
+    return latencies, errors
+
+
+def _run_worker(role, cattle_ids, deadline, queue):
+    """Runs in a forked process, like one web worker"""
+    if role == 'write':
+        result = _write_milk(cattle_ids, deadline)
+    else:
+        result = _read_dashboard(deadline)
+    connections.close_all()
+    queue.put((role, *result))
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark SQLite under concurrent load: N processes recording milk while M '
+        'processes load the dairy dashboard, once per database profile, on a '
+        'temporary copy of the schema. Reports throughput and p50/p99 latency.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=4, help='Processes writing milk records')
+        parser.add_argument('--readers', type=int, default=8, help='Processes reading the dashboard')
+        parser.add_argument('--duration', type=float, default=10, help='Seconds of load per profile')
+        parser.add_argument('--cattle', type=int, default=60, help='Cattle with 60 days of history to seed')
+        parser.add_argument(
+            '--profile', choices=[*PROFILES, 'both'], default='both',
+            help='Profile to measure (default: basic, then production)',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('The default database is not SQLite')
+        if options['writers'] < 0 or options['readers'] < 0 or not options['writers'] + options['readers']:
+            raise CommandError('Need at least one writer or reader')
+
+        profiles = list(PROFILES) if options['profile'] == 'both' else [options['profile']]
+        database = connections.settings['default']
+        original = {key: database.get(key) for key in ('NAME', 'CONN_MAX_AGE', 'CONN_HEALTH_CHECKS', 'OPTIONS')}
+
+        with tempfile.TemporaryDirectory() as directory:
+            template = Path(directory) / 'template.sqlite3'
+            try:
+                self.stdout.write(f'Building a seeded database in {directory}...')
+                self.use_database(template, PROFILES['basic'])
+                with override_settings(SQLITE_PRAGMAS={}):
+                    call_command('migrate', verbosity=0)
+                    writer_cattle = self.seed(options['cattle'], options['writers'])
+                    connections.close_all()
+
+                results = []
+                for name in profiles:
+                    path = Path(directory) / f'{name}.sqlite3'
+                    shutil.copyfile(template, path)
+                    self.use_database(path, PROFILES[name])
+                    with override_settings(SQLITE_PRAGMAS=PROFILES[name]['pragmas']):
+                        pragmas = sqlite_pragma_values(connection, SHOWN_PRAGMAS)
+                        connections.close_all()
+                        self.stdout.write(f"{name}: {', '.join(f'{k}={v}' for k, v in pragmas.items())}")
+                        results.extend(self.run_load(name, writer_cattle, options))
+            finally:
+                connections.close_all()
+                database.update(original)
+
+        self.report(results, options['duration'])
+
+    def use_database(self, path, profile):
+        """Point the default alias of this and every forked process at path"""
+        connections.close_all()
+        database = connections.settings['default']
+        database['NAME'] = str(path)
+        database.update(copy.deepcopy(profile['database']))
+
+    def seed(self, cattle_count, writers):
+        """Herd with milk history for the readers, plus cattle owned by each writer"""
+        today = timezone.now().date()
+        rng = random.Random(1)
+        breeds = [code for code, _ in Cattle.BREED_TYPES]
+
+        def make_cattle(prefix, count):
+            return Cattle.objects.bulk_create([
+                Cattle(
+                    tag_number=f'{prefix}-{number:04d}', cattle_type='DAIRY', gender='F',
+                    breed=rng.choice(breeds), birth_date=today - timedelta(days=1500),
+                )
+                for number in range(count)
+            ])
+
+        herd = make_cattle('BENCH', cattle_count)
+        days = [today - timedelta(days=offset) for offset in range(1, 61)]
+        MilkRecord.objects.bulk_create([
+            MilkRecord(
+                cattle=cow, date=day, session=session,
+                quantity=Decimal(rng.randint(40, 160)) / 10,
+            )
+            for cow in herd
+            for day in days
+            for session in ('MORNING', 'EVENING')
+        ], batch_size=2000)
+        refresh_daily_summaries(days)
+
+        owned = make_cattle('WRITER', writers * CATTLE_PER_WRITER)
+        return [
+            [cow.pk for cow in owned[index * CATTLE_PER_WRITER:(index + 1) * CATTLE_PER_WRITER]]
+            for index in range(writers)
+        ]
+
+    def run_load(self, name, writer_cattle, options):
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue()
+        deadline = time.monotonic() + options['duration'] + 0.5
+        workers = [
+            context.Process(target=_run_worker, args=('write', writer_cattle[index], deadline, queue))
+            for index in range(options['writers'])
+        ] + [
+            context.Process(target=_run_worker, args=('read', None, deadline, queue))
+            for _ in range(options['readers'])
+        ]
+        for worker in workers:
+            worker.start()
+
+        collected = {'write': ([], 0), 'read': ([], 0)}
+        for _ in workers:
+            role, latencies, errors = queue.get(timeout=options['duration'] + 120)
+            previous, previous_errors = collected[role]
+            collected[role] = (previous + latencies, previous_errors + errors)
+        for worker in workers:
+            worker.join()
+
+        return [
+            (name, role, latencies, errors)
+            for role, (latencies, errors) in collected.items()
+            if options['writers' if role == 'write' else 'readers']
+        ]
+
+    def report(self, results, duration):
+        self.stdout.write('')
+        self.stdout.write(f"{'Profile':<12}{'Role':<7}{'Ops':>8}{'Errors':>8}{'Ops/s':>9}{'p50 ms':>9}{'p99 ms':>9}")
+        for name, role, latencies, errors in results:
+            self.stdout.write(
+                f'{name:<12}{role:<7}{len(latencies):>8}{errors:>8}{len(latencies) / duration:>9.1f}'
+                f'{_percentile(latencies, 50) * 1000:>9.1f}{_percentile(latencies, 99) * 1000:>9.1f}'
+            )
@@ -0,0 +1,26 @@
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+
+from agro.cache import cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Show the default cache hit rate across all worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Zero the counters after printing them')
+
+    def handle(self, *args, **options):
+        totals = cache_stats()
+        if totals is None:
+            raise CommandError('The default cache is not a TwoTierCache, so it keeps no hit counters')
+
+        self.stdout.write(f"Lookups:      {totals['lookups']}")
+        self.stdout.write(f"Local hits:   {totals['local_hits']}")
+        self.stdout.write(f"Shared hits:  {totals['shared_hits']}")
+        self.stdout.write(f"Misses:       {totals['misses']}")
+        self.stdout.write(f"Hit rate:     {totals['hit_rate']:.1%}")
+
+        if options['reset']:
+            caches['default'].stats.reset()
+            self.stdout.write('Counters reset')
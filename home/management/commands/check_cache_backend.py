@@ -0,0 +1,121 @@
+import multiprocessing
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+
+def _worker_caches(shared, local_timeout):
+    """CACHES with two TwoTierCache 'workers' reading through one shared cache"""
+    worker = {
+        'BACKEND': 'agro.cache.TwoTierCache',
+        'OPTIONS': {
+            'SHARED': 'shared',
+            'LOCAL_TIMEOUT': local_timeout,
+            'LOCAL_EXCLUDE': ['check:version:'],
+            'STATS_FLUSH_EVERY': 1,
+        },
+    }
+    return {
+        'default': settings.CACHES['default'],
+        'shared': shared,
+        'worker_a': {**worker, 'LOCATION': 'worker-a'},
+        'worker_b': {**worker, 'LOCATION': 'worker-b'},
+    }
+
+
+def _write_from_child(queue):
+    """Runs in a separate process: write through its own worker cache and bump a counter"""
+    caches['worker_a'].set('check:child', 'from-child', 60)
+    caches['worker_a'].incr('check:version:group')
+    queue.put(True)
+
+
+class Command(BaseCommand):
+    help = (
+        'Exercise the two-tier cache against a shared backend: cross-worker visibility, '
+        'invalidation, local-tier expiry, hit-rate counters and a second OS process'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--configured', action='store_true',
+            help="Run against the configured 'shared' cache (e.g. Redis) instead of a temporary file cache",
+        )
+        parser.add_argument('--local-timeout', type=int, default=1, help='Local tier lifetime used by the checks')
+
+    def handle(self, *args, **options):
+        local_timeout = options['local_timeout']
+        with tempfile.TemporaryDirectory() as directory:
+            if options['configured']:
+                shared = settings.CACHES['shared']
+            else:
+                # Stand-in for a cache server: the file backend is shared by every process on the box
+                shared = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directory}
+            self.stdout.write(f"Shared cache: {shared['BACKEND']} ({shared.get('LOCATION', '')})")
+
+            with override_settings(CACHES=_worker_caches(shared, local_timeout)):
+                failures = self.run_checks(local_timeout)
+                caches['shared'].delete_many([
+                    'check:value', 'check:child', 'check:version:group', 'check:gone',
+                ])
+
+        if failures:
+            raise CommandError(f'{len(failures)} cache checks failed: {", ".join(failures)}')
+        self.stdout.write(self.style.SUCCESS('All cache checks passed'))
+
+    def run_checks(self, local_timeout):
+        a, b = caches['worker_a'], caches['worker_b']
+        a.stats.reset()
+        failures = []
+
+        def check(name, ok, detail=''):
+            if ok:
+                self.stdout.write(f'{name}: ok')
+            else:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f'{name}: failed {detail}'))
+
+        a.set('check:value', 'one', 60)
+        check('write is visible to the other worker', b.get('check:value') == 'one')
+        check('repeat read is served locally', b.local.get('check:value') == 'one')
+
+        a.set('check:value', 'two', 60)
+        stale = b.get('check:value')
+        time.sleep(local_timeout + 0.2)
+        fresh = b.get('check:value')
+        check('local copy expires after LOCAL_TIMEOUT', fresh == 'two', f'(got {stale!r} then {fresh!r})')
+
+        a.set('check:version:group', 1, None)
+        b.get('check:version:group')
+        a.incr('check:version:group')
+        check('excluded keys see increments at once', b.get('check:version:group') == 2)
+
+        a.set('check:gone', 'x', 60)
+        b.get('check:gone')
+        b.delete('check:gone')
+        check('delete is immediate for the deleting worker', b.get('check:gone') is None)
+        time.sleep(local_timeout + 0.2)
+        check('delete reaches other workers after LOCAL_TIMEOUT', a.get('check:gone') is None)
+
+        queue = multiprocessing.get_context('fork').Queue()
+        child = multiprocessing.get_context('fork').Process(target=_write_from_child, args=(queue,))
+        child.start()
+        child.join(30)
+        check('child process exited cleanly', child.exitcode == 0 and not queue.empty())
+        check('child process write is visible', b.get('check:child') == 'from-child')
+        check('child process increment is visible', b.get('check:version:group') == 3)
+
+        b.get('check:missing')
+        totals = a.stats.totals()
+        check(
+            'hit/miss counters are shared by both workers',
+            totals['lookups'] > 0 and totals['misses'] >= 1 and 0 < totals['hit_rate'] < 1,
+            f'({totals})',
+        )
+        self.stdout.write(f"Hit rate during checks: {totals['hit_rate']:.0%} of {totals['lookups']} lookups")
+        a.stats.reset()
+        return failures
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from home import alerts
+
+
+class Command(BaseCommand):
+    help = (
+        'Re-evaluate every alert rule against the source tables. Run it periodically (e.g. hourly from cron) '
+        'so date-based alerts are raised and cleared, and once after install or a bulk import'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('kinds', nargs='*', help="Kinds to evaluate (default all)")
+
+    def handle(self, *args, **options):
+        kinds = options['kinds'] or alerts.registered_kinds()
+        unknown = set(kinds) - set(alerts.registered_kinds())
+        if unknown:
+            raise CommandError(
+                f"Unknown kinds: {', '.join(sorted(unknown))} (choose from {', '.join(alerts.registered_kinds())})"
+            )
+
+        with transaction.atomic():
+            counts = alerts.evaluate(kinds)
+        for kind, (raised, updated, cleared) in counts.items():
+            self.stdout.write(f'{kind}: {raised} raised, {updated} updated, {cleared} cleared')
+        self.stdout.write(self.style.SUCCESS('Alerts evaluated'))
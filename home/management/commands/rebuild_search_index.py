@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from home import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the search index from the source tables (after a restore, bulk import or first install)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kinds', nargs='*', help="Kinds to rebuild (default all)")
+
+    def handle(self, *args, **options):
+        kinds = options['kinds'] or search.registered_kinds()
+        unknown = set(kinds) - set(search.registered_kinds())
+        if unknown:
+            raise CommandError(
+                f"Unknown kinds: {', '.join(sorted(unknown))} (choose from {', '.join(search.registered_kinds())})"
+            )
+
+        with transaction.atomic():
+            counts = search.rebuild(kinds)
+        for kind, count in counts.items():
+            self.stdout.write(f'{kind}: {count} entries')
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt'))
@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from home.jobs import requeue_stale_jobs
+from home.worker import run_worker
+
+
+class Command(BaseCommand):
+    help = 'Build queued reports (ReportJob rows) in a pool of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='Reports built in parallel')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds between queue checks')
+        parser.add_argument('--stale-after', type=int, default=60,
+                            help='Minutes after which a RUNNING job is assumed lost and requeued on startup')
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is empty')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError('--workers must be at least 1')
+
+        requeued = requeue_stale_jobs(timedelta(minutes=options['stale_after']))
+        if requeued:
+            self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale jobs'))
+
+        self.stdout.write(f"Report worker started with {options['workers']} processes")
+        try:
+            run_worker(
+                workers=options['workers'],
+                poll_interval=options['poll_interval'],
+                once=options['once'],
+                on_submit=lambda job_id: self.stdout.write(f'Started job {job_id}'),
+            )
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping report worker')
+            return
+        self.stdout.write(self.style.SUCCESS('Report queue drained'))
@@ -0,0 +1,99 @@
+# Generated by Django 6.0.2 on 2026-10-18 06:48
+
+from django.db import migrations, models
+
+
+# SQLite: an FTS5 index over title and body, kept in step with the table by triggers
+SQLITE_CREATE = [
+    """
+    CREATE VIRTUAL TABLE home_searchentry_fts USING fts5(
+        title, body, content='home_searchentry', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER home_searchentry_fts_insert AFTER INSERT ON home_searchentry BEGIN
+        INSERT INTO home_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER home_searchentry_fts_delete AFTER DELETE ON home_searchentry BEGIN
+        INSERT INTO home_searchentry_fts(home_searchentry_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER home_searchentry_fts_update AFTER UPDATE ON home_searchentry BEGIN
+        INSERT INTO home_searchentry_fts(home_searchentry_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO home_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS home_searchentry_fts_insert',
+    'DROP TRIGGER IF EXISTS home_searchentry_fts_delete',
+    'DROP TRIGGER IF EXISTS home_searchentry_fts_update',
+    'DROP TABLE IF EXISTS home_searchentry_fts',
+]
+
+# PostgreSQL: a GIN index on the same weighted tsvector home.search queries with
+POSTGRESQL_CREATE = [
+    """
+    CREATE INDEX home_searchentry_document ON home_searchentry USING gin ((
+        setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B')
+    ))
+    """,
+]
+POSTGRESQL_DROP = ['DROP INDEX IF EXISTS home_searchentry_document']
+
+
+def _run(schema_editor, statements):
+    for sql in statements.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(sql)
+
+
+def create_fulltext_index(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_CREATE, 'postgresql': POSTGRESQL_CREATE})
+
+
+def drop_fulltext_index(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_DROP, 'postgresql': POSTGRESQL_DROP})
+
+
+def index_existing_rows(apps, schema_editor):
+    from home import search
+    search.backfill(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0001_initial'),
+        # The searchable models, for the backfill
+        ('dairy', '0001_initial'),
+        ('fishery', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('title', models.CharField(max_length=200)),
+                ('subtitle', models.CharField(blank=True, max_length=200)),
+                ('body', models.TextField(blank=True, help_text='Other searchable text')),
+                ('url', models.CharField(blank=True, max_length=500)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Search Entry',
+                'verbose_name_plural': 'Search Entries',
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+        migrations.RunPython(index_existing_rows, migrations.RunPython.noop),
+    ]
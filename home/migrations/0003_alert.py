@@ -0,0 +1,44 @@
+# Generated by Django 6.0.2 on 2026-10-18 06:59
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0002_search_entry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Alert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=40)),
+                ('object_id', models.PositiveIntegerField()),
+                ('app', models.CharField(max_length=20)),
+                ('notify', models.BooleanField(default=True, help_text='Shown in the notification bell')),
+                ('level', models.CharField(choices=[('danger', 'Danger'), ('warning', 'Warning'), ('info', 'Info'), ('success', 'Success')], max_length=10)),
+                ('priority', models.PositiveSmallIntegerField(default=0, help_text='Lower shows first')),
+                ('icon', models.CharField(blank=True, max_length=40)),
+                ('title', models.CharField(max_length=100)),
+                ('message', models.TextField()),
+                ('url', models.CharField(blank=True, max_length=500)),
+                ('due_date', models.DateField(blank=True, null=True)),
+                ('data', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Rule specific fields')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('acknowledged_at', models.DateTimeField(blank=True, null=True)),
+                ('acknowledged_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='acknowledged_alerts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Alert',
+                'verbose_name_plural': 'Alerts',
+                'indexes': [models.Index(fields=['app', 'notify', 'acknowledged_at', 'priority', 'due_date'], name='home_alert_app_fd19f4_idx')],
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 07:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0003_alert'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reportjob',
+            name='job_type',
+            field=models.CharField(choices=[('MILK_PRODUCTION', 'Milk Production Report'), ('HEALTH_SUMMARY', 'Health Summary Report'), ('BREEDING_PERFORMANCE', 'Breeding Performance Report'), ('FISHERY_FINANCIAL', 'Fishery Financial Report'), ('PDF_EXPORT', 'PDF Export')], max_length=30),
+        ),
+    ]
@@ -1,3 +1,142 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.contrib.auth import get_user_model
 
-# Create your models here.
+User = get_user_model()
+
+
+# ==================== REPORT JOBS ====================
+
+class ReportJob(models.Model):
+    """A queued report build, picked up by `manage.py run_report_worker`"""
+
+    JOB_TYPES = [
+        ('MILK_PRODUCTION', 'Milk Production Report'),
+        ('HEALTH_SUMMARY', 'Health Summary Report'),
+        ('BREEDING_PERFORMANCE', 'Breeding Performance Report'),
+        ('FISHERY_FINANCIAL', 'Fishery Financial Report'),
+        ('PDF_EXPORT', 'PDF Export'),
+    ]
+
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('READY', 'Ready'),
+        ('FAILED', 'Failed'),
+    ]
+
+    job_type = models.CharField(max_length=30, choices=JOB_TYPES)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+
+    # Progress
+    progress = models.PositiveSmallIntegerField(default=0, help_text="Percent complete")
+    message = models.CharField(max_length=200, blank=True)
+    error = models.TextField(blank=True)
+
+    # Result
+    result_id = models.PositiveIntegerField(null=True, blank=True, help_text="Primary key of the saved report")
+    result_url = models.CharField(max_length=500, blank=True, help_text="Page to show once the report is ready")
+
+    # Metadata
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+        verbose_name = "Report Job"
+        verbose_name_plural = "Report Jobs"
+
+    def __str__(self):
+        return f"{self.get_job_type_display()} #{self.pk} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in ('READY', 'FAILED')
+
+    def set_progress(self, progress, message=''):
+        """Record progress without touching the rest of the row"""
+        self.progress = progress
+        self.message = message
+        ReportJob.objects.filter(pk=self.pk).update(progress=progress, message=message)
+
+
+# ==================== SEARCH INDEX ====================
+
+class SearchEntry(models.Model):
+    """
+    One searchable record (a cow, pond, cycle, customer or sale), kept in
+    sync by the signals registered through home.search. The full-text index
+    over title and body is built by the database, see migration 0002.
+    """
+
+    kind = models.CharField(max_length=20)
+    object_id = models.PositiveIntegerField()
+    title = models.CharField(max_length=200)
+    subtitle = models.CharField(max_length=200, blank=True)
+    body = models.TextField(blank=True, help_text="Other searchable text")
+    url = models.CharField(max_length=500, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['kind', 'object_id']
+        verbose_name = "Search Entry"
+        verbose_name_plural = "Search Entries"
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id}: {self.title}"
+
+
+# ==================== ALERTS ====================
+
+class Alert(models.Model):
+    """
+    A condition that currently needs attention (an overdue vaccination, low
+    feed stock, ...), one row per rule and object. Rows are raised, updated
+    and cleared by the rules registered through home.alerts; acknowledging
+    one hides it from the notification bell until it clears.
+    """
+
+    LEVELS = [
+        ('danger', 'Danger'),
+        ('warning', 'Warning'),
+        ('info', 'Info'),
+        ('success', 'Success'),
+    ]
+
+    kind = models.CharField(max_length=40)
+    object_id = models.PositiveIntegerField()
+    app = models.CharField(max_length=20)
+    notify = models.BooleanField(default=True, help_text="Shown in the notification bell")
+
+    level = models.CharField(max_length=10, choices=LEVELS)
+    priority = models.PositiveSmallIntegerField(default=0, help_text="Lower shows first")
+    icon = models.CharField(max_length=40, blank=True)
+    title = models.CharField(max_length=100)
+    message = models.TextField()
+    url = models.CharField(max_length=500, blank=True)
+    due_date = models.DateField(null=True, blank=True)
+    data = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder, help_text="Rule specific fields")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    acknowledged_at = models.DateTimeField(null=True, blank=True)
+    acknowledged_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name='acknowledged_alerts'
+    )
+
+    class Meta:
+        unique_together = ['kind', 'object_id']
+        indexes = [
+            # The notification bell: unacknowledged alerts of one app, most urgent first
+            models.Index(fields=['app', 'notify', 'acknowledged_at', 'priority', 'due_date']),
+        ]
+        verbose_name = "Alert"
+        verbose_name_plural = "Alerts"
+
+    def __str__(self):
+        return f"{self.title}: {self.message}"
@@ -0,0 +1,243 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_save, post_delete
+
+from .models import SearchEntry
+
+
+# ==================== SEARCH INDEX ====================
+#
+# Apps register the models they want searchable with register(), giving a
+# function that turns an instance into its title, subtitle, url and body.
+# Saving or deleting an instance updates its SearchEntry row, and the
+# database keeps a full-text index over those rows (FTS5 on SQLite, a GIN
+# tsvector index on PostgreSQL, see home/migrations/0002_search_entry.py).
+# Every search term is matched as a word prefix, so typeahead works from the
+# first couple of letters without scanning the source tables.
+
+MAX_TERMS = 8
+
+_types = {}
+
+
+class SearchType:
+    """How one model is indexed"""
+
+    def __init__(self, kind, model, document, queryset=None, follow=None):
+        self.kind = kind
+        self.model = model
+        self.document = document
+        self.queryset = queryset
+        self.follow = follow or {}
+
+    def get_queryset(self):
+        return self.queryset() if self.queryset else self.model._default_manager.all()
+
+    def index(self, instance):
+        SearchEntry.objects.update_or_create(
+            kind=self.kind, object_id=instance.pk, defaults=self.document(instance)
+        )
+
+    def remove(self, pk):
+        SearchEntry.objects.filter(kind=self.kind, object_id=pk).delete()
+
+    def rebuild(self, batch_size=500):
+        """Re-index every row of the model, dropping entries whose rows are gone"""
+        SearchEntry.objects.filter(kind=self.kind).delete()
+        entries = (
+            SearchEntry(kind=self.kind, object_id=instance.pk, **self.document(instance))
+            for instance in self.get_queryset().iterator(chunk_size=batch_size)
+        )
+        return len(SearchEntry.objects.bulk_create(entries, batch_size=batch_size))
+
+
+def register(kind, model, document, queryset=None, follow=None):
+    """
+    Make model searchable as kind. document(instance) returns a dict with
+    title, subtitle, url and body. queryset() (optional) is used when the
+    index is rebuilt. follow maps related models to the field that points at
+    them, e.g. {Pond: 'pond'}, so renaming a pond re-indexes its cycles.
+    """
+    search_type = SearchType(kind, model, document, queryset, follow)
+    _types[kind] = search_type
+
+    def save_handler(sender, instance, raw=False, **kwargs):
+        if not raw:
+            search_type.index(instance)
+
+    def delete_handler(sender, instance, **kwargs):
+        search_type.remove(instance.pk)
+
+    post_save.connect(save_handler, sender=model, weak=False, dispatch_uid=f'search_index_{kind}')
+    post_delete.connect(delete_handler, sender=model, weak=False, dispatch_uid=f'search_remove_{kind}')
+
+    for related, field in search_type.follow.items():
+        def related_handler(sender, instance, raw=False, field=field, **kwargs):
+            if not raw:
+                for dependent in search_type.get_queryset().filter(**{field: instance}):
+                    search_type.index(dependent)
+
+        post_save.connect(
+            related_handler, sender=related, weak=False,
+            dispatch_uid=f'search_follow_{kind}_{related.__name__}',
+        )
+    return search_type
+
+
+def registered_kinds():
+    return list(_types)
+
+
+def rebuild(kinds=None):
+    """Rebuild the index for the given kinds (default all), returning {kind: entries}"""
+    return {kind: _types[kind].rebuild() for kind in (kinds or _types)}
+
+
+def backfill(apps, batch_size=500):
+    """Index the rows already in the database, with a migration's historical models"""
+    SearchEntry = apps.get_model('home', 'SearchEntry')
+    for kind, search_type in _types.items():
+        model = apps.get_model(search_type.model._meta.label)
+        entries = (
+            SearchEntry(kind=kind, object_id=instance.pk, **search_type.document(instance))
+            for instance in model._default_manager.iterator(chunk_size=batch_size)
+        )
+        SearchEntry.objects.bulk_create(entries, batch_size=batch_size)
+
+
+def text(*values):
+    """Join the non-empty values of a document body"""
+    return ' '.join(str(value) for value in values if value)
+
+
+# ==================== QUERIES ====================
+
+def _terms(query):
+    return re.findall(r'\w+', query.lower())[:MAX_TERMS]
+
+
+def _kind_filter(kinds, column):
+    if not kinds:
+        return '', []
+    return f" AND {column} IN ({', '.join(['%s'] * len(kinds))})", list(kinds)
+
+
+def _fts_match(terms):
+    """FTS5 MATCH expression: every term as a quoted prefix"""
+    return ' AND '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+def _tsquery(terms):
+    return ' & '.join(f'{term}:*' for term in terms)
+
+
+# Must match the expression of the home_searchentry_document index
+PG_DOCUMENT = "setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B')"
+
+
+def _search_sqlite(terms, kinds, limit):
+    match = _fts_match(terms)
+    kind_sql, kind_params = _kind_filter(kinds, 'e.kind')
+    # bm25() is lower for better matches; a title hit counts ten times a body hit
+    sql = f"""
+        SELECT e.kind, e.object_id, e.title, e.subtitle, e.url, -bm25(home_searchentry_fts, 10.0, 1.0)
+        FROM home_searchentry_fts
+        JOIN home_searchentry e ON e.id = home_searchentry_fts.rowid
+        WHERE home_searchentry_fts MATCH %s{kind_sql}
+        ORDER BY 6 DESC
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        # LIMIT -1 is no limit in SQLite
+        cursor.execute(sql, [match, *kind_params, -1 if limit is None else limit])
+        return cursor.fetchall()
+
+
+def _search_postgresql(terms, kinds, limit):
+    document = PG_DOCUMENT
+    query = _tsquery(terms)
+    kind_sql, kind_params = _kind_filter(kinds, 'kind')
+    sql = f"""
+        SELECT kind, object_id, title, subtitle, url, ts_rank({document}, to_tsquery('simple', %s))
+        FROM home_searchentry
+        WHERE ({document}) @@ to_tsquery('simple', %s){kind_sql}
+        ORDER BY 6 DESC
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        # LIMIT NULL is no limit in PostgreSQL
+        cursor.execute(sql, [query, query, *kind_params, limit])
+        return cursor.fetchall()
+
+
+def _search_fallback(terms, kinds, limit):
+    """Unranked substring match for databases without a full-text index"""
+    entries = SearchEntry.objects.all()
+    for term in terms:
+        entries = entries.filter(Q(title__icontains=term) | Q(body__icontains=term))
+    if kinds:
+        entries = entries.filter(kind__in=kinds)
+    return [
+        (*row, 0)
+        for row in entries.values_list('kind', 'object_id', 'title', 'subtitle', 'url')[:limit]
+    ]
+
+
+BACKENDS = {
+    'sqlite': _search_sqlite,
+    'postgresql': _search_postgresql,
+}
+
+
+def search(query, kinds=None, limit=20):
+    """
+    Ranked hits for query across the given kinds (default all), best first,
+    at most limit of them (None for all). Each hit is a dict with type, id,
+    title, subtitle, url and score.
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+    backend = BACKENDS.get(connection.vendor, _search_fallback)
+    return [
+        {'type': kind, 'id': object_id, 'title': title, 'subtitle': subtitle, 'url': url, 'score': round(score, 4)}
+        for kind, object_id, title, subtitle, url, score in backend(terms, kinds, limit)
+    ]
+
+
+def search_ids(query, kind, limit=20):
+    """Primary keys of the best matches of one kind, best first"""
+    return [hit['id'] for hit in search(query, [kind], limit)]
+
+
+def matching(query, kind):
+    """
+    Subquery of the object ids of every match of one kind, unranked, for
+    filtering a source queryset (pk__in=matching(...)) inside the database
+    instead of passing the ids through Python.
+    """
+    terms = _terms(query)
+    entries = SearchEntry.objects.filter(kind=kind)
+    if not terms:
+        return entries.none().values('object_id')
+    if connection.vendor == 'sqlite':
+        entries = entries.filter(id__in=RawSQL(
+            'SELECT rowid FROM home_searchentry_fts WHERE home_searchentry_fts MATCH %s', [_fts_match(terms)]
+        ))
+    elif connection.vendor == 'postgresql':
+        entries = entries.filter(id__in=RawSQL(
+            f"SELECT id FROM home_searchentry WHERE ({PG_DOCUMENT}) @@ to_tsquery('simple', %s)", [_tsquery(terms)]
+        ))
+    else:
+        for term in terms:
+            entries = entries.filter(Q(title__icontains=term) | Q(body__icontains=term))
+    return entries.values('object_id')
+
+
+def in_order(queryset, ids):
+    """Rows of queryset with the given primary keys, in the order of ids"""
+    rows = {row['id'] if isinstance(row, dict) else row.pk: row for row in queryset.filter(pk__in=ids)}
+    return [rows[pk] for pk in ids if pk in rows]
@@ -1,3 +1,374 @@
-from django.test import TestCase
+import json
+import time
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, RequestFactory, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from agro.cache import TwoTierCache, cache_stats
+from agro.db import apply_sqlite_pragmas, sqlite_pragma_values
+from dairy.models import Cattle, HealthRecord, VaccinationSchedule
+from dairy.views import CattleListView, NotificationsAPIView, HealthAlertsAPIView
+from fishery import caching
+
+from . import alerts, jobs, search
+from .models import SearchEntry, Alert, ReportJob
+from .views import AlertListAPIView, AlertAcknowledgeAPIView
+
+
+def make_cattle(tag_number, **fields):
+    return Cattle.objects.create(
+        tag_number=tag_number, breed='HF', gender='F', birth_date=date(2022, 1, 1), **fields
+    )
+
+
+# ==================== SEARCH ====================
+
+class SearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('searcher', password='x')
+        cls.ruby = make_cattle('A100', name='Ruby')
+        cls.bella = make_cattle('B200', name='Bella', location='Ruby field')
+        cls.other = make_cattle('T001', name='Clover')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_saving_a_row_indexes_it(self):
+        entry = SearchEntry.objects.get(kind='cattle', object_id=self.ruby.pk)
+        self.assertEqual(entry.title, 'A100 - Ruby')
+
+        self.ruby.delete()
+        self.assertFalse(SearchEntry.objects.filter(kind='cattle', object_id=self.ruby.pk).exists())
+
+    def test_title_matches_rank_above_body_matches(self):
+        hits = search.search('ruby')
+        self.assertEqual([hit['id'] for hit in hits], [self.ruby.pk, self.bella.pk])
+
+    def test_terms_match_word_prefixes(self):
+        self.assertEqual(search.search_ids('clo', 'cattle'), [self.other.pk])
+        self.assertEqual(search.search_ids('ruby cl', 'cattle'), [])
+
+    def test_matching_filters_in_the_database(self):
+        cattle = Cattle.objects.filter(pk__in=search.matching('bell', 'cattle'))
+        self.assertEqual(list(cattle), [self.bella])
+        self.assertEqual(list(Cattle.objects.filter(pk__in=search.matching('', 'cattle'))), [])
+
+    def test_other_engines_fall_back_to_substring_matches(self):
+        # Neither FTS5 nor tsvector: the same queries through icontains on the index table
+        with mock.patch.object(search, 'connection', mock.Mock(vendor='mysql')):
+            self.assertEqual(sorted(search.search_ids('ruby', 'cattle')), sorted([self.ruby.pk, self.bella.pk]))
+            cattle = Cattle.objects.filter(pk__in=search.matching('clo', 'cattle'))
+            self.assertEqual(list(cattle), [self.other])
+
+    def test_cattle_list_keeps_substring_tag_matches(self):
+        request = RequestFactory().get('/', {'search': '001'})
+        request.user = self.user
+        view = CattleListView()
+        view.setup(request)
+        self.assertEqual(list(view.get_queryset()), [self.other])
+
+    def test_search_api(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('home:search'), {'q': 'rub', 'types': 'cattle'})
+        data = response.json()['data']
+        self.assertEqual([hit['id'] for hit in data], [self.ruby.pk, self.bella.pk])
+        self.assertEqual(data[0]['type'], 'cattle')
+
+        response = self.client.get(reverse('home:search'), {'q': 'rub', 'types': 'goat'})
+        self.assertEqual(response.status_code, 400)
+
+
+# ==================== TWO-TIER CACHE ====================
+
+# Two "worker processes" reading through one shared cache. Every LocMemCache
+# with the same LOCATION shares its store, so it stands in for a Redis server.
+WORKER = {
+    'BACKEND': 'agro.cache.TwoTierCache',
+    'OPTIONS': {
+        'SHARED': 'shared',
+        'LOCAL_TIMEOUT': 5,
+        'LOCAL_EXCLUDE': ['fishery:version:', 'agro:version:'],
+        'STATS_FLUSH_EVERY': 1,
+    },
+}
+TWO_WORKERS = {
+    'default': {**WORKER, 'LOCATION': 'worker-a'},
+    'worker_b': {**WORKER, 'LOCATION': 'worker-b'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'shared-stand-in'},
+}
+
+
+@override_settings(CACHES=TWO_WORKERS)
+class TwoTierCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.a, self.b = caches['default'], caches['worker_b']
+        self.a.clear()
+        self.b.local.clear()
+        self.a.stats.reset()
+        self.b.stats.reset()
+
+    def later(self, seconds):
+        """Pretend seconds have passed, for the local tier's expiry"""
+        now = time.time() + seconds
+        return mock.patch('django.core.cache.backends.locmem.time.time', return_value=now)
+
+    def test_writes_are_visible_to_other_workers(self):
+        self.a.set('value', 'one', 60)
+        self.assertEqual(self.b.get('value'), 'one')
+        self.assertEqual(self.b.local.get('value'), 'one')
+
+    def test_local_copies_expire_after_local_timeout(self):
+        self.a.set('value', 'one', 60)
+        self.b.get('value')
+        self.a.set('value', 'two', 60)
+        self.assertEqual(self.b.get('value'), 'one')
+        with self.later(6):
+            self.assertEqual(self.b.get('value'), 'two')
+
+    def test_deletes(self):
+        self.a.set('value', 'one', 60)
+        self.b.get('value')
+        self.a.delete('value')
+        self.assertIsNone(self.a.get('value'))
+        with self.later(6):
+            self.assertIsNone(self.b.get('value'))
+
+    def test_excluded_keys_skip_the_local_tier(self):
+        self.a.set('agro:version:dairy.cattle', 1, None)
+        self.b.get('agro:version:dairy.cattle')
+        self.a.incr('agro:version:dairy.cattle')
+        self.assertEqual(self.b.get('agro:version:dairy.cattle'), 2)
+
+    def test_version_bump_in_another_worker_invalidates_keys_at_once(self):
+        before = caching.versioned_key('ponds', (caching.PONDS,), 'page=1')
+        self.b.incr('fishery:version:ponds')
+        after = caching.versioned_key('ponds', (caching.PONDS,), 'page=1')
+        self.assertNotEqual(before, after)
+
+        caching.bump(caching.PONDS)
+        self.assertNotEqual(caching.versioned_key('ponds', (caching.PONDS,), 'page=1'), after)
+
+    def test_hit_counters_are_shared_by_all_workers(self):
+        self.a.set('value', 'one', 60)
+        self.b.get('value')     # shared hit
+        self.b.get('value')     # local hit
+        self.a.get('missing')   # miss
+        self.a.get('value')     # local hit (filled by set)
+
+        totals = cache_stats()
+        self.assertEqual(
+            {name: totals[name] for name in ('local_hits', 'shared_hits', 'misses', 'lookups')},
+            {'local_hits': 2, 'shared_hits': 1, 'misses': 1, 'lookups': 4},
+        )
+        self.assertEqual(totals['hit_rate'], 0.75)
+        self.assertEqual(self.b.stats.totals()['lookups'], 4)
+
+    def test_get_many_reads_through_both_tiers(self):
+        self.a.set_many({'x': 1, 'y': 2}, 60)
+        self.b.get('x')
+        self.assertEqual(self.b.get_many(['x', 'y', 'z']), {'x': 1, 'y': 2})
+        totals = self.b.stats.totals()
+        self.assertEqual((totals['local_hits'], totals['shared_hits'], totals['misses']), (1, 2, 1))
+
+    @override_settings(CACHES={'default': TWO_WORKERS['shared']})
+    def test_cache_stats_needs_a_two_tier_cache(self):
+        self.assertNotIsInstance(caches['default'], TwoTierCache)
+        self.assertIsNone(cache_stats())
+
+
+# ==================== DATABASE PROFILE ====================
+
+class SqlitePragmaTests(TestCase):
+
+    PRAGMAS = {'cache_size': -2000, 'busy_timeout': 1234}
+
+    def test_pragmas_are_applied_to_sqlite_connections_only(self):
+        if connection.vendor != 'sqlite':
+            # Other engines are left alone
+            with override_settings(SQLITE_PRAGMAS=self.PRAGMAS):
+                apply_sqlite_pragmas(sender=None, connection=connection)
+            return
+
+        before = sqlite_pragma_values(connection, self.PRAGMAS)
+        self.addCleanup(self.restore, before)
+        with override_settings(SQLITE_PRAGMAS=self.PRAGMAS):
+            apply_sqlite_pragmas(sender=None, connection=connection)
+        self.assertEqual(sqlite_pragma_values(connection, self.PRAGMAS), self.PRAGMAS)
+
+    def restore(self, values):
+        with override_settings(SQLITE_PRAGMAS=values):
+            apply_sqlite_pragmas(sender=None, connection=connection)
+
+
+# ==================== ALERTS ====================
+
+class AlertTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('alerted', password='x')
+        cls.today = timezone.localdate()
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cow = make_cattle('T100', name='Daisy')
+            self.overdue = VaccinationSchedule.objects.create(
+                cattle=self.cow, vaccine_type='FMD', scheduled_date=self.today - timedelta(days=2),
+            )
+            self.due = VaccinationSchedule.objects.create(
+                cattle=self.cow, vaccine_type='BQ', scheduled_date=self.today + timedelta(days=3),
+            )
+            self.emergency = HealthRecord.objects.create(
+                cattle=self.cow, date=self.today, health_type='TREATMENT', diagnosis='Colic',
+                veterinarian='Dr. Vet', is_emergency=True, next_checkup_date=self.today - timedelta(days=1),
+            )
+
+    def get(self, view, data=None, **kwargs):
+        request = self.factory.get('/', data or {})
+        request.user = self.user
+        return json.loads(view.as_view()(request, **kwargs).content)
+
+    def test_writes_raise_alerts_once_per_object(self):
+        self.assertEqual(sorted(Alert.objects.values_list('kind', flat=True)), [
+            'dairy.followup_overdue', 'dairy.health_emergency', 'dairy.vaccination_due', 'dairy.vaccination_overdue',
+        ])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.overdue.save()
+        self.assertEqual(Alert.objects.filter(kind='dairy.vaccination_overdue').count(), 1)
+        self.assertEqual(alerts.evaluate(), dict.fromkeys(alerts.registered_kinds(), (0, 0, 0)))
+
+    def test_bell_reads_unacknowledged_alerts_most_urgent_first(self):
+        with self.assertNumQueries(2):
+            data = self.get(NotificationsAPIView)
+        self.assertEqual(data['total'], 3)
+        self.assertEqual([n['title'] for n in data['notifications']], [
+            'Overdue Vaccination', 'Emergency Case', 'Vaccination Due Soon',
+        ])
+        self.assertEqual(data['notifications'][0]['action_url'], f'/dairy/vaccination/{self.overdue.pk}/')
+
+    def test_acknowledged_alerts_leave_the_bell(self):
+        alert = Alert.objects.get(kind='dairy.vaccination_overdue')
+        request = self.factory.post('/')
+        request.user = self.user
+        AlertAcknowledgeAPIView.as_view()(request, pk=alert.pk)
+        alert.refresh_from_db()
+        self.assertEqual(alert.acknowledged_by, self.user)
+
+        self.assertEqual(self.get(NotificationsAPIView)['total'], 2)
+        self.assertEqual(len(self.get(AlertListAPIView, {'app': 'dairy'})['data']), 3)
+        self.assertEqual(len(self.get(AlertListAPIView, {'app': 'dairy', 'acknowledged': 1})['data']), 4)
+
+    def test_completing_clears_and_renaming_rewrites(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.overdue.is_completed = True
+            self.overdue.save()
+            self.cow.tag_number = 'T200'
+            self.cow.save()
+        self.assertFalse(Alert.objects.filter(kind='dairy.vaccination_overdue').exists())
+        self.assertEqual(Alert.objects.get(kind='dairy.vaccination_due').message, 'T200 - Black Quarter in 3 days')
+
+    def test_bulk_updates_refresh_alerts(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            VaccinationSchedule.objects.filter(cattle=self.cow).update(is_completed=True)
+            alerts.refresh(VaccinationSchedule, [self.overdue.pk, self.due.pk])
+        self.assertFalse(Alert.objects.filter(kind__startswith='dairy.vaccination').exists())
+
+    def test_sweep_moves_date_based_alerts(self):
+        later = self.today + timedelta(days=8)
+        with self.captureOnCommitCallbacks(execute=True):
+            results = alerts.evaluate(today=later)
+        # The due vaccination is now overdue and the emergency has aged out
+        self.assertEqual(results['dairy.vaccination_overdue'], (1, 0, 0))
+        self.assertEqual(results['dairy.vaccination_due'], (0, 0, 1))
+        self.assertEqual(results['dairy.health_emergency'], (0, 0, 1))
+
+    def test_health_alerts_api_reads_alert_data(self):
+        data = self.get(HealthAlertsAPIView)['data']
+        self.assertEqual(data['emergencies'], [{
+            'id': self.emergency.pk, 'cattle_tag': 'T100', 'diagnosis': 'Colic', 'date': self.today.isoformat(),
+        }])
+        self.assertEqual(data['overdue_followups'][0]['checkup_date'], (self.today - timedelta(days=1)).isoformat())
+
+
+# ==================== REPORT JOBS ====================
+
+def build_report(job):
+    """Stand-in builder, returning a saved report with pk 42"""
+    return mock.Mock(pk=42)
+
+
+@mock.patch('home.jobs.close_old_connections', lambda: None)
+class ReportJobTests(TestCase):
+    """Workers claim each pending job exactly once, oldest first"""
+
+    def queue(self, count):
+        return [jobs.queue_report_job('MILK_PRODUCTION', {'n': i}) for i in range(count)]
+
+    def test_unknown_job_type(self):
+        with self.assertRaises(ValueError):
+            jobs.queue_report_job('NOPE', {})
+        self.assertFalse(ReportJob.objects.exists())
+
+    def test_claims_oldest_first_then_none(self):
+        queued = self.queue(3)
+        claimed = [jobs.claim_next_job() for _ in range(4)]
+        self.assertEqual(claimed, [job.pk for job in queued] + [None])
+        job = ReportJob.objects.get(pk=queued[0].pk)
+        self.assertEqual((job.status, job.message), ('RUNNING', 'Starting'))
+        self.assertIsNotNone(job.started_at)
+
+    def test_job_taken_by_another_worker_is_skipped(self):
+        first, second = self.queue(2)
+        racing = []
+
+        def other_worker(execute, sql, params, many, context):
+            result = execute(sql, params, many, context)
+            if sql.startswith('SELECT') and not racing:
+                # Another worker claims the job between our read and our update
+                racing.append(ReportJob.objects.filter(pk=first.pk).update(status='RUNNING'))
+            return result
+
+        with connection.execute_wrapper(other_worker):
+            self.assertEqual(jobs.claim_next_job(), second.pk)
+        self.assertEqual(racing, [1])
+        self.assertEqual(ReportJob.objects.get(pk=first.pk).message, '')
+
+    def test_stale_running_jobs_are_requeued(self):
+        stale, fresh = self.queue(2)
+        jobs.claim_next_job()
+        jobs.claim_next_job()
+        ReportJob.objects.filter(pk=stale.pk).update(started_at=timezone.now() - timedelta(hours=2))
+
+        self.assertEqual(jobs.requeue_stale_jobs(timedelta(hours=1)), 1)
+        self.assertEqual(ReportJob.objects.get(pk=stale.pk).status, 'PENDING')
+        self.assertEqual(ReportJob.objects.get(pk=fresh.pk).status, 'RUNNING')
+        self.assertEqual(jobs.claim_next_job(), stale.pk)
+
+    def test_run_job_records_the_result(self):
+        job_id = self.queue(1)[0].pk
+        jobs.claim_next_job()
+        with mock.patch.dict(jobs.JOB_BUILDERS, MILK_PRODUCTION=f'{__name__}.build_report'):
+            self.assertTrue(jobs.run_job(job_id))
+        job = ReportJob.objects.get(pk=job_id)
+        self.assertEqual((job.status, job.progress, job.result_id), ('READY', 100, 42))
+        self.assertIsNotNone(job.completed_at)
+
+    def test_failed_build_is_recorded(self):
+        job_id = self.queue(1)[0].pk
+        jobs.claim_next_job()
+        build = mock.Mock(side_effect=RuntimeError('no data'))
+        with mock.patch('home.jobs.import_string', return_value=build), self.assertLogs('home.jobs', 'ERROR'):
+            self.assertFalse(jobs.run_job(job_id))
+        job = ReportJob.objects.get(pk=job_id)
+        self.assertEqual((job.status, job.error), ('FAILED', 'no data'))
@@ -1,8 +1,13 @@
 from django.urls import path
-from .views import dashboard_view
+from .views import dashboard_view, ReportJobStatusView, CacheStatsView, SearchAPIView, AlertListAPIView, AlertAcknowledgeAPIView
 
 app_name = 'home'
 
 urlpatterns = [
     path('', dashboard_view, name='dashboard'),  # root page
+    path('jobs/<int:pk>/', ReportJobStatusView.as_view(), name='report_job_status'),
+    path('cache/stats/', CacheStatsView.as_view(), name='cache_stats'),
+    path('search/', SearchAPIView.as_view(), name='search'),
+    path('alerts/', AlertListAPIView.as_view(), name='alerts'),
+    path('alerts/<int:pk>/acknowledge/', AlertAcknowledgeAPIView.as_view(), name='alert_acknowledge'),
 ]
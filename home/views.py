@@ -1,6 +1,186 @@
-from django.shortcuts import render
+from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.generic import View
+
+from agro import conditional
+from agro.cache import cache_stats
+from agro.conditional import ConditionalGetMixin
+from . import search
+from .jobs import queue_report_job, queue_report_job_once, report_job_params
+from .models import ReportJob, Alert
 
 @login_required
 def dashboard_view(request):
     return render(request, 'home/dashboard.html', {'user': request.user})
+
+
+# ==================== REPORT JOBS ====================
+
+class ReportJobMixin:
+    """
+    Report pages show a report saved by the report worker (see home.jobs)
+    instead of aggregating inside the web request. A GET renders the saved
+    report for the page's filters; when there is none yet it queues the
+    build and sends the user to the job's progress page, which comes back
+    here once the report is ready. A saved report older than today or than
+    the last change to report_models is still shown while a fresh build is
+    queued. A POST queues a fresh build for the current filters.
+    """
+    report_job_type = None
+    report_models = ()
+
+    def get_report_job_params(self, request):
+        return report_job_params(request.GET.dict())
+
+    def get_saved_report(self, params):
+        """The saved report for these filters, or None"""
+        raise NotImplementedError
+
+    def get_report_context(self, report):
+        """Template context for a saved report"""
+        return {}
+
+    def is_stale(self, report):
+        generated_at = report.generated_at
+        if generated_at is None or timezone.localdate(generated_at) < timezone.localdate():
+            return True
+        versions = conditional.model_versions(self.report_models)
+        return any(version > generated_at.timestamp() * 10 ** 9 for version in versions.values())
+
+    def queue_report(self, request):
+        return queue_report_job_once(
+            self.report_job_type,
+            self.get_report_job_params(request),
+            user=request.user,
+            result_url=request.get_full_path(),
+        )
+
+    def get(self, request, *args, **kwargs):
+        self.report = self.get_saved_report(self.get_report_job_params(request))
+        if self.report is None:
+            return redirect('home:report_job_status', pk=self.queue_report(request).pk)
+        self.refreshing = self.is_stale(self.report) and self.queue_report(request)
+        return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(self.get_report_context(self.report))
+        context['report'] = self.report
+        context['report_refreshing'] = bool(self.refreshing)
+        context['can_save_report'] = True
+        return context
+
+    def post(self, request, *args, **kwargs):
+        job = queue_report_job(
+            self.report_job_type,
+            self.get_report_job_params(request),
+            user=request.user,
+            result_url=request.get_full_path(),
+        )
+        return redirect('home:report_job_status', pk=job.pk)
+
+
+class ReportJobStatusView(LoginRequiredMixin, View):
+    """Progress of a queued report build, as JSON or as a polling page"""
+
+    def get(self, request, pk):
+        job = get_object_or_404(ReportJob, pk=pk, requested_by=request.user)
+
+        if request.GET.get('format') == 'json':
+            return JsonResponse({
+                'success': True,
+                'data': {
+                    'id': job.pk,
+                    'type': job.job_type,
+                    'status': job.status,
+                    'progress': job.progress,
+                    'message': job.message,
+                    'error': job.error,
+                    'result_id': job.result_id,
+                    'url': job.result_url if job.status == 'READY' else None,
+                }
+            })
+
+        if job.status == 'READY' and job.result_url:
+            return redirect(job.result_url)
+
+        return render(request, 'home/report_job.html', {'job': job})
+
+
+# ==================== CACHE METRICS ====================
+
+class CacheStatsView(LoginRequiredMixin, UserPassesTestMixin, View):
+    """Hit rate of the shared cache across all workers, for staff and monitoring"""
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request):
+        totals = cache_stats()
+        if totals is None:
+            return JsonResponse({'success': False, 'error': 'Cache hit counters are not enabled'})
+        return JsonResponse({'success': True, 'data': totals})
+
+
+class SearchAPIView(LoginRequiredMixin, View):
+    """
+    Ranked search across cattle, ponds, cycles, customers and sales.
+    ?q= is matched word by word as prefixes; ?types=cattle,pond narrows the
+    kinds and ?limit= caps the hits (default 20, at most 100).
+    """
+
+    def get(self, request):
+        query = request.GET.get('q', '')
+        if len(query.strip()) < 2:
+            return JsonResponse({'success': True, 'data': []})
+
+        kinds = [kind for kind in request.GET.get('types', '').split(',') if kind]
+        unknown = set(kinds) - set(search.registered_kinds())
+        if unknown:
+            return JsonResponse({'success': False, 'error': f"Unknown types: {', '.join(sorted(unknown))}"}, status=400)
+        try:
+            limit = min(max(int(request.GET.get('limit', 20)), 1), 100)
+        except ValueError:
+            limit = 20
+
+        return JsonResponse({'success': True, 'data': search.search(query, kinds, limit)})
+
+
+# ==================== ALERTS ====================
+
+class AlertListAPIView(LoginRequiredMixin, ConditionalGetMixin, View):
+    """
+    Active alerts, most urgent first. ?app=dairy narrows them to one app and
+    ?acknowledged=1 includes the ones already acknowledged.
+    """
+    conditional_models = (Alert,)
+
+    def get(self, request):
+        alerts = Alert.objects.all()
+        if request.GET.get('app'):
+            alerts = alerts.filter(app=request.GET['app'])
+        if not request.GET.get('acknowledged'):
+            alerts = alerts.filter(acknowledged_at__isnull=True)
+
+        data = alerts.order_by('priority', 'due_date', 'id').values(
+            'id', 'kind', 'app', 'level', 'icon', 'title', 'message', 'url',
+            'due_date', 'created_at', 'acknowledged_at',
+        )[:100]
+        return JsonResponse({'success': True, 'data': list(data)})
+
+
+class AlertAcknowledgeAPIView(LoginRequiredMixin, View):
+    """Acknowledge an alert, hiding it from the notification bell until it clears"""
+
+    def post(self, request, pk):
+        count = Alert.objects.filter(pk=pk, acknowledged_at__isnull=True).update(
+            acknowledged_at=timezone.now(), acknowledged_by=request.user
+        )
+        if not count and not Alert.objects.filter(pk=pk).exists():
+            return JsonResponse({'success': False, 'error': 'Alert not found'}, status=404)
+        if count:
+            conditional.changed(Alert)
+        return JsonResponse({'success': True})
@@ -0,0 +1,55 @@
+"""
+Process pool entry points for `manage.py run_report_worker`.
+
+Pool processes are spawned fresh, so this module must stay importable
+before Django is set up: anything touching models is imported inside
+the functions.
+"""
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+def init_worker_process():
+    """Set Django up once in each spawned pool process"""
+    import django
+    django.setup()
+
+
+def run_job_in_process(job_id):
+    from .jobs import run_job
+    return run_job(job_id)
+
+
+def run_worker(workers=2, poll_interval=2.0, once=False, on_submit=None):
+    """
+    Claim pending ReportJobs and build them in a pool of worker processes.
+    With once=True, return after the queue has been drained.
+    """
+    from django.db import connections
+    from .jobs import claim_next_job
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=init_worker_process,
+    )
+    running = set()
+    try:
+        while True:
+            running = {future for future in running if not future.done()}
+            while len(running) < workers:
+                job_id = claim_next_job()
+                if job_id is None:
+                    break
+                running.add(pool.submit(run_job_in_process, job_id))
+                if on_submit:
+                    on_submit(job_id)
+
+            if once and not running:
+                return
+            # Don't hold a connection open between polls
+            connections.close_all()
+            time.sleep(poll_interval)
+    finally:
+        pool.shutdown(wait=True)